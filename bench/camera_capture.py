@@ -0,0 +1,78 @@
+"""
+Per-capture cost: open/warm-up/release vs persistent CameraStream.
+
+    python -m bench.camera_capture --source 0
+    python -m bench.camera_capture --source state/ --repeat 50
+
+--source: 카메라 인덱스, 이미지 파일, 이미지 디렉터리, 동영상 파일
+"""
+import argparse
+import statistics
+import time
+
+from worker.camera import CameraStream, open_source
+
+
+def capture_legacy(source, warmup_frames: int = 10):
+    """기존 capture_one_frame 동작 재현 (open → warm-up → release)"""
+    cap = open_source(source)
+    if not cap.isOpened():
+        raise RuntimeError(f"Camera open failed: source={source}")
+
+    frame = None
+    for _ in range(max(1, warmup_frames)):
+        ok, fr = cap.read()
+        if ok:
+            frame = fr
+        time.sleep(0.01)
+
+    cap.release()
+    return frame
+
+
+def _summary(name, xs):
+    xs = sorted(xs)
+    p95 = xs[int(0.95 * (len(xs) - 1))]
+    print(
+        f"{name:<16} mean={statistics.mean(xs) * 1000:8.2f}ms "
+        f"p50={statistics.median(xs) * 1000:8.2f}ms "
+        f"p95={p95 * 1000:8.2f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", default="0")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--legacy-repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+
+    legacy = []
+    for _ in range(args.legacy_repeat):
+        t0 = time.perf_counter()
+        capture_legacy(source)
+        legacy.append(time.perf_counter() - t0)
+
+    newer, latest = [], []
+    with CameraStream(source) as stream:
+        stream.wait_newer_than(0.0, timeout=10.0)
+
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            stream.wait_newer_than(time.monotonic())
+            newer.append(time.perf_counter() - t0)
+
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            stream.latest()
+            latest.append(time.perf_counter() - t0)
+
+    _summary("legacy", legacy)
+    _summary("stream.newer", newer)
+    _summary("stream.latest", latest)
+
+
+if __name__ == "__main__":
+    main()
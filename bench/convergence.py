@@ -0,0 +1,394 @@
+"""
+Run-to-target convergence benchmark (strategy / OCR / camera 변경 전후 비교용)
+
+    # 시뮬레이터, 무작위 목표 1000개, 전략 3종
+    python -m bench.convergence --random 1000 --seed 0 --strategies ladder calibrated adaptive --out sim.json
+
+    # 범위 / 재실행
+    python -m bench.convergence --range 1000 4500 250 --strategies calibrated
+    python -m bench.convergence --replay sim.json --baseline sim.json --csv rerun.csv
+
+    # 펄스 뒤 대기: ROI 정지 감지 (기본) vs 고정 SETTLE_TIME
+    python -m bench.convergence --random 200 --settle fixed --out fixed.json
+    python -m bench.convergence --random 200 --settle vision --baseline fixed.json
+
+    # 판독 + 펄스 융합 추정 (기본) vs 매 step 판독값 그대로
+    python -m bench.convergence --random 200 --estimator off --out raw.json
+    python -m bench.convergence --random 200 --estimator on --baseline raw.json
+
+    # 바뀌지 않은 digit ROI 추론 생략 (기본) vs 매번 4개 추론
+    python -m bench.convergence --random 200 --roi-cache off --out nocache.json
+    python -m bench.convergence --random 200 --roi-cache on --baseline nocache.json
+
+    # 실제 장비 (direct motor mode)
+    python -m bench.convergence --backend rig --motor-port /dev/ttyUSB0 --random 20
+
+분포: iterations, time(capture+OCR+motor+settle), overshoot, 방향 전환 횟수, stage별 시간,
+settle_saved_s (펄스마다 고정 SETTLE_TIME 대비 줄어든 대기 합), unsettled (max wait 초과 횟수),
+rereads (저신뢰 digit 재판독 횟수), captures (판독한 step + 재판독), skipped (추정치로 OCR 생략한 step),
+ocr_rejected (추정치와 어긋나 무시한 판독), roi_hit_rate (추론 생략한 digit ROI 비율),
+roi_saved_s (생략으로 줄어든 추론 시간 추정)
+"""
+import argparse
+import csv
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import worker.ocr
+from sim.batch import fresh_plant_model, random_targets
+from sim.rig import SimRig
+from worker.control_strategy import STRATEGIES, create_strategy
+from worker.control_worker import SETTLE_TIME
+from worker.estimator import VolumeEstimator
+from worker.roi_cache import RoiCache
+
+STAGES = ("capture_s", "ocr_s", "motor_s", "settle_s")
+METRICS = ("iterations", "time_s", "overshoot_ul", "reversals") + STAGES + (
+    "settle_saved_s", "unsettled", "rereads", "captures", "skipped", "ocr_rejected",
+    "roi_hit_rate", "roi_saved_s",
+)
+
+
+def _discard(msg: dict):
+    pass
+
+
+# =========================================================
+# Backends
+# =========================================================
+class SimBackend:
+    """strategy마다 같은 seed의 새 SimRig (같은 시작 값 / 잡음)"""
+
+    name = "sim"
+
+    def __init__(self, seed: int = 0, vision_settle: bool = True, estimator: bool = True, roi_cache: bool = True):
+        self.seed = seed
+        self.vision_settle = vision_settle
+        self.estimator = estimator
+        self.use_roi_cache = roi_cache
+        self.rig = None
+
+    def start(self, strategy_name: str):
+        self.rig = SimRig(seed=self.seed)
+        plant_model = fresh_plant_model()
+        self.plant_model = plant_model
+        self.strategy = create_strategy(strategy_name, plant_model=plant_model)
+        self.roi_cache = RoiCache() if self.use_roi_cache else None
+
+    def run(self, target: int) -> dict:
+        settle = self.rig.settle_detector() if self.vision_settle else None
+        estimator = VolumeEstimator(self.plant_model) if self.estimator else None
+        res = self.rig.run_to_target(
+            target,
+            strategy=self.strategy,
+            plant_model=self.plant_model,
+            settle=settle,
+            estimator=estimator,
+            roi_cache=self.roi_cache,
+        )
+        res["true_ul"] = round(self.rig.true_volume, 2)
+        return res
+
+    def close(self):
+        pass
+
+
+class RigBackend:
+    """실제 카메라 + 시리얼 (worker가 모터를 직접 구동)"""
+
+    name = "rig"
+
+    def __init__(
+        self,
+        camera: int,
+        rotate: int,
+        motor_port: str,
+        ocr_backend: str = None,
+        vision_settle: bool = True,
+        estimator: bool = True,
+        roi_cache: bool = True,
+    ):
+        from worker.worker import WorkerSession
+
+        if not motor_port:
+            raise RuntimeError("--motor-port is required for the rig backend")
+        self.session = WorkerSession(
+            camera_index=camera,
+            rotate=rotate,
+            ocr_backend=ocr_backend,
+            vision_settle=vision_settle,
+            use_estimator=estimator,
+            roi_cache=roi_cache,
+        )
+        self.motor_port = motor_port
+
+    def start(self, strategy_name: str):
+        self.strategy_name = strategy_name
+
+    def run(self, target: int) -> dict:
+        res = self.session.run_target(
+            target, emit=_discard, strategy=self.strategy_name, motor_port=self.motor_port
+        )
+        return res["result"]
+
+    def close(self):
+        from worker.camera import close_camera_streams
+        close_camera_streams()
+
+
+# =========================================================
+# Targets
+# =========================================================
+def load_replay(path: str):
+    """JSON (int 목록 또는 이 스크립트의 결과 파일) / CSV (target 컬럼 또는 첫 컬럼)"""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            first = next(iter(data["strategies"].values()))
+            return [int(r["target"]) for r in first["targets"]]
+        return [int(t) for t in data]
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    if rows and "target" in rows[0]:
+        col = rows[0].index("target")
+        rows = rows[1:]
+    else:
+        col = 0
+    return [int(float(r[col])) for r in rows if r]
+
+
+def build_targets(args):
+    if args.replay:
+        return load_replay(args.replay)
+    if args.range:
+        start, stop, step = args.range
+        return list(range(start, stop + 1, step))
+    return random_targets(args.random, args.seed)
+
+
+# =========================================================
+# Metrics
+# =========================================================
+def target_record(target: int, res: dict) -> dict:
+    steps = res.get("steps", [])
+
+    # overshoot: 처음 오차 방향 기준으로 목표를 넘어간 최대량 (OCR 판독값 기준)
+    overshoot = 0
+    if steps:
+        side = 1 if steps[0]["current"] < target else -1
+        overshoot = max(0, max(side * (s["current"] - target) for s in steps))
+
+    dirs = [s["direction"] for s in steps if s["direction"] is not None]
+    reversals = sum(1 for a, b in zip(dirs, dirs[1:]) if a != b)
+
+    rec = {
+        "target": target,
+        "success": bool(res.get("success")),
+        "reason": res.get("reason"),
+        "final_ul": res.get("final_ul"),
+        "iterations": res.get("iterations"),
+        "overshoot_ul": overshoot,
+        "reversals": reversals,
+        "pulses": sum(s["pulses"] for s in steps),
+    }
+    for stage in STAGES:
+        rec[stage] = round(sum(s[stage] for s in steps), 4)
+    rec["time_s"] = round(sum(rec[stage] for stage in STAGES), 4)
+
+    # 펄스를 보낸 step마다 고정 SETTLE_TIME을 기다렸다면 대비 절약한 시간
+    moved = [s for s in steps if s["pulses"]]
+    rec["settle_saved_s"] = round(len(moved) * SETTLE_TIME - rec["settle_s"], 4)
+    rec["unsettled"] = sum(1 for s in moved if s.get("settled") is False)
+    # 저신뢰 digit 재판독 (재캡처 + 추론) 횟수
+    rec["rereads"] = sum(s.get("rereads", 0) for s in steps)
+    # 캡처 + OCR 횟수 (추정치로 생략한 step 제외)
+    measured = sum(1 for s in steps if s.get("measured", True))
+    rec["captures"] = measured + rec["rereads"]
+    rec["skipped"] = len(steps) - measured
+    rec["ocr_rejected"] = sum(1 for s in steps if s.get("estimate_status") == "rejected")
+    # 바뀌지 않아 추론을 생략한 digit ROI (첫 판독 4개 기준) / 절약 추정
+    lookups = 4 * measured
+    rec["roi_hit_rate"] = round(sum(s.get("roi_hits", 0) for s in steps) / lookups, 4) if lookups else 0.0
+    rec["roi_saved_s"] = round(sum(s.get("roi_saved_s", 0.0) for s in steps), 4)
+
+    if "true_ul" in res:
+        rec["true_ul"] = res["true_ul"]
+        rec["true_error_ul"] = round(res["true_ul"] - target, 2)
+    return rec
+
+
+def _dist(xs):
+    xs = sorted(xs)
+    return {
+        "mean": round(statistics.mean(xs), 4),
+        "p50": round(statistics.median(xs), 4),
+        "p95": round(xs[int(0.95 * (len(xs) - 1))], 4),
+        "max": round(xs[-1], 4),
+    }
+
+
+def summarize(records):
+    summary = {
+        "n": len(records),
+        "success_rate": round(sum(r["success"] for r in records) / len(records), 4),
+    }
+    for m in METRICS:
+        summary[m] = _dist([r[m] for r in records])
+    if "true_error_ul" in records[0]:
+        summary["abs_true_error_ul"] = _dist([abs(r["true_error_ul"]) for r in records])
+    return summary
+
+
+def print_summary(name: str, summary: dict, baseline: dict = None):
+    print(f"\n[{name}] n={summary['n']} success={summary['success_rate'] * 100:.1f}%")
+    print(f"  {'metric':<18} {'mean':>9} {'p50':>9} {'p95':>9} {'max':>9}   {'Δmean':>9}")
+    keys = list(METRICS) + (["abs_true_error_ul"] if "abs_true_error_ul" in summary else [])
+    for m in keys:
+        d = summary[m]
+        delta = ""
+        if baseline and m in baseline:
+            delta = f"{d['mean'] - baseline[m]['mean']:+9.3f}"
+        print(f"  {m:<18} {d['mean']:9.3f} {d['p50']:9.3f} {d['p95']:9.3f} {d['max']:9.3f}   {delta:>9}")
+
+
+def _git_rev():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def write_csv(path: str, results: dict):
+    rows = [dict(strategy=name, **r) for name, res in results.items() for r in res["targets"]]
+    fields = list(dict.fromkeys(k for r in rows for k in r))
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fields)
+        w.writeheader()
+        w.writerows(rows)
+
+
+# =========================================================
+# Main
+# =========================================================
+def main():
+    ap = argparse.ArgumentParser()
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--random", type=int, default=200, help="무작위 목표 개수 (batch_random_test 분포)")
+    src.add_argument("--range", type=int, nargs=3, metavar=("START", "STOP", "STEP"))
+    src.add_argument("--replay", help="목표 목록 JSON/CSV 또는 이전 결과 JSON")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--strategies", nargs="+", default=["ladder"], choices=list(STRATEGIES))
+
+    ap.add_argument("--backend", choices=["sim", "rig"], default="sim")
+    ap.add_argument("--camera", type=int, default=0)
+    ap.add_argument("--rotate", type=int, default=1)
+    ap.add_argument("--motor-port", default=None)
+    ap.add_argument("--ocr-backend", default=None)
+    ap.add_argument(
+        "--settle", choices=["vision", "fixed"], default="vision",
+        help="펄스 뒤 대기: ROI 정지 감지 / 고정 SETTLE_TIME",
+    )
+    ap.add_argument(
+        "--estimator", choices=["on", "off"], default="on",
+        help="판독 + 명령 펄스 융합 추정 (off면 매 step 판독값 그대로)",
+    )
+    ap.add_argument(
+        "--roi-cache", choices=["on", "off"], default="on",
+        help="직전 추론 crop과 같은 digit ROI는 추론 생략",
+    )
+
+    ap.add_argument("--out", default=None, help="결과 JSON")
+    ap.add_argument("--csv", default=None, help="target별 결과 CSV")
+    ap.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    targets = build_targets(args)
+
+    if args.backend == "sim":
+        worker.ocr.SAVE_DEBUG_CROPS = False
+        backend = SimBackend(
+            seed=args.seed,
+            vision_settle=args.settle == "vision",
+            estimator=args.estimator == "on",
+            roi_cache=args.roi_cache == "on",
+        )
+    else:
+        backend = RigBackend(
+            args.camera,
+            args.rotate,
+            args.motor_port,
+            args.ocr_backend,
+            vision_settle=args.settle == "vision",
+            estimator=args.estimator == "on",
+            roi_cache=args.roi_cache == "on",
+        )
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("strategies", {})
+
+    print(
+        f"[BENCH] backend={backend.name} targets={len(targets)} strategies={args.strategies} "
+        f"settle={args.settle} estimator={args.estimator} roi_cache={args.roi_cache}"
+    )
+
+    results = {}
+    try:
+        for name in args.strategies:
+            backend.start(name)
+            records = []
+            t0 = time.perf_counter()
+            for i, target in enumerate(targets):
+                if args.verbose:
+                    res = backend.run(target)
+                else:
+                    # run_to_target 로그 억제
+                    with open(os.devnull, "w") as sink:
+                        stdout, stderr = sys.stdout, sys.stderr
+                        sys.stdout = sys.stderr = sink
+                        try:
+                            res = backend.run(target)
+                        finally:
+                            sys.stdout, sys.stderr = stdout, stderr
+                records.append(target_record(target, res))
+
+            summary = summarize(records)
+            summary["bench_wall_s"] = round(time.perf_counter() - t0, 2)
+            results[name] = {"summary": summary, "targets": records}
+            print_summary(name, summary, baseline.get(name, {}).get("summary"))
+    finally:
+        backend.close()
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "created": datetime.now().isoformat(timespec="seconds"),
+                    "git": _git_rev(),
+                    "backend": backend.name,
+                    "seed": args.seed,
+                    "settle": args.settle,
+                    "argv": sys.argv[1:],
+                },
+                "strategies": results,
+            }, f, indent=2)
+        print(f"\n[BENCH] saved → {args.out}")
+
+    if args.csv:
+        write_csv(args.csv, results)
+        print(f"[BENCH] saved → {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+RX frame parser 처리량: FrameParser vs 이전 _rx_worker 방식 (pop(0) / ETX 검색 / slice 복사)
+
+    python -m bench.frame_parser --mb 4
+    python -m bench.frame_parser --capture rx_dump.bin --chunk 64
+
+--capture: 실제 장비에서 저장한 RX byte 덤프, 없으면 status / feedback frame + 잡음으로 생성
+"""
+import argparse
+import random
+import time
+
+from worker.frame_parser import FrameParser
+from worker.make_packet import MakePacket
+
+ETX = MakePacket.ENDOFBYTE
+
+
+def legacy_feed(buffer: bytearray, data: bytes, out: list) -> bytearray:
+    """user-015 이전 SerialController._rx_worker 파싱 루프 (비교용)"""
+    buffer += data
+    while len(buffer) >= 13:
+        if buffer[0] != MakePacket.HEADER1 or buffer[1] != MakePacket.HEADER2:
+            buffer.pop(0)
+            continue
+        if ETX not in buffer:
+            break
+        end = buffer.index(ETX)
+        frame = bytes(buffer[:end + 1])
+        buffer = buffer[end + 1:]
+        if len(frame) == 13:
+            out.append(frame)
+    return buffer
+
+
+def synth_stream(size: int, noise: float, seed: int) -> bytes:
+    rng = random.Random(seed)
+    out = bytearray()
+    while len(out) < size:
+        if rng.random() < noise:
+            out += bytes(rng.randrange(256) for _ in range(rng.randint(1, 8)))
+        actuator_id = rng.choice([0x0A, 0x0B, 0x0C])
+        if rng.random() < 0.8:
+            out += MakePacket._base_packet(actuator_id, 0x11, [0, 0, 0, rng.randint(0, 1)])
+        else:
+            pos = rng.randrange(4096)
+            out += MakePacket._base_packet(actuator_id, MakePacket.MIGHTYZAP_GetFeedbackData, [pos & 0xFF, pos >> 8])
+    return bytes(out)
+
+
+def run(name, stream: bytes, chunk: int, feed):
+    t0 = time.perf_counter()
+    n = feed(stream, chunk)
+    dt = time.perf_counter() - t0
+    print(f"{name:<8} frames={n:8d} {len(stream) / dt / 1e6:8.2f} MB/s  {dt * 1000:8.1f} ms")
+    return n
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--capture", default=None, help="RX byte 덤프 파일")
+    ap.add_argument("--mb", type=float, default=4.0, help="생성할 스트림 크기 (MB)")
+    ap.add_argument("--noise", type=float, default=0.05, help="frame 사이 잡음 삽입 확률")
+    ap.add_argument("--chunk", type=int, nargs="+", default=[64, 4096], help="read() 크기")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--skip-legacy", action="store_true")
+    args = ap.parse_args()
+
+    if args.capture:
+        with open(args.capture, "rb") as f:
+            stream = f.read()
+    else:
+        stream = synth_stream(int(args.mb * 1e6), args.noise, args.seed)
+    print(f"[BENCH] {len(stream) / 1e6:.2f} MB")
+
+    def parser_feed(data, chunk):
+        p = FrameParser()
+        n = 0
+        for i in range(0, len(data), chunk):
+            n += len(p.feed(data[i:i + chunk]))
+        print(f"         {p.stats()}")
+        return n
+
+    def legacy(data, chunk):
+        buf, out = bytearray(), []
+        for i in range(0, len(data), chunk):
+            buf = legacy_feed(buf, data[i:i + chunk], out)
+        return len(out)
+
+    for chunk in args.chunk:
+        print(f"\nchunk={chunk}")
+        run("parser", stream, chunk, parser_feed)
+        if not args.skip_legacy:
+            run("legacy", stream, chunk, legacy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Throughput / latency of every available OCR backend on a directory of ROI crops.
+
+    python -m bench.ocr_backends --crops snapshots/rois --batch 4
+    python -m bench.ocr_backends --crops crops/ --backends onnx opencv --threads 4
+
+설치되지 않았거나 모델 파일이 없는 backend는 건너뛴다.
+"""
+import argparse
+import os
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from worker.camera import IMAGE_EXTS
+from worker.ocr_backends import BACKENDS, create_backend
+from worker.ocr_preprocess import preprocess_crops
+
+
+def load_batches(crops_dir: str, batch: int):
+    files = sorted(
+        os.path.join(crops_dir, f)
+        for f in os.listdir(crops_dir)
+        if f.lower().endswith(IMAGE_EXTS)
+    )
+    crops = [img for img in (cv2.imread(f) for f in files) if img is not None]
+    if not crops:
+        raise RuntimeError(f"No crops in {crops_dir}")
+
+    return [
+        preprocess_crops(crops[i:i + batch])
+        for i in range(0, len(crops), batch)
+    ]
+
+
+def bench_backend(backend, batches, warmup: int, rounds: int):
+    for b in batches[:warmup]:
+        backend.infer(b)
+
+    lat = []
+    n_crops = 0
+    t_start = time.perf_counter()
+    for _ in range(rounds):
+        for b in batches:
+            t0 = time.perf_counter()
+            backend.infer(b)
+            lat.append(time.perf_counter() - t0)
+            n_crops += b.shape[0]
+    total = time.perf_counter() - t_start
+
+    return lat, n_crops / total
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--crops", required=True, help="ROI crop 이미지 디렉터리")
+    ap.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    ap.add_argument("--batch", type=int, default=4)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--trt-model", default=None)
+    ap.add_argument("--onnx-model", default=None, help="onnx / opencv 공용")
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    batches = load_batches(args.crops, args.batch)
+    print(f"[BENCH] {sum(b.shape[0] for b in batches)} crops, batch={args.batch}")
+
+    model_paths = {
+        "trt": args.trt_model,
+        "onnx": args.onnx_model,
+        "opencv": args.onnx_model,
+    }
+
+    predictions = {}
+    print(f"\n{'backend':<8} {'p50':>9} {'p95':>9} {'mean':>9} {'crops/s':>9}")
+    for name in args.backends:
+        try:
+            backend = create_backend(name, model_path=model_paths[name], threads=args.threads)
+        except Exception as e:
+            print(f"{name:<8} skipped ({type(e).__name__}: {e})")
+            continue
+
+        lat, throughput = bench_backend(backend, batches, args.warmup, args.rounds)
+        lat.sort()
+        p95 = lat[int(0.95 * (len(lat) - 1))]
+        print(
+            f"{name:<8} {statistics.median(lat) * 1000:8.2f}ms {p95 * 1000:8.2f}ms "
+            f"{statistics.mean(lat) * 1000:8.2f}ms {throughput:9.1f}"
+        )
+
+        predictions[name] = np.concatenate([backend.infer(b)[0] for b in batches])
+
+    # backend 간 예측 일치율 (첫 backend 기준)
+    names = list(predictions)
+    for name in names[1:]:
+        agree = np.mean(predictions[name] == predictions[names[0]])
+        print(f"[BENCH] agreement {name} vs {names[0]}: {agree * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+OCR preprocessing: torchvision (PIL) path vs NumPy batch path.
+
+    python -m bench.ocr_preprocess --repeat 200
+    python -m bench.ocr_preprocess --frame state/last_frame.jpg
+
+- per-batch time (4 ROI → (4,3,224,224))
+- worker import time: torch+torchvision vs worker.ocr_preprocess
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from worker.ocr_preprocess import (
+    INPUT_SIZE,
+    NORM_MEAN,
+    NORM_STD,
+    crop_rois,
+    preprocess_rois,
+)
+from worker.paths import FRAME_JPG_PATH, ROIS_JSON_PATH
+
+
+def _import_time(stmt: str, repeat: int = 3) -> float:
+    xs = []
+    for _ in range(repeat):
+        code = (
+            "import time; t0 = time.perf_counter(); "
+            f"{stmt}; print(time.perf_counter() - t0)"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        if out.returncode != 0:
+            return float("nan")
+        xs.append(float(out.stdout.strip()))
+    return min(xs)
+
+
+def _time(fn, repeat: int):
+    xs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        xs.append(time.perf_counter() - t0)
+    return xs
+
+
+def _summary(name, xs):
+    print(
+        f"{name:<12} mean={statistics.mean(xs) * 1000:7.3f}ms "
+        f"p50={statistics.median(xs) * 1000:7.3f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frame", default=FRAME_JPG_PATH)
+    ap.add_argument("--rois", default=ROIS_JSON_PATH)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    frame = cv2.imread(args.frame)
+    if frame is None:
+        frame = np.random.default_rng(0).integers(0, 256, (1280, 800, 3), dtype=np.uint8)
+    with open(args.rois, "r", encoding="utf-8") as f:
+        rois = sorted(json.load(f), key=lambda r: r[1])[:4]
+
+    out = np.empty((len(rois), 3) + INPUT_SIZE, dtype=np.float32)
+    results = {"numpy": _time(lambda: preprocess_rois(frame, rois, out=out), args.repeat)}
+
+    try:
+        from PIL import Image
+        from torchvision import transforms
+
+        tv = transforms.Compose([
+            transforms.Resize(INPUT_SIZE, antialias=True),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=NORM_MEAN, std=NORM_STD),
+        ])
+
+        def torchvision_batch():
+            xs = []
+            for c in crop_rois(frame, rois):
+                rgb = cv2.cvtColor(c, cv2.COLOR_BGR2RGB)
+                xs.append(tv(Image.fromarray(rgb)).numpy().astype(np.float32))
+            return np.stack(xs, axis=0).astype(np.float32)
+
+        results["torchvision"] = _time(torchvision_batch, args.repeat)
+        diff = np.abs(torchvision_batch() - preprocess_rois(frame, rois))
+        print(f"[BENCH] max |numpy - torchvision| = {diff.max():.3g}")
+    except ImportError:
+        print("[BENCH] torchvision not installed, numpy path only")
+
+    print(f"\nper batch ({len(rois)} ROIs)")
+    for name, xs in results.items():
+        _summary(name, xs)
+
+    print("\nimport time (fresh interpreter)")
+    print(f"{'torchvision':<12} {_import_time('import torch, torchvision, PIL') * 1000:8.1f}ms")
+    print(f"{'numpy':<12} {_import_time('import worker.ocr_preprocess') * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+BatchingOcrServer vs backend 직접 호출 (lock 직렬화): 동시 호출자 수별 처리량 / 지연
+
+    python -m bench.ocr_server --callers 1 2 4 8 --requests 200
+    python -m bench.ocr_server --backend onnx --threads 4 --max-batch 32 --max-wait-ms 1
+
+입력은 시뮬레이터 프레임 (sim.render) 의 ROI 4개 (호출 1회 = 4행).
+backend: sim (TemplateOcrBackend, 모델 불필요) | trt | onnx | opencv
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import numpy as np
+
+from sim.ocr import TemplateOcrBackend
+from sim.render import OdometerRenderer
+from worker.ocr import sorted_digit_rois
+from worker.ocr_backends import BACKENDS, create_backend
+from worker.ocr_preprocess import crop_rois, preprocess_crops
+from worker.ocr_server import BatchingOcrServer
+
+
+class LockedBackend:
+    """기준선: 호출자마다 backend를 직접 호출 (lock으로 직렬화)"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+
+    def infer(self, batch):
+        with self._lock:
+            return self.backend.infer(batch)
+
+
+def make_inputs(renderer, n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    rois = sorted_digit_rois(renderer.rois)
+    return [
+        preprocess_crops(crop_rois(renderer.render(float(v)), rois))
+        for v in rng.integers(500, 5000, n)
+    ]
+
+
+def run_callers(backend, inputs, callers: int, requests: int):
+    """returns: (초당 요청 수, 요청별 지연 목록 s)"""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(callers + 1)
+
+    def caller(i):
+        mine = []
+        barrier.wait()
+        for k in range(requests // callers):
+            x = inputs[(i + k * callers) % len(inputs)]
+            t0 = time.perf_counter()
+            backend.infer(x)
+            mine.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(callers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    return len(latencies) / (time.perf_counter() - t0), latencies
+
+
+def _fmt(name, rate, lat):
+    lat = sorted(lat)
+    p95 = lat[int(0.95 * (len(lat) - 1))]
+    return (
+        f"{name:<8} {rate:8.1f} req/s  "
+        f"mean={statistics.mean(lat) * 1000:7.2f}ms p95={p95 * 1000:7.2f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--backend", choices=["sim"] + list(BACKENDS), default="sim")
+    ap.add_argument("--model", default=None)
+    ap.add_argument("--threads", type=int, default=None)
+    ap.add_argument("--callers", type=int, nargs="+", default=[1, 2, 4, 8])
+    ap.add_argument("--requests", type=int, default=200, help="caller 수와 관계없이 전체 요청 수")
+    ap.add_argument("--max-batch", type=int, default=32)
+    ap.add_argument("--max-wait-ms", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    renderer = OdometerRenderer(seed=args.seed)
+    if args.backend == "sim":
+        backend = TemplateOcrBackend(renderer)
+    else:
+        backend = create_backend(args.backend, model_path=args.model, threads=args.threads)
+
+    inputs = make_inputs(renderer, 64, args.seed)
+    backend.infer(inputs[0])  # warmup
+
+    print(f"[OCR SERVER] backend={backend.name} max_batch={args.max_batch} max_wait={args.max_wait_ms}ms")
+    for callers in args.callers:
+        rate, lat = run_callers(LockedBackend(backend), inputs, callers, args.requests)
+        print(f"callers={callers}")
+        print("  " + _fmt("direct", rate, lat))
+
+        with BatchingOcrServer(backend, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms) as server:
+            rate, lat = run_callers(server, inputs, callers, args.requests)
+            stats = server.stats()
+        print("  " + _fmt("batched", rate, lat))
+        print(
+            f"  batches={stats['batches']} rows/batch mean={stats['batch_rows']['mean']} "
+            f"max={stats['batch_rows']['max']} queue wait p95={stats['queue_wait_ms']['p95']}ms "
+            f"infer p50={stats['infer_ms']['p50']}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Per-frame ROI tracking cost vs full-frame YOLO detection on a recorded frame sequence.
+
+    python -m bench.roi_tracking --frames recordings/run01 --rotate 1
+    python -m bench.roi_tracking --frames recordings/run01 --rois state/rois.json --no-yolo
+
+--frames: 이미지 디렉터리 (파일명 순서 = 프레임 순서)
+초기 ROI는 --rois JSON, 없으면 첫 프레임 YOLO 검출 결과.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+import cv2
+
+from worker.camera import IMAGE_EXTS
+from worker.roi_tracker import RoiTracker
+from worker.camera import rotate_frame
+
+
+def load_frames(frames_dir: str, rotate: int):
+    files = sorted(
+        os.path.join(frames_dir, f)
+        for f in os.listdir(frames_dir)
+        if f.lower().endswith(IMAGE_EXTS)
+    )
+    frames = [rotate_frame(img, rotate) for img in (cv2.imread(f) for f in files) if img is not None]
+    if not frames:
+        raise RuntimeError(f"No frames in {frames_dir}")
+    return frames
+
+
+def _summary(name, xs):
+    xs = sorted(xs)
+    p95 = xs[int(0.95 * (len(xs) - 1))]
+    print(
+        f"{name:<10} mean={statistics.mean(xs) * 1000:8.2f}ms "
+        f"p50={statistics.median(xs) * 1000:8.2f}ms "
+        f"p95={p95 * 1000:8.2f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", required=True)
+    ap.add_argument("--rotate", type=int, default=0)
+    ap.add_argument("--rois", default=None, help="초기 ROI JSON")
+    ap.add_argument("--no-yolo", action="store_true")
+    ap.add_argument("--margin", type=int, default=48)
+    ap.add_argument("--downscale", type=int, default=2)
+    args = ap.parse_args()
+
+    frames = load_frames(args.frames, args.rotate)
+    print(f"[BENCH] {len(frames)} frames {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    detect = None
+    if not args.no_yolo:
+        try:
+            from worker.yolo_worker import detect_rois, warmup_yolo
+            warmup_yolo(frame_shape=frames[0].shape)
+            detect = detect_rois
+        except Exception as e:
+            print(f"[BENCH] YOLO unavailable ({type(e).__name__}: {e})")
+
+    if args.rois:
+        with open(args.rois, "r", encoding="utf-8") as f:
+            rois = json.load(f)
+    elif detect is not None:
+        rois = detect(frames[0])
+    else:
+        raise RuntimeError("--rois required when YOLO is unavailable")
+
+    # -------------------------------------------------
+    # Tracking (재검출 없이 lost만 집계)
+    # -------------------------------------------------
+    tracker = RoiTracker(margin=args.margin, downscale=args.downscale)
+    tracker.reset(frames[0], rois)
+
+    t_track, conf, lost = [], [], 0
+    drift = 0.0
+    for frame in frames[1:]:
+        t0 = time.perf_counter()
+        res = tracker.track(frame)
+        t_track.append(time.perf_counter() - t0)
+
+        conf.append(res.confidence)
+        drift = max(drift, res.drift)
+        if res.lost:
+            lost += 1
+            if detect is not None:
+                tracker.reset(frame, detect(frame))
+            else:
+                tracker.reset(frame, tracker.rois)
+
+    _summary("track", t_track)
+    print(
+        f"[BENCH] confidence min={min(conf):.3f} p50={statistics.median(conf):.3f} "
+        f"max drift={drift:.1f}px lost={lost}/{len(t_track)}"
+    )
+
+    # -------------------------------------------------
+    # Full YOLO detection
+    # -------------------------------------------------
+    if detect is None:
+        return
+
+    t_yolo, mismatch = [], 0
+    tracker.reset(frames[0], rois)
+    for frame in frames[1:]:
+        t0 = time.perf_counter()
+        det = detect(frame)
+        t_yolo.append(time.perf_counter() - t0)
+
+        # 추적 결과와 검출 결과 차이 (px)
+        res = tracker.track(frame)
+        if len(det) == len(res.rois):
+            err = max(
+                max(abs(a[0] - b[0]), abs(a[1] - b[1])) for a, b in zip(det, res.rois)
+            )
+            mismatch = max(mismatch, err)
+        if res.lost and det:
+            tracker.reset(frame, det)
+
+    _summary("yolo", t_yolo)
+    print(
+        f"[BENCH] speedup x{statistics.mean(t_yolo) / statistics.mean(t_track):.1f} "
+        f"max track-vs-yolo offset={mismatch}px"
+    )
+
+
+if __name__ == "__main__":
+    main()
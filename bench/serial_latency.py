@@ -0,0 +1,157 @@
+"""
+SerialController 지연 / idle CPU 측정 (PTY 가상 장치, 하드웨어 불필요)
+
+    python -m bench.serial_latency --count 200
+    python -m bench.serial_latency --count 200 --reply-delay 0.002
+
+enqueue→write : enqueue() 호출 → 장치가 packet을 받은 시각
+write→status  : 장치가 status frame을 보낸 시각 → _handle_frame 처리 시각
+idle CPU      : 연결 후 아무 명령 없이 (poll off / on) 프로세스 CPU 사용률
+stop/load     : --tx-gap 으로 느린 링크를 흉내 내고 motion burst 뒤 stop 지연 / 유실 측정
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sim.pty_device import PtyDevice
+from worker.frame_parser import StatusFrame
+from worker.make_packet import MakePacket
+from worker.serial_controller import SerialController
+
+
+def _summary(name, xs):
+    xs = sorted(xs)
+    p95 = xs[int(0.95 * (len(xs) - 1))]
+    print(
+        f"{name:<14} n={len(xs):4d} "
+        f"mean={statistics.mean(xs) * 1000:7.2f}ms "
+        f"p50={statistics.median(xs) * 1000:7.2f}ms "
+        f"p95={p95 * 1000:7.2f}ms "
+        f"max={xs[-1] * 1000:7.2f}ms"
+    )
+
+
+def _wait_for(cond, timeout):
+    deadline = time.perf_counter() + timeout
+    while not cond() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    return cond()
+
+
+def measure_tx(ctrl: SerialController, device: PtyDevice, count: int, rng: random.Random):
+    """명령마다 position 값을 달리해서 장치 수신 frame과 짝을 맞춘다"""
+    lat = []
+    for i in range(count):
+        position = 1000 + i
+        pkt = MakePacket.set_position(0x0A, position)
+
+        n = len(device.received)
+        t0 = time.perf_counter()
+        ctrl.enqueue(pkt)
+        if not _wait_for(lambda: any(f == pkt for _, f in device.received[n:]), 1.0):
+            print(f"[BENCH] packet {i} not received (dropped?)")
+            continue
+        t_rx = next(t for t, f in device.received[n:] if f == pkt)
+        lat.append(t_rx - t0)
+
+        time.sleep(rng.uniform(0.005, 0.03))
+    return lat
+
+
+def measure_rx(ctrl: SerialController, device: PtyDevice, count: int, rng: random.Random):
+    """장치가 직접 status frame을 보내고, controller가 처리한 시각과 비교"""
+    handled = []
+    orig = ctrl._handle_frame
+
+    def _stamp(frame):
+        if isinstance(frame, StatusFrame):
+            handled.append(time.perf_counter())
+        return orig(frame)
+
+    ctrl._handle_frame = _stamp
+    lat = []
+    try:
+        for i in range(count):
+            n = len(handled)
+            device.moving[0x0A] = i % 2
+            device.handle(MakePacket.get_moving(0x0A))
+            t_tx = device.replied[-1][0]
+            if not _wait_for(lambda: len(handled) > n, 1.0):
+                print(f"[BENCH] status {i} not handled")
+                continue
+            lat.append(handled[n] - t_tx)
+            time.sleep(rng.uniform(0.005, 0.03))
+    finally:
+        ctrl._handle_frame = orig
+    return lat
+
+
+def measure_stop_under_load(ctrl: SerialController, device: PtyDevice, count: int, burst: int):
+    """motion packet burst 직후 stop → 장치 도착까지 (유실 횟수 포함)"""
+    lat, lost = [], 0
+    for i in range(count):
+        for j in range(burst):
+            ctrl.enqueue(MakePacket.set_position(0x0A + j % 2, 100 + i * burst + j))
+        stop = MakePacket.pipette_change_volume(0x0C, 0, 0)
+
+        n = len(device.received)
+        t0 = time.perf_counter()
+        ctrl.enqueue(stop)
+        if not _wait_for(lambda: any(f == stop for _, f in device.received[n:]), 2.0):
+            lost += 1
+            continue
+        lat.append(next(t for t, f in device.received[n:] if f == stop) - t0)
+        ctrl.tx_queue.wait_idle(2.0)
+    return lat, lost
+
+
+def measure_idle_cpu(seconds: float) -> float:
+    c0, w0 = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    return (time.process_time() - c0) / (time.perf_counter() - w0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--count", type=int, default=200)
+    ap.add_argument("--reply-delay", type=float, default=0.0, help="장치 응답 지연 (s)")
+    ap.add_argument("--idle", type=float, default=2.0, help="idle CPU 측정 시간 (s)")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--tx-gap", type=float, default=0.005, help="stop/load 측정 시 packet 간 간격 (s)")
+    ap.add_argument("--burst", type=int, default=8, help="stop 직전 motion packet 수")
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with PtyDevice(reply_delay=args.reply_delay) as device:
+        ctrl = SerialController(port=device.port)
+        ctrl.tx_debug = False
+        ctrl.rx_debug = False
+        ctrl.polling_enabled = False
+        ctrl.connect()
+        try:
+            print(f"[BENCH] port={device.port}")
+            print(f"idle CPU (poll off) {measure_idle_cpu(args.idle) * 100:6.2f}%")
+
+            _summary("enqueue→write", measure_tx(ctrl, device, args.count, rng))
+            _summary("write→status", measure_rx(ctrl, device, args.count, rng))
+
+            ctrl.polling_enabled = True
+            n = len(device.received)
+            cpu = measure_idle_cpu(args.idle)
+            polls = len(device.received) - n
+            print(f"idle CPU (poll on)  {cpu * 100:6.2f}%  polls={polls / args.idle:.1f}/s")
+
+            ctrl.MIN_TX_GAP_SEC = args.tx_gap
+            ctrl.tx_queue.reset_stats()
+            lat, lost = measure_stop_under_load(ctrl, device, max(1, args.count // 4), args.burst)
+            if lat:
+                _summary("stop/load", lat)
+            print(f"stop lost={lost}  tx_stats={ctrl.tx_stats()}")
+        finally:
+            ctrl.close()
+
+
+if __name__ == "__main__":
+    main()
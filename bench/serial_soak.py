@@ -0,0 +1,170 @@
+"""
+SerialController soak test: 펌웨어 에뮬레이터 (sim.firmware) + 링크 오류 주입
+
+    python -m bench.serial_soak --cycles 200
+    python -m bench.serial_soak --cycles 500 --latency 0.002 --jitter 0.003 --loss 0.002 --corrupt 0.002 --rx-loss 0.01
+
+startup   : Controller 초기화와 같은 순서 (LinearActuator.initialize × 2)
+move      : 0x0A / 0x0B 임의 위치 move_and_wait → feedback 위치 확인
+detect    : set position만 보내고 adaptive poller가 이동 완료(active 해제)를 알아챈 시각 - 실제 도착 시각
+idle      : 명령 없을 때 poll 수 / CPU
+pulse     : VolumeDCActuator.pulse → 다이얼 volume 변화 / 정지 확인 (stop 유실 = runaway)
+counters  : frame parser / tx scheduler / 에뮬레이터 오류 주입 카운터
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sim.firmware import FirmwareEmulator, LinkFaults
+from worker.actuator_linear import LinearActuator
+from worker.actuator_volume_dc import VolumeDCActuator
+from worker.make_packet import MakePacket
+from worker.serial_controller import SerialController
+
+
+def _summary(name, xs):
+    if not xs:
+        print(f"{name:<10} n=   0")
+        return
+    xs = sorted(xs)
+    p95 = xs[int(0.95 * (len(xs) - 1))]
+    print(
+        f"{name:<10} n={len(xs):4d} "
+        f"mean={statistics.mean(xs) * 1000:7.1f}ms "
+        f"p50={statistics.median(xs) * 1000:7.1f}ms "
+        f"p95={p95 * 1000:7.1f}ms "
+        f"max={xs[-1] * 1000:7.1f}ms"
+    )
+
+
+def read_position(ctrl: SerialController, actuator_id: int, timeout: float = 0.2, retries: int = 3):
+    """GetFeedbackData 응답 위치 (응답 유실 시 재요청), 실패하면 None"""
+    for _ in range(retries):
+        fut = ctrl.send(MakePacket.get_feedback(actuator_id))
+        try:
+            return fut.result(timeout).position
+        except Exception:
+            fut.cancel()
+    return None
+
+
+def soak_moves(ctrl, linears, cycles, rng, tolerance):
+    times, failures, mismatches, no_feedback = [], 0, 0, 0
+    for _ in range(cycles):
+        actuator = rng.choice(linears)
+        target = rng.randint(200, 3800)
+        t0 = time.perf_counter()
+        if not actuator.move_to(target, timeout=5.0):
+            failures += 1
+            continue
+        times.append(time.perf_counter() - t0)
+
+        pos = read_position(ctrl, actuator.actuator_id)
+        if pos is None:
+            no_feedback += 1
+        elif abs(pos - target) > tolerance:
+            mismatches += 1
+    return times, {"move_failed": failures, "position_mismatch": mismatches, "no_feedback": no_feedback}
+
+
+def soak_detect(ctrl, fw, linears, count, rng):
+    """poller 완료 감지 지연 (에뮬레이터 축 속도로 실제 도착 시각 계산)"""
+    lags, missed = [], 0
+    for _ in range(count):
+        actuator = rng.choice(linears)
+        axis = fw.axes[actuator.actuator_id]
+        start, target = axis.position, rng.randint(200, 3800)
+        rate = axis.max_rate * axis.speed / axis.MAX_SPEED
+
+        t0 = time.perf_counter()
+        ctrl.send_mightyzap_set_position(actuator.actuator_id, target)
+        deadline = t0 + 5.0
+        while actuator.actuator_id in ctrl.active_ids() and time.perf_counter() < deadline:
+            time.sleep(0.0005)
+        if actuator.actuator_id in ctrl.active_ids():
+            missed += 1
+            continue
+        lags.append(max(0.0, time.perf_counter() - (t0 + abs(target - start) / rate)))
+    return lags, missed
+
+
+def measure_idle(ctrl, fw, seconds):
+    n = fw.counters["commands"]
+    c0, w0 = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    cpu = (time.process_time() - c0) / (time.perf_counter() - w0)
+    return (fw.counters["commands"] - n) / seconds, cpu
+
+
+def soak_pulses(fw, dc, count, rng):
+    """pulse 뒤 다이얼이 멈추지 않으면 runaway (stop 유실)"""
+    runaways, unchanged = 0, 0
+    for i in range(count):
+        v0 = fw.volume
+        dc.pulse(direction=i % 2, duty=rng.randint(30, 80), duration_ms=rng.randint(20, 80))
+        time.sleep(0.15)  # 관성 정지
+        v1 = fw.volume
+        time.sleep(0.05)
+        if fw.dial_moving or abs(fw.volume - v1) > 0.5:
+            runaways += 1
+            dc.stop()
+        if abs(v1 - v0) < 0.5:
+            unchanged += 1
+    return {"runaway": runaways, "unchanged": unchanged}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cycles", type=int, default=200, help="move_and_wait 횟수")
+    ap.add_argument("--pulses", type=int, default=20, help="volume DC pulse 횟수")
+    ap.add_argument("--detect", type=int, default=50, help="완료 감지 측정 횟수")
+    ap.add_argument("--idle", type=float, default=3.0, help="idle 측정 시간 (s)")
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--loss", type=float, default=0.0, help="응답 byte 유실 확률")
+    ap.add_argument("--corrupt", type=float, default=0.0, help="응답 byte bit flip 확률")
+    ap.add_argument("--rx-loss", type=float, default=0.0, help="명령 frame 유실 확률")
+    ap.add_argument("--max-rate", type=float, default=20000.0, help="speed 최대일 때 position unit / s")
+    ap.add_argument("--tolerance", type=int, default=2)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    faults = LinkFaults(args.latency, args.jitter, args.loss, args.corrupt, args.rx_loss)
+
+    with FirmwareEmulator(faults=faults, max_rate=args.max_rate, seed=args.seed) as fw:
+        ctrl = SerialController(port=fw.port)
+        ctrl.tx_debug = ctrl.rx_debug = False
+        t0 = time.perf_counter()
+        ctrl.connect()
+        t_open = time.perf_counter() - t0  # connect()의 포트 open 후 0.5 s 안정화 대기 포함
+        try:
+            linears = [LinearActuator(ctrl, 0x0B), LinearActuator(ctrl, 0x0A)]
+            t0 = time.perf_counter()
+            ok = all([a.initialize(speed=500, current=300, position=300) for a in linears])
+            t_init = time.perf_counter() - t0
+            print(f"[SOAK] port={fw.port} faults={faults}")
+            print(f"startup    connect={t_open * 1000:7.1f}ms init={t_init * 1000:7.1f}ms ok={ok}")
+
+            times, move_stats = soak_moves(ctrl, linears, args.cycles, rng, args.tolerance)
+            _summary("move", times)
+            print(f"move       {move_stats}")
+
+            lags, missed = soak_detect(ctrl, fw, linears, args.detect, rng)
+            _summary("detect", lags)
+            polls, cpu = measure_idle(ctrl, fw, args.idle)
+            print(f"idle       polls={polls:.1f}/s CPU={cpu * 100:.2f}%  poll_stats={ctrl.poll_stats()}")
+
+            pulse_stats = soak_pulses(fw, VolumeDCActuator(ctrl, fw.volume_dc_id), args.pulses, rng)
+            print(f"pulse      {pulse_stats}")
+
+            print(f"parser     {ctrl.rx_parser.stats()}")
+            print(f"tx         {ctrl.tx_stats()}")
+            print(f"firmware   {fw.counters}")
+        finally:
+            ctrl.close()
+
+
+if __name__ == "__main__":
+    main()
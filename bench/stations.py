@@ -0,0 +1,92 @@
+"""
+Multi-station 처리량: 펌웨어 에뮬레이터 (sim.firmware) N개 + 다이얼을 따라 그리는 SimCamera + 공유 OCR
+
+    python -m bench.stations --stations 1 2 4 --targets 10
+    python -m bench.stations --stations 4 --targets 20 --strategy adaptive --out stations.json
+    python -m bench.stations --stations 2 --fixed-settle --settle 0.3    # ROI 정지 감지 대신 고정 대기
+
+station 수별 targets per hour (station별 / 전체), 공유 OCR 엔진 호출 수 / lock 대기 시간.
+OCR은 sim.ocr.TemplateOcrBackend (모델 파일 불필요), 시간은 실시간 (에뮬레이터 다이얼).
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+
+import worker.control_worker as control_worker
+import worker.ocr
+from sim.batch import random_targets
+from sim.devices import SimCamera
+from sim.firmware import FirmwareEmulator
+from sim.ocr import TemplateOcrBackend
+from sim.render import DEFAULT_ROIS, OdometerRenderer
+from worker.control_strategy import STRATEGIES
+from worker.station import StationConfig, StationManager, print_report
+
+
+def run_stations(
+    n: int, n_targets: int, strategy: str, seed: int, fps: float, state_root: str, vision_settle: bool = True
+) -> dict:
+    renderer = OdometerRenderer(seed=seed)
+    targets = {f"S{i}": random_targets(n_targets, seed + i) for i in range(n)}
+
+    with contextlib.ExitStack() as stack:
+        configs = []
+        for i, name in enumerate(targets):
+            fw = stack.enter_context(FirmwareEmulator(volume=targets[name][0] - 100.0, seed=seed + i))
+            configs.append(StationConfig(
+                name=name,
+                serial_port=fw.port,
+                camera=SimCamera(fw, OdometerRenderer(seed=seed + i), fps=fps),
+                rotate=0,
+                rois=DEFAULT_ROIS,
+                strategy=strategy,
+                state_dir=os.path.join(state_root, f"n{n}", name),
+                camera_fps=fps,
+                vision_settle=vision_settle,
+            ))
+
+        manager = StationManager(configs, ocr_backend=TemplateOcrBackend(renderer))
+        with manager:
+            # run_to_target 의 [DEBUG] / [STEP] 로그 억제
+            with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+                return manager.run(targets)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stations", type=int, nargs="+", default=[1, 2, 4], help="동시 station 수 (여러 개면 차례로)")
+    ap.add_argument("--targets", type=int, default=10, help="station당 목표 수")
+    ap.add_argument("--strategy", choices=list(STRATEGIES), default="calibrated")
+    ap.add_argument("--fixed-settle", action="store_true", help="ROI 정지 감지 대신 고정 SETTLE_TIME")
+    ap.add_argument("--settle", type=float, default=None, help="SETTLE_TIME 대체 (s, --fixed-settle)")
+    ap.add_argument("--fps", type=float, default=30.0, help="SimCamera 프레임 속도")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=None, help="station 수별 report JSON")
+    args = ap.parse_args()
+
+    # 시뮬레이션에서는 /tmp 디버그 crop 기록 생략
+    worker.ocr.SAVE_DEBUG_CROPS = False
+    if args.settle is not None:
+        control_worker.SETTLE_TIME = args.settle
+
+    reports = {}
+    with tempfile.TemporaryDirectory() as state_root:
+        for n in args.stations:
+            report = run_stations(
+                n, args.targets, args.strategy, args.seed, args.fps, state_root,
+                vision_settle=not args.fixed_settle,
+            )
+            print(f"--- stations={n} strategy={args.strategy}")
+            print_report(report)
+            reports[n] = report
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
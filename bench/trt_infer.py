@@ -0,0 +1,70 @@
+"""
+TRTWrapper.infer latency microbenchmark (GPU 필요).
+
+    python -m bench.trt_infer --calls 1000 --batch 4
+
+cached   : shape별 버퍼 재사용 + host 복사 1회
+zerocopy : input_buffer()에 직접 기록 후 infer (host 복사 없음)
+realloc  : 매 호출마다 버퍼 풀을 비움 (기존 per-call 할당 동작)
+"""
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from worker.ocr_trt import TRTWrapper, INPUT_SIZE
+from worker.paths import OCR_TRT_PATH
+
+
+def _run(fn, calls: int):
+    xs = []
+    for _ in range(calls):
+        t0 = time.perf_counter()
+        fn()
+        xs.append(time.perf_counter() - t0)
+    return xs
+
+
+def _summary(name, xs):
+    xs = sorted(xs)
+    p99 = xs[int(0.99 * (len(xs) - 1))]
+    print(
+        f"{name:<9} mean={statistics.mean(xs) * 1000:7.3f}ms "
+        f"p50={statistics.median(xs) * 1000:7.3f}ms "
+        f"p99={p99 * 1000:7.3f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--engine", default=OCR_TRT_PATH)
+    ap.add_argument("--calls", type=int, default=1000)
+    ap.add_argument("--batch", type=int, default=4)
+    args = ap.parse_args()
+
+    model = TRTWrapper(args.engine)
+    shape = (args.batch, 3) + INPUT_SIZE
+    x = np.random.default_rng(0).standard_normal(shape).astype(np.float32)
+
+    # warm-up (엔진 lazy init + 첫 할당)
+    for _ in range(20):
+        model.infer(x)
+
+    def realloc():
+        model.pool.clear()
+        model._bound = None
+        model.infer(x)
+
+    def zerocopy():
+        buf = model.input_buffer(shape)
+        buf[...] = x
+        model.infer(buf)
+
+    _summary("cached", _run(lambda: model.infer(x), args.calls))
+    _summary("zerocopy", _run(zerocopy, args.calls))
+    _summary("realloc", _run(realloc, args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cold subprocess vs warm daemon latency per request type.
+
+    python -m bench.worker_latency --repeat 5
+    python -m bench.worker_latency --conda-env pipet_env --requests ping ocr
+
+cold : `python -m worker.worker --<cmd>` 매 요청마다 새 프로세스
+warm : `python -m worker.worker --serve` 한 번 띄워두고 JSON 요청
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from gui.worker_client import WorkerClient
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# request type → cold CLI flag
+CLI_FLAGS = {
+    "ping": "--ping",
+    "capture": "--capture",
+    "yolo": "--yolo",
+    "ocr": "--ocr",
+}
+
+
+def _python_cmd(conda_env):
+    if conda_env:
+        return ["conda", "run", "--no-capture-output", "-n", conda_env, "python", "-u"]
+    return [sys.executable, "-u"]
+
+
+def run_cold(python_cmd, req: str, camera: int) -> float:
+    cmd = python_cmd + ["-m", "worker.worker", CLI_FLAGS[req], f"--camera={camera}"]
+
+    t0 = time.perf_counter()
+    p = subprocess.run(
+        cmd,
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    dt = time.perf_counter() - t0
+
+    lines = (p.stdout or "").strip().splitlines()
+    ok = p.returncode == 0 and bool(lines) and json.loads(lines[-1]).get("ok")
+    if not ok:
+        raise RuntimeError(f"cold {req} failed: {p.stdout!r}")
+    return dt
+
+
+def run_warm(client: WorkerClient, req: str, camera: int) -> float:
+    t0 = time.perf_counter()
+    res = client.request(req, timeout=120, camera=camera)
+    dt = time.perf_counter() - t0
+
+    if not res.ok:
+        raise RuntimeError(f"warm {req} failed: {res.data}")
+    return dt
+
+
+def _summary(xs):
+    if not xs:
+        return "n/a"
+    return (
+        f"mean={statistics.mean(xs) * 1000:8.1f}ms "
+        f"min={min(xs) * 1000:8.1f}ms "
+        f"max={max(xs) * 1000:8.1f}ms"
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", nargs="+", default=list(CLI_FLAGS), choices=list(CLI_FLAGS))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--camera", type=int, default=0)
+    ap.add_argument("--conda-env", default=None)
+    args = ap.parse_args()
+
+    python_cmd = _python_cmd(args.conda_env)
+
+    client = WorkerClient(
+        python_cmd + ["-m", "worker.worker", "--serve"],
+        cwd=ROOT_DIR,
+    )
+
+    t0 = time.perf_counter()
+    client.request("ping", timeout=300)
+    print(f"[BENCH] daemon startup + warmup: {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+    results = {}
+    try:
+        for req in args.requests:
+            cold, warm = [], []
+            for _ in range(args.repeat):
+                try:
+                    cold.append(run_cold(python_cmd, req, args.camera))
+                    warm.append(run_warm(client, req, args.camera))
+                except RuntimeError as e:
+                    print(f"[BENCH] {e}")
+                    break
+            results[req] = (cold, warm)
+    finally:
+        client.close()
+
+    print()
+    print(f"{'request':<8} {'mode':<5} latency")
+    for req, (cold, warm) in results.items():
+        print(f"{req:<8} {'cold':<5} {_summary(cold)}")
+        print(f"{req:<8} {'warm':<5} {_summary(warm)}")
+        if cold and warm:
+            print(f"{req:<8} {'':<5} speedup x{statistics.mean(cold) / statistics.mean(warm):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,78 @@
 # gui/controller.py
-import json
 import time
 import os
-import subprocess
+import queue
 import threading
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
+from gui.worker_client import WorkerClient, WorkerResult
 from worker.serial_controller import SerialController
 from worker.actuator_linear import LinearActuator
 from worker.actuator_volume_dc import VolumeDCActuator
-from worker.paths import FRAME_JPG_PATH
-
-
-@dataclass
-class WorkerResult:
-    ok: bool
-    data: Dict[str, Any]
-    raw: str
+from worker.paths import DIRECT_MOTOR, FRAME_JPG_PATH, SERIAL_PORT
 
 
 class Controller(QObject):
     # 🔥 Signal: run_state dict 전달
     run_state_updated = pyqtSignal(dict)
-
-    def __init__(self, conda_env: str = "pipet_env"):
+    # online plant model (band별 uL/ms, backlash) 갱신
+    plant_model_updated = pyqtSignal(dict)
+
+    # run-target을 끝내는 warn status → 표시 문구 (그 외 warn은 로그만)
+    TERMINAL_WARNINGS = {
+        "cancelled": "Cancelled",
+        "max_iter": "Max iteration reached",
+    }
+
+    def __init__(self, conda_env: str = "pipet_env", direct_motor: bool = DIRECT_MOTOR):
+        """
+        direct_motor: run-target 동안 시리얼 포트를 worker에 넘기고
+                      worker가 펄스를 직접 실행 (GUI는 이벤트만 관찰)
+        """
         super().__init__()
 
         self.conda_env = conda_env
+        self.direct_motor = direct_motor
         self.root_dir = os.path.abspath(
             os.path.join(os.path.dirname(__file__), "..")
         )
 
-        self.long_proc: Optional[subprocess.Popen] = None
+        # 상주 worker 데몬 (TRT/YOLO/카메라를 한 번만 로드)
+        self.worker = WorkerClient(
+            [
+                "conda", "run", "--no-capture-output", "-n", self.conda_env,
+                "python", "-u", "-m", "worker.worker", "--serve",
+            ],
+            cwd=self.root_dir,
+        )
+        self._run_thread: Optional[threading.Thread] = None
+        # run thread는 한 번에 하나만 worker / 시리얼 포트를 잡는다
+        # (멈춘 이전 run이 finally에서 포트를 되찾은 뒤에야 다음 run이 포트를 넘김)
+        self._run_lock = threading.Lock()
 
         self.video_panel = None
 
-        self.serial = SerialController("/dev/ttyUSB0")
-        self.serial.connect()
+        self.serial = SerialController(SERIAL_PORT)
+        # exclusive: direct mode에서 worker와 동시에 포트를 열지 않도록
+        self.serial.connect(exclusive=True)
 
         self.pipetting_linear = LinearActuator(self.serial, 0x0B)
         self.volume_linear = LinearActuator(self.serial, 0x0A)
         self.volume_dc = VolumeDCActuator(self.serial, 0x0C)
 
-        for aid in (0x0B, 0x0A):
-            self.serial.send_mightyzap_force_onoff(aid, 1)
-            time.sleep(0.1)
-            self.serial.send_mightyzap_set_speed(aid, 500)
-            time.sleep(0.1)
-            self.serial.send_mightyzap_set_current(aid, 300)
-            time.sleep(0.1)
-            self.serial.send_mightyzap_set_position(aid, 300)
-            time.sleep(0.1)
+        # 초기 설정: force on / speed / current / home (write 완료까지만 대기)
+        for actuator in (self.pipetting_linear, self.volume_linear):
+            actuator.initialize(speed=500, current=300, position=300)
+
+        # GUI 모드 run-target 펄스 전용 thread
+        # (worker stdout reader thread에서 run/sleep/stop 하면 이벤트 / 응답 수신이 펄스 동안 멈춤)
+        # 항목: (direction, duty, duration_ms, cancel) — cancel은 run마다 새 Event
+        self._motor_queue: "queue.Queue" = queue.Queue()
+        self._motor_cancel = threading.Event()
+        self._motor_thread = threading.Thread(target=self._motor_loop, daemon=True)
+        self._motor_thread.start()
 
         self.run_state: Dict[str, Any] = {
             "running": False,
@@ -77,55 +96,36 @@ class Controller(QObject):
             self.video_panel.show_image(FRAME_JPG_PATH)
 
     # --------------------------
-    # 단발 worker 실행
+    # worker 요청 (상주 데몬)
     # --------------------------
-    def _run_worker(self, args: List[str], timeout: Optional[int] = 120) -> WorkerResult:
-        cmd = [
-            "conda", "run", "-n", self.conda_env,
-            "python", "-u", "-m", "worker.worker",
-        ] + args
-
-        p = subprocess.run(
-            cmd,
-            cwd=self.root_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=timeout,
-        )
-
-        raw = (p.stdout or "").strip()
-
-        if p.returncode != 0:
-            return WorkerResult(False, {}, raw)
-
-        try:
-            data = json.loads(raw.splitlines()[-1])
-            return WorkerResult(bool(data.get("ok", True)), data, raw)
-        except Exception:
-            return WorkerResult(False, {}, raw)
+    def _run_worker(self, cmd: str, timeout: Optional[int] = 120, **params) -> WorkerResult:
+        return self.worker.request(cmd, timeout=timeout, **params)
 
     def capture_frame(self, camera_index: int = 0) -> WorkerResult:
-        res = self._run_worker(["--capture", f"--camera={camera_index}"], 60)
+        res = self._run_worker("capture", 60, camera=camera_index)
         if res.ok:
             self.refresh_camera_view()
         return res
 
     def yolo_detect(self, reset: bool = False, camera_index: int = 0) -> WorkerResult:
-        args = ["--yolo", f"--camera={camera_index}"]
-        if reset:
-            args.append("--reset-rois")
-        res = self._run_worker(args, 120)
+        res = self._run_worker("yolo", 120, camera=camera_index, reset=reset)
         if res.ok:
             self.refresh_camera_view()
         return res
 
     def ocr_read_volume(self, camera_index: int = 0) -> WorkerResult:
-        res = self._run_worker(["--ocr", f"--camera={camera_index}"], 120)
+        res = self._run_worker("ocr", 120, camera=camera_index)
         if res.ok:
             self.refresh_camera_view()
         return res
 
+    def get_plant_model(self, reset: bool = False) -> WorkerResult:
+        """reset=True면 저장된 추정치를 버리고 calibration.json 기준으로 재시작"""
+        res = self._run_worker("plant-model", 30, reset=reset)
+        if res.ok:
+            self.plant_model_updated.emit(res.data.get("model", {}))
+        return res
+
     # =================================================
     # Run-to-target (핵심)
     # =================================================
@@ -145,124 +145,163 @@ class Controller(QObject):
         })
         self.run_state_updated.emit(dict(self.run_state))
 
-        cmd = [
-            "conda", "run", "-n", self.conda_env,
-            "python", "-u", "-m", "worker.worker",
-            "--run-target",
-            f"--target={target}",
-            f"--camera={camera_index}",
-        ]
-
-        # ✅ stderr도 읽어야 worker가 죽는지 알 수 있음
-        self.long_proc = subprocess.Popen(
-            cmd,
-            cwd=self.root_dir,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1,
+        self._run_thread = threading.Thread(
+            target=self._run_to_target_loop,
+            args=(target, camera_index),
+            daemon=True,
         )
+        self._run_thread.start()
+
+    def _is_current_run(self) -> bool:
+        return threading.current_thread() is self._run_thread
+
+    def _run_to_target_loop(self, target: int, camera_index: int):
+        with self._run_lock:
+            # 이전 run을 기다리는 동안 Stop / 다른 run으로 바뀌었으면 시작하지 않음
+            if self._is_current_run():
+                self._run_to_target_once(target, camera_index)
 
-        threading.Thread(target=self._run_to_target_stdout_loop, daemon=True).start()
-        threading.Thread(target=self._run_to_target_stderr_loop, daemon=True).start()
+    def _run_to_target_once(self, target: int, camera_index: int):
+        params = {"target": target, "camera": camera_index}
 
-    def _run_to_target_stdout_loop(self):
-        proc = self.long_proc
-        if not proc or not proc.stdout:
+        if self.direct_motor:
+            # 포트 소유권 이전: GUI 쪽 thread join + close 후 worker가 exclusive open
+            self.volume_dc.stop()
+            self.serial.close()
+            params["motor_port"] = self.serial.port
+
+        try:
+            res = self._run_worker(
+                "run-target",
+                None,
+                on_event=self._events_of(threading.current_thread()),
+                **params,
+            )
+        finally:
+            if self.direct_motor:
+                self._reacquire_serial()
+
+        # 멈춘 run: 상태는 stop_run_to_target / 다음 run이 관리
+        if not self._is_current_run():
             return
 
-        for line in proc.stdout:
-            line = line.strip()
-            if not line:
-                continue
+        # ✅ 이벤트 없이 끝났다면 worker가 바로 죽었을 가능성
+        if not res.ok and self.run_state.get("status") == "Running":
+            self.run_state.update({
+                "running": False,
+                "status": f"Worker failed ({res.data.get('error', 'unknown')})",
+            })
+            self.run_state_updated.emit(dict(self.run_state))
+            return
 
-            # ✅ 이제 stdout에는 JSON만 오도록 control_worker를 바꿨기 때문에
-            # 바로 json.loads 시도하면 된다.
-            try:
-                msg = json.loads(line)
-            except Exception:
-                # 혹시 stdout에 섞이면 여기 찍히게 됨
-                print("[WORKER][STDOUT-NONJSON]", line)
-                continue
-
-            cmd = msg.get("cmd")
-
-            if cmd == "volume":
-                # 상태 갱신 + emit
-                self.run_state.update({
-                    "running": True,
-                    "step": msg.get("step", 0),
-                    "current": msg.get("current", 0),
-                    "target": msg.get("target", self.run_state["target"]),
-                    "error": msg.get("error", 0),
-                    "direction": msg.get("direction", None),
-                    "duty": msg.get("duty", 0),
-                    "status": "Running",
-                })
-                self.run_state_updated.emit(dict(self.run_state))
-
-                # 모터 제어
-                direction = int(msg["direction"])
-                duty = int(msg["duty"])
-                duration_ms = int(msg["duration_ms"])
-
-                self.volume_dc.run(direction=direction, duty=duty)
-                time.sleep(duration_ms / 1000.0)
-                self.volume_dc.stop()
-
-            elif cmd == "done":
-                self.run_state.update({
-                    "running": False,
-                    "step": msg.get("step", self.run_state["step"]),
-                    "current": msg.get("current", self.run_state["current"]),
-                    "target": msg.get("target", self.run_state["target"]),
-                    "error": msg.get("error", 0),
-                    "status": "Done",
-                })
-                self.run_state_updated.emit(dict(self.run_state))
-                break
-
-            elif cmd == "warn":
-                self.run_state.update({
-                    "running": False,
-                    "status": "Max iteration reached",
-                })
-                self.run_state_updated.emit(dict(self.run_state))
-                break
-
-        # 프로세스 종료 처리
+        # 종료 처리
         self.run_state["running"] = False
         self.run_state_updated.emit(dict(self.run_state))
 
-    def _run_to_target_stderr_loop(self):
-        proc = self.long_proc
-        if not proc or not proc.stderr:
-            return
-
-        # stderr는 사람이 보는 로그
-        for line in proc.stderr:
-            line = line.rstrip()
-            if not line:
-                continue
-            print("[WORKER][STDERR]", line)
-
-        # stderr 끝났는데 stdout에서 아무 업데이트도 안 왔다면
-        # (worker가 바로 죽었을 가능성)
-        if self.long_proc and self.long_proc.poll() is not None:
-            rc = self.long_proc.returncode
-            if self.run_state.get("status") == "Running" and self.run_state.get("step", 0) == 0:
-                self.run_state.update({
-                    "running": False,
-                    "status": f"Worker exited (rc={rc})",
-                })
-                self.run_state_updated.emit(dict(self.run_state))
+    def _events_of(self, run_thread: threading.Thread):
+        """worker reader thread에서 호출되는 이벤트 핸들러: 멈춘 이전 run의 늦은 이벤트는 버림"""
+        def on_event(msg: dict):
+            if self._run_thread is run_thread:
+                self._on_run_event(msg)
+        return on_event
+
+    def _on_run_event(self, msg: dict):
+        cmd = msg.get("cmd")
+
+        if cmd == "volume":
+            # 상태 갱신 + emit
+            self.run_state.update({
+                "running": True,
+                "step": msg.get("step", 0),
+                "current": msg.get("current", 0),
+                "target": msg.get("target", self.run_state["target"]),
+                "error": msg.get("error", 0),
+                "direction": msg.get("direction", None),
+                "duty": msg.get("duty", 0),
+                "status": "Running",
+            })
+            self.run_state_updated.emit(dict(self.run_state))
+
+            # direct mode: worker가 이미 실행함
+            if msg.get("executed"):
+                return
+
+            # 모터 제어: motor thread에 넘기고 바로 반환
+            self._motor_queue.put((
+                int(msg["direction"]),
+                int(msg["duty"]),
+                int(msg["duration_ms"]),
+                self._motor_cancel,
+            ))
+
+        elif cmd == "done":
+            self.run_state.update({
+                "running": False,
+                "step": msg.get("step", self.run_state["step"]),
+                "current": msg.get("current", self.run_state["current"]),
+                "target": msg.get("target", self.run_state["target"]),
+                "error": msg.get("error", 0),
+                "status": "Done",
+            })
+            self.run_state_updated.emit(dict(self.run_state))
+
+        elif cmd == "model":
+            self.plant_model_updated.emit({
+                "step": msg.get("step"),
+                "observed_ul": msg.get("observed_ul"),
+                "predicted_ul": msg.get("predicted_ul"),
+                "rejected": msg.get("rejected", False),
+                **msg.get("model", {}),
+            })
+
+        elif cmd == "ocr":
+            # 진행 중 OCR 알림 (불확실한 판독 등): 실행은 계속됨
+            print(f"[RUN] step={msg.get('step')} {msg.get('status')}: {msg}")
+
+        elif cmd == "warn":
+            status = msg.get("status")
+            if status not in self.TERMINAL_WARNINGS:
+                print(f"[RUN] warn {status}: {msg}")
+                return
+            self.run_state.update({
+                "running": False,
+                "status": self.TERMINAL_WARNINGS[status],
+            })
+            self.run_state_updated.emit(dict(self.run_state))
+
+    def _motor_loop(self):
+        while True:
+            item = self._motor_queue.get()
+            try:
+                if item is None:
+                    return
+                direction, duty, duration_ms, cancel = item
+                # 멈춘 run의 남은 펄스는 버림, 실행 중인 펄스는 cancel 시 즉시 정지
+                if not cancel.is_set():
+                    self.volume_dc.pulse(direction, duty, duration_ms, stop_event=cancel)
+            except Exception as e:
+                print("[MOTOR] pulse failed:", e)
+            finally:
+                self._motor_queue.task_done()
+
+    def _reacquire_serial(self, retries: int = 10, delay: float = 0.2):
+        """worker가 포트를 반납한 뒤 다시 연결 (같은 SerialController 객체 재사용)"""
+        for _ in range(retries):
+            try:
+                if self.serial.connect(exclusive=True):
+                    return True
+            except Exception as e:
+                print("[SERIAL] reconnect failed:", e)
+            time.sleep(delay)
+        return False
 
     def stop_run_to_target(self) -> None:
-        if self.long_proc and self.long_proc.poll() is None:
-            try:
-                self.long_proc.terminate()
-            except Exception:
-                pass
+        if self._run_thread and self._run_thread.is_alive():
+            self.worker.cancel()
+
+        # 대기 / 실행 중인 펄스 취소 (다음 run은 새 Event)
+        self._motor_cancel.set()
+        self._motor_cancel = threading.Event()
 
         try:
             self.volume_dc.stop()
@@ -275,11 +314,14 @@ class Controller(QObject):
         })
         self.run_state_updated.emit(dict(self.run_state))
 
-        self.long_proc = None
+        self._run_thread = None
 
     def close(self):
+        self._motor_cancel.set()
+        self._motor_queue.put(None)
         try:
             self.volume_dc.stop()
         except Exception:
             pass
+        self.worker.close()
         self.serial.close()
@@ -23,6 +23,8 @@ class RunStatusPanel(QGroupBox):
         # 🔥 Controller Signal 연결
         if hasattr(controller, "run_state_updated"):
             controller.run_state_updated.connect(self.on_state_updated)
+        if hasattr(controller, "plant_model_updated"):
+            controller.plant_model_updated.connect(self.on_plant_model_updated)
 
     def on_state_updated(self, s: dict):
         """
@@ -44,3 +46,23 @@ class RunStatusPanel(QGroupBox):
         self.log.append(line)
         self.log.moveCursor(QTextCursor.End)
 
+    def on_plant_model_updated(self, m: dict):
+        """
+        online plant model 추정치 (direction별 band gain / backlash)
+        """
+        ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+
+        parts = []
+        for d, entry in sorted(m.get("directions", {}).items()):
+            gains = "/".join(f"{g:.3f}" for g in entry.get("gain_ul_per_ms", []))
+            parts.append(f"dir{d} gain={gains} backlash={entry.get('backlash_ul')}")
+
+        obs = ""
+        if m.get("observed_ul") is not None:
+            obs = (
+                f"obs={m.get('observed_ul')} pred={m.get('predicted_ul')}"
+                f"{' (rejected)' if m.get('rejected') else ''} "
+            )
+
+        self.log.append(f"[{ts}] [MODEL] {obs}" + " | ".join(parts))
+        self.log.moveCursor(QTextCursor.End)
@@ -0,0 +1,225 @@
+# gui/worker_client.py
+import itertools
+import json
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+@dataclass
+class WorkerResult:
+    ok: bool
+    data: Dict[str, Any]
+    raw: str
+
+
+class _Pending:
+    def __init__(self, proc, on_event: Optional[Callable[[dict], None]]):
+        self.proc = proc
+        self.on_event = on_event
+        self.done = threading.Event()
+        self.msg: Optional[dict] = None
+        self.raw = ""
+
+
+class WorkerClient:
+    """
+    `python -m worker.worker --serve` 데몬 클라이언트
+
+    - 데몬은 첫 요청 시 기동되고, 죽어 있으면 다음 요청에서 자동 재기동
+    - 요청/응답은 한 줄 JSON, "id"로 매칭
+    - run-target 진행 이벤트는 on_event 콜백으로 전달 (reader thread에서 호출)
+    - run-target 실행 중 다른 요청 (ping 제외) 은 데몬이 "busy: ..." 에러로 바로 거절
+    """
+
+    # 데몬이 응답 전에 죽었을 때 한 번 더 시도해도 안전한 요청
+    IDEMPOTENT_CMDS = ("ping", "capture", "yolo", "ocr")
+
+    def __init__(self, cmd: List[str], cwd: Optional[str] = None):
+        self.cmd = cmd
+        self.cwd = cwd
+
+        self.proc: Optional[subprocess.Popen] = None
+        self._proc_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _Pending] = {}
+        self._pending_lock = threading.Lock()
+        # 응답을 기다리는 run-target 요청 id (cancel 대상)
+        self._runs: Set[int] = set()
+
+        self.restarts = 0
+
+    # =========================
+    # Process lifecycle
+    # =========================
+    def is_alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        with self._proc_lock:
+            if self.is_alive():
+                return
+
+            if self.proc is not None:
+                self.restarts += 1
+                print(f"[WORKER] daemon restart #{self.restarts}")
+
+            proc = subprocess.Popen(
+                self.cmd,
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+            )
+            self.proc = proc
+
+            threading.Thread(
+                target=self._stdout_loop, args=(proc,), daemon=True
+            ).start()
+            threading.Thread(
+                target=self._stderr_loop, args=(proc,), daemon=True
+            ).start()
+
+    def close(self, timeout: float = 3.0):
+        proc = self.proc
+        if proc is None or proc.poll() is not None:
+            return
+
+        try:
+            self._write({"id": next(self._ids), "cmd": "shutdown"})
+            proc.wait(timeout=timeout)
+        except Exception:
+            proc.kill()
+
+    # =========================
+    # Requests
+    # =========================
+    def request(
+        self,
+        cmd: str,
+        timeout: Optional[float] = 120,
+        on_event: Optional[Callable[[dict], None]] = None,
+        **params,
+    ) -> WorkerResult:
+        attempts = 2 if cmd in self.IDEMPOTENT_CMDS else 1
+
+        res = WorkerResult(False, {}, "")
+        for _ in range(attempts):
+            res = self._request_once(cmd, timeout, on_event, params)
+            if res.ok or res.data.get("error") != "worker exited":
+                break
+        return res
+
+    def cancel(self):
+        """
+        이 클라이언트가 보낸 run-target 중단 (응답은 기다리지 않음)
+        요청 id로 취소하므로 아직 데몬에서 시작 전인 run-target에도 적용된다.
+        """
+        with self._pending_lock:
+            runs = sorted(self._runs)
+        if not self.is_alive():
+            return
+        for target_id in runs:
+            try:
+                self._write({"id": next(self._ids), "cmd": "cancel", "target_id": target_id})
+            except Exception:
+                pass
+
+    def _request_once(self, cmd, timeout, on_event, params) -> WorkerResult:
+        self.start()
+
+        rid = next(self._ids)
+        pending = _Pending(self.proc, on_event)
+        with self._pending_lock:
+            self._pending[rid] = pending
+            if cmd == "run-target":
+                self._runs.add(rid)
+
+        try:
+            try:
+                self._write(dict(params, id=rid, cmd=cmd))
+            except Exception as e:
+                with self._pending_lock:
+                    self._pending.pop(rid, None)
+                return WorkerResult(False, {"error": "worker exited"}, str(e))
+
+            if not pending.done.wait(timeout):
+                with self._pending_lock:
+                    self._pending.pop(rid, None)
+                return WorkerResult(False, {"error": "timeout"}, "")
+        finally:
+            with self._pending_lock:
+                self._runs.discard(rid)
+
+        msg = pending.msg or {}
+        return WorkerResult(bool(msg.get("ok", False)), msg, pending.raw)
+
+    def _write(self, msg: dict):
+        proc = self.proc
+        if proc is None or proc.stdin is None:
+            raise RuntimeError("worker not running")
+
+        with self._write_lock:
+            proc.stdin.write(json.dumps(msg) + "\n")
+            proc.stdin.flush()
+
+    # =========================
+    # Reader threads
+    # =========================
+    def _stdout_loop(self, proc: subprocess.Popen):
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                msg = json.loads(line)
+            except Exception:
+                print("[WORKER][STDOUT-NONJSON]", line)
+                continue
+
+            with self._pending_lock:
+                pending = self._pending.get(msg.get("id"))
+
+            if pending is None:
+                continue
+
+            if "event" in msg:
+                if pending.on_event:
+                    try:
+                        pending.on_event(msg["event"])
+                    except Exception as e:
+                        print("[WORKER] event handler error:", e)
+                continue
+
+            with self._pending_lock:
+                self._pending.pop(msg.get("id"), None)
+            pending.msg = msg
+            pending.raw = line
+            pending.done.set()
+
+        # EOF → 데몬 종료. 대기 중인 요청은 모두 실패 처리
+        proc.wait()
+        print(f"[WORKER] daemon exited (rc={proc.returncode})")
+
+        with self._pending_lock:
+            dead = [
+                rid for rid, p in self._pending.items() if p.proc is proc
+            ]
+            dead = [self._pending.pop(rid) for rid in dead]
+
+        for pending in dead:
+            pending.msg = {"ok": False, "error": "worker exited"}
+            pending.done.set()
+
+    def _stderr_loop(self, proc: subprocess.Popen):
+        # stderr는 사람이 보는 로그
+        for line in proc.stderr:
+            line = line.rstrip()
+            if line:
+                print("[WORKER][STDERR]", line)
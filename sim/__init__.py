@@ -0,0 +1,11 @@
+"""
+Pipette dial / camera simulator (digital twin)
+
+실제 장비(카메라, /dev/ttyUSB0) 없이 run_to_target 등 제어 루프를 돌리기 위한 가상 장비.
+"""
+from sim.clock import SimClock
+from sim.devices import SimActuator, SimCamera, SimSerial
+from sim.dial import DialModel, DialParams
+from sim.ocr import TemplateOcrBackend
+from sim.render import DEFAULT_ROIS, OdometerRenderer, wheel_positions
+from sim.rig import SimRig
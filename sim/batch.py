@@ -0,0 +1,98 @@
+"""
+가상 장비에서 batch_random_test 와 같은 방식으로 목표값 N개를 연속 실행
+
+    python -m sim.batch --targets 1000 --seed 0 --strategy ladder
+"""
+import argparse
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+import worker.ocr
+from sim.rig import SimRig
+from worker.calibration import load_calibration
+from worker.control_strategy import STRATEGIES, create_strategy
+from worker.paths import CALIB_JSON_PATH
+from worker.plant_model import PlantModel
+
+# test/batch_random_test.py 와 동일
+TARGET_MIN = 1000
+TARGET_MAX = 4500
+TARGET_STEP = 5
+
+
+def random_targets(n: int, seed: int):
+    rng = np.random.default_rng(seed)
+    steps = (TARGET_MAX - TARGET_MIN) // TARGET_STEP
+    return [int(TARGET_MIN + TARGET_STEP * k) for k in rng.integers(0, steps + 1, n)]
+
+
+def fresh_plant_model(calib_path: str = CALIB_JSON_PATH) -> PlantModel:
+    """state/plant_model.json 은 건드리지 않는 메모리 전용 모델"""
+    model = PlantModel()
+    if os.path.exists(calib_path):
+        model.seed_from_calibration(load_calibration(calib_path))
+    return model
+
+
+def run_batch(n_targets: int, seed: int = 0, strategy_name: str = "ladder", quiet: bool = True):
+    """
+    returns: target별 결과 dict 목록 (run_to_target 결과 + true_ul / sim_s)
+    """
+    rig = SimRig(seed=seed)
+    plant_model = fresh_plant_model()
+    strategy = create_strategy(strategy_name, plant_model=plant_model)
+
+    results = []
+    for target in random_targets(n_targets, seed):
+        t0 = rig.clock.monotonic()
+
+        # run_to_target 의 [DEBUG] / [STEP] 로그 억제
+        sink = open(os.devnull, "w") if quiet else None
+        with contextlib.ExitStack() as stack:
+            if sink is not None:
+                stack.enter_context(sink)
+                stack.enter_context(contextlib.redirect_stdout(sink))
+                stack.enter_context(contextlib.redirect_stderr(sink))
+            res = rig.run_to_target(target, strategy=strategy, plant_model=plant_model)
+
+        res["true_ul"] = round(rig.true_volume, 2)
+        res["sim_s"] = rig.clock.monotonic() - t0
+        results.append(res)
+
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--targets", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--strategy", choices=list(STRATEGIES), default="ladder")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+
+    # 시뮬레이션에서는 /tmp 디버그 crop 기록 생략
+    worker.ocr.SAVE_DEBUG_CROPS = False
+
+    t0 = time.perf_counter()
+    results = run_batch(args.targets, args.seed, args.strategy, quiet=not args.verbose)
+    wall = time.perf_counter() - t0
+
+    ok = [r for r in results if r["success"]]
+    iters = [r["iterations"] for r in results]
+    true_err = [abs(r["true_ul"] - r["target_ul"]) for r in ok]
+
+    print(f"[SIM] strategy={args.strategy} seed={args.seed} targets={len(results)}")
+    print(f"[SIM] success={len(ok)}/{len(results)} ({len(ok) / len(results) * 100:.1f}%)")
+    print(f"[SIM] iterations mean={statistics.mean(iters):.2f} p50={statistics.median(iters)} max={max(iters)}")
+    if true_err:
+        print(f"[SIM] |true - target| (success) mean={statistics.mean(true_err):.2f}uL max={max(true_err):.2f}uL")
+    print(f"[SIM] simulated={sum(r['sim_s'] for r in results) / 60:.1f}min wall={wall:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
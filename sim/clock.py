@@ -0,0 +1,29 @@
+import time
+
+
+class SimClock:
+    """
+    가상 시계
+    - realtime=False: sleep()이 즉시 반환하고 시간만 진행 (오프라인 벤치마크)
+    - realtime=True : 실제 시간 (SimSerial을 실시간 스크립트/GUI에 붙일 때)
+    """
+
+    def __init__(self, realtime: bool = False, start: float = 0.0):
+        self.realtime = realtime
+        self._now = float(start)
+        self._t0 = time.monotonic() - float(start)
+
+    def monotonic(self) -> float:
+        if self.realtime:
+            return time.monotonic() - self._t0
+        return self._now
+
+    # time 모듈 대체용 (module.time = clock)
+    time = monotonic
+
+    def sleep(self, seconds: float):
+        seconds = max(0.0, float(seconds))
+        if self.realtime:
+            time.sleep(seconds)
+        else:
+            self._now += seconds
@@ -0,0 +1,302 @@
+"""
+카메라 / 시리얼 / 모터 대역
+
+- SimCamera   : cv2.VideoCapture 호환 (read/isOpened/set/release) → worker.camera.open_source / CameraStream 에 그대로 연결
+- SimSerial   : SerialController 호환 API (send → Future, wait_until_idle / move_and_wait, send_*)
+                → VolumeDCActuator / LinearActuator 에 그대로 연결
+- MightyZapAxis : MightyZap 1축 (sim.firmware 와 공유)
+- SimActuator : VolumeDCActuator 호환 (run/stop/pulse), 시간은 SimClock으로 진행
+"""
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+from sim.dial import DialModel
+from sim.render import OdometerRenderer
+from worker.frame_parser import FEEDBACK_CMD, STATUS_CMD, decode
+from worker.make_packet import MakePacket
+
+BROADCAST_ID = 0xFF
+
+# worker.camera.rotate_frame 의 역변환 (worker가 rotate 후 렌더링 좌표계로 복원됨)
+_INVERSE_ROTATE = {
+    1: cv2.ROTATE_90_COUNTERCLOCKWISE,
+    2: cv2.ROTATE_90_CLOCKWISE,
+    3: cv2.ROTATE_180,
+}
+
+
+class SimCamera:
+    def __init__(
+        self, dial: DialModel, renderer: OdometerRenderer, rotate: int = 0, fps: Optional[float] = None,
+    ):
+        """
+        - dial: volume 속성만 사용 (sim.firmware.FirmwareEmulator 도 가능)
+        - rotate: worker에서 사용할 --rotate 값 (0이면 렌더링 좌표계 그대로)
+        - fps: read() 속도 제한 (실시간, CameraStream grabber가 CPU를 다 쓰지 않도록). None이면 제한 없음
+        """
+        self.dial = dial
+        self.renderer = renderer
+        self.rotate = rotate
+        self.period = (1.0 / fps) if fps else 0.0
+        self.frames = 0
+        self._opened = True
+        self._next_t = time.monotonic()
+
+    def grab_frame(self) -> np.ndarray:
+        """렌더링 좌표계 프레임 (ROI 좌표 그대로)"""
+        self.frames += 1
+        return self.renderer.render(self.dial.volume)
+
+    # -------------------------------------------------
+    # cv2.VideoCapture 호환
+    # -------------------------------------------------
+    def read(self, image: Optional[np.ndarray] = None):
+        if not self._opened:
+            return False, None
+
+        if self.period:
+            delay = self._next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_t = max(self._next_t + self.period, time.monotonic())
+
+        frame = self.grab_frame()
+        code = _INVERSE_ROTATE.get(self.rotate)
+        if code is not None:
+            frame = cv2.rotate(frame, code)
+
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame
+
+    def isOpened(self) -> bool:
+        return self._opened
+
+    def set(self, prop, value) -> bool:
+        return True
+
+    def release(self):
+        self._opened = False
+
+
+class MightyZapAxis:
+    """MightyZap 1축: 목표 위치까지 일정 속도 이동"""
+
+    MAX_POSITION = 4095
+    MAX_SPEED = 1023
+
+    def __init__(self, position: int = 0, max_rate: float = 3000.0, clock=time):
+        """
+        - max_rate: speed=1023일 때 이동 속도 (position unit / s)
+        - clock: monotonic()을 가진 시계 (SimClock이면 가상 시간으로 이동)
+        """
+        self.max_rate = float(max_rate)
+        self.clock = clock
+        self.speed = self.MAX_SPEED
+        self.current = 800
+        self.force = True
+        self._pos = float(position)
+        self._target = float(position)
+        self._t = clock.monotonic()
+
+    def _advance(self):
+        now = self.clock.monotonic()
+        rate = self.max_rate * self.speed / self.MAX_SPEED
+        step = rate * (now - self._t)
+        self._t = now
+        if not self.force:
+            return
+        d = self._target - self._pos
+        self._pos = self._target if abs(d) <= step else self._pos + (step if d > 0 else -step)
+
+    def set_target(self, position: int):
+        self._advance()
+        if self.force:
+            self._target = float(max(0, min(self.MAX_POSITION, position)))
+
+    def set_speed(self, speed: int):
+        self._advance()
+        self.speed = max(1, min(self.MAX_SPEED, speed))
+
+    def set_force(self, on: bool):
+        self._advance()
+        self.force = bool(on)
+        if not on:
+            self._target = self._pos
+
+    @property
+    def position(self) -> int:
+        self._advance()
+        return int(round(self._pos))
+
+    @property
+    def moving(self) -> bool:
+        self._advance()
+        return self._pos != self._target
+
+
+class SimActuator:
+    def __init__(self, dial: DialModel):
+        self.dial = dial
+        self.clock = dial.clock
+
+    def run(self, direction: int, duty: int):
+        self.dial.run(direction, max(0, min(100, int(duty))))
+
+    def stop(self):
+        self.dial.stop()
+
+    def pulse(self, direction: int, duty: int, duration_ms: int, stop_event=None):
+        self.run(direction, duty)
+        try:
+            self.clock.sleep(duration_ms / 1000.0)
+        finally:
+            self.stop()
+
+
+class SimSerial:
+    """
+    SerialController 대역 (포트 없음)
+    - volume DC id로 온 명령만 다이얼을 움직이고, 나머지 id는 MightyZapAxis (dial.clock 기준)로 이동
+    - send()는 packet을 바로 처리: 상태 / feedback 요청은 StatusFrame / FeedbackFrame, 나머지는 처리 시각으로 완료
+    """
+
+    IDLE_POLL_SEC = 0.01  # wait_until_idle: 상태 확인 간격 (SerialController 와 동일)
+
+    def __init__(self, dial: DialModel, volume_dc_id: int = 0x0C, port: str = "sim", max_rate: float = 3000.0):
+        self.dial = dial
+        self.clock = dial.clock
+        self.volume_dc_id = volume_dc_id
+        self.port = port
+        self.max_rate = max_rate
+        self.running = False
+
+        self.axes: Dict[int, MightyZapAxis] = {}
+        self.sent = []  # (cmd, actuator_id, args) 기록
+
+    @property
+    def connected(self) -> bool:
+        return self.running
+
+    def connect(self, exclusive: bool = False) -> bool:
+        self.running = True
+        return True
+
+    def close(self, drain: bool = True, timeout: float = 1.0):
+        self.dial.stop()
+        self.running = False
+
+    def axis(self, actuator_id: int) -> MightyZapAxis:
+        """actuator_id의 MightyZap 축 (처음 쓰일 때 위치 0으로 생성)"""
+        axis = self.axes.get(actuator_id)
+        if axis is None:
+            axis = self.axes[actuator_id] = MightyZapAxis(max_rate=self.max_rate, clock=self.clock)
+        return axis
+
+    def moving(self, actuator_id: int) -> bool:
+        if actuator_id == self.volume_dc_id:
+            return self.dial.moving
+        return self.axis(actuator_id).moving
+
+    # -------------------------------------------------
+    # Request / response (SerialController.send 와 동일 계약)
+    # -------------------------------------------------
+    def send(self, packet: bytes) -> Future:
+        fut: Future = Future()
+        if not self.connected:
+            fut.set_exception(RuntimeError("serial not connected"))
+            return fut
+
+        actuator_id, cmd = packet[2], packet[4]
+        value = packet[5] | (packet[6] << 8)
+        if cmd == MakePacket.MIGHTYZAP_GetMovingState:
+            # broadcast는 처음 도착한 응답 = volume DC
+            target = self.volume_dc_id if actuator_id == BROADCAST_ID else actuator_id
+            moving = 1 if self.moving(target) else 0
+            fut.set_result(decode(MakePacket._base_packet(target, STATUS_CMD, [0, 0, 0, moving])))
+        elif cmd == MakePacket.MIGHTYZAP_GetFeedbackData:
+            pos = self.axis(actuator_id).position
+            fut.set_result(decode(MakePacket._base_packet(actuator_id, FEEDBACK_CMD, [pos & 0xFF, (pos >> 8) & 0xFF])))
+        elif cmd == MakePacket.MIGHTYZAP_SetPosition:
+            self.send_mightyzap_set_position(actuator_id, value)
+        elif cmd == MakePacket.MIGHTYZAP_SetSpeed:
+            self.send_mightyzap_set_speed(actuator_id, value)
+        elif cmd == MakePacket.MIGHTYZAP_SetCurrent:
+            self.send_mightyzap_set_current(actuator_id, value)
+        elif cmd == MakePacket.MIGHTYZAP_SetForceOnOff:
+            self.send_mightyzap_force_onoff(actuator_id, packet[5])
+        elif cmd == MakePacket.GearedDC_changePipetteVolume:
+            self.send_pipette_change_volume(actuator_id, packet[5], packet[6])
+        else:
+            fut.set_exception(RuntimeError(f"unsupported cmd {hex(cmd)}"))
+
+        if not fut.done():
+            fut.set_result(time.time())
+        return fut
+
+    async def send_async(self, packet: bytes):
+        return self.send(packet).result()
+
+    # -------------------------------------------------
+    # Blocking helper (dial.clock 기준, SimClock이면 가상 시간만 진행)
+    # -------------------------------------------------
+    def wait_until_idle(self, actuator_id: int, timeout: float = 5.0) -> bool:
+        deadline = self.clock.monotonic() + timeout
+        while self.moving(actuator_id):
+            if not self.connected or self.clock.monotonic() >= deadline:
+                return False
+            self.clock.sleep(self.IDLE_POLL_SEC)
+        return True
+
+    def move_and_wait(self, actuator_id: int, position: int, timeout: float = 5.0) -> bool:
+        t0 = self.clock.monotonic()
+        try:
+            self.send(MakePacket.set_position(actuator_id, position)).result(timeout)
+        except RuntimeError as e:
+            print(f"[SIM SERIAL] set_position id={hex(actuator_id)} not sent: {e}")
+            return False
+        return self.wait_until_idle(actuator_id, timeout - (self.clock.monotonic() - t0))
+
+    async def wait_until_idle_async(self, actuator_id: int, timeout: float = 5.0) -> bool:
+        return self.wait_until_idle(actuator_id, timeout)
+
+    async def move_and_wait_async(self, actuator_id: int, position: int, timeout: float = 5.0):
+        return self.move_and_wait(actuator_id, position, timeout)
+
+    # -------------------------------------------------
+    # High-level APIs (SerialController 와 동일 시그니처)
+    # -------------------------------------------------
+    def send_pipette_change_volume(self, actuator_id: int, direction: int, duty: int):
+        self.sent.append(("volume", actuator_id, (direction, duty)))
+        if actuator_id != self.volume_dc_id:
+            return
+        if int(duty) <= 0:
+            self.dial.stop()
+        else:
+            self.dial.run(direction, duty)
+
+    def send_pipette_stop(self, actuator_id: int):
+        self.sent.append(("stop", actuator_id, ()))
+        if actuator_id == self.volume_dc_id:
+            self.dial.stop()
+
+    def send_mightyzap_set_position(self, actuator_id: int, position: int):
+        self.sent.append(("position", actuator_id, (position,)))
+        self.axis(actuator_id).set_target(int(position))
+
+    def send_mightyzap_set_speed(self, actuator_id: int, speed: int):
+        self.sent.append(("speed", actuator_id, (speed,)))
+        self.axis(actuator_id).set_speed(int(speed))
+
+    def send_mightyzap_set_current(self, actuator_id: int, current: int):
+        self.sent.append(("current", actuator_id, (current,)))
+        self.axis(actuator_id).current = int(current)
+
+    def send_mightyzap_force_onoff(self, actuator_id: int, onoff: int):
+        self.sent.append(("force", actuator_id, (onoff,)))
+        self.axis(actuator_id).set_force(bool(onoff))
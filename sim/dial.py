@@ -0,0 +1,140 @@
+"""
+Geared DC volume motor + odometer dial model
+
+- duty → 속도: 데드밴드 duty 이하 정지, 이후 포화 곡선
+- pulse 시작 시 dead time (정지 마찰)
+- stop 후 관성 coast (지수 감쇠)
+- 방향 전환 시 backlash 만큼은 다이얼이 움직이지 않음
+- pulse마다 gain 잡음, 방향별 gain 비대칭
+- 표시 범위 [min_ul, max_ul]
+
+direction: 0 = 증가, 1 = 감소 (control_worker 규약)
+"""
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from sim.clock import SimClock
+
+
+@dataclass
+class DialParams:
+    # calibration.json (55%/740ms≈100uL, 40%/400ms≈55uL, 25%/80ms≈5uL) 근처가 되도록 설정
+    vmax_ul_per_ms: float = 0.16
+    duty_deadband: float = 20.0
+    duty_scale: float = 12.0
+    dead_time_ms: float = 20.0
+    coast_tau_ms: float = 30.0
+    backlash_ul: float = 4.0
+    gain_down: float = 0.9      # 감소 방향 gain 비율
+    gain_noise: float = 0.05    # pulse별 gain 상대 표준편차
+    min_ul: float = 500.0
+    max_ul: float = 5000.0
+
+    def speed(self, duty: float) -> float:
+        """uL/ms (잡음/방향 보정 전)"""
+        if duty <= self.duty_deadband:
+            return 0.0
+        return self.vmax_ul_per_ms * (1.0 - math.exp(-(duty - self.duty_deadband) / self.duty_scale))
+
+
+class DialModel:
+    def __init__(
+        self,
+        params: Optional[DialParams] = None,
+        clock: Optional[SimClock] = None,
+        volume: float = 1000.0,
+        rng: Optional[np.random.Generator] = None,
+    ):
+        self.params = params or DialParams()
+        self.clock = clock or SimClock()
+        self.rng = rng or np.random.default_rng()
+
+        self._pos = float(volume)
+        self._last_t = self.clock.monotonic()
+
+        self._running = False
+        self._run_t0 = 0.0
+        self._speed = 0.0       # uL/s, 부호 포함
+        self._coast = 0.0       # uL/s, stop 이후 감쇠 중인 속도
+
+        self._dir: Optional[int] = None
+        self._slack = 0.0       # 현재 방향에서 남은 유격 (uL)
+
+        self.pulses = 0
+
+    # =========================
+    # Commands
+    # =========================
+    def run(self, direction: int, duty: int):
+        self._advance()
+        p = self.params
+        direction = 1 if int(direction) > 0 else 0
+
+        if direction != self._dir:
+            # 반대 방향: 유격을 다시 채워야 함 (첫 명령은 유격이 이미 걸린 상태로 본다)
+            self._slack = p.backlash_ul if self._dir is not None else 0.0
+            self._dir = direction
+            self._coast = 0.0
+
+        gain = p.speed(duty) * (p.gain_down if direction == 1 else 1.0)
+        gain *= max(0.0, 1.0 + self.rng.normal(0.0, p.gain_noise))
+        sign = 1.0 if direction == 0 else -1.0
+
+        self._speed = sign * gain * 1000.0
+        self._running = True
+        self._run_t0 = self._last_t
+        self.pulses += 1
+
+    def stop(self):
+        self._advance()
+        if self._running:
+            active = self._last_t - self._run_t0 >= self.params.dead_time_ms / 1000.0
+            self._coast = self._speed if active else 0.0
+        self._running = False
+        self._speed = 0.0
+
+    # =========================
+    # State
+    # =========================
+    @property
+    def volume(self) -> float:
+        """현재 표시값 (소수부 = 굴러가는 중인 자릿수)"""
+        self._advance()
+        return self._pos
+
+    @property
+    def moving(self) -> bool:
+        self._advance()
+        return self._running or abs(self._coast) > 1.0
+
+    def _move(self, travel: float):
+        # backlash: 유격을 먼저 소모
+        taken = min(self._slack, abs(travel))
+        self._slack -= taken
+        travel = math.copysign(abs(travel) - taken, travel)
+
+        p = self.params
+        self._pos = min(p.max_ul, max(p.min_ul, self._pos + travel))
+
+    def _advance(self):
+        t = self.clock.monotonic()
+        dt = t - self._last_t
+        if dt <= 0:
+            return
+
+        if self._running:
+            active_from = max(self._last_t, self._run_t0 + self.params.dead_time_ms / 1000.0)
+            if t > active_from:
+                self._move(self._speed * (t - active_from))
+        elif self._coast:
+            tau = self.params.coast_tau_ms / 1000.0
+            decay = math.exp(-dt / tau)
+            self._move(self._coast * tau * (1.0 - decay))
+            self._coast *= decay
+            if abs(self._coast) < 1e-3:
+                self._coast = 0.0
+
+        self._last_t = t
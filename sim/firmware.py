@@ -0,0 +1,233 @@
+"""
+MightyZap linear actuator + geared DC volume motor 펌웨어 에뮬레이터 (PTY)
+
+    python -m sim.firmware --link /tmp/ttyPIPETTE --latency 0.002 --loss 0.001
+    SERIAL_PORT=/tmp/ttyPIPETTE python3 -m gui.main
+
+- MightyZap (기본 0x0A, 0x0B): set position / speed / current / force on-off,
+  GetMovingState → status frame, GetFeedbackData → feedback frame (현재 위치)
+  위치는 speed에 비례한 속도로 목표까지 이동 (force off면 명령 무시)
+- Geared DC (기본 0x0C): pipette_change_volume → sim.dial.DialModel (실시간 시계)
+  duty 0 = stop, status moving = 다이얼 회전 / 관성 중
+- 링크 오류 주입 (LinkFaults): 응답 지연 / jitter, byte 유실 / bit flip (장치→host),
+  명령 frame 유실 (host→장치)
+"""
+import argparse
+import heapq
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from sim.clock import SimClock
+from sim.devices import MightyZapAxis
+from sim.dial import DialModel, DialParams
+from sim.pty_device import BROADCAST_ID, PtyDevice, status_frame
+from worker.make_packet import MakePacket
+
+
+@dataclass
+class LinkFaults:
+    latency_s: float = 0.0   # 요청 수신 → 응답 송신
+    jitter_s: float = 0.0    # 응답 지연에 더할 균등 분포 [0, jitter]
+    loss: float = 0.0        # 응답 byte별 유실 확률
+    corrupt: float = 0.0     # 응답 byte별 bit flip 확률
+    rx_loss: float = 0.0     # 명령 frame 유실 확률 (장치가 못 받음)
+
+
+class FirmwareEmulator(PtyDevice):
+    def __init__(
+        self,
+        linear_ids=(0x0A, 0x0B),
+        volume_dc_id: int = 0x0C,
+        volume: float = 1500.0,
+        dial_params: Optional[DialParams] = None,
+        faults: Optional[LinkFaults] = None,
+        max_rate: float = 3000.0,
+        seed: int = 0,
+    ):
+        super().__init__(ids=list(linear_ids) + [volume_dc_id])
+        self.axes: Dict[int, MightyZapAxis] = {i: MightyZapAxis(max_rate=max_rate) for i in linear_ids}
+        self.volume_dc_id = volume_dc_id
+        self.dial = DialModel(
+            dial_params, SimClock(realtime=True), volume=volume, rng=np.random.default_rng(seed)
+        )
+        self._dial_lock = threading.Lock()
+        self.faults = faults or LinkFaults()
+        self._rng = random.Random(seed)
+
+        self._heap = []
+        self._seq = 0
+        self._last_due = 0.0
+        self._cond = threading.Condition()
+        self._tx_thread = None
+
+        self.counters = {
+            "commands": 0,
+            "commands_lost": 0,
+            "replies": 0,
+            "bytes_lost": 0,
+            "bytes_corrupted": 0,
+            "unknown": 0,
+        }
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self) -> "FirmwareEmulator":
+        super().start()
+        self._tx_thread = threading.Thread(target=self._reply_loop, daemon=True)
+        self._tx_thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._tx_thread is not None:
+            self._tx_thread.join(1.0)
+            self._tx_thread = None
+        super().stop()
+
+    @property
+    def volume(self) -> float:
+        with self._dial_lock:
+            return self.dial.volume
+
+    @property
+    def dial_moving(self) -> bool:
+        with self._dial_lock:
+            return self.dial.moving
+
+    # =========================
+    # Reply path (지연 / 유실 / 손상)
+    # =========================
+    def reply(self, frame: bytes):
+        f = self.faults
+        due = time.perf_counter() + f.latency_s + (self._rng.uniform(0, f.jitter_s) if f.jitter_s else 0.0)
+        with self._cond:
+            due = max(due, self._last_due)  # 직렬 링크: 순서 유지
+            self._last_due = due
+            heapq.heappush(self._heap, (due, self._seq, frame))
+            self._seq += 1
+            self._cond.notify()
+
+    def _reply_loop(self):
+        while self._running:
+            with self._cond:
+                while self._running and (not self._heap or self._heap[0][0] > time.perf_counter()):
+                    timeout = None if not self._heap else self._heap[0][0] - time.perf_counter()
+                    self._cond.wait(timeout if timeout is None else max(0.0, timeout))
+                if not self._running:
+                    return
+                _, _, frame = heapq.heappop(self._heap)
+
+            data = self._inject(frame)
+            if data:
+                try:
+                    self.write(data)
+                except OSError:
+                    return
+            self.counters["replies"] += 1
+
+    def _inject(self, frame: bytes) -> bytes:
+        f = self.faults
+        if not f.loss and not f.corrupt:
+            return frame
+        out = bytearray()
+        for b in frame:
+            if f.loss and self._rng.random() < f.loss:
+                self.counters["bytes_lost"] += 1
+                continue
+            if f.corrupt and self._rng.random() < f.corrupt:
+                b ^= 1 << self._rng.randrange(8)
+                self.counters["bytes_corrupted"] += 1
+            out.append(b)
+        return bytes(out)
+
+    # =========================
+    # Command handling
+    # =========================
+    def handle(self, frame: bytes):
+        if MakePacket._checksum(frame) != frame[11] or frame[12] != MakePacket.ENDOFBYTE:
+            self.counters["unknown"] += 1
+            return
+        if self.faults.rx_loss and self._rng.random() < self.faults.rx_loss:
+            self.counters["commands_lost"] += 1
+            return
+        self.counters["commands"] += 1
+
+        actuator_id, cmd = frame[2], frame[4]
+        value = frame[5] | (frame[6] << 8)
+        axis = self.axes.get(actuator_id)
+
+        if cmd == MakePacket.MIGHTYZAP_GetMovingState:
+            ids = self.ids if actuator_id == BROADCAST_ID else [actuator_id]
+            for i in ids:
+                if i in self.axes:
+                    self.reply(status_frame(i, self.axes[i].moving))
+                elif i == self.volume_dc_id:
+                    self.reply(status_frame(i, self.dial_moving))
+        elif cmd == MakePacket.MIGHTYZAP_GetFeedbackData and axis is not None:
+            pos = axis.position
+            self.reply(MakePacket._base_packet(actuator_id, cmd, [pos & 0xFF, (pos >> 8) & 0xFF]))
+        elif cmd == MakePacket.MIGHTYZAP_SetPosition and axis is not None:
+            axis.set_target(value)
+        elif cmd == MakePacket.MIGHTYZAP_SetSpeed and axis is not None:
+            axis.set_speed(value)
+        elif cmd == MakePacket.MIGHTYZAP_SetCurrent and axis is not None:
+            axis.current = value
+        elif cmd == MakePacket.MIGHTYZAP_SetForceOnOff and axis is not None:
+            axis.set_force(frame[5])
+        elif cmd == MakePacket.GearedDC_changePipetteVolume and actuator_id == self.volume_dc_id:
+            direction, duty = frame[5], frame[6]
+            with self._dial_lock:
+                if duty == 0:
+                    self.dial.stop()
+                else:
+                    self.dial.run(direction, duty)
+        else:
+            self.counters["unknown"] += 1
+
+
+# =========================================================
+# CLI
+# =========================================================
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--link", default=None, help="pty 경로에 만들 symlink (예: /tmp/ttyPIPETTE)")
+    ap.add_argument("--volume", type=float, default=1500.0)
+    ap.add_argument("--latency", type=float, default=0.0)
+    ap.add_argument("--jitter", type=float, default=0.0)
+    ap.add_argument("--loss", type=float, default=0.0)
+    ap.add_argument("--corrupt", type=float, default=0.0)
+    ap.add_argument("--rx-loss", type=float, default=0.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    faults = LinkFaults(args.latency, args.jitter, args.loss, args.corrupt, args.rx_loss)
+    with FirmwareEmulator(volume=args.volume, faults=faults, seed=args.seed) as fw:
+        port = fw.port
+        if args.link:
+            if os.path.islink(args.link):
+                os.unlink(args.link)
+            os.symlink(fw.port, args.link)
+            port = args.link
+        print(f"[FIRMWARE] listening on {port} (SERIAL_PORT={port})", flush=True)
+        try:
+            while True:
+                time.sleep(5.0)
+                print(f"[FIRMWARE] volume={fw.volume:.1f} {fw.counters}", flush=True)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if args.link and os.path.islink(args.link):
+                os.unlink(args.link)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Template-matching OCR backend (OcrBackend 호환, 모델 파일 불필요)
+
+렌더러의 바퀴 위치 0.0 ~ 9.9 (0.1 간격) 를 실제 OCR과 같은 전처리(preprocess_crops)로
+통과시킨 템플릿과 비교한다. 템플릿 위치 확률 (거리 softmax) 을 보이는 비율대로 숫자에 나눠
+(위치 9.3 → 9: 0.7, 0: 0.3) 굴러가는 중인 숫자는 실제 분류기처럼 두 숫자에 확률이 갈린다.
+"""
+import cv2
+import numpy as np
+
+from worker.ocr_preprocess import preprocess_crops
+
+STRIDE = 4  # 224 → 56 으로 다운샘플 후 비교 (속도)
+SUBSTEPS = 10  # 숫자당 템플릿 위치 수
+
+
+class TemplateOcrBackend:
+    name = "template"
+
+    def __init__(self, renderer, temperature: float = 0.02):
+        self.temperature = float(temperature)
+
+        positions = np.arange(10 * SUBSTEPS) / SUBSTEPS
+        crops = [cv2.cvtColor(renderer.cell(p), cv2.COLOR_GRAY2BGR) for p in positions]
+        self.templates = self._features(preprocess_crops(crops))
+        self._t_sq = (self.templates * self.templates).sum(1)
+
+        # 템플릿 위치 → 숫자 확률 (floor 숫자 1-f, 다음 숫자 f)
+        floor = np.floor(positions).astype(int)
+        frac = positions - floor
+        self._split = np.zeros((len(positions), 10), dtype=np.float32)
+        self._split[np.arange(len(positions)), floor % 10] = 1.0 - frac
+        self._split[np.arange(len(positions)), (floor + 1) % 10] += frac
+
+    @staticmethod
+    def _features(batch: np.ndarray) -> np.ndarray:
+        x = batch[:, :, ::STRIDE, ::STRIDE]
+        return np.ascontiguousarray(x.reshape(x.shape[0], -1), dtype=np.float32)
+
+    def infer(self, batch: np.ndarray):
+        x = self._features(batch)
+        # (N, T) 평균 제곱 거리 → 숫자별 최소 거리
+        d = ((x * x).sum(1, keepdims=True) - 2.0 * x @ self.templates.T + self._t_sq) / x.shape[1]
+        logits = -d / self.temperature
+        w = np.exp(logits - logits.max(axis=1, keepdims=True))
+        prob = (w / w.sum(axis=1, keepdims=True)) @ self._split
+
+        cls = prob.argmax(axis=1)
+        conf = prob[np.arange(len(prob)), cls]
+        return cls.tolist(), conf.tolist(), prob
@@ -0,0 +1,126 @@
+"""
+PTY 기반 가상 시리얼 장치 (13-byte EA EB … ED 프로토콜)
+
+os.openpty()로 만든 slave 경로를 SerialController(port=device.port)에 넘기면
+실제 /dev/ttyUSB0 대신 이 객체와 통신한다.
+
+- 기본 동작: GetMovingState(0x05) 요청에 status frame(0x11) 응답
+  (broadcast 0xFF면 등록된 모든 id)
+- 수신 / 송신 시각(perf_counter)을 기록 → 지연 측정용
+"""
+import os
+import select
+import threading
+import time
+import tty
+from typing import Dict, List, Optional, Tuple
+
+from worker.make_packet import MakePacket
+
+STATUS_CMD = 0x11
+FRAME_LEN = 13
+BROADCAST_ID = 0xFF
+
+
+def status_frame(actuator_id: int, moving: int) -> bytes:
+    """_handle_frame이 읽는 status frame (frame[8] = moving)"""
+    return MakePacket._base_packet(actuator_id, STATUS_CMD, [0, 0, 0, 1 if moving else 0])
+
+
+class PtyDevice:
+    def __init__(self, ids=(0x0A, 0x0B), reply_delay: float = 0.0):
+        """
+        - ids: 응답할 actuator id 목록 (broadcast poll 시 id마다 status frame 1개)
+        - reply_delay: 요청 수신 → 응답 송신 지연 (s)
+        """
+        self.ids = list(ids)
+        self.reply_delay = float(reply_delay)
+        self.moving: Dict[int, int] = {i: 0 for i in self.ids}
+
+        self.received: List[Tuple[float, bytes]] = []  # (수신 시각, frame)
+        self.replied: List[Tuple[float, bytes]] = []   # (송신 시각, frame)
+
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self._thread = None
+        self._running = False
+        self._lock = threading.Lock()
+        self.port: Optional[str] = None
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self) -> "PtyDevice":
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # =========================
+    # I/O
+    # =========================
+    def write(self, data: bytes):
+        with self._lock:
+            os.write(self._master, data)
+            self.replied.append((time.perf_counter(), bytes(data)))
+
+    def _loop(self):
+        buf = bytearray()
+        while self._running:
+            r, _, _ = select.select([self._master], [], [], 0.05)
+            if not r:
+                continue
+            try:
+                chunk = os.read(self._master, 4096)
+            except OSError:
+                break
+            now = time.perf_counter()
+            buf += chunk
+
+            while len(buf) >= FRAME_LEN:
+                start = buf.find(bytes((MakePacket.HEADER1, MakePacket.HEADER2)))
+                if start < 0:
+                    del buf[:-1]
+                    break
+                if start:
+                    del buf[:start]
+                    continue
+                if len(buf) < FRAME_LEN:
+                    break
+                frame = bytes(buf[:FRAME_LEN])
+                del buf[:FRAME_LEN]
+                self.received.append((now, frame))
+                self.handle(frame)
+
+    def handle(self, frame: bytes):
+        """수신 frame 처리 (subclass에서 확장)"""
+        actuator_id, cmd = frame[2], frame[4]
+        if cmd != MakePacket.MIGHTYZAP_GetMovingState:
+            return
+
+        targets = self.ids if actuator_id == BROADCAST_ID else [i for i in self.ids if i == actuator_id]
+        if self.reply_delay > 0:
+            time.sleep(self.reply_delay)
+        for i in targets:
+            self.write(status_frame(i, self.moving.get(i, 0)))
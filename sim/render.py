@@ -0,0 +1,121 @@
+"""
+Synthetic odometer frames (회전 보정 후 좌표계, 800x1280)
+
+- 숫자 4개 (천/백/십/일) 를 실제 rois.json 위치에 그린다
+- 일의 자리는 연속 회전, 윗자리는 아랫자리가 9→0 넘어가는 마지막 1 단위 동안 굴러감
+- 배경은 고정 텍스처 (ROI tracker 용), 숫자 영역에는 프레임마다 센서 잡음
+"""
+import math
+from typing import List, Optional
+
+import cv2
+import numpy as np
+
+DEFAULT_ROIS = [
+    [275, 294, 116, 116],
+    [275, 459, 116, 116],
+    [275, 616, 116, 116],
+    [275, 777, 116, 116],
+]
+FRAME_SHAPE = (1280, 800, 3)
+WHEEL_WEIGHTS = (1000, 100, 10, 1)
+
+BODY_BGR = (200, 196, 190)
+WINDOW_GRAY = 18
+WHEEL_GRAY = 28
+DIGIT_GRAY = 225
+
+
+def wheel_positions(volume: float) -> List[float]:
+    """
+    자릿수 바퀴 위치 (0~10, 소수부 = 다음 숫자로 굴러간 비율)
+    """
+    v = max(0.0, float(volume))
+    pos = []
+    for w in WHEEL_WEIGHTS:
+        if w == 1:
+            pos.append(v % 10.0)
+            continue
+        base = math.floor(v / w) % 10
+        lower = v % w
+        roll = min(1.0, max(0.0, lower - (w - 1)))
+        pos.append(base + roll)
+    return pos
+
+
+class OdometerRenderer:
+    def __init__(
+        self,
+        rois=None,
+        frame_shape=FRAME_SHAPE,
+        noise_std: float = 4.0,
+        seed: Optional[int] = None,
+    ):
+        self.rois = [list(map(int, r)) for r in (rois or DEFAULT_ROIS)]
+        self.frame_shape = tuple(frame_shape)
+        self.noise_std = float(noise_std)
+        self.rng = np.random.default_rng(seed)
+
+        _, _, self.cell_w, self.cell_h = self.rois[0]
+        self._strip = self._build_strip()
+        self._background = self._build_background(seed)
+
+    # =========================
+    # Static parts
+    # =========================
+    def _build_strip(self) -> np.ndarray:
+        """0,1,...,9,0 세로 띠 (pitch = cell_h)"""
+        w, h = self.cell_w, self.cell_h
+        strip = np.full((11 * h, w), WHEEL_GRAY, dtype=np.uint8)
+
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        scale = h / 40.0
+        thickness = max(2, h // 20)
+        for i in range(11):
+            text = str(i % 10)
+            (tw, th), _ = cv2.getTextSize(text, font, scale, thickness)
+            org = ((w - tw) // 2, i * h + (h + th) // 2)
+            cv2.putText(strip, text, org, font, scale, DIGIT_GRAY, thickness, cv2.LINE_AA)
+        return strip
+
+    def _build_background(self, seed) -> np.ndarray:
+        h, w = self.frame_shape[:2]
+        rng = np.random.default_rng(None if seed is None else seed + 1)
+
+        # 저주파 텍스처 (조명 얼룩 / 본체 질감)
+        tex = rng.normal(0, 1, (h // 16, w // 16)).astype(np.float32)
+        tex = cv2.resize(tex, (w, h), interpolation=cv2.INTER_CUBIC)
+        bg = np.empty(self.frame_shape, dtype=np.float32)
+        bg[:] = BODY_BGR
+        bg += (tex * 12.0)[..., None]
+
+        # 숫자 창 (ROI 합집합 + 여백)
+        r = np.asarray(self.rois)
+        x1, y1 = r[:, 0].min() - 70, r[:, 1].min() - 30
+        x2, y2 = (r[:, 0] + r[:, 2]).max() + 70, (r[:, 1] + r[:, 3]).max() + 30
+        bg[y1:y2, x1:x2] = WINDOW_GRAY
+        cv2.rectangle(bg, (int(x1), int(y1)), (int(x2), int(y2)), (235, 235, 235), 6)
+
+        return np.clip(bg, 0, 255).astype(np.uint8)
+
+    def cell(self, position: float) -> np.ndarray:
+        """바퀴 위치 → (cell_h, cell_w) gray"""
+        y0 = int(round(min(10.0, max(0.0, position)) * self.cell_h))
+        return self._strip[y0:y0 + self.cell_h]
+
+    # =========================
+    # Frame
+    # =========================
+    def render(self, volume: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None or out.shape != self.frame_shape:
+            out = np.empty(self.frame_shape, dtype=np.uint8)
+        np.copyto(out, self._background)
+
+        for (x, y, w, h), p in zip(self.rois, wheel_positions(volume)):
+            cell = self.cell(p)
+            if self.noise_std > 0:
+                noisy = cell + self.rng.normal(0, self.noise_std, cell.shape).astype(np.float32)
+                cell = np.clip(noisy, 0, 255).astype(np.uint8)
+            out[y:y + h, x:x + w] = cell[..., None]
+
+        return out
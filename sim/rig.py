@@ -0,0 +1,122 @@
+"""
+SimRig: 다이얼 + 카메라 + 모터 + OCR 를 seed 하나로 묶은 가상 장비
+
+    rig = SimRig(seed=0, volume=1500)
+    result = rig.run_to_target(2620, strategy=create_strategy("ladder"))
+    result = rig.run_to_target(2620, settle=rig.settle_detector())   # 고정 sleep 대신 vision settle
+"""
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from sim.clock import SimClock
+from sim.devices import SimActuator, SimCamera, SimSerial
+from sim.dial import DialModel, DialParams
+from sim.ocr import TemplateOcrBackend
+from sim.render import OdometerRenderer
+from worker.control_worker import run_to_target
+from worker.ocr import read_volume
+from worker.settle import SettleDetector
+
+
+def _discard(msg: dict):
+    pass
+
+
+class SimRig:
+    def __init__(
+        self,
+        seed: Optional[int] = 0,
+        volume: Optional[float] = None,
+        params: Optional[DialParams] = None,
+        noise_std: float = 4.0,
+        rois=None,
+        realtime: bool = False,
+    ):
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.params = params or DialParams()
+
+        if volume is None:
+            volume = float(self.rng.integers(self.params.min_ul, self.params.max_ul + 1))
+
+        self.clock = SimClock(realtime=realtime)
+        self.dial = DialModel(self.params, self.clock, volume=volume, rng=self.rng)
+        self.renderer = OdometerRenderer(rois=rois, noise_std=noise_std, seed=seed)
+        self.camera = SimCamera(self.dial, self.renderer)
+        self.actuator = SimActuator(self.dial)
+        self.serial = SimSerial(self.dial)
+        self.ocr_backend = TemplateOcrBackend(self.renderer)
+
+    @property
+    def rois(self):
+        return self.renderer.rois
+
+    @property
+    def true_volume(self) -> float:
+        return self.dial.volume
+
+    # =========================
+    # Loop hooks
+    # =========================
+    def capture(self) -> np.ndarray:
+        return self.camera.grab_frame()
+
+    def read_volume(self) -> int:
+        return read_volume(self.capture(), self.ocr_backend, rois=self.rois, save_crops=False).volume
+
+    def settle_detector(self, fps: float = 30.0, **kwargs) -> SettleDetector:
+        """가상 시계 위 카메라: fps 간격으로 프레임 (kwargs는 SettleDetector 설정)"""
+        period = 1.0 / fps
+
+        def next_frame(after_ts: float):
+            self.clock.sleep(period)
+            return self.camera.grab_frame(), self.clock.monotonic()
+
+        return SettleDetector(next_frame, clock=self.clock.monotonic, **kwargs)
+
+    def move_motor(self, direction: int, duty: int, duration_ms: int):
+        """control_worker 규약 (0 = 증가)"""
+        self.actuator.pulse(direction, duty, duration_ms)
+
+    def run_to_target(self, target: int, strategy=None, plant_model=None, emit=None, **kwargs):
+        return run_to_target(
+            target=target,
+            ocr_backend=self.ocr_backend,
+            emit=emit or _discard,
+            capture=self.capture,
+            locate_rois=lambda frame: self.rois,
+            strategy=strategy,
+            plant_model=plant_model,
+            actuator=self.actuator,
+            sleep=self.clock.sleep,
+            clock=self.clock.monotonic,
+            **kwargs,
+        )
+
+    # =========================
+    # Legacy scripts (test/single_target_test.py)
+    # =========================
+    @contextmanager
+    def patch_single_target_test(self, module=None):
+        """
+        single_target_test 의 OCR(subprocess) / 모터 / sleep 을 가상 장비로 교체
+
+        single_target_test 는 direction 1 = 증가 규약이므로 뒤집어서 전달한다.
+        """
+        if module is None:
+            import test.single_target_test as module
+
+        saved = {name: getattr(module, name) for name in ("read_ocr_volume", "move_motor", "time")}
+        module.read_ocr_volume = lambda camera_index=0, rotate=1: self.read_volume()
+        module.move_motor = lambda direction, duty, duration_ms: self.move_motor(
+            1 - int(direction), duty, duration_ms
+        )
+        module.time = self.clock
+        try:
+            yield module
+        finally:
+            for name, value in saved.items():
+                setattr(module, name, value)
+
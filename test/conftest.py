@@ -0,0 +1,9 @@
+import pytest
+
+import worker.ocr
+
+
+@pytest.fixture(autouse=True)
+def no_debug_crops(monkeypatch):
+    """OCR_DEBUG_CROPS=1 환경에서도 테스트는 /tmp에 crop을 쓰지 않음"""
+    monkeypatch.setattr(worker.ocr, "SAVE_DEBUG_CROPS", False)
@@ -0,0 +1,64 @@
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from worker.camera import CameraStream, ImageSequenceSource, capture_one_frame, close_camera_streams
+
+
+@pytest.fixture
+def frame_dir(tmp_path):
+    for i in range(3):
+        img = np.full((80, 128, 3), i * 50, dtype=np.uint8)
+        cv2.imwrite(str(tmp_path / f"{i:04d}.png"), img)
+    return str(tmp_path)
+
+
+def test_image_sequence_reads_into_given_buffer(frame_dir):
+    src = ImageSequenceSource(frame_dir, fps=None)
+    buf = np.zeros((80, 128, 3), dtype=np.uint8)
+
+    ok, img = src.read(buf)
+    assert ok and img is buf
+    assert int(buf[0, 0, 0]) == 0
+
+    ok, img = src.read(buf)
+    assert ok and int(img[0, 0, 0]) == 50
+
+
+def test_stream_latest_and_wait_newer_than(frame_dir):
+    with CameraStream(frame_dir, warmup_frames=0, fps=200) as stream:
+        first = stream.wait_newer_than(0.0)
+        newer = stream.wait_newer_than(first.timestamp)
+
+        assert newer.timestamp > first.timestamp
+        assert newer.seq > first.seq
+        assert newer.image.shape == (80, 128, 3)
+
+        latest = stream.latest()
+        assert latest is not None and latest.seq >= newer.seq
+
+
+def test_stream_reuses_ring_buffers(frame_dir):
+    with CameraStream(frame_dir, n_buffers=3, warmup_frames=0, fps=500) as stream:
+        ring_ids = [id(b) for b in stream._ring]
+        ts = stream.wait_newer_than(0.0).timestamp
+        for _ in range(10):
+            ts = stream.wait_newer_than(ts).timestamp
+        assert [id(b) for b in stream._ring] == ring_ids
+
+
+def test_capture_one_frame_from_directory(frame_dir):
+    try:
+        t0 = time.monotonic()
+        frame = capture_one_frame(frame_dir, warmup_frames=2)
+        assert frame.shape == (80, 128, 3)
+        assert time.monotonic() - t0 < 2.0
+    finally:
+        close_camera_streams()
+
+
+def test_open_failure_raises(tmp_path):
+    with pytest.raises(RuntimeError):
+        CameraStream(str(tmp_path)).start()
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from worker.calibration import Pulse, load_calibration
+from worker.control_strategy import CalibratedStrategy, LadderStrategy, create_strategy
+from worker.plant_model import PlantModel
+
+PULSES = [
+    Pulse(duty=55, duration_ms=740, delta_ul=100),
+    Pulse(duty=40, duration_ms=400, delta_ul=55),
+    Pulse(duty=25, duration_ms=80, delta_ul=5),
+]
+
+
+def test_ladder_matches_legacy_table():
+    ladder = LadderStrategy()
+    assert ladder.plan(-350) == [(1, 60, 300, None)]
+    assert ladder.plan(150) == [(0, 45, 250, None)]
+    assert ladder.plan(-30) == [(1, 35, 200, None)]
+    assert ladder.plan(2) == [(0, 25, 150, None)]
+
+
+def test_calibrated_composes_pulses_without_overshoot():
+    moves = CalibratedStrategy(PULSES).plan(265)
+
+    assert [m.expected_ul for m in moves] == [100, 100, 55, 5, 5]
+    assert all(m.direction == 0 for m in moves)
+    assert sum(m.expected_ul for m in moves) <= 265
+
+
+def test_calibrated_small_error_and_pulse_cap():
+    strategy = CalibratedStrategy(PULSES, max_pulses=3)
+
+    small = strategy.plan(-2)
+    assert len(small) == 1 and small[0].direction == 1 and small[0].expected_ul == 5
+
+    assert len(strategy.plan(1000)) == 3
+
+
+def test_load_calibration_sorts_and_validates(tmp_path):
+    path = tmp_path / "calibration.json"
+    path.write_text(json.dumps({
+        "5": {"duty": 25, "duration_ms": 80, "delta_ul": 5},
+        "100": {"duty": 55, "duration_ms": 740, "delta_ul": 100},
+    }))
+    assert [p.delta_ul for p in load_calibration(str(path))] == [100, 5]
+
+    strategy = create_strategy("calibrated", calib_path=str(path))
+    assert strategy.name == "calibrated"
+
+    path.write_text(json.dumps({"5": {"duty": 25}}))
+    with pytest.raises(RuntimeError):
+        load_calibration(str(path))
+
+
+def test_default_is_adaptive_without_calibration(tmp_path):
+    missing = str(tmp_path / "missing.json")
+    strategy = create_strategy(calib_path=missing, plant_model=PlantModel())
+    assert strategy.name == "adaptive"
+
+
+def test_calibrated_default_falls_back_to_ladder(tmp_path, monkeypatch):
+    import worker.control_strategy as control_strategy
+
+    monkeypatch.setattr(control_strategy, "CONTROL_STRATEGY", "calibrated")
+    path = tmp_path / "calibration.json"
+    path.write_text(json.dumps({"100": {"duty": 55, "duration_ms": 740, "delta_ul": 100}}))
+    assert create_strategy(calib_path=str(path)).name == "calibrated"
+
+    missing = str(tmp_path / "missing.json")
+    assert create_strategy(calib_path=missing).name == "ladder"
+    with pytest.raises(FileNotFoundError):
+        create_strategy("calibrated", calib_path=missing)
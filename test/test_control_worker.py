@@ -0,0 +1,205 @@
+import threading
+
+import numpy as np
+import pytest
+
+import worker.control_worker as control_worker
+import worker.ocr
+from worker.control_strategy import LadderStrategy
+from worker.ocr import VOLUME_WEIGHTS
+
+ROIS = [[0, i * 10, 8, 8] for i in range(4)]
+
+
+class FakePlant:
+    """VolumeDCActuator 대역: duty*ms 에 비례해 분주량 변화 (dir 0 = 증가)"""
+
+    def __init__(self, volume: int, ul_per_ms: float = 0.1):
+        self.volume = volume
+        self.ul_per_ms = ul_per_ms
+        self.pulses = []
+
+    def pulse(self, direction, duty, duration_ms, stop_event=None):
+        self.pulses.append((direction, duty, duration_ms))
+        delta = int(round(self.ul_per_ms * duration_ms))
+        self.volume += delta if direction == 0 else -delta
+
+
+class FakeBackend:
+    """현재 plant 분주량을 자릿수 logits로 돌려주는 OCR backend"""
+
+    name = "fake"
+
+    def __init__(self, plant: FakePlant):
+        self.plant = plant
+
+    def infer(self, batch):
+        digits = [(self.plant.volume // w) % 10 for w in VOLUME_WEIGHTS]
+        logits = np.full((len(digits), 10), -10.0, dtype=np.float32)
+        logits[np.arange(len(digits)), digits] = 10.0
+        cls = logits.argmax(axis=1).tolist()
+        return cls, [1.0] * len(cls), logits
+
+
+@pytest.fixture(autouse=True)
+def no_settle(monkeypatch):
+    monkeypatch.setattr(control_worker, "SETTLE_TIME", 0.0)
+
+
+def _run(plant, **kwargs):
+    events = []
+    result = control_worker.run_to_target(
+        target=kwargs.pop("target"),
+        ocr_backend=FakeBackend(plant),
+        emit=events.append,
+        capture=lambda: np.zeros((40, 8, 3), dtype=np.uint8),
+        locate_rois=lambda frame: ROIS,
+        strategy=kwargs.pop("strategy", LadderStrategy()),
+        actuator=plant,
+        **kwargs,
+    )
+    return result, events
+
+
+def test_direct_mode_executes_pulses_and_marks_events():
+    plant = FakePlant(volume=1000)
+    result, events = _run(plant, target=1100)
+
+    assert result["success"] and abs(result["final_ul"] - 1100) <= control_worker.VOLUME_TOLERANCE
+    volume_events = [e for e in events if e["cmd"] == "volume"]
+    assert len(volume_events) == len(plant.pulses) > 0
+    assert all(e["executed"] for e in volume_events)
+    assert events[-1]["cmd"] == "done"
+
+    steps = result["steps"]
+    assert len(steps) == result["iterations"]
+    assert sum(s["pulses"] for s in steps) == len(plant.pulses)
+    assert steps[-1]["direction"] is None and steps[0]["direction"] == 0
+
+
+def test_direct_mode_cancel_before_first_step():
+    plant = FakePlant(volume=1000)
+    stop = threading.Event()
+    stop.set()
+
+    result, events = _run(plant, target=1100, stop_event=stop)
+
+    assert result["reason"] == "cancelled"
+    assert plant.pulses == []
+    assert events == [{"cmd": "warn", "status": "cancelled"}]
+
+
+class FlakyBackend(FakeBackend):
+    """
+    처음 uncertain번 호출은 일의 자리가 굴러가는 중 (2순위 = digit + alt),
+    재판독 배치 (불확실한 ROI만) 는 뒤쪽 자리
+    """
+
+    def __init__(self, plant: FakePlant, uncertain: int, alt: int = 5):
+        super().__init__(plant)
+        self.uncertain = uncertain
+        self.alt = alt
+        self.batches = []
+
+    def infer(self, batch):
+        self.batches.append(len(batch))
+        cls, conf, prob = super().infer(batch)
+        n = len(batch)
+        cls, conf, prob = cls[-n:], conf[-n:], prob[-n:].copy()
+        if self.uncertain > 0:
+            self.uncertain -= 1
+            conf[-1] = 0.4
+            prob[-1] = 0.0
+            prob[-1, cls[-1]] = 0.4
+            prob[-1, (cls[-1] + self.alt) % 10] = 0.3
+        return cls, conf, prob
+
+
+def _run_flaky(plant, backend, target, stats=None):
+    events = []
+    result = control_worker.run_to_target(
+        target=target,
+        ocr_backend=backend,
+        emit=events.append,
+        capture=lambda: np.zeros((40, 8, 3), dtype=np.uint8),
+        locate_rois=lambda frame: ROIS,
+        strategy=LadderStrategy(),
+        actuator=plant,
+        sleep=lambda s: None,
+        ocr_stats=stats,
+    )
+    return result, [e for e in events if e.get("status") == "ocr_uncertain"]
+
+
+def test_uncertain_digit_is_reread_and_held_near_target():
+    plant = FakePlant(volume=1000, ul_per_ms=0.02)
+    backend = FlakyBackend(plant, uncertain=4)
+    stats = worker.ocr.OcrStats()
+    result, warns = _run_flaky(plant, backend, target=1003, stats=stats)
+
+    assert result["success"]
+    # step 0: 판독 + 재판독 2번 모두 불확실 (±5uL ≥ 오차 3) → 펄스 없음
+    s0, s1 = result["steps"][:2]
+    assert not s0["ocr_valid"] and s0["pulses"] == 0 and s0["rereads"] == 2
+    assert s1["ocr_valid"] and s1["rereads"] == 1 and s1["pulses"] > 0
+    assert [(w["uncertainty_ul"], w["hold"]) for w in warns] == [(5, True)]
+    # 재판독은 불확실한 ROI 1개만
+    assert backend.batches[:5] == [4, 1, 1, 4, 1]
+
+    ocr = result["ocr"]
+    assert ocr["low_conf"] == 2 and ocr["rereads"] == 3 and ocr["reread_rois"] == 3
+    assert ocr["unresolved"] == 1 and ocr["readings"] == result["iterations"]
+    assert stats.as_dict() == ocr
+
+
+def test_uncertain_digit_acts_when_direction_is_certain_or_holds_run_out():
+    # 오차 100 ≫ 불확실 범위 3 → 계속 불확실해도 움직여서 도달
+    plant = FakePlant(volume=1000)
+    result, warns = _run_flaky(plant, FlakyBackend(plant, uncertain=10 ** 6, alt=3), target=1100)
+    assert result["success"]
+    assert not warns[0]["hold"] and result["steps"][0]["pulses"] > 0
+
+    # 반쯤 굴러간 채 멈춘 다이얼: OCR_MAX_HOLDS 번 기다린 뒤 최선의 판독으로 진행
+    plant = FakePlant(volume=1000, ul_per_ms=0.02)
+    result, warns = _run_flaky(plant, FlakyBackend(plant, uncertain=10 ** 6), target=1003)
+    assert [w["hold"] for w in warns[:3]] == [True] * control_worker.OCR_MAX_HOLDS + [False]
+    assert result["steps"][control_worker.OCR_MAX_HOLDS]["pulses"] > 0
+
+
+class ScriptedStrategy:
+    """정해진 펄스 묶음을 순서대로 (plan 시점의 plant model 직전 방향 기록)"""
+
+    name = "scripted"
+
+    def __init__(self, model, plans):
+        self.model = model
+        self.plans = list(plans)
+        self.seen_directions = []
+
+    def plan(self, err):
+        self.seen_directions.append(self.model.last_direction)
+        return self.plans.pop(0)
+
+
+def test_reversal_after_skipped_model_update_uses_last_executed_direction():
+    from worker.control_strategy import Move
+    from worker.plant_model import PlantModel
+
+    plant = FakePlant(volume=1000)
+    model = PlantModel()
+    model.theta[1][-1] = 5.0   # CCW backlash 5 uL
+    # step 1: 방향이 섞인 펄스 → 다음 판독은 model 갱신 없음 (마지막 실행 방향은 CW)
+    # step 2: CCW로 반전
+    strategy = ScriptedStrategy(model, [
+        [Move(1, 55, 100), Move(0, 55, 300)],
+        [Move(1, 55, 100)],
+    ])
+    result, events = _run(plant, target=1010, strategy=strategy, plant_model=model)
+
+    assert result["success"] and plant.volume == 1010
+    assert strategy.seen_directions == [None, 0]
+    # 반전 step 갱신에 backlash feature가 들어감 (직전 CW 기준)
+    (update,) = [e for e in events if e["cmd"] == "model"]
+    assert update["step"] == 2 and model.updates[1] == 1
+    # CCW 100 ms × prior 0.1 uL/ms - backlash 5
+    assert update["predicted_ul"] == pytest.approx(5.0) and model.last_direction == 1
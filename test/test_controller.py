@@ -0,0 +1,196 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import gui.controller as controller_mod
+
+
+class FakeSerial:
+    def __init__(self, port):
+        self.port = port
+        self.connected = False
+        self.log = []
+
+    def connect(self, exclusive=False):
+        self.connected = True
+        self.log.append("connect")
+        return True
+
+    def close(self):
+        self.connected = False
+        self.log.append("close")
+
+
+class FakeLinear:
+    def __init__(self, serial, actuator_id):
+        self.serial = serial
+
+    def initialize(self, **kwargs):
+        pass
+
+
+class FakeVolumeDC:
+    def __init__(self, serial, actuator_id):
+        self.serial = serial
+        self.calls = []
+
+    def run(self, direction, duty):
+        self.calls.append(("run", direction, duty))
+
+    def stop(self):
+        self.calls.append(("stop",))
+
+    def pulse(self, direction, duty, duration_ms, stop_event=None):
+        self.calls.append(("pulse", direction, duty, duration_ms, threading.current_thread().name))
+        stop_event.wait(duration_ms / 1000.0)
+
+
+@pytest.fixture
+def fake_hardware(monkeypatch):
+    monkeypatch.setattr(controller_mod, "SerialController", FakeSerial)
+    monkeypatch.setattr(controller_mod, "LinearActuator", FakeLinear)
+    monkeypatch.setattr(controller_mod, "VolumeDCActuator", FakeVolumeDC)
+
+
+@pytest.fixture
+def controller(fake_hardware):
+    ctrl = controller_mod.Controller(direct_motor=False)
+    states = []
+    ctrl.run_state_updated.connect(states.append)
+    ctrl.run_state["running"] = True
+    ctrl.run_state["status"] = "Running"
+    yield ctrl, states
+    ctrl.close()
+
+
+def test_ocr_progress_events_do_not_end_the_run(controller):
+    ctrl, states = controller
+    ctrl._on_run_event({"cmd": "ocr", "status": "ocr_uncertain", "step": 2, "hold": True})
+    ctrl._on_run_event({"cmd": "warn", "status": "something_new", "step": 3})
+
+    assert ctrl.run_state["running"] and ctrl.run_state["status"] == "Running"
+    assert states == []
+
+
+@pytest.mark.parametrize("status, shown", [("max_iter", "Max iteration reached"), ("cancelled", "Cancelled")])
+def test_terminal_warnings_end_the_run(controller, status, shown):
+    ctrl, states = controller
+    ctrl._on_run_event({"cmd": "warn", "status": status})
+
+    assert not ctrl.run_state["running"] and ctrl.run_state["status"] == shown
+    assert states[-1]["status"] == shown
+
+
+def pulse_event(step, duration_ms):
+    return {"cmd": "volume", "step": step, "direction": 1, "duty": 60, "duration_ms": duration_ms}
+
+
+def test_pulses_run_on_motor_thread_not_reader_thread(controller):
+    ctrl, states = controller
+    t0 = time.perf_counter()
+    ctrl._on_run_event(pulse_event(1, 200))
+    ctrl._on_run_event(pulse_event(2, 100))
+    # reader thread는 펄스를 기다리지 않는다
+    assert time.perf_counter() - t0 < 0.1
+    assert [s["step"] for s in states] == [1, 2]
+
+    ctrl._motor_queue.join()
+    pulses = [c for c in ctrl.volume_dc.calls if c[0] == "pulse"]
+    assert [c[3] for c in pulses] == [200, 100]
+    assert {c[4] for c in pulses} == {ctrl._motor_thread.name}
+
+
+def test_stop_drops_queued_pulses(controller):
+    ctrl, _ = controller
+    for step in range(1, 4):
+        ctrl._on_run_event(pulse_event(step, 2000))
+    while not any(c[0] == "pulse" for c in ctrl.volume_dc.calls):
+        time.sleep(0.01)
+
+    t0 = time.perf_counter()
+    ctrl.stop_run_to_target()
+    ctrl._motor_queue.join()
+    # 실행 중이던 펄스는 끊기고 남은 2개는 실행되지 않음
+    assert time.perf_counter() - t0 < 1.0
+    assert [c[0] for c in ctrl.volume_dc.calls].count("pulse") == 1
+
+    # 다음 run의 펄스는 정상 실행
+    ctrl._on_run_event(pulse_event(1, 10))
+    ctrl._motor_queue.join()
+    assert [c[0] for c in ctrl.volume_dc.calls].count("pulse") == 2
+
+
+class SlowCancelWorker:
+    """run-target은 cancel까지 대기, cancel 뒤에도 잠시 걸려 끝남 (worker가 포트를 닫는 시간)"""
+
+    def __init__(self, serial):
+        self.serial = serial
+        self.started = []
+        self._cancel = threading.Event()
+
+    def request(self, cmd, timeout=None, on_event=None, **params):
+        self.serial.log.append(f"run {params['target']}")
+        self.started.append(params["target"])
+        self._cancel.wait(5)
+        self._cancel = threading.Event()
+        time.sleep(0.1)
+        on_event({"cmd": "warn", "status": "cancelled"})
+        self.serial.log.append(f"end {params['target']}")
+        return controller_mod.WorkerResult(True, {"status": "cancelled"}, "")
+
+    def cancel(self):
+        self._cancel.set()
+
+    def close(self):
+        self._cancel.set()
+
+
+def test_new_run_waits_for_previous_run_to_return_the_port(fake_hardware):
+    ctrl = controller_mod.Controller(direct_motor=True)
+    ctrl.worker = worker = SlowCancelWorker(ctrl.serial)
+    ctrl.start_run_to_target(1500)
+    while not worker.started:
+        time.sleep(0.01)
+    first = ctrl._run_thread
+
+    # 이전 run이 아직 끝나는 중에 새 run 시작
+    ctrl.start_run_to_target(1600)
+    second = ctrl._run_thread
+    first.join(2)
+    while len(worker.started) < 2:
+        time.sleep(0.01)
+
+    # 새 run 동안 포트는 worker 소유 (이전 run이 다시 잡지 않음)
+    assert not ctrl.serial.connected
+    assert ctrl.serial.log[-6:] == ["close", "run 1500", "end 1500", "connect", "close", "run 1600"]
+    # 이전 run의 늦은 cancelled 이벤트는 새 run 상태를 덮지 않음
+    assert ctrl.run_state["running"] and ctrl.run_state["status"] == "Running"
+
+    ctrl.stop_run_to_target()
+    second.join(2)
+    assert ctrl.serial.connected and ctrl.run_state["status"] == "Stopped"
+    ctrl.close()
+
+
+def test_run_replaced_while_waiting_never_starts(fake_hardware):
+    ctrl = controller_mod.Controller(direct_motor=True)
+    ctrl.worker = worker = SlowCancelWorker(ctrl.serial)
+    ctrl.start_run_to_target(1500)
+    while not worker.started:
+        time.sleep(0.01)
+    threads = [ctrl._run_thread]
+    for target in (1600, 1700):
+        ctrl.start_run_to_target(target)
+        threads.append(ctrl._run_thread)
+    threads[0].join(2)
+    threads[1].join(2)
+    while len(worker.started) < 2:
+        time.sleep(0.01)
+
+    assert worker.started == [1500, 1700]
+    ctrl.stop_run_to_target()
+    threads[2].join(2)
+    ctrl.close()
@@ -0,0 +1,160 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import worker.control_worker as control_worker
+from sim import SimRig
+from sim.batch import fresh_plant_model
+from test.test_control_worker import ROIS, FakeBackend, FakePlant
+from worker.control_strategy import LadderStrategy, Move, create_strategy
+from worker.estimator import VolumeEstimator
+from worker.plant_model import PlantModel
+
+
+@pytest.fixture(autouse=True)
+def no_settle(monkeypatch):
+    monkeypatch.setattr(control_worker, "SETTLE_TIME", 0.0)
+
+
+def reading(volume: int, uncertainty_ul: int = 0):
+    return SimpleNamespace(volume=volume, uncertainty_ul=uncertainty_ul)
+
+
+def test_outlier_is_rejected_then_model_is_reset():
+    est = VolumeEstimator()
+    assert est.update(reading(1000)) == "init"
+
+    est.predict([Move(0, 55, 500, expected_ul=50.0)])
+    assert est.volume == pytest.approx(1050.0)
+    assert est.update(reading(1048)) == "accepted"
+    assert 1048 < est.volume < 1050 and est.std < est.pulse_abs_std
+
+    # 한 자리 오독: 추정치 유지
+    v = est.volume
+    assert est.update(reading(1148)) == "rejected"
+    assert est.volume == v
+    # 연속으로 어긋나면 판독 쪽을 믿고 다시 시작
+    assert est.update(reading(1150)) == "reset"
+    assert est.volume == 1150 and est.stats() == {"updates": 1, "rejected": 1, "resets": 1, "skipped": 0}
+
+
+def test_interrupted_pulse_counts_half_with_wide_uncertainty():
+    est = VolumeEstimator()
+    est.update(reading(1000))
+    var = est.var
+    est.predict([Move(0, 55, 200, expected_ul=20.0)], interrupted=Move(0, 55, 600, expected_ul=60.0))
+    assert est.volume == pytest.approx(1050.0)
+    assert est.var - var > 60.0 ** 2 / 12
+
+    # 첫 펄스부터 끊김: 끝난 펄스 없이도 반영
+    est = VolumeEstimator()
+    est.update(reading(1000))
+    est.predict([], interrupted=Move(1, 55, 600, expected_ul=60.0))
+    assert est.volume == pytest.approx(970.0)
+
+
+def test_uncertain_reading_gets_less_weight():
+    est = VolumeEstimator(gate=100.0)
+    est.update(reading(1000))
+    est.predict([Move(0, 55, 100, expected_ul=10.0)])
+    sharp, blurry = VolumeEstimator(gate=100.0), VolumeEstimator(gate=100.0)
+    for e in (sharp, blurry):
+        e.volume, e.var = est.volume, est.var
+    sharp.update(reading(1016))
+    blurry.update(reading(1016, uncertainty_ul=10))
+    assert 1010 < blurry.volume < sharp.volume < 1016
+
+
+def test_skip_only_far_from_target_and_limited_blind_steps():
+    est = VolumeEstimator(plant_model=PlantModel())
+    assert not est.can_skip(2000, 1)            # 판독 전
+    est.update(reading(1000))
+    assert est.can_skip(2000, 1)
+    assert not est.can_skip(1003, 1)            # 목표 근처는 항상 판독
+
+    for _ in range(est.max_blind_steps):
+        est.skip()
+        est.predict([Move(0, 55, 740)])
+    assert not est.can_skip(5000, 1)
+    assert est.update(reading(int(round(est.volume)))) == "accepted"
+    assert est.can_skip(5000, 1)
+
+    # 예측 수단이 없는 펄스 (ladder, plant model 없음) 뒤에는 판독으로 다시 시작
+    est = VolumeEstimator()
+    est.update(reading(1000))
+    est.predict([Move(0, 55, 740)])
+    assert not est.can_skip(5000, 1)
+    assert est.update(reading(1300)) == "init"
+
+
+class MisreadBackend(FakeBackend):
+    """misread번째 호출만 백의 자리를 +3으로 잘못 읽는다 (확신 있는 오독)"""
+
+    def __init__(self, plant: FakePlant, misread: int):
+        super().__init__(plant)
+        self.misread = misread
+        self.batches = []
+
+    def infer(self, batch):
+        self.batches.append(len(batch))
+        cls, conf, logits = super().infer(batch)
+        if len(self.batches) == self.misread:
+            logits = logits.copy()
+            logits[1] = np.roll(logits[1], 3)
+            cls = logits.argmax(axis=1).tolist()
+        return cls, conf, logits
+
+
+def test_run_to_target_ignores_misread_without_recapture():
+    plant = FakePlant(volume=1000)
+    backend = MisreadBackend(plant, misread=2)
+    plant_model = PlantModel()
+    events = []
+    result = control_worker.run_to_target(
+        target=1100,
+        ocr_backend=backend,
+        emit=events.append,
+        capture=lambda: np.zeros((40, 8, 3), dtype=np.uint8),
+        locate_rois=lambda frame: ROIS,
+        strategy=LadderStrategy(),
+        plant_model=plant_model,
+        actuator=plant,
+        sleep=lambda s: None,
+        estimator=VolumeEstimator(plant_model),
+    )
+
+    assert result["success"] and abs(plant.volume - 1100) <= control_worker.VOLUME_TOLERANCE
+    rejected = [s for s in result["steps"] if s["estimate_status"] == "rejected"]
+    assert len(rejected) == 1 and rejected[0]["rereads"] == 0
+    (warn,) = [e for e in events if e.get("status") == "ocr_outlier"]
+    assert warn["ocr_ul"] - warn["estimate_ul"] == pytest.approx(300, abs=5)
+    # 오독은 plant model 학습에도 쓰이지 않는다
+    assert plant_model.rejected == 0
+    # 재판독 없음: 판독한 step마다 4 ROI 배치 1번
+    measured = [s for s in result["steps"] if s["measured"]]
+    assert backend.batches == [4] * len(measured)
+    assert result["estimator"]["rejected"] == 1
+
+
+def test_sim_estimator_needs_fewer_captures():
+    targets = [2100, 1700, 2300, 2000]
+
+    def run(with_estimator: bool):
+        rig = SimRig(seed=1, volume=1500)
+        plant_model = fresh_plant_model()
+        strategy = create_strategy("ladder", plant_model=plant_model)
+        captures, reached = 0, []
+        for target in targets:
+            est = VolumeEstimator(plant_model) if with_estimator else None
+            res = rig.run_to_target(
+                target, strategy=strategy, plant_model=plant_model, settle=rig.settle_detector(), estimator=est
+            )
+            captures += sum(s["measured"] for s in res["steps"]) + res["ocr"]["rereads"]
+            reached.append(res["success"] and abs(rig.true_volume - target) <= 2)
+        return captures, reached
+
+    raw, raw_reached = run(False)
+    fused, fused_reached = run(True)
+    assert all(raw_reached) and all(fused_reached)
+    assert fused < 0.75 * raw
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from sim.firmware import FirmwareEmulator, LinkFaults
+from worker.actuator_linear import LinearActuator
+from worker.actuator_volume_dc import VolumeDCActuator
+from worker.make_packet import MakePacket
+from worker.serial_controller import SerialController
+
+
+def _connect(fw):
+    ctrl = SerialController(port=fw.port)
+    ctrl.tx_debug = ctrl.rx_debug = False
+    ctrl.polling_enabled = False
+    ctrl.connect()
+    return ctrl
+
+
+@pytest.fixture
+def rig():
+    with FirmwareEmulator(max_rate=10000.0) as fw:
+        ctrl = _connect(fw)
+        yield ctrl, fw
+        ctrl.close()
+
+
+def test_initialize_and_move_reports_feedback_position(rig):
+    ctrl, fw = rig
+    actuator = LinearActuator(ctrl, 0x0A)
+    assert actuator.initialize(speed=1023, current=300, position=0)
+
+    t0 = time.perf_counter()
+    assert actuator.move_to(2000, timeout=2.0)
+    elapsed = time.perf_counter() - t0
+
+    assert 0.15 <= elapsed < 0.6  # 2000 / 10000 unit/s
+    assert ctrl.send(MakePacket.get_feedback(0x0A)).result(0.5).position == 2000
+    assert fw.axes[0x0B].position == 0
+
+
+def test_dc_pulse_turns_dial_and_stops(rig):
+    ctrl, fw = rig
+    v0 = fw.volume
+    VolumeDCActuator(ctrl, fw.volume_dc_id).pulse(direction=0, duty=80, duration_ms=100)
+
+    time.sleep(0.3)
+    assert not fw.dial_moving
+    assert fw.volume != v0
+    assert fw.counters["commands"] == 2
+
+
+def test_corrupted_replies_are_dropped_by_parser():
+    with FirmwareEmulator(faults=LinkFaults(corrupt=0.05), seed=3) as fw:
+        fw.axes[0x0A].set_target(1234)
+        time.sleep(0.2)
+        ctrl = _connect(fw)
+        try:
+            positions = []
+            for _ in range(100):
+                fut = ctrl.send(MakePacket.get_feedback(0x0A))
+                try:
+                    positions.append(fut.result(0.1).position)
+                except Exception:
+                    fut.cancel()
+        finally:
+            ctrl.close()
+
+    assert fw.counters["bytes_corrupted"] > 0
+    assert ctrl.rx_parser.errors > 0
+    assert positions and set(positions) == {1234}
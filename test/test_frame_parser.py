@@ -0,0 +1,68 @@
+import random
+
+from worker.frame_parser import FeedbackFrame, FrameParser, StatusFrame, decode
+from worker.make_packet import MakePacket
+
+
+def _random_frame(rng):
+    cmd = rng.choice([0x11, 0x07, 0x01, 0xA1])
+    return MakePacket._base_packet(rng.randrange(256), cmd, [rng.randrange(256) for _ in range(6)])
+
+
+def _feed_chunked(parser, stream, rng):
+    out, i = [], 0
+    while i < len(stream):
+        n = rng.randint(1, 40)
+        out += parser.feed(stream[i:i + n])
+        i += n
+    return out
+
+
+def test_typed_records_and_etx_inside_payload():
+    status = MakePacket._base_packet(0x0B, 0x11, [0, 0, 0, 1])
+    assert status[11] == MakePacket.ENDOFBYTE  # checksum이 ETX와 같은 값
+
+    feedback = MakePacket._base_packet(0x0A, MakePacket.MIGHTYZAP_GetFeedbackData, [0x34, 0x12])
+    recs = FrameParser().feed(status + feedback)
+
+    assert recs == [StatusFrame(0x0B, 1, status), FeedbackFrame(0x0A, 0x1234, feedback)]
+    assert decode(MakePacket.set_position(0x0A, 5)).cmd == MakePacket.MIGHTYZAP_SetPosition
+
+
+def test_fuzz_garbage_and_random_chunking():
+    rng = random.Random(0)
+    frames, stream = [], bytearray()
+    for _ in range(2000):
+        if rng.random() < 0.3:
+            # header 첫 byte(EA)와 가짜 header 일부를 섞은 잡음
+            noise = bytes(rng.choice([0xEA, 0xEB, 0xED, rng.randrange(256)]) for _ in range(rng.randint(1, 20)))
+            stream += noise.replace(b"\xea\xeb", b"\xea")
+        f = _random_frame(rng)
+        frames.append(f)
+        stream += f
+
+    parser = FrameParser()
+    out = _feed_chunked(parser, bytes(stream), rng)
+
+    assert [r.raw for r in out] == frames
+    assert parser.frames == len(frames)
+
+
+def test_fuzz_corrupted_frames_are_counted_not_emitted():
+    rng = random.Random(1)
+    good, stream, corrupted = [], bytearray(), 0
+    for _ in range(1000):
+        f = bytearray(_random_frame(rng))
+        if rng.random() < 0.2:
+            f[rng.randrange(3, 13)] ^= 1 << rng.randrange(8)
+            corrupted += 1
+        else:
+            good.append(bytes(f))
+        stream += f
+
+    parser = FrameParser()
+    out = _feed_chunked(parser, bytes(stream), rng)
+
+    assert [r.raw for r in out] == good
+    assert parser.errors >= corrupted
+    assert parser.stats()["buffered"] < 13
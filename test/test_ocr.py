@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from worker.ocr import OcrStats, read_volume, read_volume_confident
+from worker.ocr_preprocess import NORM_MEAN, NORM_STD
+
+ROIS = [[0, i * 10, 8, 8] for i in range(4)]
+
+
+class CodeBackend:
+    """
+    ROI 밝기 v = 10 * (conf * 20) + digit 을 그대로 판독 (호출별 batch 크기 기록).
+    나머지 확률은 digit + 5 (굴러가는 중이 아니라 가려짐 / 반사처럼 counter 규칙으로 못 푸는 경우)
+    """
+
+    name = "code"
+
+    def __init__(self):
+        self.calls = []
+
+    def infer(self, batch):
+        self.calls.append(len(batch))
+        r = batch[:, 0].mean(axis=(1, 2)) * NORM_STD[0] + NORM_MEAN[0]
+        v = np.rint(r * 255).astype(int)
+        cls = (v % 10).tolist()
+        conf = ((v // 10) / 20.0).tolist()
+        prob = np.zeros((len(cls), 10), dtype=np.float32)
+        prob[np.arange(len(cls)), cls] = conf
+        prob[np.arange(len(cls)), (np.array(cls) + 5) % 10] += 1.0 - np.array(conf)
+        return cls, conf, prob
+
+
+def frame(digits, conf=(1.0, 1.0, 1.0, 1.0)):
+    img = np.zeros((40, 8, 3), dtype=np.uint8)
+    for (x, y, w, h), d, c in zip(ROIS, digits, conf):
+        img[y:y + h, x:x + w] = 10 * int(round(c * 20)) + d
+    return img
+
+
+def test_reading_keeps_digit_probabilities():
+    r = read_volume(frame([2, 6, 1, 9], conf=(1.0, 0.95, 1.0, 0.6)), CodeBackend(), rois=ROIS, min_conf=0.8)
+    assert r.volume == 2619 and r.digits == [2, 6, 1, 9]
+    assert r.conf == pytest.approx([1.0, 0.95, 1.0, 0.6])
+    assert r.prob.shape == (4, 10) and r.prob[3, 9] == pytest.approx(0.6)
+    # 일의 자리 9 / 4 → counter 규칙으로 못 모음
+    assert r.low == [3] and r.in_transition and not r.valid
+    assert r.uncertainty_ul == 5
+
+
+def test_only_low_confidence_rois_are_reread():
+    backend = CodeBackend()
+    frames = iter([
+        frame([2, 6, 1, 0], conf=(0.3, 1.0, 1.0, 0.4)),  # 일의 자리 더 불확실 → 유지
+        frame([2, 6, 2, 0], conf=(1.0, 1.0, 1.0, 1.0)),
+    ])
+    stats = OcrStats()
+    r = read_volume_confident(
+        frame([2, 6, 1, 9], conf=(1.0, 1.0, 1.0, 0.5)), backend, ROIS,
+        recapture=lambda: next(frames), stats=stats, min_conf=0.8, wait=lambda s: None,
+    )
+    # 두 번째 재판독에서 해결, 확실했던 십의 자리는 다시 읽지 않음
+    assert r.valid and r.volume == 2610
+    assert backend.calls == [4, 1, 1]
+    assert stats.as_dict() == {
+        "readings": 1, "low_conf": 1, "rereads": 2, "reread_rois": 2,
+        "reread_s": pytest.approx(stats.reread_s, abs=1e-4), "unresolved": 0, "low_conf_rate": 1.0,
+        "roi_lookups": 0, "roi_hits": 0, "roi_saved_s": 0.0, "roi_hit_rate": 0.0,
+    }
+
+
+def test_unresolved_after_max_rereads():
+    stats = OcrStats()
+    low = frame([1, 0, 0, 5], conf=(1.0, 1.0, 0.5, 0.5))
+    r = read_volume_confident(
+        low, CodeBackend(), ROIS, recapture=lambda: low, max_rereads=2, stats=stats,
+        min_conf=0.8, wait=lambda s: None,
+    )
+    assert not r.valid and r.low == [2, 3]
+    assert stats.rereads == 2 and stats.reread_rois == 4 and stats.unresolved == 1
+
+    # recapture 없으면 재판독 없이 그대로
+    r = read_volume_confident(low, CodeBackend(), ROIS, min_conf=0.8)
+    assert not r.valid
@@ -0,0 +1,170 @@
+import hashlib
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from worker.ocr_preprocess import (
+    INPUT_SIZE,
+    NORM_MEAN,
+    NORM_STD,
+    crop_rois,
+    preprocess_crops,
+    preprocess_rois,
+)
+
+# torchvision 파이프라인 (Resize antialias → ToTensor → Normalize) 으로 한 번 생성해 둔 기준 결과
+# - "<h>x<w>": Resize 출력 uint8 (3, 224, 224) RGB — ToTensor / Normalize는 float32 연산이라 아래에서 그대로 재현
+# - "<h>x<w>_sha1": 입력 crop 해시 (생성기가 바뀌면 기준도 다시 만들어야 함)
+# 재생성: python -m test.test_ocr_preprocess  (torch / torchvision 필요)
+REFERENCE_PATH = os.path.join(os.path.dirname(__file__), "data", "ocr_preprocess_ref.npz")
+
+SHAPES = [
+    (116, 116),   # 실제 ROI (확대)
+    (224, 224),   # resize 없음
+    (448, 448),   # 정수배 축소
+    (301, 259),   # 비정수배 축소 (antialias)
+    (90, 500),    # 가로 축소 + 세로 확대
+    (1000, 37),
+    (7, 9),
+]
+
+# 1 LSB (1/255) 차이가 Normalize 후 가질 수 있는 최대 크기
+ATOL = 1.0 / 255.0 / min(NORM_STD) + 1e-6
+
+
+def _crop(rng, h, w):
+    img = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+    # 실제 ROI처럼 저주파 성분 위주로
+    return cv2.GaussianBlur(img, (5, 5), 0)
+
+
+def shape_crop(shape):
+    return _crop(np.random.default_rng(sum(shape)), *shape)
+
+
+def _key(shape):
+    return f"{shape[0]}x{shape[1]}"
+
+
+def _normalize(resized_u8):
+    """torchvision ToTensor + Normalize (float32) 재현"""
+    mean = np.asarray(NORM_MEAN, dtype=np.float32)[:, None, None]
+    std = np.asarray(NORM_STD, dtype=np.float32)[:, None, None]
+    return (resized_u8.astype(np.float32) / np.float32(255.0) - mean) / std
+
+
+@pytest.fixture(scope="module")
+def reference():
+    with np.load(REFERENCE_PATH) as data:
+        refs = {k: data[k] for k in data.files}
+
+    def get(shape, crop):
+        assert hashlib.sha1(crop.tobytes()).hexdigest() == str(refs[_key(shape) + "_sha1"]), \
+            "test crop generator changed: regenerate the reference"
+        return _normalize(refs[_key(shape)])
+
+    return get
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_parity_with_torchvision_reference(reference, shape):
+    crop = shape_crop(shape)
+
+    got = preprocess_crops([crop])[0]
+    ref = reference(shape, crop)
+
+    assert got.dtype == np.float32
+    assert got.shape == (3,) + INPUT_SIZE
+    np.testing.assert_allclose(got, ref, rtol=0, atol=ATOL)
+    assert np.mean(got != ref) < 1e-3
+
+
+def test_batch_of_mixed_sizes_matches_per_crop(reference):
+    shapes = [(116, 116), (301, 259), (90, 500), (116, 116)]
+    crops = [shape_crop(s) for s in shapes]
+
+    got = preprocess_crops(crops)
+    for i, (s, c) in enumerate(zip(shapes, crops)):
+        np.testing.assert_allclose(got[i], reference(s, c), rtol=0, atol=ATOL)
+
+
+def test_writes_into_caller_buffer():
+    rng = np.random.default_rng(1)
+    frame = _crop(rng, 800, 600)
+    rois = [[275, 294 + i * 120, 116, 116] for i in range(4)]
+
+    out = np.zeros((4, 3) + INPUT_SIZE, dtype=np.float32)
+    res = preprocess_rois(frame, rois, out=out)
+
+    assert res is out
+    np.testing.assert_array_equal(out, preprocess_crops(crop_rois(frame, rois)))
+
+
+def test_rejects_wrong_out_buffer():
+    crop = np.zeros((116, 116, 3), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        preprocess_crops([crop], out=np.zeros((2, 3) + INPUT_SIZE, dtype=np.float32))
+
+
+def test_crop_rois_clamps_and_rejects_empty():
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    crops = crop_rois(frame, [[90, 90, 50, 50]])
+    assert crops[0].shape == (10, 10, 3)
+
+    with pytest.raises(RuntimeError):
+        crop_rois(frame, [[10, 10, 0, 5]])
+
+
+def _torchvision_pipeline():
+    from PIL import Image
+    from torchvision import transforms
+
+    resize = transforms.Resize(INPUT_SIZE, antialias=True)
+    normalize = transforms.Compose([
+        transforms.ToTensor(),
+        transforms.Normalize(mean=NORM_MEAN, std=NORM_STD),
+    ])
+
+    def run(crop_bgr):
+        """기존 ocr_trt 파이프라인 (BGR → PIL → torchvision). returns: (Resize 출력 uint8 CHW, 최종 tensor)"""
+        resized = resize(Image.fromarray(cv2.cvtColor(crop_bgr, cv2.COLOR_BGR2RGB)))
+        tensor = normalize(resized).numpy().astype(np.float32)
+        return np.asarray(resized).transpose(2, 0, 1).copy(), tensor
+
+    return run
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_parity_with_live_torchvision(reference, shape):
+    pytest.importorskip("torch")
+    pytest.importorskip("torchvision")
+    pytest.importorskip("PIL")
+
+    crop = shape_crop(shape)
+    resized, ref = _torchvision_pipeline()(crop)
+
+    # 저장된 기준이 설치된 torchvision과 같고, 구현도 그대로 맞는지
+    np.testing.assert_array_equal(_normalize(resized), ref)
+    np.testing.assert_array_equal(reference(shape, crop), ref)
+    np.testing.assert_allclose(preprocess_crops([crop])[0], ref, rtol=0, atol=ATOL)
+
+
+def write_reference(path: str = REFERENCE_PATH):
+    run = _torchvision_pipeline()
+    arrays = {}
+    for shape in SHAPES:
+        crop = shape_crop(shape)
+        resized, tensor = run(crop)
+        assert np.array_equal(_normalize(resized), tensor)
+        arrays[_key(shape)] = resized
+        arrays[_key(shape) + "_sha1"] = np.array(hashlib.sha1(crop.tobytes()).hexdigest())
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.savez_compressed(path, **arrays)
+    print(f"wrote {path} ({len(SHAPES)} crops)")
+
+
+if __name__ == "__main__":
+    write_reference()
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from worker.ocr import softmax_predict
+from worker.ocr_server import BatchingOcrServer, Histogram
+
+
+class EchoBackend:
+    """row i의 첫 값을 class로 돌려주는 backend (호출별 batch 크기 기록, 느린 추론 흉내)"""
+
+    name = "echo"
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+        self._buf = None
+
+    def input_buffer(self, shape):
+        if self._buf is None or self._buf.shape != shape:
+            self._buf = np.empty(shape, dtype=np.float32)
+        return self._buf
+
+    def infer(self, batch):
+        self.calls.append(len(batch))
+        if self.fail:
+            raise RuntimeError("engine error")
+        time.sleep(self.delay)
+        logits = np.full((len(batch), 10), -10.0, dtype=np.float32)
+        logits[np.arange(len(batch)), batch[:, 0, 0, 0].astype(int)] = 10.0
+        return softmax_predict(logits)
+
+
+def _batch(*digits):
+    x = np.zeros((len(digits), 3, 4, 4), dtype=np.float32)
+    x[:, 0, 0, 0] = digits
+    return x
+
+
+def test_concurrent_requests_are_batched_and_scattered():
+    backend = EchoBackend(delay=0.02)
+    with BatchingOcrServer(backend, max_batch=8, max_wait_ms=5.0) as server:
+        results = {}
+        barrier = threading.Barrier(6)
+
+        def caller(i):
+            barrier.wait()
+            digits = [(i + k) % 10 for k in range(4)]
+            cls, conf, prob = server.infer(_batch(*digits))
+            results[i] = (digits, cls, prob.shape)
+
+        threads = [threading.Thread(target=caller, args=(i,)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    for digits, cls, shape in results.values():
+        assert cls == digits and shape == (4, 10)
+
+    # 4행 요청 6개 → max_batch 8 이하 배치, 요청은 나뉘지 않음
+    assert sum(backend.calls) == 24
+    assert max(backend.calls) <= 8 and all(n % 4 == 0 for n in backend.calls)
+    assert len(backend.calls) < 6
+
+    stats = server.stats()
+    assert stats["requests"] == 6 and stats["batches"] == len(backend.calls)
+    assert stats["latency_ms"]["n"] == 6 and stats["batch_rows"]["n"] == stats["batches"]
+    assert stats["batch_requests"]["max"] == 2
+
+
+def test_oversized_request_runs_alone_and_errors_propagate():
+    with BatchingOcrServer(EchoBackend(), max_batch=2, max_wait_ms=0.0) as server:
+        cls, _, _ = server.infer(_batch(1, 2, 3, 4))
+        assert cls == [1, 2, 3, 4]
+
+    with BatchingOcrServer(EchoBackend(fail=True)) as server:
+        with pytest.raises(RuntimeError, match="engine error"):
+            server.infer(_batch(1))
+
+    with pytest.raises(RuntimeError, match="closed"):
+        server.infer(_batch(1))
+
+
+def test_histogram_percentiles():
+    h = Histogram((1, 2, 5, 10))
+    for v in (0.5, 0.5, 1.5, 4, 20):
+        h.add(v)
+    s = h.summary()
+    assert s["n"] == 5 and s["p50"] == 2 and s["max"] == 20
+    assert s["buckets"] == {"<=1": 2, "<=2": 1, "<=5": 1, "<=10": 0, ">10": 1}
+    assert h.percentile(0.99) == 20
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from sim.render import wheel_positions
+from worker.odometer import VOLUME_WEIGHTS, OdometerDecoder, get_decoder, wheel_positions_grid
+
+
+def split_prob(volume: float) -> np.ndarray:
+    """바퀴 위치 → 보이는 비율대로 두 숫자에 나눈 확률 (굴러가는 중인 바퀴를 읽은 분류기)"""
+    prob = np.zeros((4, 10))
+    for i, p in enumerate(wheel_positions(volume)):
+        d, f = int(p) % 10, p - int(p)
+        prob[i, d] += 1.0 - f
+        prob[i, (d + 1) % 10] += f
+    return prob
+
+
+def argmax_volume(prob) -> int:
+    return int(sum(int(row.argmax()) * w for row, w in zip(prob, VOLUME_WEIGHTS)))
+
+
+def test_grid_matches_dial_wheels():
+    xi = np.array([19995, 6995, 26200, 10591])
+    got = wheel_positions_grid(xi, 10) / 10.0
+    for x, row in zip(xi, got):
+        assert row == pytest.approx(wheel_positions(x / 10.0))
+
+
+@pytest.mark.parametrize("volume", [1999.5, 699.5, 509.5, 2999.5, 4099.5])
+def test_half_rolled_carry_decodes_to_neighbour(volume):
+    prob = split_prob(volume)
+    dec = get_decoder().decode(prob)
+
+    # 독립 argmax는 자릿수 하나가 10 / 100 / 1000 만큼 틀림
+    assert abs(argmax_volume(prob) - volume) >= 9
+    assert abs(dec.volume - volume) <= 0.5 + 1e-9
+    assert dec.position == pytest.approx(volume)
+    assert not dec.in_transition and dec.spread_ul <= 1
+
+
+def test_range_and_ambiguous_wheels():
+    decoder = OdometerDecoder(min_ul=500, max_ul=5000)
+
+    # 0300 은 범위 밖 → 백의 자리 2순위 (8) 로 범위 안 후보
+    prob = split_prob(800.0)
+    prob[1] = 0.0
+    prob[1, 3], prob[1, 8] = 0.6, 0.4
+    assert argmax_volume(prob) == 300
+    assert decoder.decode(prob).volume == 800
+
+    # 십의 자리가 1 / 6 으로 갈림 (가려짐) → counter 규칙으로 못 모음
+    prob = split_prob(2610.0)
+    prob[2] = 0.0
+    prob[2, 1], prob[2, 6] = 0.5, 0.5
+    dec = decoder.decode(prob)
+    assert dec.in_transition and dec.spread_ul == 50
+    assert dec.volume in (2610, 2660)
@@ -0,0 +1,92 @@
+import numpy as np
+
+from worker.calibration import Pulse
+from worker.control_strategy import AdaptiveStrategy, Move
+from worker.plant_model import PlantModel
+
+
+def _simulate(model, gains, backlash, rng, n=60):
+    """direction별 실제 gain(uL/ms)과 backlash를 가진 가상 plant로 학습"""
+    for i in range(n):
+        direction = int(rng.integers(0, 2))
+        duty = int(rng.choice([25, 35, 45, 55]))
+        dur = int(rng.integers(80, 800))
+        moves = [Move(direction, duty, dur)]
+
+        band = model.band_of(duty)
+        reversed_ = model.last_direction is not None and model.last_direction != direction
+        observed = gains[direction][band] * dur - (backlash[direction] if reversed_ else 0.0)
+        model.update(moves, observed + rng.normal(0, 0.5))
+
+
+def test_rls_converges_to_per_direction_gain_and_backlash():
+    gains = {0: [0.05, 0.07, 0.12, 0.15], 1: [0.04, 0.06, 0.10, 0.13]}
+    backlash = {0: 6.0, 1: 3.0}
+
+    model = PlantModel(forgetting=0.99, outlier_abs=1e9)
+    _simulate(model, gains, backlash, np.random.default_rng(0), n=300)
+
+    for d in (0, 1):
+        for b in range(4):
+            assert abs(model.gain(d, b) - gains[d][b]) < 0.01
+        assert abs(model.backlash(d) - backlash[d]) < 1.5
+
+
+def test_outlier_is_rejected_and_direction_tracked():
+    model = PlantModel()
+    moves = [Move(0, 55, 500)]
+
+    assert model.update(moves, 10000.0) is None
+    assert model.rejected == 1
+    assert model.last_direction == 0
+    assert model.updates[0] == 0
+
+
+def test_roundtrip_and_calibration_seed(tmp_path):
+    model = PlantModel().seed_from_calibration([
+        Pulse(duty=55, duration_ms=740, delta_ul=100),
+        Pulse(duty=25, duration_ms=80, delta_ul=5),
+    ])
+    assert abs(model.gain(1, model.band_of(55)) - 100 / 740) < 1e-9
+    assert model.band_duties[model.band_of(25)] == 25
+
+    model.update([Move(1, 55, 300)], 40.0)
+    path = str(tmp_path / "plant_model.json")
+    model.save(path)
+
+    loaded = PlantModel.load(path)
+    assert loaded.last_direction == 1
+    assert loaded.updates == model.updates
+    assert np.allclose(loaded.theta[1], model.theta[1], atol=1e-5)
+
+
+def test_adaptive_plan_adds_backlash_on_reversal():
+    model = PlantModel()
+    model.theta[0][:] = [0.05, 0.07, 0.12, 0.15, 10.0]
+    strategy = AdaptiveStrategy(model, fill_ratio=1.0)
+
+    model.last_direction = 0
+    same = strategy.plan(10)
+    model.last_direction = 1
+    reversed_ = strategy.plan(10)
+
+    assert same[0].direction == 0 and same[0].duty == 25
+    assert reversed_[0].duration_ms > same[0].duration_ms
+    assert abs(same[0].duration_ms - 200) <= 1
+
+
+def test_backlash_clamped_and_consecutive_outliers_relearn():
+    model = PlantModel(max_rejects=3)
+    model.theta[1][:] = [0.05, 0.07, 0.12, 0.01, 500.0]
+    moves = [Move(1, 55, 500)]
+
+    model.last_direction = 0
+    model.update(moves, 5.0 - 500.0)
+    assert model.backlash(1) <= 30.0
+
+    # gain이 틀린 상태: 실제 75uL 이동을 계속 outlier로 무시하면 안 된다
+    results = [model.update(moves, 75.0) for _ in range(3)]
+    assert results[:2] == [None, None]
+    assert results[2] is not None
+    assert model.rejected == 2
+    assert model.gain(1, 3) > 0.01
@@ -0,0 +1,63 @@
+import numpy as np
+
+from sim import SimRig
+from test.test_ocr import ROIS, CodeBackend, frame
+from worker.control_strategy import create_strategy
+from worker.ocr import OcrStats, read_volume, read_volume_confident
+from worker.roi_cache import RoiCache
+
+
+def test_only_changed_rois_are_inferred():
+    # CodeBackend 프레임은 digit 1 차이가 밝기 1 → 실제 숫자 창보다 훨씬 작은 변화
+    backend, cache, stats = CodeBackend(), RoiCache(threshold=0.5), OcrStats()
+    a = read_volume(frame([2, 6, 1, 9]), backend, ROIS, min_conf=0.8, cache=cache, stats=stats)
+    b = read_volume(frame([2, 6, 2, 0]), backend, ROIS, min_conf=0.8, cache=cache, stats=stats)
+    c = read_volume(frame([2, 6, 2, 0]), backend, ROIS, min_conf=0.8, cache=cache, stats=stats)
+
+    assert (a.volume, b.volume, c.volume) == (2619, 2620, 2620)
+    # 십 / 일의 자리만 2개짜리 batch로, 같은 프레임은 추론 없음
+    assert backend.calls == [4, 2]
+    assert c.conf == b.conf and np.array_equal(c.prob, b.prob)
+    d = stats.as_dict()
+    assert d["roi_lookups"] == 12 and d["roi_hits"] == 6 and d["roi_hit_rate"] == 0.5
+    assert d["roi_saved_s"] > 0 and cache.row_cost_s > 0
+
+
+def test_compares_against_last_inferred_crop():
+    cache = RoiCache(threshold=2.0, downscale=1)
+    base = np.full((8, 8), 100, dtype=np.uint8)
+    cache.store(0, cache.signature(base), 3, 0.99, np.eye(10)[3])
+
+    # 조금씩 밝아지는 창: 매 프레임 차이는 작아도 추론 시점 대비 누적되면 miss
+    assert cache.lookup(0, cache.signature(base + 1)) is not None
+    assert cache.lookup(0, cache.signature(base + 2)) is not None
+    assert cache.lookup(0, cache.signature(base + 3)) is None
+    # ROI 크기가 바뀌면 (추적 결과 변경) miss, 없는 index도 miss
+    assert cache.lookup(0, cache.signature(np.full((8, 9), 100, dtype=np.uint8))) is None
+    assert cache.lookup(1, cache.signature(base)) is None
+
+
+def test_rereads_bypass_cache_and_refresh_it():
+    backend, cache = CodeBackend(), RoiCache()
+    low = frame([2, 6, 1, 9], conf=(1.0, 1.0, 1.0, 0.5))
+    sharp = frame([2, 6, 1, 9])
+    r = read_volume_confident(
+        low, backend, ROIS, recapture=lambda: sharp, min_conf=0.8, wait=lambda s: None, cache=cache
+    )
+    assert r.valid and backend.calls == [4, 1]
+
+    # 재판독한 선명한 일의 자리가 cache에 남음 → 같은 프레임은 추론 없음
+    r = read_volume_confident(sharp, backend, ROIS, min_conf=0.8, cache=cache)
+    assert r.valid and r.volume == 2619 and backend.calls == [4, 1]
+
+
+def test_sim_run_to_target_skips_static_wheels():
+    rig = SimRig(seed=3, volume=1500)
+    cache = RoiCache()
+    res = rig.run_to_target(2620, strategy=create_strategy("ladder"), settle=rig.settle_detector(), roi_cache=cache)
+
+    assert res["success"] and abs(rig.true_volume - 2620) <= 1.5
+    ocr = res["ocr"]
+    assert ocr["roi_hits"] == sum(s["roi_hits"] for s in res["steps"])
+    # 미세 조정 구간은 천 / 백의 자리가 그대로
+    assert ocr["roi_hit_rate"] > 0.3
@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+from worker.roi_tracker import RoiTracker
+
+ROIS = [[120, 60, 60, 50], [120, 120, 60, 50], [120, 180, 60, 50], [120, 240, 60, 50]]
+
+
+def _scene(dx=0, dy=0, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 255, (400, 320), dtype=np.uint8)
+    base = cv2.GaussianBlur(base, (5, 5), 0)
+    M = np.float32([[1, 0, dx], [0, 1, dy]])
+    moved = cv2.warpAffine(base, M, (320, 400), borderMode=cv2.BORDER_REFLECT)
+    return cv2.cvtColor(moved, cv2.COLOR_GRAY2BGR)
+
+
+def test_track_follows_rigid_shift():
+    tracker = RoiTracker(margin=24)
+    tracker.reset(_scene(), ROIS)
+
+    res = tracker.track(_scene(dx=6, dy=-4))
+
+    assert not res.lost
+    assert res.confidence > 0.5
+    for (x, y, w, h), (x0, y0, w0, h0) in zip(res.rois, ROIS):
+        assert abs(x - (x0 + 6)) <= 1 and abs(y - (y0 - 4)) <= 1
+        assert (w, h) == (w0, h0)
+    assert 6 < res.drift < 8
+
+
+def test_lost_tracking_triggers_detector():
+    calls = []
+
+    def detector(frame):
+        calls.append(frame.shape)
+        return ROIS
+
+    tracker = RoiTracker(detector=detector, margin=24)
+    tracker.reset(_scene(seed=0), ROIS)
+
+    # 전혀 다른 장면 → lost → 재검출
+    res = tracker.update(_scene(seed=1))
+
+    assert res.redetected
+    assert calls == [(400, 320, 3)]
+    assert res.rois == ROIS
+    assert tracker.redetections == 1
+
+
+def test_uninitialized_update_uses_initial_rois():
+    tracker = RoiTracker()
+    res = tracker.update(_scene(), initial_rois=ROIS)
+    assert tracker.initialized and not res.redetected
+    assert res.rois == ROIS
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+
+from sim.pty_device import PtyDevice
+from worker.actuator_linear import LinearActuator
+from worker.frame_parser import FeedbackFrame
+from worker.make_packet import MakePacket
+from worker.serial_controller import SerialController
+
+
+def _wait_for(cond, timeout=1.0):
+    deadline = time.perf_counter() + timeout
+    while not cond() and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    return cond()
+
+
+@pytest.fixture
+def link():
+    with PtyDevice(ids=(0x0A, 0x0B)) as device:
+        ctrl = SerialController(port=device.port)
+        ctrl.tx_debug = ctrl.rx_debug = False
+        ctrl.polling_enabled = False
+        ctrl.connect()
+        yield ctrl, device
+        ctrl.close()
+
+
+def test_enqueue_is_written_without_tick_delay(link):
+    ctrl, device = link
+    pkt = MakePacket.set_position(0x0A, 1234)
+
+    t0 = time.perf_counter()
+    ctrl.enqueue(pkt)
+    assert _wait_for(lambda: any(f == pkt for _, f in device.received))
+    t_rx = next(t for t, f in device.received if f == pkt)
+    assert t_rx - t0 < 0.02
+
+
+def test_heartbeat_poll_updates_states_and_survives_missed_reply(link):
+    ctrl, device = link
+    ctrl.POLL_HEARTBEAT_SEC = 0.05
+    device.moving[0x0B] = 1  # status checksum이 0xED (ETX와 같은 값)
+    ctrl.polling_enabled = True
+
+    assert _wait_for(lambda: 0x0A in ctrl.states and 0x0B in ctrl.states)
+    assert ctrl.states[0x0B]["moving"] == 1
+    assert ctrl.rx_parser.errors == 0
+
+    # 응답이 없어도 timeout 후 heartbeat 계속
+    device.ids = []
+    time.sleep(ctrl.POLL_HEARTBEAT_SEC + ctrl.POLL_REPLY_TIMEOUT_SEC)
+    n = len(device.received)
+    time.sleep(4 * (ctrl.POLL_HEARTBEAT_SEC + ctrl.POLL_REPLY_TIMEOUT_SEC))
+    assert len(device.received) - n >= 2
+    assert ctrl.poll_counts["missed"] >= 2
+
+
+def test_close_drains_pending_stop_packet(link):
+    ctrl, device = link
+    stop = MakePacket.pipette_change_volume(0x0C, 0, 0)
+
+    ctrl.enqueue(MakePacket.pipette_change_volume(0x0C, 1, 40))
+    ctrl.enqueue(stop)
+    ctrl.close()
+
+    assert not ctrl.connected
+    assert _wait_for(lambda: any(f == stop for _, f in device.received))
+    assert ctrl.tx_queue.unfinished_tasks == 0
+
+
+class _TravelDevice(PtyDevice):
+    """set_position 후 travel_s 동안 moving=1, feedback 요청에 현재 위치 응답"""
+
+    def __init__(self, travel_s, **kwargs):
+        super().__init__(**kwargs)
+        self.travel_s = travel_s
+        self.position = {}
+        self._until = {}
+
+    def handle(self, frame):
+        actuator_id, cmd = frame[2], frame[4]
+        now = time.perf_counter()
+        for i, t in self._until.items():
+            self.moving[i] = int(now < t)
+
+        if cmd == MakePacket.MIGHTYZAP_SetPosition:
+            self.position[actuator_id] = frame[5] | (frame[6] << 8)
+            self._until[actuator_id] = now + self.travel_s
+            self.moving[actuator_id] = 1
+        elif cmd == MakePacket.MIGHTYZAP_GetFeedbackData:
+            pos = self.position.get(actuator_id, 0)
+            self.write(MakePacket._base_packet(actuator_id, cmd, [pos & 0xFF, pos >> 8]))
+        else:
+            super().handle(frame)
+
+
+@pytest.fixture
+def travel_link():
+    with _TravelDevice(travel_s=0.12, ids=(0x0A, 0x0B)) as device:
+        ctrl = SerialController(port=device.port)
+        ctrl.tx_debug = ctrl.rx_debug = False
+        ctrl.polling_enabled = False
+        ctrl.connect()
+        yield ctrl, device
+        ctrl.close()
+
+
+def test_move_and_wait_returns_when_actuator_reports_idle(travel_link):
+    ctrl, device = travel_link
+    linear = LinearActuator(ctrl, 0x0A)
+
+    t0 = time.perf_counter()
+    assert linear.move_to(1500)
+    dt = time.perf_counter() - t0
+    assert 0.12 <= dt < 0.3
+
+    rec = ctrl.send(MakePacket.get_feedback(0x0A)).result(1.0)
+    assert isinstance(rec, FeedbackFrame) and rec.position == 1500
+
+
+def test_async_move_and_timeout(travel_link):
+    ctrl, device = travel_link
+    linear = LinearActuator(ctrl, 0x0B)
+
+    assert asyncio.run(linear.move_to_async(200))
+    device.travel_s = 10.0
+    assert not ctrl.move_and_wait(0x0B, 300, timeout=0.2)
+
+    ctrl.close()
+    with pytest.raises(RuntimeError):
+        ctrl.send(MakePacket.get_moving(0x0B)).result(0.1)
+
+
+def test_commanded_actuator_is_polled_fast_until_idle(travel_link):
+    ctrl, device = travel_link
+    ctrl.polling_enabled = True
+    time.sleep(0.05)  # 첫 heartbeat
+
+    ctrl.send_mightyzap_set_position(0x0A, 800)
+    assert _wait_for(lambda: ctrl.states.get(0x0A, {}).get("moving") == 1, 0.1)
+    assert _wait_for(lambda: not ctrl.active_ids(), 0.5)
+    assert ctrl.states[0x0A]["moving"] == 0
+
+    polled = [f for _, f in device.received if f == MakePacket.get_moving(0x0A)]
+    assert len(polled) >= 5  # travel 0.12 s 동안 개별 poll
+
+    # idle: heartbeat만 (1 s 간격)
+    n = len(device.received)
+    time.sleep(0.3)
+    assert len(device.received) - n <= 1
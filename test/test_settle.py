@@ -0,0 +1,50 @@
+import pytest
+
+from sim import SimRig
+from worker.control_strategy import create_strategy
+from worker.control_worker import SETTLE_TIME
+
+
+def test_static_dial_settles_after_k_quiet_frames():
+    rig = SimRig(seed=0, volume=2000)
+    res = rig.settle_detector(stable_frames=3).wait(rig.rois)
+
+    # 센서 잡음만 있는 정지 다이얼: 첫 프레임 + 비교 3번
+    assert res.settled and res.frames == 4
+    assert res.score is not None and res.score <= 2.0
+    assert res.frame.shape == rig.capture().shape
+
+
+def test_waits_for_coast_and_gives_up_at_max_wait():
+    rig = SimRig(seed=0, volume=2000)
+    detector = rig.settle_detector()
+
+    rig.actuator.pulse(0, 55, 150)
+    res = detector.wait(rig.rois)
+    v = rig.true_volume
+    rig.clock.sleep(0.5)
+    assert res.settled and res.wait_s < SETTLE_TIME
+    assert rig.true_volume == pytest.approx(v, abs=0.5)
+
+    # 모터가 계속 돌면 max_wait_s에서 포기
+    rig.actuator.run(0, 55)
+    res = detector.wait(rig.rois, max_wait_s=0.4)
+    rig.actuator.stop()
+    assert not res.settled
+    assert res.wait_s == pytest.approx(0.4, abs=0.05)
+
+
+def test_run_to_target_uses_settle_and_reuses_frame():
+    rig = SimRig(seed=3, volume=1500)
+    captures = []
+    capture = rig.capture
+    rig.capture = lambda: captures.append(1) or capture()
+
+    res = rig.run_to_target(2620, strategy=create_strategy("ladder"), settle=rig.settle_detector())
+    assert res["success"]
+
+    moved = [s for s in res["steps"] if s["pulses"]]
+    assert moved and all(s["settled"] for s in moved)
+    assert max(s["settle_s"] for s in moved) < SETTLE_TIME
+    # 정지 프레임을 다음 iteration OCR에 사용 → loop의 capture는 첫 step + 저신뢰 digit 재캡처만
+    assert len(captures) == 1 + res["ocr"]["rereads"]
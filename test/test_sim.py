@@ -0,0 +1,114 @@
+import pytest
+
+from sim import DialModel, DialParams, SimClock, SimRig, SimSerial, wheel_positions
+from worker.actuator_linear import LinearActuator
+from worker.actuator_volume_dc import VolumeDCActuator
+from worker.make_packet import MakePacket
+from worker.control_strategy import create_strategy
+
+
+def test_wheel_positions_roll_with_carry():
+    assert wheel_positions(1234) == [1, 2, 3, 4]
+    # 일의 자리가 9→0 넘어가는 동안 십의 자리도 같이 굴러감
+    assert wheel_positions(1239.5) == pytest.approx([1, 2, 3.5, 9.5])
+    assert wheel_positions(1999.25) == pytest.approx([1.25, 9.25, 9.25, 9.25])
+
+
+def test_template_ocr_reads_settled_and_rolling_digits():
+    rig = SimRig(seed=1, volume=2620)
+    assert rig.read_volume() == 2620
+
+    rig.dial._pos = 1299.8
+    assert rig.read_volume() == 1300
+
+
+def test_dial_backlash_and_determinism():
+    params = DialParams(gain_noise=0.0, backlash_ul=4.0)
+
+    def moves(dial):
+        clock = dial.clock
+        out = []
+        for direction in (0, 0, 1):
+            v0 = dial.volume
+            dial.run(direction, 55)
+            clock.sleep(0.3)
+            dial.stop()
+            clock.sleep(0.5)
+            out.append(dial.volume - v0)
+        return out
+
+    up1, up2, down = moves(DialModel(params, SimClock(), volume=2000))
+    assert up1 == pytest.approx(up2)
+    # 반대 방향 첫 pulse는 유격만큼 덜 움직임 (gain_down 포함)
+    assert -down == pytest.approx(up1 * params.gain_down - params.backlash_ul, abs=0.01)
+
+    a = SimRig(seed=7)
+    b = SimRig(seed=7)
+    assert a.true_volume == b.true_volume
+
+
+def test_sim_serial_drives_volume_actuator():
+    clock = SimClock()
+    dial = DialModel(DialParams(gain_noise=0.0), clock, volume=1000)
+    dc = VolumeDCActuator(SimSerial(dial), 0x0C)
+
+    dc.run(direction=0, duty=55)
+    clock.sleep(0.5)
+    dc.stop()
+    clock.sleep(0.5)
+
+    assert dial.volume > 1050
+
+
+
+def test_sim_serial_linear_actuator_initialize_and_move():
+    clock = SimClock()
+    serial = SimSerial(DialModel(DialParams(), clock, volume=1000))
+    linear = LinearActuator(serial, 0x0A)
+
+    # 연결 전 send()는 실패
+    assert not linear.initialize()
+    serial.sent.clear()
+
+    serial.connect()
+    assert linear.initialize(speed=500, current=300, position=300)
+    assert [cmd for cmd, _, _ in serial.sent] == ["force", "speed", "current", "position"]
+    axis = serial.axis(0x0A)
+    assert (axis.speed, axis.current) == (500, 300)
+
+    # speed 500 → 약 1466 unit/s: 300까지 이동하는 동안 moving, 완료 후 feedback = 목표
+    assert serial.send(MakePacket.get_moving(0x0A)).result(0).moving == 1
+    assert serial.wait_until_idle(0x0A)
+    assert serial.send(MakePacket.get_feedback(0x0A)).result(0).position == 300
+
+    t0 = clock.monotonic()
+    assert linear.move_to(3000)
+    assert clock.monotonic() - t0 == pytest.approx(2700 / (3000 * 500 / 1023), abs=0.02)
+    assert serial.send(MakePacket.get_feedback(0x0A)).result(0).position == 3000
+    assert serial.send(MakePacket.get_moving(0x0A)).result(0).moving == 0
+
+    # 목표에 못 가면 timeout
+    assert not serial.move_and_wait(0x0A, 0, timeout=0.5)
+
+
+def test_sim_serial_send_drives_volume_dial():
+    clock = SimClock()
+    dial = DialModel(DialParams(gain_noise=0.0), clock, volume=1000)
+    serial = SimSerial(dial)
+    serial.connect()
+
+    serial.send(MakePacket.pipette_change_volume(0x0C, 0, 55)).result(0)
+    clock.sleep(0.5)
+    assert serial.send(MakePacket.request_check_operate_status()).result(0).moving == 1
+    serial.send(MakePacket.pipette_change_volume(0x0C, 0, 0)).result(0)
+
+    assert serial.wait_until_idle(0x0C, timeout=2.0)
+    assert dial.volume > 1050
+
+def test_rig_run_to_target_converges_on_virtual_time():
+    rig = SimRig(seed=3, volume=1500)
+    result = rig.run_to_target(2620, strategy=create_strategy("calibrated"))
+
+    assert result["success"]
+    assert abs(rig.true_volume - 2620) < 5
+    assert rig.clock.monotonic() > 1.0
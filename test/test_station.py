@@ -0,0 +1,140 @@
+import threading
+import time
+
+import cv2
+import pytest
+
+import worker.control_worker as control_worker
+from sim.devices import SimCamera
+from sim.firmware import FirmwareEmulator
+from sim.ocr import TemplateOcrBackend
+from sim.render import DEFAULT_ROIS, OdometerRenderer
+from worker.station import Station, StationConfig, StationManager, load_station_configs
+
+
+@pytest.fixture(autouse=True)
+def fast_settle(monkeypatch):
+    monkeypatch.setattr(control_worker, "SETTLE_TIME", 0.15)  # 다이얼 관성 (coast tau 30 ms) 이상
+
+
+@pytest.fixture
+def renderer():
+    return OdometerRenderer(seed=0)
+
+
+def _config(name, fw, camera, tmp_path, **kwargs):
+    return StationConfig(
+        name=name,
+        serial_port=fw.port,
+        camera=camera,
+        rotate=0,
+        rois=DEFAULT_ROIS,
+        state_dir=str(tmp_path / name),
+        **kwargs,
+    )
+
+
+def test_station_reads_file_backed_camera(tmp_path, renderer):
+    frames = tmp_path / "frames"
+    frames.mkdir()
+    for i in range(3):
+        cv2.imwrite(str(frames / f"{i:04d}.png"), renderer.render(2620))
+
+    with FirmwareEmulator() as fw:
+        config = _config("A", fw, str(frames), tmp_path, camera_fps=100)
+        with Station(config, TemplateOcrBackend(renderer)) as station:
+            assert station.read_volume() == 2620
+            assert station.serial.connected
+            # start()에서 linear 초기화 (home 300)
+            assert fw.axes[0x0A].force and fw.axes[0x0B].speed == 500
+
+
+def test_manager_runs_stations_concurrently_with_shared_ocr(tmp_path, renderer):
+    with FirmwareEmulator(volume=1500.0, seed=1) as fw_a, FirmwareEmulator(volume=2500.0, seed=2) as fw_b:
+        configs = [
+            _config(name, fw, SimCamera(fw, OdometerRenderer(seed=i), fps=60), tmp_path, strategy="calibrated")
+            for i, (name, fw) in enumerate((("A", fw_a), ("B", fw_b)))
+        ]
+        events = []
+        with StationManager(configs, ocr_backend=TemplateOcrBackend(renderer)) as manager:
+            report = manager.run({"A": [1530], "B": [2460]}, emit=events.append)
+
+    for name, target, fw, v0 in (("A", 1530, fw_a, 1500.0), ("B", 2460, fw_b, 2500.0)):
+        stats = report["stations"][name]
+        assert stats["targets"] == 1 and stats["error"] is None
+        assert stats["targets_per_hour"] > 0
+        result = manager.station(name).results[0]
+        assert result["station"] == name and result["iterations"] >= 2
+        assert result["success"] and abs(result["final_ul"] - target) <= control_worker.VOLUME_TOLERANCE
+        assert abs(fw.volume - v0) > 10  # 각 station의 다이얼이 실제로 움직임
+        assert any(e["station"] == name and e["cmd"] == "volume" for e in events)
+        assert (tmp_path / name / "plant_model.json").exists()
+
+    agg = report["aggregate"]
+    assert agg["targets"] == 2 and agg["stations"] == 2
+    assert agg["targets_per_hour"] == pytest.approx(
+        sum(s["targets_per_hour"] for s in report["stations"].values()), rel=0.01
+    )
+    # OCR 엔진 1개를 두 station이 공유 (동시에 들어온 요청은 한 배치)
+    ocr = report["ocr"]
+    # 요청 = 판독한 step (ROI가 전부 cache hit면 추론 없음) + 저신뢰 digit 재판독
+    assert ocr["requests"] == sum(
+        sum(1 for st in r["steps"] if st["measured"] and st["roi_hits"] < 4) + r["ocr"]["rereads"]
+        for s in manager.stations
+        for r in s.results
+    )
+    assert 0 < ocr["batches"] <= ocr["requests"]
+    assert ocr["batch_rows"]["max"] <= 8
+
+
+
+class SlowStation:
+    """cancel 후에도 진행 중인 step을 잠시 마저 끝내는 station (포트 / 카메라 사용 중 표시)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.running = threading.Event()
+        self.in_run = False
+        self.closed_while_running = None
+
+    def run_target(self, target, emit=None, stop_event=None):
+        self.in_run = True
+        self.running.set()
+        stop_event.wait(5)
+        time.sleep(0.2)
+        self.in_run = False
+        return {}
+
+    def close(self):
+        self.closed_while_running = self.in_run
+
+
+def test_close_waits_for_running_stations(renderer):
+    manager = StationManager([], ocr_backend=TemplateOcrBackend(renderer))
+    manager.stations = [SlowStation("A"), SlowStation("B")]
+    manager.report = lambda: {}
+    runner = threading.Thread(target=manager.run, args=([1500],))
+    runner.start()
+    for station in manager.stations:
+        assert station.running.wait(2)
+
+    manager.cancel()
+    assert not manager.join(0.05)
+    manager.close()
+    runner.join(2)
+    assert [s.closed_while_running for s in manager.stations] == [False, False]
+    assert manager.join(0)
+
+def test_load_station_configs_rejects_duplicates(tmp_path):
+    path = tmp_path / "stations.json"
+    path.write_text('[{"name": "A", "serial_port": "/dev/ttyUSB0"}, {"name": "B", "serial_port": "/dev/ttyUSB0"}]')
+    with pytest.raises(RuntimeError):
+        load_station_configs(str(path))
+
+    path.write_text('{"stations": [{"name": "A", "camera": 2, "rotate": 0}]}')
+    (config,) = load_station_configs(str(path))
+    assert config.camera == 2 and config.rotate == 0
+
+    path.write_text('[{"name": "A", "port": "/dev/ttyUSB0"}]')
+    with pytest.raises(ValueError):
+        load_station_configs(str(path))
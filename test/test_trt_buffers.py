@@ -0,0 +1,99 @@
+import numpy as np
+
+from worker.trt_buffers import BufferPool, HostAllocator, batch_bucket
+
+
+class CountingAllocator(HostAllocator):
+    def __init__(self):
+        super().__init__()
+        self.host_allocs = 0
+        self.device_allocs = 0
+        self.device_frees = 0
+
+    def host_empty(self, shape, dtype=np.float32):
+        self.host_allocs += 1
+        return super().host_empty(shape, dtype)
+
+    def device_alloc(self, nbytes):
+        self.device_allocs += 1
+        return super().device_alloc(nbytes)
+
+    def device_free(self, handle):
+        self.device_frees += 1
+        super().device_free(handle)
+
+
+def _out_shape(in_shape):
+    return (in_shape[0], 10)
+
+
+def test_same_shape_allocates_once():
+    alloc = CountingAllocator()
+    pool = BufferPool(alloc)
+
+    first = pool.get((4, 3, 224, 224), _out_shape)
+    for _ in range(1000):
+        assert pool.get((4, 3, 224, 224), _out_shape) is first
+
+    assert alloc.host_allocs == 2
+    assert alloc.device_allocs == 2
+    assert pool.misses == 1 and pool.hits == 1000
+    assert first.host_input.shape == (4, 3, 224, 224)
+    assert first.host_output.shape == (4, 10)
+
+
+def test_out_shape_fn_only_called_on_miss():
+    calls = []
+
+    def out_shape(in_shape):
+        calls.append(in_shape)
+        return (in_shape[0], 10)
+
+    pool = BufferPool(HostAllocator())
+    pool.get((4, 3, 224, 224), out_shape)
+    pool.get((4, 3, 224, 224), out_shape)
+    pool.get((2, 3, 224, 224), out_shape)
+
+    assert calls == [(4, 3, 224, 224), (2, 3, 224, 224)]
+
+
+def test_lru_eviction_frees_device_memory():
+    alloc = CountingAllocator()
+    pool = BufferPool(alloc, max_entries=2)
+
+    pool.get((1, 3, 224, 224), _out_shape)
+    pool.get((2, 3, 224, 224), _out_shape)
+    pool.get((1, 3, 224, 224), _out_shape)  # (1,...)을 최근 사용으로
+    pool.get((3, 3, 224, 224), _out_shape)  # (2,...) evict
+
+    assert len(pool) == 2
+    assert alloc.device_frees == 2
+    assert len(alloc.live) == 4
+
+    pool.clear()
+    assert len(pool) == 0
+    assert alloc.live == {}
+
+
+def test_batch_bucket_rounds_up_to_power_of_two():
+    assert [batch_bucket(n, 16) for n in (1, 2, 3, 4, 5, 8, 9, 16)] == [1, 2, 4, 4, 8, 8, 16, 16]
+    # 2의 거듭제곱이 아닌 상한 / 상한보다 큰 단독 배치
+    assert [batch_bucket(n, 12) for n in (5, 9, 12, 20)] == [8, 12, 12, 20]
+
+
+def test_bucketed_pool_does_not_thrash_on_mixed_batches():
+    alloc = CountingAllocator()
+    pool = BufferPool(alloc, max_batch=16)
+
+    # ROI cache miss 수 (1~4) + server 묶음 (최대 16) 이 섞인 batch 크기
+    for _ in range(10):
+        for n in range(1, 17):
+            bufs = pool.get((n, 3, 224, 224), _out_shape)
+            assert bufs.in_shape[0] >= n
+            assert bufs.is_host_input(bufs.host_input[:n])
+
+    # bucket 1/2/4/8/16 한 번씩만 할당, 해제 없음
+    assert pool.max_entries == 5 and len(pool) == 5
+    assert pool.misses == 5 and alloc.device_frees == 0
+    assert pool.get((3, 3, 224, 224), _out_shape).host_output.shape == (4, 10)
+    assert not pool.get((3, 3, 224, 224), _out_shape).is_host_input(np.empty((3, 3, 224, 224), np.float32))
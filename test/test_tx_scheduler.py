@@ -0,0 +1,106 @@
+import threading
+
+from worker.make_packet import MakePacket
+from worker.tx_scheduler import HOUSEKEEPING, MOTION, SAFETY, TxScheduler, classify
+
+POLL = MakePacket.request_check_operate_status()
+STOP = MakePacket.pipette_change_volume(0x0C, 0, 0)
+RUN = MakePacket.pipette_change_volume(0x0C, 1, 40)
+
+
+def _drain(s):
+    out = []
+    while True:
+        pkt = s.get(timeout=0)
+        if pkt is None:
+            return out
+        s.task_done()
+        out.append(pkt)
+
+
+def test_classify():
+    assert classify(STOP)[0] == SAFETY
+    assert classify(MakePacket.set_force_onoff(0x0A, 0))[0] == SAFETY
+    assert classify(RUN)[0] == MOTION
+    assert classify(MakePacket.set_position(0x0A, 100))[0] == MOTION
+    assert classify(POLL)[0] == HOUSEKEEPING
+
+
+def test_stop_jumps_ahead_and_cancels_pending_motion():
+    s = TxScheduler()
+    s.put(POLL)
+    s.put(MakePacket.set_position(0x0A, 100))
+    s.put(RUN)
+    s.put(STOP)
+
+    assert _drain(s) == [STOP, MakePacket.set_position(0x0A, 100), POLL]
+    assert s.cancelled == 1
+    assert s.unfinished_tasks == 0
+
+
+
+def test_force_off_cancels_pending_force_on_and_motion():
+    s = TxScheduler()
+    force_on = MakePacket.set_force_onoff(0x0B, 1)
+    force_off = MakePacket.set_force_onoff(0x0B, 0)
+    other = MakePacket.set_position(0x0A, 100)
+    s.put(force_on)
+    s.put(MakePacket.set_position(0x0B, 500))
+    s.put(other)
+    s.put(force_off)
+
+    sent = _drain(s)
+    assert sent == [force_off, other]
+    # 마지막으로 나간 force 명령이 off → actuator는 꺼진 채로 움직이지 않음
+    force = [p for p in sent if p[4] == MakePacket.MIGHTYZAP_SetForceOnOff]
+    assert force[-1][5] == 0
+    assert s.cancelled == 2 and s.unfinished_tasks == 0
+
+def test_motion_supersede_and_poll_coalesce():
+    s = TxScheduler()
+    s.put(MakePacket.set_position(0x0A, 100))
+    s.put(MakePacket.set_speed(0x0A, 50))
+    assert s.put(MakePacket.set_position(0x0A, 200))
+    assert s.put(POLL)
+    assert not s.put(POLL)
+
+    assert _drain(s) == [
+        MakePacket.set_position(0x0A, 200),
+        MakePacket.set_speed(0x0A, 50),
+        POLL,
+    ]
+    st = s.stats()
+    assert st["superseded"] == 1 and st["coalesced"] == 1
+    assert st["max_depth"]["motion"] == 2
+
+
+def test_capacity_drops_oldest_motion_never_safety():
+    s = TxScheduler(capacity={MOTION: 2, SAFETY: 1})
+    for i in range(4):
+        s.put(MakePacket.set_position(0x0A + i, 100))
+    assert s.stats()["dropped"]["motion"] == 2
+
+    s.put(MakePacket.pipette_change_volume(0x0C, 0, 0))
+    s.put(MakePacket.pipette_change_volume(0x0D, 0, 0))
+    out = _drain(s)
+    assert out[:2] == [
+        MakePacket.pipette_change_volume(0x0C, 0, 0),
+        MakePacket.pipette_change_volume(0x0D, 0, 0),
+    ]
+    assert s.unfinished_tasks == 0
+
+
+def test_blocking_get_wake_and_wait_idle():
+    s = TxScheduler()
+    got = []
+    t = threading.Thread(target=lambda: got.append(s.get()))
+    t.start()
+    s.wake()
+    t.join(1.0)
+    assert got == [None]
+
+    s.put(RUN)
+    assert not s.wait_idle(0.01)
+    assert s.get() == RUN
+    s.task_done()
+    assert s.wait_idle(0.01)
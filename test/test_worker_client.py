@@ -0,0 +1,136 @@
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from gui.worker_client import WorkerClient
+
+# 줄 단위 JSON --serve 프로토콜만 흉내내는 stub 데몬
+# - ocr: "delay"초 뒤 별도 thread에서 응답 (응답 순서 ≠ 요청 순서)
+# - capture / plant-model: "crash"가 있으면 그 파일이 없을 때 만들고 바로 죽음 (1회만)
+# - run-target: cancel(target_id) 이 올 때까지 이벤트를 보냄
+STUB = textwrap.dedent('''
+    import json, os, sys, threading, time
+
+    lock = threading.Lock()
+    cancelled = set()
+
+    def send(msg):
+        with lock:
+            sys.stdout.write(json.dumps(msg) + "\\n")
+            sys.stdout.flush()
+
+    def crash_once(path):
+        if path and not os.path.exists(path):
+            open(path, "w").close()
+            os._exit(3)
+
+    def ocr(req):
+        time.sleep(req.get("delay", 0))
+        send({"id": req["id"], "ok": True, "volume": req["volume"]})
+
+    def run_target(req):
+        step = 0
+        while req["id"] not in cancelled:
+            step += 1
+            send({"id": req["id"], "event": {"cmd": "volume", "step": step}})
+            time.sleep(0.02)
+        send({"id": req["id"], "ok": True, "status": "cancelled", "steps": step})
+
+    for line in sys.stdin:
+        req = json.loads(line)
+        cmd = req["cmd"]
+        if cmd == "shutdown":
+            send({"id": req["id"], "ok": True})
+            break
+        if cmd == "ping":
+            send({"id": req["id"], "ok": True, "pid": os.getpid()})
+        elif cmd == "ocr":
+            threading.Thread(target=ocr, args=(req,), daemon=True).start()
+        elif cmd in ("capture", "plant-model"):
+            crash_once(req.get("crash"))
+            send({"id": req["id"], "ok": True, "pid": os.getpid()})
+        elif cmd == "run-target":
+            threading.Thread(target=run_target, args=(req,), daemon=True).start()
+        elif cmd == "cancel":
+            cancelled.add(req.get("target_id"))
+            send({"id": req["id"], "ok": True})
+''')
+
+
+@pytest.fixture
+def client(tmp_path):
+    stub = tmp_path / "stub_worker.py"
+    stub.write_text(STUB)
+    c = WorkerClient([sys.executable, "-u", str(stub), "--serve"], cwd=str(tmp_path))
+    yield c
+    c.close()
+
+
+def test_responses_are_matched_by_id(client):
+    results = {}
+
+    def read(volume, delay):
+        results[volume] = client.request("ocr", timeout=5, volume=volume, delay=delay)
+
+    threads = [threading.Thread(target=read, args=(v, d)) for v, d in ((1000, 0.3), (2000, 0.0), (3000, 0.15))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert {v: r.data["volume"] for v, r in results.items()} == {1000: 1000, 2000: 2000, 3000: 3000}
+    assert all(r.ok for r in results.values())
+
+
+def test_dead_worker_is_restarted_and_idempotent_request_retried(client, tmp_path):
+    pid = client.request("ping", timeout=5).data["pid"]
+
+    res = client.request("capture", timeout=5, crash=str(tmp_path / "crashed"))
+    assert res.ok and res.data["pid"] != pid
+    assert client.restarts == 1
+
+
+def test_non_idempotent_request_is_not_retried(client, tmp_path):
+    client.request("ping", timeout=5)
+
+    res = client.request("plant-model", timeout=5, crash=str(tmp_path / "crashed"))
+    assert not res.ok and res.data["error"] == "worker exited"
+
+    # 다음 요청에서 재기동
+    assert client.request("ping", timeout=5).ok and client.restarts == 1
+
+
+def test_cancel_stops_the_running_target(client):
+    events = []
+    first = threading.Event()
+
+    def on_event(msg):
+        events.append(msg)
+        first.set()
+
+    out = {}
+    t = threading.Thread(
+        target=lambda: out.setdefault("res", client.request("run-target", timeout=5, on_event=on_event, target=1500))
+    )
+    t.start()
+    assert first.wait(5)
+
+    client.cancel()
+    t.join(5)
+
+    res = out["res"]
+    assert res.ok and res.data["status"] == "cancelled"
+    assert [e["step"] for e in events] == list(range(1, res.data["steps"] + 1))
+    # 끝난 run-target은 더 이상 cancel 대상이 아님
+    assert client._runs == set()
+
+
+def test_timeout_does_not_block_later_responses(client):
+    res = client.request("ocr", timeout=0.05, volume=1, delay=0.3)
+    assert not res.ok and res.data["error"] == "timeout"
+
+    time.sleep(0.3)
+    assert client.request("ocr", timeout=5, volume=2).data["volume"] == 2
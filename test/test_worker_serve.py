@@ -0,0 +1,160 @@
+import json
+import queue
+import threading
+
+import pytest
+
+import worker.worker as worker_mod
+from worker.worker import WorkerSession, _ProtocolWriter, serve_loop
+
+
+class FakeSession:
+    """run-target은 취소될 때까지 펄스 이벤트를 내보내며 대기"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.runs = []
+        self.rotations = []
+
+    def capture(self, camera_index=None, rotate=None):
+        return {"ok": True, "frame": "frame.jpg"}
+
+    def run_target(
+        self, target, camera_index=None, emit=None, stop_event=None, strategy=None, motor_port=None, rotate=None,
+    ):
+        self.runs.append(target)
+        self.rotations.append(rotate)
+        self.started.set()
+        step = 0
+        while not stop_event.wait(0.01):
+            step += 1
+            emit({"cmd": "volume", "step": step})
+        return {"ok": True, "success": False, "status": "cancelled"}
+
+
+class Lines:
+    """serve_loop stdin 대용: send()한 요청을 한 줄씩, close() 시 EOF"""
+
+    def __init__(self):
+        self._q = queue.Queue()
+
+    def send(self, **req):
+        self._q.put(json.dumps(req) + "\n")
+
+    def close(self):
+        self._q.put(None)
+
+    def __iter__(self):
+        return iter(self._q.get, None)
+
+
+class Replies:
+    def __init__(self):
+        self._q = queue.Queue()
+        self._responses = {}
+
+    def write(self, line):
+        self._q.put(json.loads(line))
+
+    def flush(self):
+        pass
+
+    def response(self, rid, timeout=2.0):
+        """rid 응답이 올 때까지 (이벤트는 건너뛰고, 먼저 온 다른 응답은 보관)"""
+        while rid not in self._responses:
+            msg = self._q.get(timeout=timeout)
+            if "event" not in msg:
+                self._responses[msg.get("id")] = msg
+        return self._responses.pop(rid)
+
+
+@pytest.fixture
+def daemon():
+    session, lines, replies = FakeSession(), Lines(), Replies()
+    t = threading.Thread(target=serve_loop, args=(session, lines, _ProtocolWriter(replies)), daemon=True)
+    t.start()
+    yield session, lines, replies
+    lines.close()
+    t.join(timeout=2.0)
+    assert not t.is_alive()
+
+
+def test_other_requests_are_rejected_while_run_target_runs(daemon):
+    session, lines, replies = daemon
+    lines.send(id=1, cmd="run-target", target=1500)
+    assert session.started.wait(2.0)
+
+    lines.send(id=2, cmd="capture")
+    assert replies.response(2) == {"id": 2, "ok": False, "error": "busy: run-target 1 in progress"}
+    lines.send(id=3, cmd="ping")
+    assert replies.response(3)["ok"]
+
+    lines.send(id=4, cmd="cancel", target_id=1)
+    assert replies.response(4) == {"id": 4, "ok": True, "cancelled": 1}
+    assert replies.response(1)["status"] == "cancelled"
+
+    # 끝난 뒤에는 다시 처리
+    lines.send(id=5, cmd="capture")
+    assert replies.response(5)["ok"]
+
+
+def test_cancel_before_run_target_starts_is_kept(daemon):
+    session, lines, replies = daemon
+    lines.send(id=7, cmd="cancel", target_id=8)
+    lines.send(id=8, cmd="run-target", target=1500)
+
+    assert replies.response(8)["status"] == "cancelled"
+    assert session.runs == [1500]
+
+
+def test_cancel_for_another_request_does_not_stop_the_run(daemon):
+    session, lines, replies = daemon
+    lines.send(id=1, cmd="cancel", target_id=99)
+    lines.send(id=2, cmd="run-target", target=1500)
+    assert session.started.wait(2.0)
+    assert replies.response(1)["ok"]
+
+    lines.send(id=3, cmd="ping")
+    replies.response(3)
+    lines.send(id=4, cmd="cancel")
+    assert replies.response(2)["status"] == "cancelled"
+
+
+def test_shutdown_cancels_running_target(daemon):
+    session, lines, replies = daemon
+    lines.send(id=1, cmd="run-target", target=1500)
+    assert session.started.wait(2.0)
+    lines.send(id=2, cmd="shutdown")
+
+    assert replies.response(1)["status"] == "cancelled"
+    assert replies.response(2) == {"id": 2, "ok": True}
+
+
+def test_run_target_request_rotation_reaches_session(daemon):
+    session, lines, replies = daemon
+    lines.send(id=1, cmd="run-target", target=1500, rotate=3)
+    assert session.started.wait(2.0)
+    lines.send(id=2, cmd="cancel", target_id=1)
+
+    assert replies.response(1)["status"] == "cancelled"
+    assert session.rotations == [3]
+
+
+def test_run_target_uses_one_rotation_for_ocr_and_settle(monkeypatch):
+    session = WorkerSession(rotate=1)
+    session._plant_model = session._ocr_backend = object()
+    captured, settle = [], []
+
+    def fake_run(target, plant_model, rotate=0, capture=None, **kwargs):
+        settle.append(rotate)
+        capture()
+        return {}
+
+    monkeypatch.setattr(worker_mod, "get_camera_stream", lambda index: None)
+    monkeypatch.setattr(worker_mod, "run_session_target", fake_run)
+    monkeypatch.setattr(session, "capture_rotated", lambda camera_index=None, rotate=None: captured.append(rotate))
+
+    session.run_target(1500, rotate=3)
+    session.run_target(1500)
+    # 요청 회전이 있으면 OCR 캡처 / 정지 감지 모두 그 값, 없으면 둘 다 session 기본값
+    assert captured == settle == [3, 1]
@@ -0,0 +1,138 @@
+import sys
+import threading
+import time
+import types
+
+import numpy as np
+import pytest
+
+import worker.yolo_worker as yolo_worker
+
+
+class FakeBox:
+    def __init__(self, x1, y1, x2, y2):
+        self.xyxy = np.array([[x1, y1, x2, y2]], dtype=np.float32)
+
+
+class FakeYOLO:
+    """ultralytics.YOLO 대용: 고정 box를 돌려주는 CPU 모델 (생성 횟수 기록)"""
+
+    loads = []
+
+    def __init__(self, path):
+        FakeYOLO.loads.append(path)
+        self.calls = 0
+
+    def __call__(self, frame, conf=0.25, iou=0.7, verbose=True):
+        self.calls += 1
+        boxes = [FakeBox(10, 300, 60, 340), FakeBox(10, 20, 60, 60), FakeBox(10, 200, 60, 240),
+                 FakeBox(10, 110, 60, 150), FakeBox(10, 400, 60, 440)]
+        return [types.SimpleNamespace(boxes=boxes)]
+
+
+@pytest.fixture
+def fake_ultralytics(monkeypatch):
+    FakeYOLO.loads = []
+    monkeypatch.setitem(sys.modules, "ultralytics", types.SimpleNamespace(YOLO=FakeYOLO))
+    monkeypatch.setattr(yolo_worker, "_models", {})
+
+
+@pytest.fixture
+def saved_rois(monkeypatch):
+    saved = []
+    monkeypatch.setattr(yolo_worker, "save_rois", saved.append)
+    return saved
+
+
+def test_model_is_loaded_once_per_path(fake_ultralytics):
+    a = yolo_worker.get_yolo_model("a.pt")
+    assert yolo_worker.get_yolo_model("a.pt") is a
+    b = yolo_worker.get_yolo_model("b.pt")
+    assert b is not a and FakeYOLO.loads == ["a.pt", "b.pt"]
+
+    # 동시 첫 호출도 1번만 로드
+    threads = [threading.Thread(target=yolo_worker.get_yolo_model, args=("c.pt",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert FakeYOLO.loads.count("c.pt") == 1
+
+
+def test_detect_rois_sorts_top_to_bottom_and_clips(fake_ultralytics):
+    frame = np.zeros((420, 50, 3), dtype=np.uint8)
+    rois = yolo_worker.detect_rois(frame, model=FakeYOLO("m.pt"))
+    # 위 → 아래 최대 4개, 프레임 밖 좌표는 잘림
+    assert rois == [[10, 20, 39, 40], [10, 110, 39, 40], [10, 200, 39, 40], [10, 300, 39, 40]]
+
+
+def test_no_annotation_work_without_annotate(fake_ultralytics, saved_rois, monkeypatch):
+    def forbidden(*args, **kwargs):
+        raise AssertionError("annotate=False must not draw or encode")
+
+    monkeypatch.setattr(yolo_worker, "render_annotated", forbidden)
+    monkeypatch.setattr(yolo_worker.cv2, "imwrite", forbidden)
+    monkeypatch.setattr(yolo_worker.cv2, "imencode", forbidden)
+    monkeypatch.setattr(yolo_worker.cv2, "rectangle", forbidden)
+    monkeypatch.setattr(yolo_worker._annotation_writer, "submit", forbidden)
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    rois, path = yolo_worker.run_yolo_on_frame(frame, model=FakeYOLO("m.pt"))
+    assert path is None and len(rois) == 4 and saved_rois == [rois]
+
+
+class SlowRender:
+    """첫 기록은 release까지 막힘 (writer thread가 바쁜 동안 제출이 밀리도록)"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.release = threading.Event()
+        self.busy = threading.Event()
+        self.written = []
+
+    def __call__(self, frame, rois, path):
+        self.busy.set()
+        self.release.wait(2.0)
+        time.sleep(self.delay)
+        self.written.append((int(frame[0, 0, 0]), path))
+        return path
+
+
+def test_newer_submissions_replace_pending_one(monkeypatch):
+    render = SlowRender()
+    monkeypatch.setattr(yolo_worker, "render_annotated", render)
+    writer = yolo_worker._AnnotationWriter()
+
+    writer.submit(np.full((4, 4, 3), 1, dtype=np.uint8), [], "1.jpg")
+    assert render.busy.wait(2.0)
+    for i in (2, 3, 4):
+        writer.submit(np.full((4, 4, 3), i, dtype=np.uint8), [], f"{i}.jpg")
+
+    render.release.set()
+    writer.flush()
+    # 기록 중이던 1 + 마지막 4만, 중간 2 / 3은 버려짐
+    assert render.written == [(1, "1.jpg"), (4, "4.jpg")]
+
+
+def test_flush_waits_for_pending_write(monkeypatch):
+    render = SlowRender(delay=0.2)
+    render.release.set()
+    monkeypatch.setattr(yolo_worker, "render_annotated", render)
+    writer = yolo_worker._AnnotationWriter()
+
+    writer.submit(np.zeros((4, 4, 3), dtype=np.uint8), [], "a.jpg")
+    writer.flush()
+    assert render.written == [(0, "a.jpg")]
+
+
+def test_write_failure_is_raised_on_flush(tmp_path):
+    writer = yolo_worker._AnnotationWriter()
+    missing = str(tmp_path / "no_such_dir" / "yolo.jpg")
+    writer.submit(np.zeros((8, 8, 3), dtype=np.uint8), [[1, 1, 4, 4]], missing)
+
+    with pytest.raises(RuntimeError, match="no_such_dir"):
+        writer.flush()
+    # 한 번 알린 실패는 지워짐
+    writer.submit(np.zeros((8, 8, 3), dtype=np.uint8), [[1, 1, 4, 4]], str(tmp_path / "yolo.jpg"))
+    writer.flush()
+    assert (tmp_path / "yolo.jpg").exists()
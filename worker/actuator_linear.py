@@ -1,5 +1,5 @@
+from worker.make_packet import MakePacket
 from worker.serial_controller import SerialController
-import time
 
 
 class LinearActuator:
@@ -28,14 +28,42 @@ class LinearActuator:
         self.actuator_id = actuator_id
 
     # -------------------------------------------------
-    # Core low-level move
+    # Startup (force on / speed / current / home)
     # -------------------------------------------------
-    def move_to(self, position: int):
-        self.serial.send_mightyzap_set_position(self.actuator_id, position)
-        time.sleep(0.6)  # 물리 이동 시간
-        return True
+    def initialize(self, speed: int = 500, current: int = 300, position: int = 300, timeout: float = 1.0) -> bool:
+        """
+        GUI 시작 시 초기 설정: packet마다 고정 0.1 s 대신 실제 write 완료까지만 대기
+        - returns: 모든 packet이 timeout 안에 전송됐으면 True
+        """
+        ok = True
+        for pkt in (
+            MakePacket.set_force_onoff(self.actuator_id, 1),
+            MakePacket.set_speed(self.actuator_id, speed),
+            MakePacket.set_current(self.actuator_id, current),
+            MakePacket.set_position(self.actuator_id, position),
+        ):
+            try:
+                self.serial.send(pkt).result(timeout)
+            except Exception as e:
+                print(f"[SERIAL] init id={hex(self.actuator_id)} failed: {e}")
+                ok = False
+        return ok
 
+    # -------------------------------------------------
+    # Core low-level move
+    # -------------------------------------------------
+    def move_to(self, position: int, wait: bool = True, timeout: float = 5.0) -> bool:
+        """
+        wait=True면 actuator가 idle(status moving=0)을 보고할 때까지 대기
+        (이전: 이동 거리와 관계없이 0.6 s sleep)
+        """
+        if not wait:
+            self.serial.send_mightyzap_set_position(self.actuator_id, position)
+            return True
+        return self.serial.move_and_wait(self.actuator_id, position, timeout=timeout)
 
+    async def move_to_async(self, position: int, timeout: float = 5.0) -> bool:
+        return await self.serial.move_and_wait_async(self.actuator_id, position, timeout=timeout)
 
     # -------------------------------------------------
     # Pipetting (흡인 / 분주)
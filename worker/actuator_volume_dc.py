@@ -1,5 +1,9 @@
+import time
+
 from worker.make_packet import MakePacket
 
+VOLUME_DC_ID = 0x0C
+
 
 class VolumeDCActuator:
     """
@@ -33,3 +37,20 @@ class VolumeDCActuator:
     # ======================================================
     def stop(self):
         self.serial.send_pipette_stop(self.actuator_id)
+
+    # ======================================================
+    # Timed pulse (run_to_target direct mode)
+    # ======================================================
+    def pulse(self, direction: int, duty: int, duration_ms: int, stop_event=None):
+        """
+        run → duration_ms 대기 → stop
+        - stop_event가 set되면 대기를 끊고 즉시 정지
+        """
+        self.run(direction=direction, duty=duty)
+        try:
+            if stop_event is not None:
+                stop_event.wait(duration_ms / 1000.0)
+            else:
+                time.sleep(duration_ms / 1000.0)
+        finally:
+            self.stop()
@@ -0,0 +1,50 @@
+"""
+calibration.json (test/single_target_test.py::run_calibration 결과) 로딩
+
+    {"100": {"duty": 55, "duration_ms": 740, "delta_ul": 100}, ...}
+
+key는 목표 펄스 크기, delta_ul은 실제로 측정된 1회 펄스당 변화량.
+"""
+import json
+import os
+from typing import List, NamedTuple
+
+from worker.paths import CALIB_JSON_PATH
+
+
+class Pulse(NamedTuple):
+    duty: int
+    duration_ms: int
+    delta_ul: float  # 측정된 1회 펄스당 분주량 변화 (uL)
+
+
+def load_calibration(path: str = CALIB_JSON_PATH) -> List[Pulse]:
+    """
+    returns: delta_ul 큰 순서로 정렬된 Pulse 목록
+    - 같은 delta_ul이면 짧은 duration 우선
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Calibration not found: {path}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+
+    pulses = []
+    for key, cfg in raw.items():
+        try:
+            pulse = Pulse(
+                duty=int(cfg["duty"]),
+                duration_ms=int(cfg["duration_ms"]),
+                delta_ul=float(cfg["delta_ul"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            raise RuntimeError(f"Invalid calibration entry {key}: {cfg}")
+
+        if pulse.delta_ul <= 0:
+            raise RuntimeError(f"Invalid calibration entry {key}: delta_ul={pulse.delta_ul}")
+        pulses.append(pulse)
+
+    if not pulses:
+        raise RuntimeError(f"Empty calibration: {path}")
+
+    return sorted(pulses, key=lambda p: (-p.delta_ul, p.duration_ms))
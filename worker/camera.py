@@ -1,25 +1,311 @@
-import cv2
+import atexit
+import os
+import threading
 import time
+from typing import NamedTuple, Optional
 
-def capture_one_frame(camera_index: int = 0, warmup_frames: int = 10):
-    cap = cv2.VideoCapture(camera_index)
-    if not cap.isOpened():
-        raise RuntimeError(f"Camera open failed: index={camera_index}")
-    
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 800)
-
-    frame = None
-    for _ in range(max(1, warmup_frames)):
-        ok, fr = cap.read()
-        if ok:
-            frame = fr
-        time.sleep(0.01)
-
-    cap.release()
-
-    if frame is None:
-        raise RuntimeError("Failed to capture frame.")
-    
+import cv2
+import numpy as np
+
+FRAME_WIDTH = 1280
+FRAME_HEIGHT = 800
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
 
+
+class Frame(NamedTuple):
+    image: np.ndarray
+    timestamp: float  # time.monotonic() at grab
+    seq: int
+
+
+def rotate_frame(frame, rotate_code: int):
+    """
+    rotate_code:
+      0: no rotate
+      1: 90 CW
+      2: 90 CCW
+      3: 180
+    """
+    if rotate_code == 1:
+        return cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
+    if rotate_code == 2:
+        return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+    if rotate_code == 3:
+        return cv2.rotate(frame, cv2.ROTATE_180)
     return frame
+
+
+# =========================================================
+# File / directory backed source (카메라 없이 벤치마크/테스트용)
+# =========================================================
+class ImageSequenceSource:
+    """
+    cv2.VideoCapture와 같은 read(image) 인터페이스를 갖는 이미지 소스
+    - path: 이미지 파일 1장 또는 이미지 디렉터리 (파일명 정렬 순서)
+    - fps: 프레임 공급 속도 (None이면 제한 없음)
+    - loop: 끝에 도달하면 처음부터 반복
+    """
+
+    def __init__(self, path: str, fps: Optional[float] = 30.0, loop: bool = True):
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, f)
+                for f in os.listdir(path)
+                if f.lower().endswith(IMAGE_EXTS)
+            )
+        else:
+            files = [path]
+
+        # 디코딩은 open 시 1회만
+        self.images = [cv2.imread(f) for f in files]
+        self.images = [img for img in self.images if img is not None]
+
+        self.period = (1.0 / fps) if fps else 0.0
+        self.loop = loop
+        self._index = 0
+        self._next_t = time.monotonic()
+
+    def isOpened(self) -> bool:
+        return len(self.images) > 0
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def read(self, image: Optional[np.ndarray] = None):
+        if self._index >= len(self.images):
+            if not self.loop or not self.images:
+                return False, image
+            self._index = 0
+
+        if self.period:
+            delay = self._next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_t = max(self._next_t + self.period, time.monotonic())
+
+        src = self.images[self._index]
+        self._index += 1
+
+        if image is not None and image.shape == src.shape and image.dtype == src.dtype:
+            np.copyto(image, src)
+            return True, image
+        return True, src.copy()
+
+    def release(self):
+        self.images = []
+
+
+def open_source(source, fps: Optional[float] = 30.0):
+    """
+    - int: 카메라 인덱스 (1280x800 고정)
+    - 이미지 파일 / 디렉터리: ImageSequenceSource
+    - 그 외 문자열: 동영상 파일 (cv2.VideoCapture)
+    """
+    if isinstance(source, int):
+        cap = cv2.VideoCapture(source)
+        if cap.isOpened():
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+        return cap
+
+    if hasattr(source, "read"):
+        return source  # 이미 열린 소스 (시뮬레이터 등)
+
+    if os.path.isdir(source) or str(source).lower().endswith(IMAGE_EXTS):
+        return ImageSequenceSource(source, fps=fps)
+
+    return cv2.VideoCapture(source)
+
+
+# =========================================================
+# Background grabber
+# =========================================================
+class CameraStream:
+    """
+    카메라를 수명 동안 열어두고 grabber thread가 최신 프레임을 계속 갱신한다.
+
+    - 미리 할당된 ring buffer에 cap.read(image)로 직접 기록 (프레임당 할당 없음)
+    - latest(): 가장 최근 프레임
+    - wait_newer_than(ts): timestamp > ts 인 프레임이 들어올 때까지 대기
+    - timestamp는 time.monotonic() 기준
+    """
+
+    MAX_READ_FAILURES = 30
+
+    def __init__(
+        self,
+        source=0,
+        n_buffers: int = 4,
+        warmup_frames: int = 10,
+        fps: Optional[float] = 30.0,
+    ):
+        self.source = source
+        self.n_buffers = max(2, int(n_buffers))
+        self.warmup_frames = max(0, int(warmup_frames))
+        self.fps = fps
+
+        self.cap = None
+        self.running = False
+        self.error: Optional[str] = None
+
+        self._ring = [None] * self.n_buffers
+        self._stamps = [0.0] * self.n_buffers
+        self._seq = 0
+        self._latest_slot = -1
+
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    # =========================
+    # Lifecycle
+    # =========================
+    def start(self) -> "CameraStream":
+        if self.running:
+            return self
+
+        self.cap = open_source(self.source, fps=self.fps)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Camera open failed: source={self.source}")
+
+        self._alloc_ring()
+
+        self.running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.running = False
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+        with self._cond:
+            self._cond.notify_all()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _alloc_ring(self):
+        # 첫 프레임으로 크기를 확정한 뒤 ring 전체를 한 번에 할당
+        ok, first = self.cap.read()
+        if not ok or first is None:
+            raise RuntimeError("Failed to capture frame.")
+
+        self._ring = [np.empty_like(first) for _ in range(self.n_buffers)]
+
+    # =========================
+    # Grabber
+    # =========================
+    def _grab_loop(self):
+        failures = 0
+        skipped = 0
+
+        while self.running:
+            slot = (self._latest_slot + 1) % self.n_buffers
+            buf = self._ring[slot]
+
+            ok, img = self.cap.read(buf)
+            ts = time.monotonic()
+
+            if not ok or img is None:
+                failures += 1
+                if failures >= self.MAX_READ_FAILURES:
+                    self.error = "Failed to capture frame."
+                    break
+                time.sleep(0.01)
+                continue
+            failures = 0
+
+            # 해상도가 바뀐 경우에만 새 버퍼를 받아들인다
+            if img is not buf:
+                self._ring[slot] = img
+
+            if skipped < self.warmup_frames:
+                skipped += 1
+                continue
+
+            with self._cond:
+                self._stamps[slot] = ts
+                self._latest_slot = slot
+                self._seq += 1
+                self._cond.notify_all()
+
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+
+    # =========================
+    # Readers
+    # =========================
+    def _frame(self, copy: bool) -> Frame:
+        slot = self._latest_slot
+        img = self._ring[slot]
+        return Frame(img.copy() if copy else img, self._stamps[slot], self._seq)
+
+    def latest(self, copy: bool = True) -> Optional[Frame]:
+        """
+        가장 최근 프레임. 아직 없으면 None
+        copy=False면 ring buffer view를 그대로 반환 (n_buffers-1 프레임 이후 덮어써짐)
+        """
+        with self._cond:
+            if self._latest_slot < 0:
+                return None
+            return self._frame(copy)
+
+    def wait_newer_than(self, ts: float, timeout: float = 2.0, copy: bool = True) -> Frame:
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while self._latest_slot < 0 or self._stamps[self._latest_slot] <= ts:
+                if not self.running:
+                    raise RuntimeError(self.error or "Camera stream stopped.")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"Camera frame timeout ({timeout:.1f}s)")
+                self._cond.wait(remaining)
+
+            return self._frame(copy)
+
+
+# =========================================================
+# Shared streams (프로세스당 소스별 1개)
+# =========================================================
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+def get_camera_stream(source=0, warmup_frames: int = 10) -> CameraStream:
+    with _streams_lock:
+        stream = _streams.get(source)
+        if stream is None or not stream.running:
+            stream = CameraStream(source, warmup_frames=warmup_frames).start()
+            _streams[source] = stream
+        return stream
+
+
+def close_camera_streams():
+    with _streams_lock:
+        for stream in _streams.values():
+            stream.close()
+        _streams.clear()
+
+
+atexit.register(close_camera_streams)
+
+
+def capture_one_frame(camera_index: int = 0, warmup_frames: int = 10):
+    """
+    호출 시점 이후에 들어온 프레임 1장 (카메라는 열린 채로 유지)
+    """
+    stream = get_camera_stream(camera_index, warmup_frames=warmup_frames)
+    return stream.wait_newer_than(time.monotonic()).image
@@ -0,0 +1,198 @@
+"""
+run_to_target의 이동량 결정 전략
+
+    strategy = create_strategy("calibrated")
+    moves = strategy.plan(err)      # err = target - current (uL)
+
+- ladder     : 오차 구간별 고정 duty / duration (기존 동작), 1 iteration = 1 펄스
+- calibrated : calibration.json의 측정 펄스(delta_ul)를 조합해 오차를 한 번에 메움
+               → 카메라/OCR iteration 수 감소
+- adaptive   : online plant model(band별 uL/ms, backlash)로 duration을 직접 계산
+
+direction: 1 = CCW (분주량 감소), 0 = CW (증가)
+"""
+import math
+import os
+from typing import List, NamedTuple, Optional, Protocol
+
+from worker.calibration import Pulse, load_calibration
+from worker.paths import CALIB_JSON_PATH, CONTROL_STRATEGY
+from worker.plant_model import PlantModel, load_plant_model
+
+
+class Move(NamedTuple):
+    direction: int
+    duty: int
+    duration_ms: int
+    expected_ul: Optional[float] = None  # 모델 기반 예상 변화량 (ladder는 None)
+
+
+def direction_for(err: float) -> int:
+    return 1 if err < 0 else 0
+
+
+class ControlStrategy(Protocol):
+    name: str
+
+    def plan(self, err: int) -> List[Move]:
+        """현재 오차(target - current)에 대해 이번 iteration에 실행할 펄스 목록"""
+        ...
+
+
+# =========================================================
+# Ladder (hard-coded)
+# =========================================================
+class LadderStrategy:
+    name = "ladder"
+
+    # (최소 |err|, duty, duration_ms)
+    LADDER = (
+        (300, 60, 300),
+        (100, 45, 250),
+        (30, 35, 200),
+        (0, 25, 150),
+    )
+
+    def plan(self, err: int) -> List[Move]:
+        abs_err = abs(err)
+        for min_err, duty, duration_ms in self.LADDER:
+            if abs_err >= min_err:
+                return [Move(direction_for(err), duty, duration_ms)]
+        return []
+
+
+# =========================================================
+# Calibrated (measured volume-per-pulse model)
+# =========================================================
+class CalibratedStrategy:
+    name = "calibrated"
+
+    def __init__(self, pulses: List[Pulse], max_pulses: int = 8, fill_ratio: float = 1.0):
+        """
+        - pulses: load_calibration() 결과 (delta_ul 내림차순)
+        - max_pulses: 한 iteration에 조합할 최대 펄스 수
+        - fill_ratio: 오차 중 이번 iteration에 메울 비율 (<1이면 overshoot 보수적)
+        """
+        if not pulses:
+            raise ValueError("CalibratedStrategy needs at least one pulse")
+        self.pulses = sorted(pulses, key=lambda p: (-p.delta_ul, p.duration_ms))
+        self.max_pulses = int(max_pulses)
+        self.fill_ratio = float(fill_ratio)
+
+    @classmethod
+    def from_file(cls, path: str = CALIB_JSON_PATH, **kwargs):
+        return cls(load_calibration(path), **kwargs)
+
+    def plan(self, err: int) -> List[Move]:
+        if err == 0:
+            return []
+
+        direction = direction_for(err)
+        remaining = abs(err) * self.fill_ratio
+
+        # 큰 펄스부터 overshoot 없이 채운다
+        chosen: List[Pulse] = []
+        for pulse in self.pulses:
+            while remaining >= pulse.delta_ul and len(chosen) < self.max_pulses:
+                chosen.append(pulse)
+                remaining -= pulse.delta_ul
+
+        # 가장 작은 펄스보다 작은 오차: 한 번은 움직여야 수렴한다
+        if not chosen:
+            chosen.append(self.pulses[-1])
+
+        return [Move(direction, p.duty, p.duration_ms, p.delta_ul) for p in chosen]
+
+
+# =========================================================
+# Adaptive (online plant model)
+# =========================================================
+class AdaptiveStrategy:
+    name = "adaptive"
+
+    MIN_PULSE_MS = 80     # 이보다 짧으면 모터가 거의 반응하지 않음 (calibration 하한)
+    MAX_PULSE_MS = 1500
+    PREFERRED_MS = 400    # 이 안에 끝나는 가장 낮은 duty band 선택 (분해능 우선)
+
+    def __init__(self, model: PlantModel, max_pulses: int = 4, fill_ratio: float = 0.95):
+        self.model = model
+        self.max_pulses = int(max_pulses)
+        self.fill_ratio = float(fill_ratio)
+
+    def plan(self, err: int) -> List[Move]:
+        if err == 0:
+            return []
+
+        model = self.model
+        direction = direction_for(err)
+
+        need = abs(err) * self.fill_ratio
+        if model.last_direction is not None and model.last_direction != direction:
+            need += model.backlash(direction)
+
+        bands = range(model.n_bands)
+        band = next(
+            (b for b in bands if need / model.gain(direction, b) <= self.PREFERRED_MS),
+            model.n_bands - 1,
+        )
+        gain = model.gain(direction, band)
+        duty = model.band_duties[band]
+
+        total_ms = need / gain
+        n = min(self.max_pulses, max(1, math.ceil(total_ms / self.MAX_PULSE_MS)))
+        duration_ms = int(round(min(self.MAX_PULSE_MS, max(self.MIN_PULSE_MS, total_ms / n))))
+
+        return [Move(direction, duty, duration_ms, gain * duration_ms) for _ in range(n)]
+
+
+# =========================================================
+# Registry
+# =========================================================
+def _create_ladder(calib_path: Optional[str] = None, plant_model: Optional[PlantModel] = None):
+    return LadderStrategy()
+
+
+def _create_calibrated(calib_path: Optional[str] = None, plant_model: Optional[PlantModel] = None):
+    return CalibratedStrategy.from_file(calib_path or CALIB_JSON_PATH)
+
+
+def _create_adaptive(calib_path: Optional[str] = None, plant_model: Optional[PlantModel] = None):
+    if plant_model is None:
+        plant_model = default_plant_model(calib_path)
+    return AdaptiveStrategy(plant_model)
+
+
+STRATEGIES = {
+    "ladder": _create_ladder,
+    "calibrated": _create_calibrated,
+    "adaptive": _create_adaptive,
+}
+
+
+def default_plant_model(calib_path: Optional[str] = None) -> PlantModel:
+    """state/plant_model.json, 없으면 calibration.json (있으면) 으로 초기화"""
+    calib_path = calib_path or CALIB_JSON_PATH
+    pulses = load_calibration(calib_path) if os.path.exists(calib_path) else None
+    return load_plant_model(calib_pulses=pulses)
+
+
+def create_strategy(
+    name: Optional[str] = None,
+    calib_path: Optional[str] = None,
+    plant_model: Optional[PlantModel] = None,
+) -> ControlStrategy:
+    """
+    name: ladder | calibrated | adaptive (None이면 paths.CONTROL_STRATEGY / 환경변수 CONTROL_STRATEGY)
+    plant_model: adaptive가 사용할 모델 (None이면 state/plant_model.json 로드)
+
+    기본값 (name=None, paths.CONTROL_STRATEGY) 이 calibrated인데 calibration.json이 없으면 ladder로 대체한다.
+    명시적으로 calibrated를 요청하면 그대로 FileNotFoundError.
+    """
+    explicit = name is not None
+    name = (name or CONTROL_STRATEGY).lower()
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown control strategy: {name} (choices: {', '.join(STRATEGIES)})")
+    if not explicit and name == "calibrated" and not os.path.exists(calib_path or CALIB_JSON_PATH):
+        print(f"[STRATEGY] {calib_path or CALIB_JSON_PATH} not found, default strategy falls back to ladder")
+        name = "ladder"
+    return STRATEGIES[name](calib_path=calib_path, plant_model=plant_model)
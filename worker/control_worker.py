@@ -4,12 +4,19 @@ import time
 import sys
 
 from worker.camera import capture_one_frame
-from worker.ocr_trt import TRTWrapper, read_volume_trt
-from worker.paths import OCR_TRT_PATH
+from worker.control_strategy import ControlStrategy, create_strategy
+from worker.plant_model import PlantModel
+from worker.ocr import OcrStats, load_rois, read_volume_confident
+from worker.settle import SettleDetector, stream_frame_source
+from worker.estimator import VolumeEstimator
+from worker.roi_cache import RoiCache
+from worker.ocr_backends import OcrBackend, create_backend
 
 VOLUME_TOLERANCE = 1
 SETTLE_TIME = 0.7
 MAX_ITER = 60
+# 재판독 후에도 불확실한 판독으로 연속 대기할 최대 iteration (다이얼이 반쯤 굴러간 채 멈춘 경우 대비)
+OCR_MAX_HOLDS = 2
 
 
 def _elog(msg: str):
@@ -17,39 +24,236 @@ def _elog(msg: str):
     print(msg, file=sys.stderr, flush=True)
 
 
+def _emit_stdout(msg: dict):
+    # GUI 단발 모드: stdout 한 줄 = JSON 한 개
+    print(json.dumps(msg), flush=True)
+
+
 def run_to_target(
     target: int,
     camera_index: int = 0,
     max_iter: int = MAX_ITER,
+    ocr_backend: OcrBackend = None,
+    emit=None,
+    stop_event=None,
+    capture=None,
+    locate_rois=None,
+    strategy: ControlStrategy = None,
+    plant_model: PlantModel = None,
+    actuator=None,
+    sleep=None,
+    clock=None,
+    settle: SettleDetector = None,
+    ocr_stats: OcrStats = None,
+    estimator: VolumeEstimator = None,
+    roi_cache: RoiCache = None,
 ):
+    """
+    - ocr_backend: 이미 로드된 OCR backend (serve 모드에서 재사용). None이면 새로 로드
+    - emit: 진행 이벤트(dict) 콜백. None이면 stdout JSON
+    - stop_event: set되면 다음 step에서 중단 (threading.Event)
+    - capture: () → frame. None이면 capture_one_frame(camera_index)
+    - locate_rois: frame → rois (ROI tracker). None이면 rois.json
+    - strategy: 이동량 결정 전략 (control_strategy). None이면 create_strategy() 기본값
+    - plant_model: 매 iteration (명령 펄스, 관측 변화량)으로 online 갱신 (저장은 호출자)
+    - actuator: VolumeDCActuator. 주어지면 펄스를 직접 실행 (GUI는 이벤트만 관찰)
+    - sleep: 대기 함수 (시뮬레이터의 가상 시계). None이면 실제 시간 (stop_event로 중단 가능)
+    - clock: motor / settle / 전체 시간 측정용 monotonic 함수 (sleep과 같은 시계). None이면 time.monotonic
+    - settle: SettleDetector. 주어지면 고정 SETTLE_TIME 대신 ROI가 멈출 때까지 대기하고
+      정지 프레임을 다음 iteration OCR에 그대로 사용 (None이면 고정 sleep)
+    - ocr_stats: 누적 OcrStats (세션 / station). 이번 실행분은 반환값 "ocr"에도 들어간다
+    - estimator: VolumeEstimator. 주어지면 판독과 명령 펄스를 합친 추정치로 움직이고,
+      outlier 판독은 재캡처 없이 무시, 추정이 충분히 확실한 step은 캡처 / OCR 생략
+      (목표 도달은 항상 실제 판독으로 판단)
+    - roi_cache: RoiCache. 주어지면 직전 추론 crop과 같은 digit ROI는 추론 생략 (세션 / station마다 1개)
+
+    conf < OCR_MIN_CONF 인 digit은 새 프레임에서 그 ROI만 다시 추론한다. 그래도 불확실하면
+    - 오차가 불확실 범위(uncertainty_ul)보다 커서 방향이 확실할 때만 그 판독으로 움직이고
+    - 아니면 펄스 없이 다음 iteration에서 다시 캡처 (연속 OCR_MAX_HOLDS 번까지)
+    불확실한 판독은 plant model 갱신에 쓰지 않는다.
+
+    반환값의 "steps"에 iteration별 telemetry (capture/OCR은 실제 연산 시간,
+    motor/settle은 clock 기준) 가 들어간다.
+    """
+    emit = emit or _emit_stdout
+    clock = clock or time.monotonic
+    t_run = clock()
+
     print(">>> ENTER run_to_target()", flush=True)
     _elog("[RUN] run_to_target started (VISION ONLY)")
 
-    print("[DEBUG] before TRT load", flush=True)
-    trt_model = TRTWrapper(OCR_TRT_PATH)
-    print("[DEBUG] after TRT load", flush=True)
+    if ocr_backend is None:
+        print("[DEBUG] before OCR backend load", flush=True)
+        ocr_backend = create_backend()
+        print("[DEBUG] after OCR backend load", flush=True)
+
+    if strategy is None:
+        strategy = create_strategy()
 
     final_volume = None
     success = False
+    step = 0
+
+    meas_volume = None   # plant model 갱신 기준 (마지막으로 받아들인 판독)
+    pending_moves = []   # meas_volume 이후 실행한 펄스
+    pending_from = None  # pending_moves 직전에 실행된 방향 (backlash 판단)
+    last_rois = None
+    steps = []
+    settled_frame = None
+    run_ocr_stats = OcrStats()
+    holds = 0
+
+    def wait(seconds):
+        if sleep is not None:
+            sleep(seconds)
+        elif stop_event is not None:
+            stop_event.wait(seconds)
+        else:
+            time.sleep(seconds)
+
+    def grab():
+        return capture() if capture is not None else capture_one_frame(camera_index)
 
     for step in range(max_iter):
-        print("[DEBUG] before capture", flush=True)
-        frame = capture_one_frame(camera_index)
-        print("[DEBUG] after capture", flush=True)
-        cur_volume = int(read_volume_trt(frame, trt_model))
+        if stop_event is not None and stop_event.is_set():
+            emit({
+                "cmd": "warn",
+                "status": "cancelled",
+            })
+            _elog("[STOP] run_to_target cancelled")
+            reason = "cancelled"
+            break
+
+        rereads, reread_s = run_ocr_stats.rereads, run_ocr_stats.reread_s
+        roi_hits, roi_saved_s = run_ocr_stats.roi_hits, run_ocr_stats.roi_saved_s
+        t0 = t1 = t2 = time.perf_counter()
+        if estimator is not None and estimator.can_skip(target, VOLUME_TOLERANCE):
+            # 추정이 충분히 확실: 캡처 / OCR 없이 추정치로 다음 펄스
+            estimator.skip()
+            reading, rois, settled_frame = None, last_rois, None
+        else:
+            print("[DEBUG] before capture", flush=True)
+            if settled_frame is not None:
+                frame, settled_frame = settled_frame, None
+            else:
+                frame = grab()
+            t1 = time.perf_counter()
+            print("[DEBUG] after capture", flush=True)
+            rois = last_rois = locate_rois(frame) if locate_rois is not None else None
+            reading = read_volume_confident(
+                frame, ocr_backend, rois, recapture=grab, stats=run_ocr_stats, wait=wait, cache=roi_cache
+            )
+            t2 = time.perf_counter()
+
+        cur_volume = reading.volume if reading is not None else int(round(estimator.volume))
         err = target - cur_volume
 
         final_volume = cur_volume
 
-        # 종료 조건
+        telemetry = {
+            "step": step,
+            "current": cur_volume,
+            "error": err,
+            "direction": None,
+            "pulses": 0,
+            "motion_ms": 0,
+            "capture_s": t1 - t0,
+            "ocr_s": t2 - t1,
+            "motor_s": 0.0,
+            "settle_s": 0.0,
+            "settled": None,  # vision settle: 정지 감지 여부 (False = max wait 초과)
+            "measured": reading is not None,
+            "ocr_conf": round(min(reading.conf), 4) if reading is not None else None,
+            "ocr_valid": reading.valid if reading is not None else None,
+            "rereads": run_ocr_stats.rereads - rereads,
+            "reread_s": run_ocr_stats.reread_s - reread_s,  # ocr_s에 포함
+            "roi_hits": run_ocr_stats.roi_hits - roi_hits,  # 추론 생략한 digit ROI
+            "roi_saved_s": run_ocr_stats.roi_saved_s - roi_saved_s,  # 추정 절약 시간
+            "estimate": None,
+            "estimate_std": None,
+            "estimate_status": None,  # init / accepted / rejected / reset / skipped
+        }
+        steps.append(telemetry)
+
+        # 재판독 후에도 불확실한 digit: 방향이 바뀔 수 있으면 움직이지 않고 다시 캡처
+        if reading is not None and not reading.valid:
+            uncertainty = reading.uncertainty_ul
+            hold = abs(err) <= uncertainty + VOLUME_TOLERANCE and holds < OCR_MAX_HOLDS
+            # 진행 중 알림 (warn은 실행 종료 이벤트)
+            emit({
+                "cmd": "ocr",
+                "status": "ocr_uncertain",
+                "step": step,
+                "digits": reading.digits,
+                "conf": [round(c, 3) for c in reading.conf],
+                "uncertainty_ul": uncertainty,
+                "hold": hold,
+            })
+            _elog(
+                f"[STEP {step}] uncertain OCR digits={reading.digits} conf={min(reading.conf):.2f} "
+                f"±{uncertainty}uL" + (", re-capture" if hold else "")
+            )
+            if hold:
+                holds += 1
+                continue
+        holds = 0
+
+        # 판독 + 예측 융합: outlier 판독은 재캡처 없이 무시하고 추정치로 진행
+        status = "skipped" if reading is None else None
+        if estimator is not None:
+            if reading is not None:
+                status = estimator.update(reading)
+            cur_volume = final_volume = int(round(estimator.volume))
+            err = target - cur_volume
+            telemetry.update(
+                current=cur_volume,
+                error=err,
+                estimate=round(estimator.volume, 2),
+                estimate_std=round(estimator.std, 3),
+                estimate_status=status,
+            )
+            if status == "rejected":
+                emit({
+                    "cmd": "ocr",
+                    "status": "ocr_outlier",
+                    "step": step,
+                    "ocr_ul": reading.volume,
+                    "estimate_ul": round(estimator.volume, 2),
+                })
+                _elog(f"[STEP {step}] OCR {reading.volume} rejected, estimate={estimator.volume:.1f}")
+        measured = reading is not None and status != "rejected"
+
+        # 마지막 판독 이후 펄스 → 관측 변화량으로 plant model 갱신 (불확실 / outlier 판독은 제외)
+        if measured and reading.valid:
+            directions = {m.direction for m in pending_moves}
+            if plant_model is not None and meas_volume is not None and len(directions) == 1:
+                sign = 1 if pending_moves[0].direction == 0 else -1
+                observed = sign * (reading.volume - meas_volume)
+                predicted = plant_model.predict(pending_moves, prev_direction=pending_from)
+                residual = plant_model.update(pending_moves, observed, prev_direction=pending_from)
+                emit({
+                    "cmd": "model",
+                    "step": step,
+                    "observed_ul": observed,
+                    "predicted_ul": round(predicted, 2),
+                    "rejected": residual is None,
+                    "model": plant_model.summary(),
+                })
+            meas_volume, pending_moves = reading.volume, []
+        elif measured:
+            meas_volume, pending_moves = None, []
+
+        # 종료 조건 (실제 판독으로만)
+        if not measured and abs(err) <= VOLUME_TOLERANCE:
+            continue
         if abs(err) <= VOLUME_TOLERANCE:
-            print(json.dumps({
+            emit({
                 "cmd": "done",
                 "step": step,
                 "current": cur_volume,
                 "target": target,
                 "error": err,
-            }), flush=True)
+            })
 
             _elog("[DONE] target reached")
 
@@ -57,45 +261,77 @@ def run_to_target(
             reason = "done"
             break
 
-        direction = 1 if err < 0 else 0
-        abs_err = abs(err)
-
-        if abs_err >= 300:
-            duty = 60
-            duration_ms = 300
-        elif abs_err >= 100:
-            duty = 45
-            duration_ms = 250
-        elif abs_err >= 30:
-            duty = 35
-            duration_ms = 200
-        else:
-            duty = 25
-            duration_ms = 150
+        moves = strategy.plan(err)
+        motion_ms = sum(m.duration_ms for m in moves)
+        telemetry.update(direction=moves[0].direction, pulses=len(moves), motion_ms=motion_ms)
 
         _elog(
-            f"[STEP {step}] cur={cur_volume} err={err} "
-            f"dir={'CCW' if direction==1 else 'CW'} duty={duty} dur={duration_ms}ms"
+            f"[STEP {step}] cur={cur_volume} err={err} strategy={strategy.name} "
+            f"dir={'CCW' if moves[0].direction==1 else 'CW'} pulses="
+            + ",".join(f"{m.duty}%/{m.duration_ms}ms" for m in moves)
         )
 
-        print(json.dumps({
-            "cmd": "volume",
-            "step": step,
-            "current": cur_volume,
-            "target": target,
-            "error": err,
-            "direction": direction,
-            "duty": duty,
-            "duration_ms": duration_ms,
-        }), flush=True)
+        # 펄스마다 volume 이벤트 1개
+        # - actuator 없음: GUI가 이벤트 순서대로 run → sleep → stop
+        # - actuator 있음: 여기서 직접 실행, 이벤트는 관찰용 (executed=True)
+        t_motor = clock()
+        executed, interrupted = list(moves), None
+        for i, move in enumerate(moves):
+            emit({
+                "cmd": "volume",
+                "step": step,
+                "current": cur_volume,
+                "target": target,
+                "error": err,
+                "direction": move.direction,
+                "duty": move.duty,
+                "duration_ms": move.duration_ms,
+                "pulse": i,
+                "pulses": len(moves),
+                "expected_ul": move.expected_ul,
+                "strategy": strategy.name,
+                "executed": actuator is not None,
+            })
 
-        time.sleep(SETTLE_TIME)
+            if actuator is not None:
+                actuator.pulse(move.direction, move.duty, move.duration_ms, stop_event=stop_event)
+                if stop_event is not None and stop_event.is_set():
+                    # 이 펄스는 도중에 끊겼을 수 있고, 나머지는 실행 안 됨
+                    executed, interrupted = list(moves[:i]), move
+                    break
+
+        t_settle = clock()
+        telemetry["motor_s"] = t_settle - t_motor
+        if estimator is not None:
+            estimator.predict(executed, interrupted=interrupted)
+        if plant_model is not None:
+            if not pending_moves:
+                pending_from = plant_model.last_direction
+            # 이번 step의 갱신 여부 (outlier / 불확실 판독 / 방향 섞임) 와 무관하게 실제 방향 기록
+            plant_model.record_pulses(executed + ([interrupted] if interrupted is not None else []))
+        if interrupted is None:
+            pending_moves = pending_moves + executed
+        else:
+            # 실제 이동량을 모르므로 다음 판독은 plant model 학습에 쓰지 않는다
+            meas_volume, pending_moves = None, []
+
+        if settle is not None:
+            # (GUI 실행 시) 모터 동작 시간만큼 먼저 대기한 뒤 ROI 정지 감지
+            if actuator is None:
+                wait(motion_ms / 1000.0)
+            res = settle.wait(rois if rois is not None else load_rois(), stop_event=stop_event)
+            settled_frame = res.frame
+            telemetry["settled"] = res.settled
+        else:
+            # (GUI 실행 시) 모터 동작 시간 + 안정화 대기
+            wait(SETTLE_TIME if actuator is not None else motion_ms / 1000.0 + SETTLE_TIME)
+        telemetry["settle_s"] = clock() - t_settle
 
     else:
-        print(json.dumps({
+        emit({
             "cmd": "warn",
             "status": "max_iter"
-        }), flush=True)
+        })
 
         _elog("[WARN] max_iter reached")
 
@@ -103,6 +339,8 @@ def run_to_target(
         reason = "max_iter"
 
     _elog("[CLEANUP] run_to_target finished")
+    if ocr_stats is not None:
+        ocr_stats.add(run_ocr_stats)
 
     # ✅ 실험/테스트용 반환값
     return {
@@ -110,5 +348,53 @@ def run_to_target(
         "final_ul": final_volume,
         "target_ul": target,
         "iterations": step + 1,
-        "reason": reason
+        "reason": reason,
+        "elapsed_s": clock() - t_run,
+        "steps": steps,
+        "ocr": run_ocr_stats.as_dict(),
+        "estimator": estimator.stats() if estimator is not None else None,
     }
+
+
+def run_session_target(
+    target: int,
+    plant_model: PlantModel,
+    plant_model_path: str = None,
+    strategy: str = None,
+    calib_path: str = None,
+    camera=None,
+    rotate: int = 0,
+    vision_settle: bool = True,
+    use_estimator: bool = True,
+    **kwargs,
+) -> dict:
+    """
+    WorkerSession / Station 공용: 목표 1개 실행 준비 + run_to_target + plant model 저장
+    - strategy: 전략 이름 (None이면 paths.CONTROL_STRATEGY). calibration.json 변경이 바로 반영되도록
+      목표마다 생성 (가벼움), plant_model을 공유
+    - camera: CameraStream. vision_settle이면 rotate를 적용한 ROI 정지 감지에 사용 (capture와 같은 rotate)
+    - use_estimator: 목표마다 새 VolumeEstimator (실행 사이에 다이얼을 손으로 돌렸을 수 있음)
+    - plant_model_path: 저장 경로 (None이면 기본 state/plant_model.json)
+    - kwargs: 나머지 run_to_target 인자 (capture / locate_rois / actuator / ocr_backend / ...)
+    """
+    strategy = create_strategy(strategy, calib_path=calib_path, plant_model=plant_model)
+    settle = None
+    if vision_settle and camera is not None:
+        settle = SettleDetector(stream_frame_source(camera, rotate))
+    estimator = VolumeEstimator(plant_model) if use_estimator else None
+
+    try:
+        return run_to_target(
+            target=target,
+            strategy=strategy,
+            plant_model=plant_model,
+            settle=settle,
+            estimator=estimator,
+            **kwargs,
+        )
+    finally:
+        # 중간에 실패/취소돼도 그때까지의 추정치는 유지
+        if plant_model_path is None:
+            plant_model.save()
+        else:
+            plant_model.save(plant_model_path)
@@ -0,0 +1,168 @@
+"""
+Volume state estimator: OCR 판독 + 명령 펄스 + plant model 을 합친 1차원 Kalman filter
+
+    est = VolumeEstimator(plant_model)
+    est.update(reading)            # OcrReading → "init" / "accepted" / "rejected" / "reset"
+    est.predict(moves)             # 펄스 실행 후: 예상 변화량만큼 이동, 분산 증가
+    if est.can_skip(target): ...   # 다음 펄스 방향/크기가 확실하면 OCR 생략
+
+- 상태: 분주량 추정치 volume (uL) 과 분산 var
+- predict: plant model 예측 (없으면 Move.expected_ul) 만큼 이동.
+  process noise = (pulse_rel_std × 예측)² + pulse_abs_std² + plant model 파라미터 분산
+- update: 판독 분산 = meas_std² + (reading.uncertainty_ul / 2)² (반쯤 굴러간 / 가려진 바퀴는 덜 믿음).
+  innovation이 gate σ 밖이면 오독으로 보고 무시 (재캡처 없음). 연속 max_rejects 번이면
+  모델 쪽이 틀린 것 (미끄러짐 등) 으로 보고 판독값으로 다시 시작
+- can_skip: 추정 오차가 tolerance + gate σ 보다 커서 어차피 같은 방향으로 더 가야 하면
+  OCR 없이 추정치로 다음 펄스 (연속 max_blind_steps 번까지).
+  목표 도달 판단은 항상 실제 판독으로 한다
+- 목표 근처 짧은 펄스는 정지 마찰 / 유격 때문에 예측보다 훨씬 덜 (또는 더) 움직이므로
+  pulse_abs_std 를 작게 잡으면 정상 판독을 outlier로 버린다 (시뮬레이터 기준 2.5 uL)
+"""
+import math
+from typing import Optional
+
+from worker.plant_model import PlantModel
+
+
+class VolumeEstimator:
+    def __init__(
+        self,
+        plant_model: Optional[PlantModel] = None,
+        meas_std: float = 0.5,
+        pulse_rel_std: float = 0.2,
+        pulse_abs_std: float = 2.5,
+        gate: float = 4.0,
+        max_rejects: int = 2,
+        max_blind_steps: int = 2,
+    ):
+        """
+        - meas_std: 정상 판독 표준편차 (정수 표시 반올림 + 잔여 OCR 오차)
+        - pulse_rel_std / pulse_abs_std: 펄스 1회 변화량의 상대 / 절대 표준편차
+        - gate: outlier 판정 (innovation / σ)
+        - max_blind_steps: 연속으로 OCR을 생략할 수 있는 최대 step 수
+        """
+        self.plant_model = plant_model
+        self.meas_std = float(meas_std)
+        self.pulse_rel_std = float(pulse_rel_std)
+        self.pulse_abs_std = float(pulse_abs_std)
+        self.gate = float(gate)
+        self.max_rejects = int(max_rejects)
+        self.max_blind_steps = int(max_blind_steps)
+
+        self.volume: Optional[float] = None
+        self.var = math.inf
+        self.blind_steps = 0
+        self._reject_run = 0
+
+        self.updates = 0
+        self.rejected = 0
+        self.resets = 0
+        self.skipped = 0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+    @property
+    def initialized(self) -> bool:
+        return self.volume is not None
+
+    # =========================
+    # Predict (명령 펄스)
+    # =========================
+    def expected_delta(self, moves) -> Optional[float]:
+        """moves 실행 시 예상 변화량 (uL, 부호 포함). 예측 수단이 없으면 None"""
+        if not moves:
+            return 0.0
+        sign = 1.0 if moves[0].direction == 0 else -1.0
+        if self.plant_model is not None:
+            return sign * self.plant_model.predict(moves)
+        if all(m.expected_ul is not None for m in moves):
+            return sign * sum(m.expected_ul for m in moves)
+        return None
+
+    def predict(self, moves, interrupted=None) -> Optional[float]:
+        """
+        펄스 실행 후 호출. returns: 적용한 예상 변화량 (예측 불가면 None, 분산 무한대)
+        - moves: 끝까지 실행된 펄스
+        - interrupted: 도중에 끊긴 펄스 (취소). 어디서 멈췄는지 모르므로 0 ~ 전체 균등분포로 반영
+        """
+        if not self.initialized:
+            return None
+        all_moves = list(moves) + ([interrupted] if interrupted is not None else [])
+        if not all_moves:
+            return None
+        delta = self.expected_delta(moves)
+        cut = self.expected_delta([interrupted]) if interrupted is not None else 0.0
+        if delta is None or cut is None:
+            self.var = math.inf
+            return None
+
+        full = delta + cut
+        q = (self.pulse_rel_std * full) ** 2 + self.pulse_abs_std ** 2 + cut * cut / 12.0
+        if self.plant_model is not None:
+            q += self.plant_model.predict_var(all_moves)
+        self.volume += delta + cut / 2.0
+        self.var += q
+        return delta + cut / 2.0
+
+    # =========================
+    # Update (OCR 판독)
+    # =========================
+    def measurement_std(self, reading) -> float:
+        return math.hypot(self.meas_std, reading.uncertainty_ul / 2.0)
+
+    def update(self, reading) -> str:
+        """reading: worker.ocr.OcrReading"""
+        z = float(reading.volume)
+        r = self.measurement_std(reading) ** 2
+        self.blind_steps = 0
+
+        if not self.initialized or math.isinf(self.var):
+            self._reset(z, r)
+            return "init"
+
+        innovation = z - self.volume
+        s = self.var + r
+        if innovation * innovation > self.gate * self.gate * s:
+            self._reject_run += 1
+            if self._reject_run < self.max_rejects:
+                self.rejected += 1
+                return "rejected"
+            # 연속으로 어긋남: 판독이 아니라 예측이 틀림 (미끄러짐 / 모델 오차)
+            self.resets += 1
+            self._reset(z, r)
+            return "reset"
+
+        k = self.var / s
+        self.volume += k * innovation
+        self.var *= 1.0 - k
+        self._reject_run = 0
+        self.updates += 1
+        return "accepted"
+
+    def _reset(self, volume: float, var: float):
+        self.volume = volume
+        self.var = var
+        self._reject_run = 0
+
+    # =========================
+    # OCR 생략 판단
+    # =========================
+    def can_skip(self, target: float, tolerance: float) -> bool:
+        if not self.initialized or self.blind_steps >= self.max_blind_steps:
+            return False
+        return abs(target - self.volume) > tolerance + self.gate * self.std
+
+    def skip(self):
+        """이번 step은 판독 없이 추정치 사용"""
+        self.blind_steps += 1
+        self.skipped += 1
+
+    def stats(self) -> dict:
+        return {
+            "updates": self.updates,
+            "rejected": self.rejected,
+            "resets": self.resets,
+            "skipped": self.skipped,
+        }
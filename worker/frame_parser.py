@@ -0,0 +1,132 @@
+"""
+RX 스트림 → 13-byte frame 파서 (incremental, 선형 시간)
+
+    EA EB | ID | LEN(07) | CMD | DATA0..DATA5 | CHECKSUM | ED
+
+- header(EA EB) 위치는 bytes.find 로 찾고 (정렬된 스트림이면 find 생략), 후보 13 byte를 LEN / ETX / checksum 으로 검증
+  (checksum은 송신 쪽과 같은 MakePacket._checksum)
+- 검증 실패 시 후보 시작 다음 byte부터 다시 header 탐색 (payload 안의 0xED로 frame이 잘리지 않음)
+- 처리한 byte는 feed() 끝에서 한 번에 버린다 (byte 단위 pop(0) / frame마다 slice 복사 없음)
+- 결과는 typed record: StatusFrame (0x11), FeedbackFrame (0x07), 나머지는 Frame
+"""
+from typing import List, NamedTuple, Union
+
+from worker.make_packet import MakePacket
+
+FRAME_LEN = 13
+HEADER = bytes((MakePacket.HEADER1, MakePacket.HEADER2))
+LEN = MakePacket.LEN
+ETX = MakePacket.ENDOFBYTE
+STATUS_CMD = 0x11
+FEEDBACK_CMD = MakePacket.MIGHTYZAP_GetFeedbackData
+
+
+class Frame(NamedTuple):
+    actuator_id: int
+    cmd: int
+    data: bytes   # DATA0..DATA5
+    raw: bytes
+
+
+class StatusFrame(NamedTuple):
+    actuator_id: int
+    moving: int
+    raw: bytes
+
+
+class FeedbackFrame(NamedTuple):
+    actuator_id: int
+    position: int  # DATA0 | DATA1 << 8 (set_position과 같은 little endian)
+    raw: bytes
+
+
+Record = Union[Frame, StatusFrame, FeedbackFrame]
+
+
+def decode(raw: bytes) -> Record:
+    actuator_id, cmd = raw[2], raw[4]
+    if cmd == STATUS_CMD:
+        return StatusFrame(actuator_id, raw[8], raw)
+    if cmd == FEEDBACK_CMD:
+        return FeedbackFrame(actuator_id, raw[5] | (raw[6] << 8), raw)
+    return Frame(actuator_id, cmd, raw[5:11], raw)
+
+
+class FrameParser:
+    def __init__(self, verify_checksum: bool = True):
+        self.verify_checksum = verify_checksum
+        self._buf = bytearray()
+        self.reset_stats()
+
+    def reset(self):
+        self._buf.clear()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.bad_length = 0
+        self.bad_checksum = 0
+        self.bad_etx = 0
+        self.skipped_bytes = 0  # header 밖에서 버린 byte
+
+    def stats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "bad_length": self.bad_length,
+            "bad_checksum": self.bad_checksum,
+            "bad_etx": self.bad_etx,
+            "skipped_bytes": self.skipped_bytes,
+            "buffered": len(self._buf),
+        }
+
+    @property
+    def errors(self) -> int:
+        return self.bad_length + self.bad_checksum + self.bad_etx
+
+    def feed(self, data) -> List[Record]:
+        """수신 byte를 추가하고 완성된 frame을 순서대로 반환"""
+        buf = self._buf
+        buf += data
+        out = []
+        append = out.append
+        find = buf.find
+        verify = self.verify_checksum
+        record = decode
+        checksum = MakePacket._checksum
+
+        pos, n = 0, len(buf)
+        while n - pos >= FRAME_LEN:
+            if buf[pos] != HEADER[0] or buf[pos + 1] != HEADER[1]:
+                start = find(HEADER, pos)
+                if start < 0:
+                    # 마지막 byte가 EA면 다음 chunk의 EB와 header가 될 수 있음
+                    keep = 1 if buf[-1] == HEADER[0] else 0
+                    self.skipped_bytes += n - keep - pos
+                    pos = n - keep
+                    break
+
+                self.skipped_bytes += start - pos
+                pos = start
+                if n - pos < FRAME_LEN:
+                    break
+
+            end = pos + FRAME_LEN
+            raw = bytes(buf[pos:end])
+            if raw[3] != LEN:
+                self.bad_length += 1
+            elif raw[12] != ETX:
+                self.bad_etx += 1
+            elif verify and checksum(raw) != raw[11]:
+                self.bad_checksum += 1
+            else:
+                append(record(raw))
+                pos = end
+                continue
+
+            # 잘못된 후보: header 첫 byte만 버리고 재탐색
+            self.skipped_bytes += 1
+            pos += 1
+
+        self.frames += len(out)
+        if pos:
+            del buf[:pos]
+        return out
@@ -0,0 +1,305 @@
+"""
+Backend-agnostic OCR (ROI 로딩 / 배치 구성 / 분주량 계산)
+
+추론 자체는 worker.ocr_backends 의 OcrBackend 가 담당한다.
+
+    reading = read_volume(frame, backend)          # OcrReading: digits / conf / prob / valid
+    reading = read_volume_confident(frame, backend, rois, recapture=grab, stats=stats)
+    # 판독이 불확실하면 conf < OCR_MIN_CONF 인 digit만 새 프레임에서 다시 추론 (최대 OCR_MAX_REREADS 번)
+    reading = read_volume(frame, backend, rois, cache=RoiCache())
+    # 직전 추론 crop과 같은 ROI는 추론 생략 (worker.roi_cache)
+
+volume은 바퀴 4개의 확률 전체를 counter carry 규칙으로 함께 해석한 값 (worker.odometer).
+"""
+import json
+import os
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from worker.paths import OCR_DEBUG_CROPS, OCR_MIN_CONF, ROIS_JSON_PATH
+from worker.ocr_preprocess import INPUT_SIZE, crop_rois, preprocess_crops
+from worker.odometer import VOLUME_WEIGHTS, OdometerDecode, get_decoder
+from worker.roi_cache import RoiCache
+
+OCR_MAX_REREADS = 2
+
+# 디버그 crop 기록 (JPEG 인코딩 4회라 hot path에서 무시 못 할 비용)
+SAVE_DEBUG_CROPS = OCR_DEBUG_CROPS
+
+
+# =========================================================
+# Logits → prediction (모든 backend 공통)
+# =========================================================
+def softmax_predict(logits: np.ndarray):
+    """
+    logits: (N, num_classes)
+    return: (cls list, conf list, prob (N, num_classes))
+    """
+    logits = np.asarray(logits, dtype=np.float32).reshape((logits.shape[0], -1))
+    n = logits.shape[0]
+
+    e_x = np.exp(logits - np.max(logits, axis=1, keepdims=True))
+    prob = e_x / np.sum(e_x, axis=1, keepdims=True)
+
+    cls = prob.argmax(axis=1).astype(int)
+    conf = prob[np.arange(n), cls]
+    return cls.tolist(), conf.tolist(), prob
+
+
+# =========================================================
+# Reading (digit별 확률 보존)
+# =========================================================
+class OcrReading(NamedTuple):
+    digits: List[int]    # 천 / 백 / 십 / 일 (바퀴별 argmax)
+    conf: List[float]    # digit별 softmax 확률 (argmax)
+    prob: np.ndarray     # (4, num_classes)
+    min_conf: float      # valid 판단 기준
+    decoded: Optional[OdometerDecode] = None  # counter 규칙 decoding (None이면 argmax 합)
+
+    @property
+    def volume(self) -> int:
+        if self.decoded is not None:
+            return self.decoded.volume
+        return sum(d * w for d, w in zip(self.digits, VOLUME_WEIGHTS))
+
+    @property
+    def low(self) -> List[int]:
+        """min_conf 미만 digit index"""
+        return [i for i, c in enumerate(self.conf) if c < self.min_conf]
+
+    @property
+    def in_transition(self) -> bool:
+        """바퀴들이 한 값으로 모이지 않음 (굴러가는 중 캡처 / 가려짐)"""
+        return self.decoded is not None and self.decoded.in_transition
+
+    @property
+    def valid(self) -> bool:
+        # decoding이 있으면 반쯤 굴러간 바퀴 (conf 낮음) 도 volume ±1로 해석되면 유효
+        if self.decoded is not None:
+            return not self.decoded.in_transition
+        return not self.low
+
+    @property
+    def uncertainty_ul(self) -> int:
+        """판독이 달라질 수 있는 양 (decoding: 그럴듯한 후보 범위, 아니면 저신뢰 digit의 2순위 class)"""
+        if self.decoded is not None:
+            return self.decoded.spread_ul
+        total = 0
+        for i in self.low:
+            alt = int(np.argsort(self.prob[i])[-2])
+            total += VOLUME_WEIGHTS[i] * abs(alt - self.digits[i])
+        return total
+
+    def merge(self, indices, other: "OcrReading") -> "OcrReading":
+        """indices 자리의 other 판독 (other.digits[k] ↔ indices[k]) 중 더 확실한 쪽으로 교체"""
+        digits, conf, prob = list(self.digits), list(self.conf), self.prob.copy()
+        for k, i in enumerate(indices):
+            if other.conf[k] >= conf[i]:
+                digits[i], conf[i], prob[i] = other.digits[k], other.conf[k], other.prob[k]
+        return _reading(digits, conf, prob, self.min_conf, decode=self.decoded is not None)
+
+
+def _reading(digits, conf, prob, min_conf: float, decode: bool = True) -> OcrReading:
+    prob = np.asarray(prob)
+    decoded = None
+    if decode and prob.shape[0] == len(VOLUME_WEIGHTS) and prob.shape[1] >= 10:
+        decoded = get_decoder().decode(prob)
+    return OcrReading(digits, conf, prob, float(min_conf), decoded)
+
+
+class OcrStats:
+    """판독 횟수 / 저신뢰 digit 재판독 횟수 / 비용 / ROI cache hit (누적)"""
+
+    FIELDS = (
+        "readings", "low_conf", "rereads", "reread_rois", "reread_s", "unresolved",
+        "roi_lookups", "roi_hits", "roi_saved_s",
+    )
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def add(self, other: "OcrStats"):
+        for name in self.FIELDS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def as_dict(self) -> dict:
+        out = {name: getattr(self, name) for name in self.FIELDS}
+        out["reread_s"] = round(self.reread_s, 4)
+        out["roi_saved_s"] = round(self.roi_saved_s, 4)
+        out["low_conf_rate"] = round(self.low_conf / self.readings, 4) if self.readings else 0.0
+        out["roi_hit_rate"] = round(self.roi_hits / self.roi_lookups, 4) if self.roi_lookups else 0.0
+        return out
+
+
+# =========================================================
+# ROI loading
+# =========================================================
+def load_rois(path: str = ROIS_JSON_PATH):
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"ROIs not found: {path}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        rois = json.load(f)
+
+    if not isinstance(rois, list) or len(rois) == 0:
+        raise RuntimeError(f"Invalid ROIs: {rois}")
+
+    return rois
+
+
+def sorted_digit_rois(rois):
+    # 위 → 아래 (천/백/십/일)
+    return sorted(rois, key=lambda r: r[1])[:4]
+
+
+# =========================================================
+# Main OCR logic
+# =========================================================
+def input_batch(backend, n: int) -> np.ndarray:
+    """backend가 입력 버퍼를 제공하면 (TRT pinned memory) 그 위에 바로 기록"""
+    shape = (n, 3) + INPUT_SIZE
+    get_buffer = getattr(backend, "input_buffer", None)
+    if get_buffer is not None:
+        return get_buffer(shape)
+    return np.empty(shape, dtype=np.float32)
+
+
+def _infer_crops(crops, backend, min_conf: float, decode: bool) -> OcrReading:
+    batch = input_batch(backend, len(crops))
+    preprocess_crops(crops, out=batch)
+
+    pred_cls, pred_conf, prob = backend.infer(batch)
+    return _reading([int(d) for d in pred_cls], [float(c) for c in pred_conf], prob, min_conf, decode)
+
+
+def _infer_cached(crops, backend, cache: RoiCache, min_conf: float, decode: bool, stats) -> OcrReading:
+    """cache miss ROI만 모아 작은 batch로 추론, hit는 저장된 결과 재사용"""
+    signatures = [cache.signature(c) for c in crops]
+    entries = [cache.lookup(i, s) for i, s in enumerate(signatures)]
+    miss = [i for i, e in enumerate(entries) if e is None]
+
+    digits = [0] * len(crops)
+    conf = [0.0] * len(crops)
+    rows: List[Optional[np.ndarray]] = [None] * len(crops)
+    for i, e in enumerate(entries):
+        if e is not None:
+            digits[i], conf[i], rows[i] = e.digit, e.conf, e.prob
+
+    hits = len(crops) - len(miss)
+    saved_s = hits * (cache.row_cost_s or 0.0)
+    if miss:
+        t0 = time.perf_counter()
+        part = _infer_crops([crops[i] for i in miss], backend, min_conf, decode=False)
+        cache.observe_cost(time.perf_counter() - t0, len(miss))
+        for k, i in enumerate(miss):
+            digits[i], conf[i], rows[i] = part.digits[k], part.conf[k], part.prob[k]
+            cache.store(i, signatures[i], part.digits[k], part.conf[k], part.prob[k])
+
+    if stats is not None:
+        stats.roi_lookups += len(crops)
+        stats.roi_hits += hits
+        stats.roi_saved_s += saved_s
+    return _reading(digits, conf, np.stack(rows), min_conf, decode)
+
+
+def read_volume(
+    frame: np.ndarray,
+    backend,
+    rois=None,
+    save_crops=None,
+    min_conf: Optional[float] = None,
+    decode: bool = True,
+    cache: Optional[RoiCache] = None,
+    stats: Optional[OcrStats] = None,
+) -> OcrReading:
+    """
+    save_crops: /tmp/ocr_roi_i.jpg 기록 여부 (None이면 SAVE_DEBUG_CROPS)
+    min_conf: 저신뢰 digit 기준 (None이면 OCR_MIN_CONF)
+    decode: odometer decoding (False면 digit별 argmax 합, conf 기준으로만 valid)
+    cache: RoiCache. 주어지면 직전 추론 crop과 같은 ROI는 추론하지 않음 (hit 수 / 절약 시간은 stats에)
+    """
+    if rois is None:
+        rois = load_rois()
+    rois = sorted_digit_rois(rois)
+
+    crops = crop_rois(frame, rois)
+    if SAVE_DEBUG_CROPS if save_crops is None else save_crops:
+        for i, crop in enumerate(crops):
+            cv2.imwrite(f"/tmp/ocr_roi_{i}.jpg", crop)
+
+    if len(crops) < 4:
+        raise RuntimeError("Not enough ROIs")
+
+    min_conf = OCR_MIN_CONF if min_conf is None else min_conf
+    if cache is not None:
+        return _infer_cached(crops[:4], backend, cache, min_conf, decode, stats)
+    return _infer_crops(crops[:4], backend, min_conf, decode)
+
+
+def reread_digits(
+    reading: OcrReading, frame: np.ndarray, backend, rois, indices=None, cache: Optional[RoiCache] = None
+) -> OcrReading:
+    """
+    indices (기본: reading.low) 자리의 ROI만 frame에서 다시 잘라 추론하고 합친다 (decoding도 다시)
+    cache: 재판독은 항상 추론 (새 프레임이 목적), 결과만 cache에 기록
+    """
+    indices = reading.low if indices is None else list(indices)
+    if not indices:
+        return reading
+    rois = sorted_digit_rois(rois)
+    crops = crop_rois(frame, [rois[i] for i in indices])
+    other = _infer_crops(crops, backend, reading.min_conf, decode=False)
+    if cache is not None:
+        for k, i in enumerate(indices):
+            cache.store(i, cache.signature(crops[k]), other.digits[k], other.conf[k], other.prob[k])
+    return reading.merge(indices, other)
+
+
+def read_volume_confident(
+    frame: np.ndarray,
+    backend,
+    rois=None,
+    recapture: Callable[[], np.ndarray] = None,
+    max_rereads: int = OCR_MAX_REREADS,
+    stats: Optional[OcrStats] = None,
+    min_conf: Optional[float] = None,
+    wait: Callable[[float], None] = None,
+    reread_delay_s: float = 0.03,
+    cache: Optional[RoiCache] = None,
+) -> OcrReading:
+    """
+    판독이 불확실하면 (valid False) recapture()로 새 프레임을 받아 저신뢰 digit ROI만
+    (없으면 4개 모두) 다시 추론 (최대 max_rereads 번).
+    그래도 남으면 reading.valid == False 그대로 반환 (호출자가 그 판독으로 움직이지 않도록)
+
+    - recapture: 새 프레임 함수 (None이면 재판독 없음)
+    - wait: 재캡처 전 대기 (기본 time.sleep, 시뮬레이터는 가상 시계). 같은 프레임을 다시 받지 않도록
+      reread_delay_s (약 1 프레임) 만큼
+    - cache: RoiCache (첫 판독만 사용, 재판독은 항상 추론)
+    """
+    if rois is None:
+        rois = load_rois()
+    reading = read_volume(frame, backend, rois=rois, min_conf=min_conf, cache=cache, stats=stats)
+    if stats is not None:
+        stats.readings += 1
+        stats.low_conf += not reading.valid
+
+    rereads = 0
+    t0 = time.perf_counter()
+    while not reading.valid and recapture is not None and rereads < max_rereads:
+        (wait or time.sleep)(reread_delay_s)
+        low = reading.low or list(range(len(reading.digits)))
+        reading = reread_digits(reading, recapture(), backend, rois, low, cache=cache)
+        rereads += 1
+        if stats is not None:
+            stats.rereads += 1
+            stats.reread_rois += len(low)
+
+    if stats is not None and rereads:
+        stats.reread_s += time.perf_counter() - t0
+        stats.unresolved += not reading.valid
+    return reading
@@ -0,0 +1,118 @@
+"""
+Pluggable OCR inference backends
+
+    backend = create_backend("onnx", threads=2)
+    cls, conf, prob = backend.infer(batch)   # batch: (N,3,224,224) float32
+
+- trt    : TensorRT (GPU, worker.ocr_trt.TRTWrapper)
+- onnx   : ONNX Runtime CPU
+- opencv : OpenCV DNN CPU
+
+각 backend의 무거운 import(tensorrt/pycuda, onnxruntime)는 생성 시점에만 일어난다.
+"""
+import os
+from typing import List, Optional, Protocol, Tuple
+
+import cv2
+import numpy as np
+
+from worker.ocr import softmax_predict
+from worker.paths import OCR_BACKEND, OCR_ONNX_PATH, OCR_TRT_PATH
+
+
+class OcrBackend(Protocol):
+    name: str
+
+    def infer(self, batch: np.ndarray) -> Tuple[List[int], List[float], np.ndarray]:
+        """(N,3,224,224) float32 → (cls, conf, prob)"""
+        ...
+
+
+# =========================================================
+# ONNX Runtime (CPU)
+# =========================================================
+class OnnxRuntimeBackend:
+    name = "onnx"
+
+    def __init__(self, model_path: str = OCR_ONNX_PATH, threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+
+        opts = ort.SessionOptions()
+        if threads:
+            opts.intra_op_num_threads = int(threads)
+            opts.inter_op_num_threads = 1
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        self.session = ort.InferenceSession(
+            model_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.output_name = self.session.get_outputs()[0].name
+
+    def infer(self, batch: np.ndarray):
+        batch = np.ascontiguousarray(batch, dtype=np.float32)
+        logits = self.session.run([self.output_name], {self.input_name: batch})[0]
+        return softmax_predict(logits)
+
+
+# =========================================================
+# OpenCV DNN (CPU)
+# =========================================================
+class OpenCVDnnBackend:
+    name = "opencv"
+
+    def __init__(self, model_path: str = OCR_ONNX_PATH, threads: Optional[int] = None):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(model_path)
+
+        if threads:
+            cv2.setNumThreads(int(threads))
+
+        self.net = cv2.dnn.readNetFromONNX(model_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def infer(self, batch: np.ndarray):
+        self.net.setInput(np.ascontiguousarray(batch, dtype=np.float32))
+        logits = self.net.forward()
+        return softmax_predict(logits)
+
+
+# =========================================================
+# Registry
+# =========================================================
+def _create_trt(model_path: Optional[str] = None, threads: Optional[int] = None):
+    from worker.ocr_trt import TRTWrapper
+    return TRTWrapper(model_path or OCR_TRT_PATH)
+
+
+def _create_onnx(model_path: Optional[str] = None, threads: Optional[int] = None):
+    return OnnxRuntimeBackend(model_path or OCR_ONNX_PATH, threads=threads)
+
+
+def _create_opencv(model_path: Optional[str] = None, threads: Optional[int] = None):
+    return OpenCVDnnBackend(model_path or OCR_ONNX_PATH, threads=threads)
+
+
+BACKENDS = {
+    "trt": _create_trt,
+    "onnx": _create_onnx,
+    "opencv": _create_opencv,
+}
+
+
+def create_backend(
+    name: Optional[str] = None,
+    model_path: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> OcrBackend:
+    """
+    name: trt | onnx | opencv (None이면 paths.OCR_BACKEND / 환경변수 OCR_BACKEND)
+    """
+    name = (name or OCR_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name} (choices: {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_path=model_path, threads=threads)
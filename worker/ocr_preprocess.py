@@ -0,0 +1,183 @@
+"""
+Torch-free OCR preprocessing (NumPy only)
+
+학습 코드의 torchvision 파이프라인과 동일한 결과를 낸다:
+    PIL RGB → Resize(224, antialias=True) → ToTensor → Normalize
+
+Resize는 PIL의 BILINEAR resample(축소 시 antialias 포함)을 고정소수점까지
+그대로 재현한다 (horizontal pass → uint8 → vertical pass → uint8).
+"""
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+INPUT_SIZE = (224, 224)
+NORM_MEAN = [0.485, 0.456, 0.406]  # RGB
+NORM_STD  = [0.229, 0.224, 0.225]  # RGB
+
+# PIL Resample.c 와 동일
+_PRECISION_BITS = 32 - 8 - 2
+
+_MEAN = np.array(NORM_MEAN, dtype=np.float32).reshape(1, 3, 1, 1)
+_STD = np.array(NORM_STD, dtype=np.float32).reshape(1, 3, 1, 1)
+
+
+# =========================================================
+# PIL BILINEAR coefficients
+# =========================================================
+@lru_cache(maxsize=64)
+def _bilinear_coeffs(in_size: int, out_size: int):
+    """
+    return: (index, weight) 각각 (K, out_size)
+    - index: 입력 좌표 (K개 tap)
+    - weight: 고정소수점 가중치 (int32), 전부 0인 tap은 제외
+    """
+    scale = float(in_size) / out_size
+    filterscale = max(scale, 1.0)
+    support = 1.0 * filterscale
+    ksize = int(np.ceil(support)) * 2 + 1
+
+    index = np.zeros((ksize, out_size), dtype=np.intp)
+    weight = np.zeros((ksize, out_size), dtype=np.int32)
+
+    ss = 1.0 / filterscale
+    for xx in range(out_size):
+        center = (xx + 0.5) * scale
+        xmin = max(int(center - support + 0.5), 0)
+        xmax = min(int(center + support + 0.5), in_size) - xmin
+
+        x = np.arange(xmax)
+        w = np.maximum(0.0, 1.0 - np.abs((x + xmin - center + 0.5) * ss))
+        ww = w.sum()
+        if ww != 0.0:
+            w = w / ww
+
+        index[:xmax, xx] = xmin + x
+        index[xmax:, xx] = xmin  # 가중치 0, 인덱스만 유효하게
+        weight[:xmax, xx] = (0.5 + w * (1 << _PRECISION_BITS)).astype(np.int32)
+
+    used = weight.any(axis=1)
+    index = np.ascontiguousarray(index[used])
+    weight = np.ascontiguousarray(weight[used])
+
+    index.setflags(write=False)
+    weight.setflags(write=False)
+    return index, weight
+
+
+def _resample_axis(x: np.ndarray, axis: int, out_size: int) -> np.ndarray:
+    """
+    x: (N,C,H,W) 0~255 정수 배열, axis 방향 resample
+    return: int32, 0~255 (PIL의 pass 간 uint8 clip과 동일)
+    """
+    in_size = x.shape[axis]
+    if in_size == out_size:
+        return x
+
+    index, weight = _bilinear_coeffs(in_size, out_size)
+
+    shape = [1] * x.ndim
+    shape[axis] = out_size
+    out_shape = x.shape[:axis] + (out_size,) + x.shape[axis + 1:]
+
+    acc = np.empty(out_shape, dtype=np.int32)
+    tmp = np.empty(out_shape, dtype=np.int32)
+
+    np.multiply(np.take(x, index[0], axis=axis), weight[0].reshape(shape), out=acc)
+    for k in range(1, index.shape[0]):
+        np.multiply(np.take(x, index[k], axis=axis), weight[k].reshape(shape), out=tmp)
+        acc += tmp
+
+    acc += 1 << (_PRECISION_BITS - 1)
+    acc >>= _PRECISION_BITS
+    np.clip(acc, 0, 255, out=acc)
+    return acc
+
+
+def resize_bilinear_aa(x_nchw: np.ndarray, size=INPUT_SIZE) -> np.ndarray:
+    """
+    (N,C,H,W) uint8 → (N,C,size[0],size[1]) 0~255
+    PIL BILINEAR resize와 bit 단위 동일
+    """
+    out_h, out_w = size
+    x = _resample_axis(x_nchw, 3, out_w)  # horizontal first (PIL 순서)
+    return _resample_axis(x, 2, out_h)
+
+
+# =========================================================
+# ROI crop
+# =========================================================
+def crop_rois(frame: np.ndarray, rois: Sequence) -> List[np.ndarray]:
+    """(x,y,w,h) ROI → frame view 리스트 (프레임 경계로 clamp)"""
+    h, w = frame.shape[:2]
+    crops = []
+
+    for i, (x, y, rw, rh) in enumerate(rois):
+        x1 = max(0, min(w - 1, int(x)))
+        y1 = max(0, min(h - 1, int(y)))
+        x2 = max(0, min(w, x1 + int(rw)))
+        y2 = max(0, min(h, y1 + int(rh)))
+
+        crop = frame[y1:y2, x1:x2]
+        if crop.size == 0:
+            raise RuntimeError(f"Empty ROI{i}")
+        crops.append(crop)
+
+    return crops
+
+
+# =========================================================
+# Batch preprocessing
+# =========================================================
+def _to_planar_rgb(stacked_bgr: np.ndarray) -> np.ndarray:
+    """(n,H,W,3) BGR → (n,3,H,W) RGB (contiguous, 이후 resample이 행/열 단위 연속 접근)"""
+    return np.ascontiguousarray(stacked_bgr[..., ::-1].transpose(0, 3, 1, 2))
+
+
+def _normalize_into(resized: np.ndarray, dst: np.ndarray):
+    """(n,3,H,W) 0~255 → dst float32, ToTensor + Normalize"""
+    np.divide(resized, np.float32(255.0), out=dst, dtype=np.float32)
+    np.subtract(dst, _MEAN, out=dst)
+    np.divide(dst, _STD, out=dst)
+
+
+def preprocess_crops(crops: Sequence[np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    BGR crop 리스트 → (N,3,224,224) float32
+    - 같은 크기의 crop끼리 묶어 한 번에 resize (ROI는 보통 모두 같은 크기)
+    - out: 결과를 기록할 배열 (예: TRTWrapper.input_buffer). None이면 새로 할당
+    """
+    n = len(crops)
+    shape = (n, 3) + INPUT_SIZE
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape or out.dtype != np.float32:
+        raise ValueError(f"out must be float32 {shape}, got {out.dtype} {out.shape}")
+
+    groups = {}
+    for i, c in enumerate(crops):
+        groups.setdefault(c.shape, []).append(i)
+
+    for idxs in groups.values():
+        stacked = np.stack([crops[i] for i in idxs], axis=0)
+        resized = resize_bilinear_aa(_to_planar_rgb(stacked))
+
+        if len(idxs) == n:
+            _normalize_into(resized, out)
+        else:
+            tmp = np.empty((len(idxs), 3) + INPUT_SIZE, dtype=np.float32)
+            _normalize_into(resized, tmp)
+            out[idxs] = tmp
+
+    return out
+
+
+def preprocess_rois(frame: np.ndarray, rois: Sequence, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """frame + ROI 리스트 → (N,3,224,224) float32"""
+    return preprocess_crops(crop_rois(frame, rois), out=out)
+
+
+def preprocess_roi_bgr(roi_bgr: np.ndarray) -> np.ndarray:
+    """단일 crop → (3,224,224) float32"""
+    return preprocess_crops([roi_bgr])[0]
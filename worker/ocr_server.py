@@ -0,0 +1,236 @@
+"""
+Dynamic micro-batching OCR inference server
+
+    server = BatchingOcrServer(create_backend("trt"), max_batch=16, max_wait_ms=2.0)
+    volume = read_volume(frame, server)      # OcrBackend 호환 (여러 thread에서 동시 호출)
+    server.stats()                           # queue wait / batch size / latency histogram
+
+- 호출자(station / 요청)마다 ROI crop 배치 (N,3,224,224) 를 queue에 넣고 Future로 대기
+- server thread 1개가 첫 요청 도착 후 max_wait_ms 안에 들어온 요청을 max_batch 행까지 모아
+  backend.infer()를 한 번 호출하고 결과(cls / conf / prob)를 요청별로 나눠 돌려준다
+- 한 요청은 나누지 않는다 (max_batch보다 큰 요청은 단독 배치)
+- backend는 server thread만 호출하므로 thread-safe일 필요가 없고, TRT pinned 입력 버퍼
+  (input_buffer)에 바로 모아 쓴다
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from worker.ocr import input_batch
+from worker.ocr_backends import OcrBackend
+
+LATENCY_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+BATCH_EDGES = (1, 2, 4, 8, 12, 16, 24, 32, 48, 64)
+
+
+class Histogram:
+    """고정 bucket histogram (bucket 상한 기준 percentile 근사)"""
+
+    def __init__(self, edges):
+        self.edges = tuple(edges)
+        self.counts = [0] * (len(self.edges) + 1)  # 마지막 = 최대 edge 초과
+        self.n = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        i = 0
+        while i < len(self.edges) and value > self.edges[i]:
+            i += 1
+        self.counts[i] += 1
+        self.n += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.n:
+            return None
+        rank = q * self.n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank and c:
+                return self.edges[i] if i < len(self.edges) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        buckets = {f"<={e:g}": c for e, c in zip(self.edges, self.counts)}
+        buckets[f">{self.edges[-1]:g}"] = self.counts[-1]
+        return {
+            "n": self.n,
+            "mean": round(self.total / self.n, 3) if self.n else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+class _Request(NamedTuple):
+    batch: np.ndarray
+    future: Future
+    t_submit: float  # perf_counter
+
+
+class BatchingOcrServer:
+    def __init__(self, backend: OcrBackend, max_batch: int = 16, max_wait_ms: float = 2.0):
+        """
+        - max_batch: 한 번의 backend 호출에 넣을 최대 행(ROI crop) 수
+          (TRT 엔진의 optimization profile 최대 batch 이하로)
+        - max_wait_ms: 첫 요청 이후 다른 요청을 기다리는 최대 시간 (0이면 이미 대기 중인 것만)
+        """
+        self.backend = backend
+        self.name = backend.name
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait_s = max(0.0, float(max_wait_ms)) / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._carry: Optional[_Request] = None  # 직전 배치에 못 들어간 요청
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.requests = 0
+        self.batches = 0
+        self.queue_wait_ms = Histogram(LATENCY_EDGES_MS)
+        self.latency_ms = Histogram(LATENCY_EDGES_MS)
+        self.infer_ms = Histogram(LATENCY_EDGES_MS)
+        self.batch_rows = Histogram(BATCH_EDGES)
+        self.batch_requests = Histogram(BATCH_EDGES)
+
+    # =========================
+    # Client side
+    # =========================
+    def submit(self, batch: np.ndarray) -> Future:
+        """(N,3,224,224) float32 → Future[(cls, conf, prob)]"""
+        fut: Future = Future()
+        with self._lock:
+            if self._closed:
+                fut.set_exception(RuntimeError("OCR server closed"))
+                return fut
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._serve, name="ocr-server", daemon=True)
+                self._thread.start()
+            self.requests += 1
+            self._queue.put(_Request(batch, fut, time.perf_counter()))
+        return fut
+
+    def infer(self, batch: np.ndarray):
+        """OcrBackend 호환 (blocking)"""
+        return self.submit(batch).result()
+
+    def close(self, timeout: float = 2.0):
+        """대기 중인 요청은 처리한 뒤 종료"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # =========================
+    # Server thread
+    # =========================
+    def _next(self, timeout: Optional[float]) -> Optional[_Request]:
+        if self._carry is not None:
+            req, self._carry = self._carry, None
+            return req
+        if timeout is None:
+            return self._queue.get()
+        if timeout <= 0:
+            return self._queue.get_nowait()
+        return self._queue.get(timeout=timeout)
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        reqs, rows = [first], len(first.batch)
+        deadline = time.perf_counter() + self.max_wait_s
+
+        while rows < self.max_batch:
+            try:
+                req = self._next(deadline - time.perf_counter())
+            except queue.Empty:
+                break
+            if req is None:  # close: 지금까지 모은 배치까지 처리
+                self._queue.put(None)
+                break
+            if rows + len(req.batch) > self.max_batch:
+                self._carry = req
+                break
+            reqs.append(req)
+            rows += len(req.batch)
+        return reqs
+
+    def _serve(self):
+        while True:
+            first = self._next(None)
+            if first is None:
+                break
+            self._run_batch(self._collect(first))
+
+        # close 이후 들어온 요청 (경합) 정리
+        while True:
+            try:
+                req = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if req is not None and not req.future.done():
+                req.future.set_exception(RuntimeError("OCR server closed"))
+
+    def _run_batch(self, reqs: List[_Request]):
+        t_start = time.perf_counter()
+        try:
+            if len(reqs) == 1:
+                x = reqs[0].batch
+            else:
+                # backend가 입력 버퍼를 제공하면 (TRT pinned memory) 그 위에 바로 모은다
+                first = reqs[0].batch
+                x = input_batch(self.backend, sum(len(r.batch) for r in reqs))
+                if x.shape[1:] != first.shape[1:]:
+                    x = np.empty((x.shape[0],) + first.shape[1:], dtype=np.float32)
+                np.concatenate([r.batch for r in reqs], axis=0, out=x)
+
+            cls, conf, prob = self.backend.infer(x)
+        except Exception as e:
+            for r in reqs:
+                r.future.set_exception(e)
+            return
+        t_done = time.perf_counter()
+
+        offset = 0
+        for r in reqs:
+            n = len(r.batch)
+            r.future.set_result((cls[offset:offset + n], conf[offset:offset + n], prob[offset:offset + n]))
+            offset += n
+            self.queue_wait_ms.add((t_start - r.t_submit) * 1000.0)
+            self.latency_ms.add((t_done - r.t_submit) * 1000.0)
+
+        self.batches += 1
+        self.infer_ms.add((t_done - t_start) * 1000.0)
+        self.batch_rows.add(offset)
+        self.batch_requests.add(len(reqs))
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.name,
+            "requests": self.requests,
+            "batches": self.batches,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait_s * 1000.0,
+            "queue_wait_ms": self.queue_wait_ms.summary(),
+            "latency_ms": self.latency_ms.summary(),
+            "infer_ms": self.infer_ms.summary(),
+            "batch_rows": self.batch_rows.summary(),
+            "batch_requests": self.batch_requests.summary(),
+        }
@@ -1,30 +1,38 @@
-import json
 import os
 import numpy as np
-import cv2
 import tensorrt as trt
 import pycuda.driver as cuda
 import pycuda.autoinit  # noqa
 
-from PIL import Image
-from torchvision import transforms
+from worker.ocr import VOLUME_WEIGHTS, OcrReading, load_rois, read_volume, softmax_predict  # noqa: F401
+from worker.ocr_preprocess import INPUT_SIZE, preprocess_roi_bgr  # noqa: F401
+from worker.trt_buffers import BufferAllocator, BufferPool, TRTBuffers
 
-from worker.paths import OCR_TRT_PATH, ROIS_JSON_PATH
 
-# =============================
-# OCR preprocessing settings (TRAIN/VAL과 동일)
-# =============================
-INPUT_SIZE = (224, 224)
-NORM_MEAN = [0.485, 0.456, 0.406]  # RGB
-NORM_STD  = [0.229, 0.224, 0.225]  # RGB
-VOLUME_WEIGHTS = [1000, 100, 10, 1]
+# =========================================================
+# CUDA allocator (pagelocked host + device memory)
+# =========================================================
+class CudaAllocator:
+    def host_empty(self, shape, dtype=np.float32) -> np.ndarray:
+        return cuda.pagelocked_empty(shape, dtype=dtype)
+
+    def device_alloc(self, nbytes: int):
+        return cuda.mem_alloc(nbytes)
+
+    def device_free(self, handle):
+        handle.free()
 
 
 # =========================================================
 # TensorRT Wrapper
 # =========================================================
 class TRTWrapper:
-    def __init__(self, engine_path: str):
+    name = "trt"
+
+    def __init__(self, engine_path: str, allocator: BufferAllocator = None, max_batch: int = None):
+        """
+        max_batch: 버퍼 bucket 상한 (None이면 엔진 optimization profile의 최대 batch)
+        """
         if not os.path.exists(engine_path):
             raise FileNotFoundError(engine_path)
 
@@ -52,116 +60,72 @@ class TRTWrapper:
             self.input_name = self.engine.get_tensor_name(0)
             self.output_name = self.engine.get_tensor_name(1)
 
-    def infer(self, x_nchw: np.ndarray):
-        if x_nchw.dtype != np.float32:
-            x_nchw = x_nchw.astype(np.float32)
+        if max_batch is None:
+            max_batch = self.engine.get_tensor_profile_shape(self.input_name, 0)[2][0]
 
-        N, C, H, W = x_nchw.shape
+        # batch bucket (1, 2, 4, ..., max_batch)별 pinned/device 버퍼는 한 번만 할당
+        self.pool = BufferPool(allocator or CudaAllocator(), max_batch=max_batch)
+        self._bound: TRTBuffers = None
+        self._bound_shape = None
 
-        self.context.set_input_shape(self.input_name, (N, C, H, W))
-        out_shape = tuple(self.context.get_tensor_shape(self.output_name))
+    def _output_shape(self, in_shape):
+        self.context.set_input_shape(self.input_name, in_shape)
+        return tuple(self.context.get_tensor_shape(self.output_name))
 
-        host_input = cuda.pagelocked_empty((N, C, H, W), dtype=np.float32)
-        host_output = cuda.pagelocked_empty(out_shape, dtype=np.float32)
+    def _buffers(self, in_shape) -> TRTBuffers:
+        bufs = self.pool.get(in_shape, self._output_shape)
 
-        d_input = cuda.mem_alloc(host_input.nbytes)
-        d_output = cuda.mem_alloc(host_output.nbytes)
+        # bucket이 바뀐 경우에만 주소 재바인딩, batch 크기가 바뀐 경우에만 입력 shape 재설정
+        if bufs is not self._bound:
+            self.context.set_tensor_address(self.input_name, int(bufs.d_input))
+            self.context.set_tensor_address(self.output_name, int(bufs.d_output))
+            self._bound = bufs
+            self._bound_shape = None
 
-        self.context.set_tensor_address(self.input_name, int(d_input))
-        self.context.set_tensor_address(self.output_name, int(d_output))
+        in_shape = tuple(int(d) for d in in_shape)
+        if in_shape != self._bound_shape:
+            self.context.set_input_shape(self.input_name, in_shape)
+            self._bound_shape = in_shape
 
-        np.copyto(host_input, x_nchw)
+        return bufs
 
-        cuda.memcpy_htod_async(d_input, host_input, self.stream)
-        self.context.execute_async_v3(stream_handle=self.stream.handle)
-        cuda.memcpy_dtoh_async(host_output, d_output, self.stream)
-        self.stream.synchronize()
+    def input_buffer(self, shape) -> np.ndarray:
+        """
+        zero-copy 입력: 반환된 pinned 배열에 전처리 결과를 직접 쓰고
+        그 배열 그대로 infer()에 넘기면 host 복사가 생략된다
+        """
+        return self._buffers(shape).host_input[: shape[0]]
 
-        d_input.free()
-        d_output.free()
+    def infer(self, x_nchw: np.ndarray):
+        N, C, H, W = x_nchw.shape
+
+        bufs = self._buffers((N, C, H, W))
+        host_input = bufs.host_input[:N]
+        host_output = bufs.host_output[:N]
+
+        if not bufs.is_host_input(x_nchw):
+            np.copyto(host_input, x_nchw, casting="same_kind")
 
-        logits = host_output.reshape((N, -1))
-        e_x = np.exp(logits - np.max(logits, axis=1, keepdims=True))
-        prob = e_x / np.sum(e_x, axis=1, keepdims=True)
+        cuda.memcpy_htod_async(bufs.d_input, host_input, self.stream)
+        self.context.execute_async_v3(stream_handle=self.stream.handle)
+        cuda.memcpy_dtoh_async(host_output, bufs.d_output, self.stream)
+        self.stream.synchronize()
 
-        cls = prob.argmax(axis=1).astype(int)
-        conf = prob[np.arange(N), cls]
-        return cls.tolist(), conf.tolist(), prob
+        return softmax_predict(host_output.reshape((N, -1)))
 
 
 # =========================================================
-# torchvision preprocessing (TRAIN 코드와 100% 동일)
+# Preprocessing (torchvision 학습 파이프라인과 bit 단위 동일, torch 불필요)
 # =========================================================
-_preprocess = transforms.Compose([
-    transforms.Resize(INPUT_SIZE, antialias=True),
-    transforms.ToTensor(),  # [0,1], CHW
-    transforms.Normalize(mean=NORM_MEAN, std=NORM_STD),
-])
-
 def preprocess_roi_bgr_trt(roi_bgr: np.ndarray) -> np.ndarray:
     """
-    BGR(OpenCV) → PIL → torchvision → numpy (TRT input)
-    return: (3,224,224) float32
+    BGR(OpenCV) → (3,224,224) float32 (TRT input)
     """
-    rgb = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2RGB)
-    pil = Image.fromarray(rgb)
-
-    x = _preprocess(pil)          # torch.Tensor (3,H,W)
-    x = x.numpy().astype(np.float32)
-    return x
+    return preprocess_roi_bgr(roi_bgr)
 
 
 # =========================================================
-# ROI loading
+# Main OCR logic (TRT) - worker.ocr.read_volume 호환 래퍼
 # =========================================================
-def load_rois():
-    if not os.path.exists(ROIS_JSON_PATH):
-        raise FileNotFoundError(f"ROIs not found: {ROIS_JSON_PATH}")
-
-    with open(ROIS_JSON_PATH, "r", encoding="utf-8") as f:
-        rois = json.load(f)
-
-    if not isinstance(rois, list) or len(rois) == 0:
-        raise RuntimeError(f"Invalid ROIs: {rois}")
-
-    return rois
-
-
-# =========================================================
-# Main OCR logic (TRT)
-# =========================================================
-def read_volume_trt(frame: np.ndarray, trt_model: TRTWrapper) -> int:
-    rois = load_rois()
-
-    # 위 → 아래 (천/백/십/일)
-    rois = sorted(rois, key=lambda r: r[1])
-
-    h, w = frame.shape[:2]
-    crops = []
-
-    for i, (x, y, rw, rh) in enumerate(rois[:4]):
-        x1 = max(0, min(w - 1, int(x)))
-        y1 = max(0, min(h - 1, int(y)))
-        x2 = max(0, min(w, x1 + int(rw)))
-        y2 = max(0, min(h, y1 + int(rh)))
-
-        crop = frame[y1:y2, x1:x2]
-        if crop.size == 0:
-            raise RuntimeError(f"Empty ROI{i}")
-
-        cv2.imwrite(f"/tmp/ocr_roi_{i}.jpg", crop)
-        crops.append(crop)
-
-    if len(crops) < 4:
-        raise RuntimeError("Not enough ROIs")
-
-    batch = np.stack(
-        [preprocess_roi_bgr_trt(c) for c in crops],
-        axis=0
-    ).astype(np.float32)
-
-    pred_cls, pred_conf, _ = trt_model.infer(batch)
-    digits = [int(d) for d in pred_cls[:4]]
-
-    volume = sum(d * w for d, w in zip(digits, VOLUME_WEIGHTS))
-    return volume
+def read_volume_trt(frame: np.ndarray, trt_model: TRTWrapper) -> OcrReading:
+    return read_volume(frame, trt_model)
@@ -0,0 +1,125 @@
+"""
+Odometer-aware 분주량 decoding
+
+    dec = get_decoder().decode(reading.prob)   # OdometerDecode(volume, position, in_transition, spread_ul)
+
+다이얼 표시는 기계식 counter: 아래 바퀴가 9 → 0 으로 넘어가는 동안 위 바퀴도 같이 굴러간다.
+ROI 4개를 argmax로 따로 읽으면 2000 근처에서 1990 / 2090 같은 값이 나오므로,
+바퀴별 확률 전체를 counter 규칙과 유효 범위 (500 ~ 5000 uL) 안의 위치 하나로 함께 해석한다.
+
+- 후보: 유효 범위의 다이얼 위치 x (0.1 uL 간격). 위치마다 바퀴 4개의 (숫자, 굴러간 비율)이 정해진다
+  (일의 자리는 연속, 위 바퀴는 아래 자리가 w-1 → w 로 가는 마지막 1 uL 동안 같이 굴러감)
+- 바퀴 i 관측 점수: OCR 확률 p_i 와 기대 분포 (floor 숫자 1-f, 다음 숫자 f) 의 Bhattacharyya 계수
+  (반쯤 걸린 바퀴는 반반 확률, 정지한 바퀴는 한쪽 확률을 기대)
+- 점수 = sharpness × Σ log BC. 최고 점수 위치를 반올림한 값이 volume
+- spread_ul: 최고 점수 대비 likelihood 비율이 spread_ratio 이상인 후보들의 volume 범위 (반올림 기준).
+  1보다 크면 바퀴들이 한 값으로 모이지 않는 상태 (굴러가는 중 캡처 등) → in_transition
+
+후보 위치 표는 생성 시 1번 만들고, decode는 바퀴마다 (10, steps) 표를 만든 뒤 gather 4번 (수백 us).
+"""
+import math
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+# 천 / 백 / 십 / 일 (worker.ocr 에서 재사용)
+VOLUME_WEIGHTS = [1000, 100, 10, 1]
+
+# test/single_target_test.py 의 VALID_MIN_UL / VALID_MAX_UL 과 같은 범위
+VALID_MIN_UL = 500
+VALID_MAX_UL = 5000
+
+
+class OdometerDecode(NamedTuple):
+    volume: int            # 가장 그럴듯한 위치의 반올림 값
+    position: float        # 가장 그럴듯한 다이얼 위치 (uL, steps 간격)
+    in_transition: bool    # 후보가 volume ±1 밖까지 퍼짐 (판독 보류 권장)
+    spread_ul: int         # 그럴듯한 후보 volume의 volume 대비 최대 거리
+    score: float           # 최고 점수 (sharpness × Σ log BC, 0이 완전 일치)
+
+
+def wheel_positions_grid(xi: np.ndarray, steps: int) -> np.ndarray:
+    """
+    xi: 다이얼 위치 × steps (정수 배열)
+    return: (N, 4) 바퀴 위치 × steps (천 / 백 / 십 / 일, 소수부 = 다음 숫자로 굴러간 비율)
+    """
+    out = np.empty((len(xi), len(VOLUME_WEIGHTS)), dtype=np.int64)
+    for i, w in enumerate(VOLUME_WEIGHTS):
+        if w == 1:
+            out[:, i] = xi % (10 * steps)
+            continue
+        base = (xi // (w * steps)) % 10
+        lower = xi % (w * steps)
+        roll = np.clip(lower - (w - 1) * steps, 0, steps)
+        out[:, i] = base * steps + roll
+    return out
+
+
+class OdometerDecoder:
+    def __init__(
+        self,
+        min_ul: int = VALID_MIN_UL,
+        max_ul: int = VALID_MAX_UL,
+        steps: int = 10,
+        sharpness: float = 10.0,
+        spread_ratio: float = 0.05,
+    ):
+        """
+        - steps: 1 uL 당 후보 위치 수 (굴러간 비율 해상도)
+        - sharpness: log BC 배율 (클수록 OCR 확률을 믿음)
+        - spread_ratio: spread_ul 계산에 포함할 최소 likelihood 비율 (최고 점수 대비)
+        """
+        self.min_ul = int(min_ul)
+        self.max_ul = int(max_ul)
+        self.steps = int(steps)
+        self.sharpness = float(sharpness)
+        self.spread_margin = math.log(1.0 / spread_ratio)
+
+        xi = np.arange(self.min_ul * self.steps, self.max_ul * self.steps + 1, dtype=np.int64)
+        pos = wheel_positions_grid(xi, self.steps)
+        digit = (pos // self.steps) % 10
+        frac = pos % self.steps
+        # 바퀴별 (숫자, 비율) → (10 * steps) 표의 flat index
+        self._index = [np.ascontiguousarray(digit[:, i] * self.steps + frac[:, i]) for i in range(pos.shape[1])]
+        self._position = xi / self.steps
+        self._rounded = (xi + self.steps // 2) // self.steps
+
+        f = np.arange(self.steps) / self.steps
+        self._w_floor = np.sqrt(1.0 - f)
+        self._w_next = np.sqrt(f)
+
+    def _log_bc(self, prob: np.ndarray) -> np.ndarray:
+        """(4, 10) 확률 → (4, 10 * steps) log Bhattacharyya 계수 표"""
+        p = np.clip(np.asarray(prob, dtype=np.float64)[:, :10], 0.0, None)
+        p = p / np.maximum(p.sum(axis=1, keepdims=True), 1e-12)
+        s = np.sqrt(p)
+        bc = s[:, :, None] * self._w_floor + np.roll(s, -1, axis=1)[:, :, None] * self._w_next
+        return np.log(np.maximum(bc, 1e-9)).reshape(len(p), -1)
+
+    def scores(self, prob: np.ndarray) -> np.ndarray:
+        """후보 위치별 점수 (len = (max_ul - min_ul) * steps + 1)"""
+        table = self._log_bc(prob)
+        total = table[0][self._index[0]].copy()
+        for i in range(1, len(self._index)):
+            total += table[i][self._index[i]]
+        return self.sharpness * total
+
+    def decode(self, prob: np.ndarray) -> OdometerDecode:
+        score = self.scores(prob)
+        best = int(score.argmax())
+        volume = int(self._rounded[best])
+
+        near = self._rounded[score >= score[best] - self.spread_margin]
+        spread = int(max(volume - near.min(), near.max() - volume))
+        return OdometerDecode(volume, float(self._position[best]), spread > 1, spread, float(score[best]))
+
+
+_default: Optional[OdometerDecoder] = None
+
+
+def get_decoder() -> OdometerDecoder:
+    """기본 범위 decoder (후보 표는 프로세스당 1번)"""
+    global _default
+    if _default is None:
+        _default = OdometerDecoder()
+    return _default
@@ -7,9 +7,39 @@ STATE_DIR = os.path.join(ROOT_DIR, "state")
 YOLO_MODEL_PATH = os.path.join(MODELS_DIR, "yolo", "best_rotate_yolo.pt")
 # OCR_TRT_PATH    = os.path.join(MODELS_DIR, "ocr", "efficientnet_b0_fp16_dynamic.trt")
 OCR_TRT_PATH    = os.path.join(MODELS_DIR, "ocr", "finetuned_efficientnet_b0_trtmatch_fp16_dynamic.trt")
+# CPU backend (onnxruntime / opencv) 용 ONNX export
+OCR_ONNX_PATH   = os.path.join(MODELS_DIR, "ocr", "finetuned_efficientnet_b0_trtmatch_dynamic.onnx")
+
+# trt | onnx | opencv  (환경변수 OCR_BACKEND로 변경 가능)
+OCR_BACKEND     = os.environ.get("OCR_BACKEND", "trt")
+
+# test/single_target_test.py::run_calibration 이 repo root에 기록
+CALIB_JSON_PATH = os.path.join(ROOT_DIR, "calibration.json")
+
+# read_volume 이 매 호출마다 /tmp/ocr_roi_i.jpg 디버그 crop 을 기록할지 (1이면 켬)
+# 제어 루프 hot path에서 매 읽기마다 JPEG 4장을 쓰므로 기본은 끔
+OCR_DEBUG_CROPS = os.environ.get("OCR_DEBUG_CROPS", "0") == "1"
+
+# digit softmax 확률이 이보다 낮으면 (굴러가는 중 등) 해당 ROI만 다시 캡처 / 추론
+OCR_MIN_CONF    = float(os.environ.get("OCR_MIN_CONF", "0.8"))
+
+# ladder | calibrated | adaptive  (환경변수 CONTROL_STRATEGY로 변경 가능)
+# 기본 adaptive: online plant model을 쓰는 유일한 전략. bench.convergence 시뮬레이터에서
+# iteration mean calibrated 8.2 → 5.1 (1000 targets), overshoot 11.8 → 3.3 uL (60 targets), 성공률 100%
+# (calibrated를 기본으로 지정했는데 calibration.json이 없으면 create_strategy가 ladder로 대체)
+CONTROL_STRATEGY = os.environ.get("CONTROL_STRATEGY", "adaptive")
+
+# MightyZap / geared DC 시리얼 포트 (에뮬레이터: python -m sim.firmware --link /tmp/ttyPIPETTE)
+SERIAL_PORT     = os.environ.get("SERIAL_PORT", "/dev/ttyUSB0")
+
+# 1이면 run-target 동안 worker가 시리얼 포트를 넘겨받아 모터를 직접 구동
+DIRECT_MOTOR    = os.environ.get("DIRECT_MOTOR", "0") == "1"
 
 ROIS_JSON_PATH  = os.path.join(STATE_DIR, "rois.json")
+PLANT_MODEL_PATH = os.path.join(STATE_DIR, "plant_model.json")
 FRAME_JPG_PATH  = os.path.join(STATE_DIR, "last_frame.jpg")
+# multi-station: station별 rois.json / plant_model.json (state/stations/<name>/)
+STATIONS_DIR    = os.path.join(STATE_DIR, "stations")
 YOLO_JPG_PATH   = os.path.join(STATE_DIR, "last_yolo.jpg")
 
 def ensure_state_dir():
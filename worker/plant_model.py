@@ -0,0 +1,268 @@
+"""
+Online plant model: 펄스 명령 → 분주량 변화 (uL)
+
+    observed_ul ≈ Σ_band gain[dir, band] * duration_ms(band) - backlash[dir] * reversed
+
+- direction별로 RLS(forgetting factor) 1개: θ = [band별 uL/ms ..., backlash]
+  한 iteration에 여러 펄스를 조합해도 관측 1개로 동시에 갱신된다.
+- reversed: 직전 이동과 방향이 바뀐 경우 1 (기어 유격만큼 덜 움직임)
+  직전 방향 (last_direction) 은 갱신 여부와 무관하게 실제 실행된 펄스로 기록 (record_pulses)
+- 초기값은 calibration.json, 이후 run_to_target 매 iteration 관측으로 갱신
+- state/plant_model.json 에 저장되어 실행 간 유지
+
+direction: 0 = CW (분주량 증가), 1 = CCW (감소)  (control_worker 규약)
+"""
+import json
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from worker.paths import PLANT_MODEL_PATH, ensure_state_dir
+
+# duty band 경계 (<30, 30~39, 40~49, >=50)
+DUTY_BAND_EDGES = (30, 40, 50)
+# band별 명령 duty 기본값 (calibration에 있으면 그 duty 사용)
+BAND_DUTIES = (25, 35, 45, 55)
+DIRECTIONS = (0, 1)
+
+PRIOR_GAIN = 0.1          # uL/ms (calibration 없을 때)
+PRIOR_GAIN_STD = 0.05
+PRIOR_BACKLASH_STD = 5.0  # uL
+MIN_GAIN = 1e-4
+MAX_GAIN = 1.0            # uL/ms
+MAX_BACKLASH = 30.0       # uL, 이보다 큰 값은 유격이 아니라 다른 band gain 오차를 흡수한 것
+
+# prev_direction 기본값: 마지막으로 실행된 펄스 방향 (last_direction)
+LAST_EXECUTED = object()
+
+
+class PlantModel:
+    def __init__(
+        self,
+        band_edges=DUTY_BAND_EDGES,
+        band_duties=BAND_DUTIES,
+        forgetting: float = 0.98,
+        outlier_abs: float = 30.0,
+        outlier_rel: float = 1.0,
+        max_rejects: int = 3,
+    ):
+        """
+        - forgetting: RLS 망각 계수 (온도/마모에 따른 drift 추종)
+        - outlier_abs / outlier_rel: |관측 - 예측| > max(abs, rel*예측)이면 OCR 오독으로 보고 무시
+        - max_rejects: 같은 방향으로 연속 이만큼 무시되면 모델 쪽이 틀린 것으로 보고
+          해당 방향을 prior(calibration)로 되돌린 뒤 관측을 받아들인다
+        """
+        self.band_edges = tuple(int(e) for e in band_edges)
+        self.band_duties = [int(d) for d in band_duties]
+        if len(self.band_duties) != len(self.band_edges) + 1:
+            raise ValueError("band_duties must have len(band_edges) + 1 entries")
+
+        self.forgetting = float(forgetting)
+        self.outlier_abs = float(outlier_abs)
+        self.outlier_rel = float(outlier_rel)
+        self.max_rejects = int(max_rejects)
+
+        self._p0 = np.diag([PRIOR_GAIN_STD ** 2] * self.n_bands + [PRIOR_BACKLASH_STD ** 2])
+        self.theta = {d: np.array([PRIOR_GAIN] * self.n_bands + [0.0]) for d in DIRECTIONS}
+        self.P = {d: self._p0.copy() for d in DIRECTIONS}
+        self.prior = {d: self.theta[d].copy() for d in DIRECTIONS}
+
+        self.last_direction: Optional[int] = None
+        self.updates = {d: 0 for d in DIRECTIONS}
+        self.rejected = 0
+        self._reject_run = {d: 0 for d in DIRECTIONS}
+
+    # =========================
+    # Structure
+    # =========================
+    @property
+    def n_bands(self) -> int:
+        return len(self.band_edges) + 1
+
+    def band_of(self, duty: int) -> int:
+        for i, edge in enumerate(self.band_edges):
+            if duty < edge:
+                return i
+        return len(self.band_edges)
+
+    def gain(self, direction: int, band: int) -> float:
+        return float(self.theta[direction][band])
+
+    def backlash(self, direction: int) -> float:
+        return float(self.theta[direction][-1])
+
+    def _features(self, moves, direction: int, prev_direction=LAST_EXECUTED) -> np.ndarray:
+        if prev_direction is LAST_EXECUTED:
+            prev_direction = self.last_direction
+        x = np.zeros(self.n_bands + 1)
+        for m in moves:
+            x[self.band_of(m.duty)] += m.duration_ms
+        if prev_direction is not None and prev_direction != direction:
+            x[-1] = -1.0
+        return x
+
+    def record_pulses(self, moves):
+        """실제로 실행된 펄스 (도중에 끊긴 것 포함) 의 방향 기록 — update를 건너뛴 step에도 호출"""
+        if moves:
+            self.last_direction = moves[-1].direction
+
+    # =========================
+    # Prediction / update
+    # =========================
+    # prev_direction: moves 직전에 실행된 방향 (backlash 판단). 기본은 last_direction
+    # (이미 실행해 record_pulses로 기록한 펄스를 나중에 update할 때는 그 전 방향을 넘긴다)
+    def predict(self, moves, prev_direction=LAST_EXECUTED) -> float:
+        """moves (같은 방향) 실행 시 예상 변화량 (uL, 이동 방향 기준 양수)"""
+        if not moves:
+            return 0.0
+        direction = moves[0].direction
+        return float(self._features(moves, direction, prev_direction) @ self.theta[direction])
+
+    def predict_var(self, moves, prev_direction=LAST_EXECUTED) -> float:
+        """predict() 의 파라미터 불확실성 (uL², RLS 공분산 기준)"""
+        if not moves:
+            return 0.0
+        direction = moves[0].direction
+        x = self._features(moves, direction, prev_direction)
+        return float(max(0.0, x @ self.P[direction] @ x))
+
+    def update(self, moves, observed_ul: float, prev_direction=LAST_EXECUTED) -> Optional[float]:
+        """
+        - moves: 직전 판독 이후 실행한 펄스 (같은 방향)
+        - observed_ul: 이동 방향 기준 관측 변화량 (dir 0이면 cur-prev, dir 1이면 prev-cur)
+        - returns: 예측 잔차 (outlier로 무시되면 None)
+        """
+        if not moves:
+            return None
+
+        direction = moves[0].direction
+        x = self._features(moves, direction, prev_direction)
+        theta, P = self.theta[direction], self.P[direction]
+
+        pred = float(x @ theta)
+        residual = float(observed_ul) - pred
+
+        self.last_direction = direction
+
+        if abs(residual) > max(self.outlier_abs, self.outlier_rel * abs(pred)):
+            self._reject_run[direction] += 1
+            if self._reject_run[direction] < self.max_rejects:
+                self.rejected += 1
+                return None
+            # 연속 outlier: OCR이 아니라 모델이 틀림 → prior에서 재학습
+            print(f"[PLANT] dir={direction} {self._reject_run[direction]} consecutive outliers, re-seeding from prior")
+            theta[:] = self.prior[direction]
+            P[:] = self._p0
+            pred = float(x @ theta)
+            residual = float(observed_ul) - pred
+        self._reject_run[direction] = 0
+
+        lam = self.forgetting
+        Px = P @ x
+        k = Px / (lam + x @ Px)
+        theta += k * residual
+        P -= np.outer(k, Px)
+
+        # 관측이 없는 파라미터의 공분산이 무한히 커지지 않도록 prior 수준에서 멈춘다
+        if np.trace(P) < np.trace(self._p0):
+            P /= lam
+
+        theta[:-1] = np.clip(theta[:-1], MIN_GAIN, MAX_GAIN)
+        theta[-1] = min(max(theta[-1], 0.0), MAX_BACKLASH)
+
+        self.updates[direction] += 1
+        return residual
+
+    # =========================
+    # Calibration prior
+    # =========================
+    def seed_from_calibration(self, pulses):
+        """calibration.json 펄스로 band별 gain / 명령 duty 초기화"""
+        per_band = {}
+        for p in pulses:
+            per_band.setdefault(self.band_of(p.duty), []).append(p)
+
+        for band, ps in per_band.items():
+            gain = sum(p.delta_ul for p in ps) / sum(p.duration_ms for p in ps)
+            for d in DIRECTIONS:
+                self.theta[d][band] = min(max(gain, MIN_GAIN), MAX_GAIN)
+            self.band_duties[band] = max(ps, key=lambda p: p.delta_ul).duty
+
+        self.prior = {d: self.theta[d].copy() for d in DIRECTIONS}
+        return self
+
+    # =========================
+    # Persistence
+    # =========================
+    def to_dict(self) -> dict:
+        return {
+            "band_edges": list(self.band_edges),
+            "band_duties": list(self.band_duties),
+            "forgetting": self.forgetting,
+            "last_direction": self.last_direction,
+            "updates": {str(d): n for d, n in self.updates.items()},
+            "rejected": self.rejected,
+            "directions": {
+                str(d): {
+                    "gain_ul_per_ms": [round(float(g), 6) for g in self.theta[d][:-1]],
+                    "backlash_ul": round(float(self.theta[d][-1]), 3),
+                    "prior": [round(float(v), 6) for v in self.prior[d]],
+                    "P": self.P[d].tolist(),
+                }
+                for d in DIRECTIONS
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PlantModel":
+        model = cls(
+            band_edges=data["band_edges"],
+            band_duties=data["band_duties"],
+            forgetting=data.get("forgetting", 0.98),
+        )
+        model.last_direction = data.get("last_direction")
+        model.rejected = int(data.get("rejected", 0))
+        for d in DIRECTIONS:
+            entry = data["directions"][str(d)]
+            model.theta[d] = np.array(entry["gain_ul_per_ms"] + [entry["backlash_ul"]], dtype=np.float64)
+            model.P[d] = np.array(entry["P"], dtype=np.float64)
+            model.prior[d] = np.array(entry.get("prior", model.theta[d]), dtype=np.float64)
+            model.updates[d] = int(data.get("updates", {}).get(str(d), 0))
+        return model
+
+    def save(self, path: str = PLANT_MODEL_PATH):
+        ensure_state_dir()
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = PLANT_MODEL_PATH) -> "PlantModel":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def summary(self) -> dict:
+        """GUI 표시용 (공분산 제외)"""
+        d = self.to_dict()
+        for entry in d["directions"].values():
+            entry.pop("P")
+            entry.pop("prior")
+        return d
+
+
+def load_plant_model(path: str = PLANT_MODEL_PATH, calib_pulses: Optional[List] = None) -> PlantModel:
+    """
+    저장된 모델이 있으면 로드, 없으면 calibration으로 초기화한 새 모델
+    """
+    if os.path.exists(path):
+        try:
+            return PlantModel.load(path)
+        except Exception as e:
+            print(f"[PLANT] invalid {path}, re-seeding: {e}")
+
+    model = PlantModel()
+    if calib_pulses:
+        model.seed_from_calibration(calib_pulses)
+    return model
@@ -0,0 +1,72 @@
+"""
+Per-ROI OCR 결과 cache: 바뀌지 않은 digit 창은 추론하지 않는다
+
+    cache = RoiCache()
+    reading = read_volume(frame, backend, rois, cache=cache, stats=stats)
+    # 바뀐 ROI만 (작은 dynamic batch로) 추론, 나머지는 직전 digit / conf / 확률 재사용
+
+미세 조정 step에서는 보통 일 / 십의 자리 바퀴만 움직이고 천 / 백의 자리는 그대로다.
+
+- signature: ROI crop 축소 gray (worker.settle.roi_signature)
+- 마지막으로 **추론한** crop의 signature 와 평균 절대 차이가 threshold 이하이면 hit.
+  직전 프레임이 아니라 추론 시점과 비교하므로 조금씩 누적되는 변화 (천천히 굴러감 / 조명)도 결국 miss
+- ROI 크기가 바뀌면 (추적 결과 변경) signature shape가 달라 miss
+- 추론 시간 / 추론 ROI 수로 ROI 1개 추론 비용을 추정해 hit마다 절약 시간으로 기록 (OcrStats.roi_saved_s)
+
+cache는 카메라 / ROI 1세트 전용 (WorkerSession / Station마다 1개). thread-safe 아님.
+"""
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from worker.settle import roi_signature
+
+
+class RoiEntry(NamedTuple):
+    signature: np.ndarray
+    digit: int
+    conf: float
+    prob: np.ndarray     # (num_classes,)
+
+
+class RoiCache:
+    def __init__(self, threshold: float = 2.0, downscale: int = 4, cost_alpha: float = 0.2):
+        """
+        - threshold: 같은 창으로 볼 최대 signature 차이 (SettleDetector 정지 기준과 같은 척도, 센서 잡음보다 약간 크게)
+        - downscale: signature 축소 배율
+        - cost_alpha: ROI 1개 추론 비용 EMA 계수
+        """
+        self.threshold = float(threshold)
+        self.downscale = max(1, int(downscale))
+        self.cost_alpha = float(cost_alpha)
+        self.entries: List[Optional[RoiEntry]] = []
+        self.row_cost_s: Optional[float] = None
+
+    def signature(self, crop: np.ndarray) -> np.ndarray:
+        return roi_signature(crop, self.downscale)
+
+    def lookup(self, index: int, signature: np.ndarray) -> Optional[RoiEntry]:
+        entry = self.entries[index] if index < len(self.entries) else None
+        if entry is None or entry.signature.shape != signature.shape:
+            return None
+        if float(np.mean(np.abs(signature - entry.signature))) > self.threshold:
+            return None
+        return entry
+
+    def store(self, index: int, signature: np.ndarray, digit: int, conf: float, prob: np.ndarray):
+        if index >= len(self.entries):
+            self.entries.extend([None] * (index + 1 - len(self.entries)))
+        self.entries[index] = RoiEntry(signature, int(digit), float(conf), np.array(prob, copy=True))
+
+    def observe_cost(self, elapsed_s: float, rows: int):
+        """추론 1번 (rows개 ROI, 전처리 포함) 의 소요 시간"""
+        if rows <= 0:
+            return
+        cost = elapsed_s / rows
+        if self.row_cost_s is None:
+            self.row_cost_s = cost
+        else:
+            self.row_cost_s += self.cost_alpha * (cost - self.row_cost_s)
+
+    def clear(self):
+        self.entries = []
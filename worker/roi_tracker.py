@@ -0,0 +1,176 @@
+"""
+ROI tracker: 매 프레임 YOLO를 돌리는 대신 이전 프레임 기준 위치 보정
+
+4개의 숫자 창은 피펫 몸체에 고정되어 함께 움직이므로 하나의 평행이동으로 본다.
+ROI 4개를 감싸는 영역(+margin)을 이전 프레임과 phase correlation 하여
+(dx, dy)와 응답값(confidence)을 구하고, 추적이 끊기면 detector(YOLO)를 다시 돌린다.
+"""
+from typing import Callable, List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+
+class TrackResult(NamedTuple):
+    rois: List[List[int]]
+    confidence: float   # phase correlation 응답 (0~1), 재검출 직후 1.0
+    drift: float        # 마지막 검출 이후 누적 이동량 (px)
+    lost: bool          # 이번 프레임에서 추적 실패 여부
+    redetected: bool    # detector를 다시 돌렸는지
+
+
+class RoiTracker:
+    def __init__(
+        self,
+        detector: Optional[Callable[[np.ndarray], list]] = None,
+        margin: int = 48,
+        downscale: int = 2,
+        min_confidence: float = 0.2,
+        refresh_confidence: float = 0.5,
+        max_shift: float = 40.0,
+        max_drift: float = 120.0,
+    ):
+        """
+        - detector: frame → rois (보통 yolo_worker.run_yolo_on_frame(frame)[0])
+        - margin: ROI 합집합 영역 바깥으로 포함할 여백 (px, 원본 해상도)
+        - downscale: 상관 계산 전 축소 배율 (속도)
+        - min_confidence: 이보다 낮은 응답이면 lost
+        - refresh_confidence: 이보다 낮으면 (숫자가 바뀌는 등) 현재 프레임으로 reference 갱신
+        - max_shift: reference 대비 이동량 상한 (px)
+        - max_drift: 마지막 검출 이후 누적 이동 상한 (px), 넘으면 재검출
+        """
+        self.detector = detector
+        self.margin = int(margin)
+        self.downscale = max(1, int(downscale))
+        self.min_confidence = float(min_confidence)
+        self.refresh_confidence = float(refresh_confidence)
+        self.max_shift = float(max_shift)
+        self.max_drift = float(max_drift)
+
+        self._rois: Optional[np.ndarray] = None  # (4,4) float, x,y,w,h
+        self._ref_rois: Optional[np.ndarray] = None  # reference 시점의 ROI
+        self._ref: Optional[np.ndarray] = None
+        self._box = None  # (x1, y1, x2, y2) 원본 좌표
+        self._window = None
+        self._drift = np.zeros(2)  # 마지막 검출 ~ reference 시점까지 이동량
+
+        self.updates = 0
+        self.refreshes = 0
+        self.redetections = 0
+
+    # =========================
+    # State
+    # =========================
+    @property
+    def initialized(self) -> bool:
+        return self._ref is not None
+
+    @property
+    def rois(self) -> Optional[List[List[int]]]:
+        if self._rois is None:
+            return None
+        return [[int(round(v)) for v in r] for r in self._rois]
+
+    def _region(self, frame_shape):
+        h, w = frame_shape[:2]
+        r = self._rois
+        x1 = int(np.floor(r[:, 0].min())) - self.margin
+        y1 = int(np.floor(r[:, 1].min())) - self.margin
+        x2 = int(np.ceil((r[:, 0] + r[:, 2]).max())) + self.margin
+        y2 = int(np.ceil((r[:, 1] + r[:, 3]).max())) + self.margin
+        return max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+
+    def _patch(self, frame, box) -> np.ndarray:
+        x1, y1, x2, y2 = box
+        crop = frame[y1:y2, x1:x2]
+        if crop.ndim == 3:
+            crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+        if self.downscale > 1:
+            crop = cv2.resize(
+                crop,
+                (crop.shape[1] // self.downscale, crop.shape[0] // self.downscale),
+                interpolation=cv2.INTER_AREA,
+            )
+        return crop.astype(np.float32)
+
+    def reset(self, frame: np.ndarray, rois, rebase_only: bool = False):
+        """rois 기준으로 reference 재설정 (YOLO 검출 직후 호출)"""
+        self._rois = np.asarray(rois, dtype=np.float64).reshape(-1, 4)
+        self._ref_rois = self._rois.copy()
+        self._box = self._region(frame.shape)
+        self._ref = self._patch(frame, self._box)
+
+        ph, pw = self._ref.shape[:2]
+        if self._window is None or self._window.shape != (ph, pw):
+            self._window = cv2.createHanningWindow((pw, ph), cv2.CV_32F)
+
+        if not rebase_only:
+            self._drift = np.zeros(2)
+
+    # =========================
+    # Tracking
+    # =========================
+    def track(self, frame: np.ndarray) -> TrackResult:
+        """detector 없이 추적만 수행"""
+        if not self.initialized:
+            raise RuntimeError("RoiTracker not initialized (call reset first)")
+
+        cur = self._patch(frame, self._box)
+        if cur.shape != self._ref.shape:
+            return TrackResult(self.rois, 0.0, float(np.hypot(*self._drift)), True, False)
+
+        # 매 프레임 reference를 바꾸면 sub-pixel 추정 오차가 누적되므로
+        # reference 대비 총 이동량을 측정하고, 응답이 약해졌을 때만 갱신한다.
+        (dx, dy), response = cv2.phaseCorrelate(self._ref, cur, self._window)
+        shift = np.array([dx, dy]) * self.downscale
+        drift = self._drift + shift
+
+        lost = (
+            response < self.min_confidence
+            or np.hypot(*shift) > self.max_shift
+            or np.hypot(*drift) > self.max_drift
+        )
+        self.updates += 1
+
+        if lost:
+            return TrackResult(self.rois, float(response), float(np.hypot(*drift)), True, False)
+
+        self._rois = self._ref_rois.copy()
+        self._rois[:, 0] += shift[0]
+        self._rois[:, 1] += shift[1]
+
+        if response < self.refresh_confidence:
+            self._drift = drift
+            self.reset(frame, self._rois, rebase_only=True)
+            self.refreshes += 1
+
+        return TrackResult(self.rois, float(response), float(np.hypot(*drift)), False, False)
+
+    def update(self, frame: np.ndarray, initial_rois=None) -> TrackResult:
+        """
+        추적 후 실패하면 detector로 재검출
+        - 미초기화 상태면 initial_rois (없으면 detector) 로 시작
+        """
+        if not self.initialized:
+            if initial_rois is not None:
+                self.reset(frame, initial_rois)
+                return TrackResult(self.rois, 1.0, 0.0, False, False)
+            return self._redetect(frame)
+
+        res = self.track(frame)
+        if res.lost and self.detector is not None:
+            return self._redetect(frame)
+        return res
+
+    def _redetect(self, frame: np.ndarray) -> TrackResult:
+        if self.detector is None:
+            raise RuntimeError("RoiTracker lost and no detector configured")
+
+        rois = self.detector(frame)
+        self.redetections += 1
+        if not rois:
+            self._ref = None
+            return TrackResult([], 0.0, 0.0, True, True)
+
+        self.reset(frame, rois)
+        return TrackResult(self.rois, 1.0, 0.0, False, True)
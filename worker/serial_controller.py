@@ -1,10 +1,14 @@
+import asyncio
 import time
 import threading
-import queue
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from typing import Optional, Callable
 
 import serial
+from worker.frame_parser import FEEDBACK_CMD, STATUS_CMD, FeedbackFrame, FrameParser, StatusFrame
 from worker.make_packet import MakePacket
+from worker.paths import SERIAL_PORT
+from worker.tx_scheduler import TxScheduler
 
 
 class SerialController:
@@ -12,11 +16,37 @@ class SerialController:
     C# MightyZap 통신 구조 1:1 대응
     - Poll Timer 기반
     - RX Status Frame 기반 상태 관리
+
+    thread 3개 모두 event 기반 (고정 주기 sleep 없음)
+    - TX  : tx_queue.get() blocking → enqueue 즉시 write
+            (TxScheduler: stop > motion > poll 우선순위, stop/motion은 버리지 않음)
+    - RX  : serial.read() blocking (timeout까지 대기, 수신 즉시 반환)
+    - Poll: adaptive (아래), 다음 poll 시각까지 event wait, 응답은 Future로 timeout 대기
+
+    Adaptive poll
+    - set position을 보낸 id는 active: POLL_FAST_SEC 간격으로 그 id만 GetMovingState
+      (moving=1을 본 뒤 idle, 또는 idle 응답 2번 연속이면 active 해제)
+    - active가 없으면 POLL_HEARTBEAT_SEC 간격 broadcast heartbeat
+    - 응답이 POLL_REPLY_TIMEOUT_SEC 안에 안 오면 missed로 세고 다음 poll 진행 (유실 1번에 멈추지 않음)
+
+    send(packet) → Future: 응답이 있는 요청은 응답 frame, 나머지는 write 완료 시각으로 완료
     """
 
-    TX_TICK_SEC = 0.05
-    POLL_INTERVAL_SEC = 0.1
-    MAX_QUEUE = 3
+    POLL_FAST_SEC = 0.01          # active actuator status poll 간격
+    POLL_HEARTBEAT_SEC = 1.0      # 모두 idle일 때 broadcast 간격
+    POLL_REPLY_TIMEOUT_SEC = 0.05  # poll 응답 대기 (초과 시 missed)
+    POLL_ACTIVE_TIMEOUT_SEC = 10.0  # idle 보고가 없어도 이 시간 뒤 active 해제
+    POLL_DEFER_SEC = 0.01   # TX 대기 중이면 poll을 이만큼 미룸
+    MIN_TX_GAP_SEC = 0.0    # 펌웨어가 연속 frame을 못 받으면 packet 간 최소 간격
+    STATUS_TIMEOUT_SEC = 0.2  # wait_until_idle: status 요청 1회 응답 대기
+    IDLE_POLL_SEC = 0.01      # wait_until_idle: status 요청 간격
+
+    # 요청 cmd → 응답 frame cmd (같은 id, broadcast 요청이면 아무 id)
+    RESPONSE_CMD = {
+        MakePacket.MIGHTYZAP_GetMovingState: STATUS_CMD,
+        MakePacket.MIGHTYZAP_GetFeedbackData: FEEDBACK_CMD,
+    }
+    BROADCAST_ID = 0xFF
 
     STX1 = 0xEA
     STX2 = 0xEB
@@ -24,7 +54,7 @@ class SerialController:
 
     def __init__(
         self,
-        port: str = "/dev/ttyUSB0",
+        port: str = SERIAL_PORT,
         baudrate: int = 115200,
         timeout: float = 0.1,
     ):
@@ -35,16 +65,20 @@ class SerialController:
         self.ser: Optional[serial.Serial] = None
         self.running = False
 
-        self.tx_queue: "queue.Queue[bytes]" = queue.Queue()
+        self.tx_queue = TxScheduler()
 
+        self._stop_event = threading.Event()
+        self._poll_wake = threading.Event()  # 새 motion 명령 / polling 재개 / close 시 poll thread 깨움
         # 🔥 Poll은 항상 켜져 있어야 한다
         self.polling_enabled = True
-        self._last_poll_time = 0.0
-        self._rx_received = True
+        self._active = {}  # actuator_id → {"since", "seen_moving", "idle"}
+        self.poll_counts = {"active": 0, "heartbeat": 0, "missed": 0}
 
         # Status storage
         self.states = {}
+        self.rx_parser = FrameParser()  # rx_parser.stats(): frame / checksum 오류 카운터
         self._state_lock = threading.Lock()
+        self._pending = {}  # (actuator_id, 응답 cmd) → [Future]
 
         self.rx_debug = True
         self.tx_debug = True
@@ -61,7 +95,15 @@ class SerialController:
     # =========================
     # Connection
     # =========================
-    def connect(self) -> bool:
+    def connect(self, exclusive: bool = False) -> bool:
+        """
+        exclusive=True: 다른 프로세스가 같은 포트를 열지 못하도록 잠금 (POSIX)
+        - GUI ↔ worker 간 포트 소유권을 넘길 때 동시 open을 막는다
+        """
+        if self.running:
+            return self.connected
+
+        kwargs = {"exclusive": True} if exclusive else {}
         self.ser = serial.Serial(
             port=self.port,
             baudrate=self.baudrate,
@@ -69,9 +111,12 @@ class SerialController:
             bytesize=serial.EIGHTBITS,
             parity=serial.PARITY_NONE,
             stopbits=serial.STOPBITS_ONE,
+            **kwargs,
         )
 
         time.sleep(0.5)
+        self._stop_event.clear()
+        self._poll_wake.clear()
         self.running = True
 
         self._tx_thread = threading.Thread(
@@ -93,16 +138,35 @@ class SerialController:
     # =========================
     # Graceful Close (🔥 필수)
     # =========================
-    def close(self):
+    @property
+    def connected(self) -> bool:
+        return bool(self.running and self.ser and self.ser.is_open)
+
+    def close(self, drain: bool = True, timeout: float = 1.0):
         """
-        control_worker cleanup용
-        - thread 중단
-        - serial 안전 종료
+        control_worker cleanup / 포트 소유권 반납용
+        - drain=True면 대기 중인 TX(예: stop 패킷)를 먼저 내보낸다
+        - thread 종료까지 join 후 serial 닫기 → 바로 다른 프로세스가 open 가능
         """
+        if drain and self.running:
+            # write 중인 packet까지 끝날 때까지 (task_done 기준)
+            self.tx_queue.wait_idle(timeout)
+
         self.running = False
+        self._stop_event.set()
+        self._poll_wake.set()
+        self.tx_queue.wake()  # blocking get() 깨우기
+        self._fail_pending("serial closed")
 
-        # thread들이 loop 탈출할 시간
-        time.sleep(0.1)
+        for t in (self._tx_thread, self._rx_thread, self._poll_thread):
+            if t is not None and t is not threading.current_thread():
+                t.join(timeout)
+        self._tx_thread = self._rx_thread = self._poll_thread = None
+
+        # 재연결 시 이전 세션 패킷이 나가지 않도록
+        dropped = self.tx_queue.clear()
+        if dropped and self.tx_debug:
+            print(f"[SERIAL] discarded {dropped} pending packets")
 
         try:
             if self.ser and self.ser.is_open:
@@ -115,117 +179,253 @@ class SerialController:
     # =========================
     # TX
     # =========================
-    def enqueue(self, packet: bytes):
+    def enqueue(self, packet: bytes, future: Optional[Future] = None) -> bool:
+        """
+        TxScheduler로 분류해서 대기열에 넣음
+        - future: write 완료 시각(time.time())으로 완료 (버려지면 RuntimeError)
+        - returns: False면 버려짐 (중복 poll / 용량 초과), tx_stats()로 확인
+        """
         if not self.ser or not self.ser.is_open:
-            return
+            if future is not None:
+                future.set_exception(RuntimeError("serial not connected"))
+            return False
 
-        if self.tx_queue.qsize() >= self.MAX_QUEUE:
-            return
-
-        self.tx_queue.put(packet)
+        queued = self.tx_queue.put(packet, future=future)
+        if queued and packet[4] == MakePacket.MIGHTYZAP_SetPosition:
+            self._mark_active(packet[2])
         if self.tx_debug:
-            print(f"[ENQUEUE] {packet.hex(' ')}")
+            print(f"[ENQUEUE] {packet.hex(' ')}{'' if queued else ' (dropped)'}")
+        return queued
+
+    def tx_stats(self) -> dict:
+        """class별 대기열 깊이 / 최대 깊이 / 전송 / 버림 / 교체 카운터 (링크 포화 확인용)"""
+        return self.tx_queue.stats()
 
     def _tx_worker(self):
+        last_write = 0.0
         while self.running:
+            item = self.tx_queue.get_item()
+            if item is None:
+                continue
+            pkt, futures = item
             try:
-                if not self.tx_queue.empty():
-                    pkt = self.tx_queue.get_nowait()
-                    self.ser.write(pkt)
-                    self.ser.flush()
-                    if self.tx_debug:
-                        print(f"[TX] {pkt.hex(' ')}")
+                if not self.running:
+                    raise RuntimeError("serial closed")
+
+                gap = self.MIN_TX_GAP_SEC - (time.monotonic() - last_write)
+                if gap > 0:
+                    time.sleep(gap)
+
+                self.ser.write(pkt)
+                self.ser.flush()
+                last_write = time.monotonic()
+                written = time.time()
+                for f in futures:
+                    if not f.done():
+                        f.set_result(written)
+                if self.tx_debug:
+                    print(f"[TX] {pkt.hex(' ')}")
             except Exception as e:
+                for f in futures:
+                    if not f.done():
+                        f.set_exception(e if isinstance(e, RuntimeError) else RuntimeError(str(e)))
                 if self.running:
                     print("[TX ERROR]", e)
+            finally:
+                self.tx_queue.task_done()
+
+    # =========================
+    # Request / response
+    # =========================
+    def send(self, packet: bytes) -> Future:
+        """
+        packet 전송 → concurrent.futures.Future
+        - 응답이 있는 요청 (GetMovingState / GetFeedbackData): 같은 id의 응답 record
+          (StatusFrame / FeedbackFrame)로 완료, broadcast(0xFF)면 처음 도착한 응답
+        - 그 외: write 완료 시각 (time.time())
+        - 버려지거나 포트가 닫히면 RuntimeError, 응답 대기 timeout은 호출자가 result(timeout)로
+        """
+        fut: Future = Future()
+        if not self.connected:
+            fut.set_exception(RuntimeError("serial not connected"))
+            return fut
 
-            time.sleep(self.TX_TICK_SEC)
+        resp = self.RESPONSE_CMD.get(packet[4])
+        if resp is None:
+            self.enqueue(packet, future=fut)
+            return fut
+
+        key = (packet[2], resp)
+        with self._state_lock:
+            self._pending.setdefault(key, []).append(fut)
+        # 응답 대기 중 취소(timeout 후 정리)되면 목록에서 제거
+        fut.add_done_callback(lambda f, key=key: f.cancelled() and self._discard_pending(key, f))
+        self.enqueue(packet)
+        return fut
+
+    async def send_async(self, packet: bytes):
+        """send()의 asyncio 버전 (응답 record 또는 write 시각)"""
+        return await asyncio.wrap_future(self.send(packet))
+
+    def _resolve_pending(self, actuator_id: int, cmd: int, frame):
+        with self._state_lock:
+            futures = self._pending.pop((actuator_id, cmd), []) + self._pending.pop((self.BROADCAST_ID, cmd), [])
+        for f in futures:
+            if not f.done():
+                f.set_result(frame)
+
+    def _discard_pending(self, key, fut: Future):
+        with self._state_lock:
+            futures = self._pending.get(key)
+            if futures and fut in futures:
+                futures.remove(fut)
+
+    def _fail_pending(self, reason: str):
+        with self._state_lock:
+            pending, self._pending = self._pending, {}
+        for futures in pending.values():
+            for f in futures:
+                if not f.done():
+                    f.set_exception(RuntimeError(reason))
 
     # =========================
-    # Poll (C# Timer 복제)
+    # Poll (adaptive)
     # =========================
+    @property
+    def polling_enabled(self) -> bool:
+        return self._polling_enabled
+
+    @polling_enabled.setter
+    def polling_enabled(self, enabled: bool):
+        self._polling_enabled = bool(enabled)
+        if enabled:
+            self._poll_wake.set()  # 꺼져 있는 동안 대기 중이던 poll thread가 바로 poll
+
+    def _mark_active(self, actuator_id: int):
+        with self._state_lock:
+            self._active[actuator_id] = {"since": time.monotonic(), "seen_moving": False, "idle": 0}
+        self._poll_wake.set()
+
+    def _update_active(self, actuator_id: int, moving: int):
+        """status 응답으로 active 해제 판단 (wait_until_idle과 같은 규칙), _state_lock 안에서 호출"""
+        entry = self._active.get(actuator_id)
+        if entry is None:
+            return
+        if moving:
+            entry["seen_moving"], entry["idle"] = True, 0
+            return
+        entry["idle"] += 1
+        if entry["seen_moving"] or entry["idle"] >= 2:
+            del self._active[actuator_id]
+
+    def active_ids(self) -> list:
+        """이동 완료를 아직 확인하지 못한 actuator id (POLL_ACTIVE_TIMEOUT_SEC 지난 항목은 해제)"""
+        now = time.monotonic()
+        with self._state_lock:
+            for i in [i for i, e in self._active.items() if now - e["since"] > self.POLL_ACTIVE_TIMEOUT_SEC]:
+                del self._active[i]
+            return list(self._active)
+
+    def poll_stats(self) -> dict:
+        return dict(self.poll_counts, active_ids=self.active_ids())
+
     def _poll_worker(self):
-        while self.running:
-            try:
-                now = time.time()
+        last_poll = float("-inf")
 
-                if not self._rx_received:
-                    time.sleep(0.01)
+        while self.running and not self._stop_event.is_set():
+            try:
+                active = self.active_ids()
+                interval = self.POLL_FAST_SEC if active else self.POLL_HEARTBEAT_SEC
+                delay = last_poll + interval - time.monotonic()
+                if delay > 0:
+                    # motion 명령이 들어오면 heartbeat 대기 중이라도 바로 깨어남
+                    if self._poll_wake.wait(delay):
+                        self._poll_wake.clear()
                     continue
 
-                if (now - self._last_poll_time) < self.POLL_INTERVAL_SEC:
-                    time.sleep(0.01)
+                if not self.polling_enabled or not self.make_poll_status:
+                    # 다시 켜지면 (setter가 wake) 바로 poll
+                    if self._poll_wake.wait(self.POLL_HEARTBEAT_SEC):
+                        self._poll_wake.clear()
                     continue
 
+                # stop / motion 이 먼저 나가도록
                 if not self.tx_queue.empty():
-                    time.sleep(0.01)
+                    self._stop_event.wait(self.POLL_DEFER_SEC)
                     continue
 
-                if self.make_poll_status and self.polling_enabled:
-                    self.enqueue(self.make_poll_status())
-                    self._rx_received = False
-                    self._last_poll_time = now
+                last_poll = time.monotonic()
+                if active:
+                    self.poll_counts["active"] += len(active)
+                    futures = [self.send(MakePacket.get_moving(i)) for i in active]
+                else:
+                    self.poll_counts["heartbeat"] += 1
+                    futures = [self.send(self.make_poll_status())]
+                self._await_poll(futures)
 
             except Exception as e:
                 if self.running:
                     print("[POLL ERROR]", e)
+                    self._stop_event.wait(self.POLL_FAST_SEC)
 
-            time.sleep(0.01)
+    def _await_poll(self, futures):
+        """poll 응답 대기: 유실된 응답은 timeout 후 취소하고 missed로 기록"""
+        deadline = time.monotonic() + self.POLL_REPLY_TIMEOUT_SEC
+        for fut in futures:
+            try:
+                fut.result(max(0.0, deadline - time.monotonic()))
+            except FutureTimeout:
+                fut.cancel()
+                self.poll_counts["missed"] += 1
+            except RuntimeError:
+                return  # close
 
     # =========================
     # RX
     # =========================
     def _rx_worker(self):
-        buffer = bytearray()
+        parser = self.rx_parser
+        parser.reset()
 
         while self.running:
             try:
-                if self.ser and self.ser.in_waiting:
-                    buffer += self.ser.read(self.ser.in_waiting)
-
-                    while len(buffer) >= 13:
-                        if buffer[0] != self.STX1 or buffer[1] != self.STX2:
-                            buffer.pop(0)
-                            continue
-
-                        if self.ETX not in buffer:
-                            break
-
-                        end = buffer.index(self.ETX)
-                        frame = bytes(buffer[:end + 1])
-                        buffer = buffer[end + 1:]
-
-                        if self.rx_debug:
-                            print(f"[RX] {frame.hex(' ')}")
+                # 1 byte 이상 도착할 때까지 blocking (최대 self.timeout), 도착하면 쌓인 만큼 읽음
+                data = self.ser.read(self.ser.in_waiting or 1)
+                if not data:
+                    continue
 
-                        self._handle_frame(frame)
+                for frame in parser.feed(data):
+                    if self.rx_debug:
+                        print(f"[RX] {frame.raw.hex(' ')}")
+                    self._handle_frame(frame)
 
             except Exception as e:
                 if self.running:
                     print("[RX ERROR]", e)
-
-            time.sleep(0.002)
-
-    def _handle_frame(self, frame: bytes):
-        if len(frame) != 13:
+                    self._stop_event.wait(self.timeout)
+
+    def _handle_frame(self, frame):
+        """frame: frame_parser record (checksum 검증 완료)"""
+        if isinstance(frame, FeedbackFrame):
+            with self._state_lock:
+                self.states.setdefault(frame.actuator_id, {"moving": 0})
+                self.states[frame.actuator_id]["position"] = frame.position
+            self._resolve_pending(frame.actuator_id, FEEDBACK_CMD, frame)
             return
 
-        cmd = frame[4]
-        actuator_id = frame[2]
-
         # Status Frame only
-        if cmd != 0x11:
+        if not isinstance(frame, StatusFrame):
             return
 
-        moving = frame[8]
+        actuator_id, moving = frame.actuator_id, frame.moving
 
         with self._state_lock:
-            self.states[actuator_id] = {
-                "moving": moving,
-                "timestamp": time.time(),
-            }
+            state = self.states.setdefault(actuator_id, {})
+            state["moving"] = moving
+            state["timestamp"] = time.time()
+            self._update_active(actuator_id, moving)
 
-        self._rx_received = True
+        self._resolve_pending(actuator_id, STATUS_CMD, frame)
 
         if self.rx_debug:
             print(f"[STATUS] id={hex(actuator_id)} moving={moving}")
@@ -233,12 +433,64 @@ class SerialController:
     # =========================
     # Blocking helper
     # =========================
-    def move_and_wait(self, actuator_id: int, position: int, timeout: float = 5.0):
-        self.enqueue(MakePacket.set_position(actuator_id, position))
+    def wait_until_idle(self, actuator_id: int, timeout: float = 5.0) -> bool:
+        """
+        actuator가 moving=0을 보고할 때까지 status 요청 반복 (고정 sleep 없음)
+        - 직전에 보낸 poll의 응답이 명령 이전 상태일 수 있으므로
+          moving=1을 본 뒤의 idle, 또는 idle 응답 2번 연속일 때 완료로 판단
+        - returns: timeout 전에 idle이면 True (포트가 닫히면 False)
+        """
+        deadline = time.monotonic() + timeout
+        seen_moving, idle_replies = False, 0
 
-        # C# 동일 동작
-        time.sleep(0.6)
-        return True
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            fut = self.send(MakePacket.get_moving(actuator_id))
+            try:
+                frame = fut.result(min(remaining, self.STATUS_TIMEOUT_SEC))
+            except FutureTimeout:
+                fut.cancel()  # 응답 유실 → 다시 요청
+                continue
+            except RuntimeError:
+                return False
+
+            if frame.moving:
+                seen_moving, idle_replies = True, 0
+            else:
+                idle_replies += 1
+                if seen_moving or idle_replies >= 2:
+                    return True
+
+            if self._stop_event.wait(self.IDLE_POLL_SEC):
+                return False
+
+    def move_and_wait(self, actuator_id: int, position: int, timeout: float = 5.0) -> bool:
+        """
+        set position → status가 idle이 될 때까지 대기
+        (C#은 이동 거리와 관계없이 0.6 s sleep, 짧은 이동은 바로 끝난다)
+        """
+        t0 = time.monotonic()
+        try:
+            self.send(MakePacket.set_position(actuator_id, position)).result(timeout)
+        except (FutureTimeout, RuntimeError) as e:
+            print(f"[SERIAL] set_position id={hex(actuator_id)} not sent: {e}")
+            return False
+
+        ok = self.wait_until_idle(actuator_id, timeout - (time.monotonic() - t0))
+        if not ok:
+            print(f"[SERIAL] id={hex(actuator_id)} still moving after {timeout}s")
+        return ok
+
+    async def wait_until_idle_async(self, actuator_id: int, timeout: float = 5.0) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.wait_until_idle, actuator_id, timeout)
+
+    async def move_and_wait_async(self, actuator_id: int, position: int, timeout: float = 5.0) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.move_and_wait, actuator_id, position, timeout)
 
     # =========================
     # High-level APIs (🔥 호환 필수)
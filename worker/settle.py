@@ -0,0 +1,102 @@
+"""
+Vision settle detector: 펄스 뒤 다이얼이 멈출 때까지 ROI 4개만 보고 대기
+
+    detector = SettleDetector(stream_frame_source(stream, rotate=1))
+    res = detector.wait(rois, max_wait_s=1.5)   # res.settled / res.wait_s / res.frame
+
+- 연속 프레임의 ROI crop (gray, 축소) 평균 절대 차이 = score (ROI 4개 중 최대)
+- score <= threshold 인 프레임이 stable_frames 번 연속이면 정지로 판단
+- 고정 SETTLE_TIME 대신: 작은 이동은 빨리 끝나고, 큰 이동은 멈출 때까지 (max_wait_s까지) 기다림
+- 마지막(정지) 프레임을 돌려주므로 다음 iteration OCR에 그대로 쓸 수 있다
+"""
+import time
+from typing import Callable, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# next_frame(after_ts) → (frame, timestamp): timestamp > after_ts 인 프레임
+FrameSource = Callable[[float], Tuple[np.ndarray, float]]
+
+
+class SettleResult(NamedTuple):
+    settled: bool        # False면 max_wait_s 초과 / 취소
+    wait_s: float        # 대기 시작 → 판단 프레임 timestamp
+    frames: int          # 비교한 프레임 수
+    score: Optional[float]  # 마지막 프레임 차이 (gray level)
+    frame: Optional[np.ndarray]  # 마지막 프레임 (다음 OCR 입력)
+
+
+def roi_signature(crop: np.ndarray, downscale: int = 4) -> np.ndarray:
+    """ROI crop → 축소 gray (float32). 두 signature의 평균 절대 차이로 변화 판단 (worker.roi_cache 공용)"""
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    if downscale > 1:
+        size = (max(1, crop.shape[1] // downscale), max(1, crop.shape[0] // downscale))
+        crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA)
+    return crop.astype(np.float32)
+
+
+def stream_frame_source(stream, rotate: int = 0) -> FrameSource:
+    """worker.camera.CameraStream → FrameSource (rotate 적용, timestamp는 time.monotonic)"""
+    from worker.camera import rotate_frame
+
+    def next_frame(after_ts: float):
+        f = stream.wait_newer_than(after_ts)
+        return rotate_frame(f.image, rotate), f.timestamp
+
+    return next_frame
+
+
+class SettleDetector:
+    def __init__(
+        self,
+        next_frame: FrameSource,
+        threshold: float = 2.0,
+        stable_frames: int = 3,
+        max_wait_s: float = 1.5,
+        downscale: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        - next_frame: FrameSource (카메라 stream / 시뮬레이터)
+        - threshold: 정지로 볼 최대 프레임 간 차이 (축소 gray 평균 절대 차이, 센서 잡음보다 약간 크게)
+        - stable_frames: 연속 정지 프레임 수 K
+        - max_wait_s: 기본 최대 대기 (wait()에서 덮어쓰기 가능)
+        - downscale: 비교 전 ROI 축소 배율 (잡음 평균화 + 속도)
+        - clock: next_frame timestamp와 같은 시계
+        """
+        self.next_frame = next_frame
+        self.threshold = float(threshold)
+        self.stable_frames = max(1, int(stable_frames))
+        self.max_wait_s = float(max_wait_s)
+        self.downscale = max(1, int(downscale))
+        self.clock = clock
+
+    def _features(self, frame: np.ndarray, rois) -> list:
+        return [roi_signature(frame[y:y + h, x:x + w], self.downscale) for x, y, w, h in rois]
+
+    def score(self, prev: list, cur: list) -> float:
+        """ROI별 평균 절대 차이 중 최대 (한 자리만 굴러도 움직임)"""
+        return max(float(np.mean(np.abs(c - p))) for c, p in zip(cur, prev))
+
+    def wait(self, rois, max_wait_s: Optional[float] = None, stop_event=None) -> SettleResult:
+        max_wait_s = self.max_wait_s if max_wait_s is None else float(max_wait_s)
+        t0 = last_ts = self.clock()
+        prev, score, stable, frames = None, None, 0, 0
+        frame = None
+
+        while True:
+            frame, last_ts = self.next_frame(last_ts)
+            frames += 1
+            cur = self._features(frame, rois)
+
+            if prev is not None:
+                score = self.score(prev, cur)
+                stable = stable + 1 if score <= self.threshold else 0
+                if stable >= self.stable_frames:
+                    return SettleResult(True, last_ts - t0, frames, score, frame)
+            prev = cur
+
+            if last_ts - t0 >= max_wait_s or (stop_event is not None and stop_event.is_set()):
+                return SettleResult(False, last_ts - t0, frames, score, frame)
@@ -0,0 +1,459 @@
+"""
+Multi-station orchestration: 한 프로세스에서 피펫 rig 여러 대 구동
+
+    stations.json
+    [
+      {"name": "A", "serial_port": "/dev/ttyUSB0", "camera": 0},
+      {"name": "B", "serial_port": "/dev/ttyUSB1", "camera": 2, "strategy": "adaptive"}
+    ]
+
+    python -m worker.station --config stations.json --targets 1500 2620 3000 --ocr-backend onnx
+
+- Station: 시리얼 포트 / 카메라 stream / ROI tracker / calibration / plant model 묶음
+  (rois.json / plant_model.json 은 state/stations/<name>/ 에 station별로 저장)
+- StationManager: station마다 thread 1개로 목표 목록 실행, OCR backend(엔진)는 1개를
+  BatchingOcrServer로 공유 (동시에 들어온 station 요청을 한 번의 추론으로 묶음)
+- report(): station별 / 전체 targets per hour
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from typing import Any, List, Optional
+
+from worker.actuator_linear import LinearActuator
+from worker.actuator_volume_dc import VOLUME_DC_ID, VolumeDCActuator
+from worker.calibration import load_calibration
+from worker.camera import CameraStream, rotate_frame
+from worker.control_strategy import STRATEGIES
+from worker.control_worker import run_session_target
+from worker.ocr import OcrStats, load_rois, read_volume
+from worker.ocr_backends import BACKENDS, OcrBackend, create_backend
+from worker.ocr_server import BatchingOcrServer
+from worker.paths import CALIB_JSON_PATH, SERIAL_PORT, STATIONS_DIR
+from worker.plant_model import PlantModel, load_plant_model
+from worker.roi_cache import RoiCache
+from worker.roi_tracker import RoiTracker
+from worker.serial_controller import SerialController
+from worker.yolo_worker import detect_rois, get_yolo_model, save_rois
+
+# YOLO 모델은 프로세스당 1개 (get_yolo_model 캐시), 추론은 station 간 직렬화
+_yolo_lock = threading.Lock()
+
+
+def _discard(msg: dict):
+    pass
+
+
+@dataclass
+class StationConfig:
+    name: str
+    serial_port: str = SERIAL_PORT
+    camera: Any = 0               # 카메라 인덱스 / 이미지 파일·디렉터리 / 동영상 / 열린 소스 객체
+    rotate: int = 1
+    volume_dc_id: int = VOLUME_DC_ID
+    volume_linear_id: int = 0x0A
+    pipetting_linear_id: int = 0x0B
+    strategy: Optional[str] = None
+    calibration: Optional[str] = None  # None이면 calibration.json
+    rois: Optional[list] = None        # 고정 ROI: 추적 / YOLO 없이 그대로 사용 (없으면 rois.json → 추적)
+    state_dir: Optional[str] = None    # None이면 state/stations/<name>
+    camera_fps: Optional[float] = 30.0
+    init_linears: bool = True          # start()에서 force on / speed / current / home
+    vision_settle: bool = True         # 펄스 뒤 고정 SETTLE_TIME 대신 ROI 정지 감지
+    estimator: bool = True             # OCR 판독 + 명령 펄스 융합 추정 (확실한 step은 OCR 생략)
+    roi_cache: bool = True             # 직전 추론 crop과 같은 digit ROI는 추론 생략
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StationConfig":
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown station config keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+
+def load_station_configs(path: str) -> List[StationConfig]:
+    """JSON 목록 (또는 {"stations": [...]}) → StationConfig 목록 (이름 / 포트 중복 불가)"""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if isinstance(raw, dict):
+        raw = raw.get("stations", [])
+
+    configs = [StationConfig.from_dict(c) for c in raw]
+    if not configs:
+        raise RuntimeError(f"No stations in {path}")
+    for key in ("name", "serial_port"):
+        values = [getattr(c, key) for c in configs]
+        if len(set(values)) != len(values):
+            raise RuntimeError(f"Duplicate station {key} in {path}: {values}")
+    return configs
+
+
+# =========================================================
+# Station (rig 1대)
+# =========================================================
+class Station:
+    """
+    rig 1대의 자원 묶음. OCR backend는 외부에서 받는다 (StationManager가 공유 backend 전달)
+    """
+
+    def __init__(self, config: StationConfig, ocr_backend: OcrBackend):
+        self.config = config
+        self.name = config.name
+        self.ocr_backend = ocr_backend
+
+        self.state_dir = config.state_dir or os.path.join(STATIONS_DIR, config.name)
+        self.rois_path = os.path.join(self.state_dir, "rois.json")
+        self.plant_model_path = os.path.join(self.state_dir, "plant_model.json")
+        self.calib_path = config.calibration or CALIB_JSON_PATH
+
+        self.serial: Optional[SerialController] = None
+        self.camera: Optional[CameraStream] = None
+        self.volume_dc: Optional[VolumeDCActuator] = None
+
+        # 추적이 끊겼을 때만 YOLO 재검출 (결과는 station rois.json에 저장)
+        self.roi_tracker = RoiTracker(detector=self._detect_rois)
+        self._plant_model: Optional[PlantModel] = None
+
+        self.results: List[dict] = []  # run_to_target 결과 (+ station / wall_s)
+        self.ocr_stats = OcrStats()
+        self.roi_cache = RoiCache() if config.roi_cache else None
+        self.busy_s = 0.0
+        self.error: Optional[str] = None
+
+    # -------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------
+    def start(self) -> "Station":
+        cfg = self.config
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        self.camera = CameraStream(cfg.camera, fps=cfg.camera_fps).start()
+
+        self.serial = SerialController(cfg.serial_port)
+        self.serial.tx_debug = self.serial.rx_debug = False
+        self.serial.connect(exclusive=True)
+        self.volume_dc = VolumeDCActuator(self.serial, cfg.volume_dc_id)
+
+        if cfg.init_linears:
+            for actuator_id in (cfg.pipetting_linear_id, cfg.volume_linear_id):
+                LinearActuator(self.serial, actuator_id).initialize(speed=500, current=300, position=300)
+        return self
+
+    def close(self):
+        if self.volume_dc is not None:
+            try:
+                self.volume_dc.stop()
+            except Exception:
+                pass
+        if self.serial is not None:
+            self.serial.close()
+        if self.camera is not None:
+            self.camera.close()
+        self.serial = self.camera = self.volume_dc = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------
+    # Vision
+    # -------------------------------------------------
+    @property
+    def plant_model(self) -> PlantModel:
+        if self._plant_model is None:
+            pulses = load_calibration(self.calib_path) if os.path.exists(self.calib_path) else None
+            self._plant_model = load_plant_model(self.plant_model_path, calib_pulses=pulses)
+        return self._plant_model
+
+    def _detect_rois(self, frame) -> list:
+        with _yolo_lock:
+            rois = detect_rois(frame, model=get_yolo_model())
+        if rois:
+            save_rois(rois, self.rois_path)
+        return rois
+
+    def capture(self):
+        """호출 시점 이후에 들어온 프레임 1장 (rotate 적용)"""
+        frame = self.camera.wait_newer_than(time.monotonic()).image
+        return rotate_frame(frame, self.config.rotate)
+
+    def locate_rois(self, frame) -> list:
+        if self.config.rois:
+            return self.config.rois
+
+        initial = None
+        if not self.roi_tracker.initialized and os.path.exists(self.rois_path):
+            initial = load_rois(self.rois_path)
+        return self.roi_tracker.update(frame, initial_rois=initial).rois
+
+    def read_volume(self) -> int:
+        frame = self.capture()
+        return read_volume(frame, self.ocr_backend, rois=self.locate_rois(frame)).volume
+
+    # -------------------------------------------------
+    # Run to target
+    # -------------------------------------------------
+    def run_target(self, target: int, emit=None, stop_event=None) -> dict:
+        t0 = time.monotonic()
+        result = run_session_target(
+            target,
+            self.plant_model,
+            plant_model_path=self.plant_model_path,
+            strategy=self.config.strategy,
+            calib_path=self.calib_path,
+            camera=self.camera,
+            rotate=self.config.rotate,
+            vision_settle=self.config.vision_settle,
+            use_estimator=self.config.estimator,
+            ocr_backend=self.ocr_backend,
+            emit=emit or _discard,
+            stop_event=stop_event,
+            capture=self.capture,
+            locate_rois=self.locate_rois,
+            actuator=self.volume_dc,
+            ocr_stats=self.ocr_stats,
+            roi_cache=self.roi_cache,
+        )
+
+        wall_s = time.monotonic() - t0
+        self.busy_s += wall_s
+        result.update(station=self.name, wall_s=wall_s)
+        self.results.append(result)
+        return result
+
+    def stats(self, elapsed_s: Optional[float] = None) -> dict:
+        """
+        elapsed_s: 처리량 기준 시간 (StationManager.run 전체 wall time). None이면 busy_s
+        """
+        n = len(self.results)
+        elapsed = self.busy_s if elapsed_s is None else elapsed_s
+        return {
+            "targets": n,
+            "success": sum(1 for r in self.results if r["success"]),
+            "iterations": sum(r["iterations"] for r in self.results),
+            "busy_s": round(self.busy_s, 3),
+            "mean_s": round(self.busy_s / n, 3) if n else None,
+            "targets_per_hour": round(n / elapsed * 3600.0, 1) if elapsed > 0 else 0.0,
+            "ocr": self.ocr_stats.as_dict(),
+            "error": self.error,
+        }
+
+
+# =========================================================
+# Manager (N stations, OCR 엔진 1개)
+# =========================================================
+class StationManager:
+    # cancel 후 station thread가 끝나기를 기다리는 최대 시간
+    # (run_to_target은 다음 step에서 멈추고, 펄스 도중이면 펄스도 바로 끊긴다)
+    JOIN_TIMEOUT_S = 10.0
+
+    def __init__(
+        self,
+        configs: List[StationConfig],
+        ocr_backend: Optional[OcrBackend] = None,
+        ocr_backend_name: Optional[str] = None,
+        ocr_model: Optional[str] = None,
+        ocr_threads: Optional[int] = None,
+        ocr_max_batch: Optional[int] = None,
+        ocr_max_wait_ms: float = 2.0,
+    ):
+        """
+        - ocr_backend: 이미 만든 backend (None이면 create_backend로 1개 생성) → 모든 station이 공유
+        - ocr_max_batch: 추론 1회 최대 ROI 수 (None이면 station 수 × 4)
+        - ocr_max_wait_ms: 첫 요청 이후 다른 station 요청을 기다리는 시간
+        """
+        if ocr_backend is None:
+            ocr_backend = create_backend(ocr_backend_name, model_path=ocr_model, threads=ocr_threads)
+        self.ocr_backend = BatchingOcrServer(
+            ocr_backend,
+            max_batch=ocr_max_batch or 4 * max(1, len(configs)),
+            max_wait_ms=ocr_max_wait_ms,
+        )
+
+        self.stations = [Station(c, self.ocr_backend) for c in configs]
+        self.stop_event = threading.Event()
+        self.elapsed_s = 0.0
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> "StationManager":
+        started = []
+        try:
+            for station in self.stations:
+                started.append(station.start())
+        except Exception:
+            for station in started:
+                station.close()
+            raise
+        return self
+
+    def close(self):
+        self.stop_event.set()
+        # 실행 중인 run_to_target이 포트 / 카메라를 쓰는 동안 닫지 않도록
+        if not self.join(self.JOIN_TIMEOUT_S):
+            print("[STATIONS] station threads still running, closing anyway", file=sys.stderr, flush=True)
+        for station in self.stations:
+            station.close()
+        self.ocr_backend.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def station(self, name: str) -> Station:
+        for station in self.stations:
+            if station.name == name:
+                return station
+        raise KeyError(name)
+
+    def cancel(self):
+        """모든 station의 run_to_target을 다음 step에서 중단 (끝날 때까지 기다리려면 join)"""
+        self.stop_event.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """run() 의 station thread 종료 대기. returns: 모두 끝났으면 True"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(t.is_alive() for t in self._threads)
+
+    def run(self, targets, emit=None) -> dict:
+        """
+        - targets: station 이름 → 목표 목록, 또는 목표 목록 1개 (모든 station에 같은 목록)
+        - emit: 진행 이벤트 콜백 (여러 thread에서 호출, msg["station"]에 station 이름)
+        - returns: report()
+        """
+        if not isinstance(targets, dict):
+            targets = {s.name: list(targets) for s in self.stations}
+
+        self.stop_event.clear()
+        self._threads = threads = [
+            threading.Thread(
+                target=self._run_station,
+                args=(station, targets.get(station.name, []), emit),
+                name=f"station-{station.name}",
+                daemon=True,
+            )
+            for station in self.stations
+        ]
+
+        t0 = time.monotonic()
+        for t in threads:
+            t.start()
+        try:
+            for t in threads:
+                t.join()
+        finally:
+            # KeyboardInterrupt로 빠져나와도 그때까지의 시간은 report에 반영
+            self.elapsed_s += time.monotonic() - t0
+        return self.report()
+
+    def _run_station(self, station: Station, targets: List[int], emit):
+        station_emit = None
+        if emit is not None:
+            station_emit = lambda msg: emit(dict(msg, station=station.name))  # noqa: E731
+
+        for target in targets:
+            if self.stop_event.is_set():
+                break
+            try:
+                station.run_target(target, emit=station_emit, stop_event=self.stop_event)
+            except Exception as e:
+                # 한 rig의 고장이 다른 station을 멈추지 않는다
+                station.error = f"{type(e).__name__}: {e}"
+                print(f"[STATION {station.name}] stopped: {station.error}", file=sys.stderr, flush=True)
+                break
+
+    def report(self) -> dict:
+        elapsed = self.elapsed_s
+        stations = {s.name: s.stats(elapsed) for s in self.stations}
+        total = sum(s["targets"] for s in stations.values())
+        return {
+            "stations": stations,
+            "aggregate": {
+                "stations": len(self.stations),
+                "targets": total,
+                "success": sum(s["success"] for s in stations.values()),
+                "elapsed_s": round(elapsed, 3),
+                "targets_per_hour": round(total / elapsed * 3600.0, 1) if elapsed > 0 else 0.0,
+            },
+            "ocr": self.ocr_backend.stats(),
+        }
+
+
+def print_report(report: dict):
+    for name, s in report["stations"].items():
+        print(
+            f"[STATION {name}] targets={s['targets']} success={s['success']} "
+            f"mean={s['mean_s']}s targets/h={s['targets_per_hour']} "
+            f"ocr low={s['ocr']['low_conf']}/{s['ocr']['readings']} rereads={s['ocr']['rereads']} "
+            f"roi_hit={s['ocr']['roi_hit_rate'] * 100:.0f}%"
+            + (f" error={s['error']}" if s["error"] else "")
+        )
+    a = report["aggregate"]
+    print(
+        f"[STATIONS] n={a['stations']} targets={a['targets']} success={a['success']} "
+        f"elapsed={a['elapsed_s']:.1f}s targets/h={a['targets_per_hour']}"
+    )
+    o = report["ocr"]
+    print(
+        f"[OCR] requests={o['requests']} batches={o['batches']} "
+        f"rows/batch={o['batch_rows']['mean']} wait p95={o['queue_wait_ms']['p95']}ms "
+        f"latency p95={o['latency_ms']['p95']}ms"
+    )
+
+
+# =========================================================
+# CLI
+# =========================================================
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--config", required=True, help="station 목록 JSON")
+    ap.add_argument("--targets", type=int, nargs="+", required=True, help="모든 station에 같은 목표 목록")
+    ap.add_argument("--strategy", choices=list(STRATEGIES), default=None, help="config에 없는 station 기본값")
+    ap.add_argument("--ocr-backend", choices=list(BACKENDS), default=None)
+    ap.add_argument("--ocr-model", default=None)
+    ap.add_argument("--ocr-threads", type=int, default=None)
+    ap.add_argument("--ocr-max-batch", type=int, default=None, help="추론 1회 최대 ROI 수 (기본 station 수 × 4)")
+    ap.add_argument("--ocr-max-wait-ms", type=float, default=2.0)
+    ap.add_argument("--out", default=None, help="report JSON 저장 경로")
+    args = ap.parse_args()
+
+    configs = load_station_configs(args.config)
+    for cfg in configs:
+        cfg.strategy = cfg.strategy or args.strategy
+
+    manager = StationManager(
+        configs,
+        ocr_backend_name=args.ocr_backend,
+        ocr_model=args.ocr_model,
+        ocr_threads=args.ocr_threads,
+        ocr_max_batch=args.ocr_max_batch,
+        ocr_max_wait_ms=args.ocr_max_wait_ms,
+    )
+    with manager:
+        try:
+            report = manager.run(args.targets)
+        except KeyboardInterrupt:
+            manager.cancel()
+            # 진행 중인 목표가 끝나야 결과가 report에 들어가고, 그 뒤에야 포트 / 카메라를 닫는다
+            if not manager.join(manager.JOIN_TIMEOUT_S):
+                print("[STATIONS] cancel timed out, report may be incomplete", file=sys.stderr, flush=True)
+            report = manager.report()
+
+    print_report(report)
+    if args.out:
+        report["config"] = [asdict(c) for c in configs]
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import Callable, Optional, Protocol, Tuple
+
+import numpy as np
+
+
+# =========================================================
+# Allocator interface
+# =========================================================
+class BufferAllocator(Protocol):
+    """
+    TRT 추론 버퍼 할당 인터페이스
+    - 실제 구현: worker.ocr_trt.CudaAllocator (pagelocked host + cuda.mem_alloc)
+    - CPU 전용 환경에서는 가짜 구현으로 bookkeeping만 검증 가능
+    """
+
+    def host_empty(self, shape, dtype=np.float32) -> np.ndarray:
+        ...
+
+    def device_alloc(self, nbytes: int):
+        """int(handle) == device address 인 핸들을 반환"""
+        ...
+
+    def device_free(self, handle):
+        ...
+
+
+class HostAllocator:
+    """일반 numpy 메모리 + 가짜 device 주소 (테스트/벤치용)"""
+
+    def __init__(self):
+        self._next_addr = 0x1000
+        self.live = {}
+
+    def host_empty(self, shape, dtype=np.float32) -> np.ndarray:
+        return np.empty(shape, dtype=dtype)
+
+    def device_alloc(self, nbytes: int):
+        addr = self._next_addr
+        self._next_addr += max(256, (nbytes + 255) // 256 * 256)
+        self.live[addr] = nbytes
+        return addr
+
+    def device_free(self, handle):
+        self.live.pop(int(handle), None)
+
+
+# =========================================================
+# Batch buckets
+# =========================================================
+def batch_bucket(n: int, max_batch: Optional[int] = None) -> int:
+    """
+    n 이상인 가장 작은 2의 거듭제곱 (max_batch로 상한)
+    - max_batch보다 큰 n은 그대로 (단독 배치)
+    """
+    n = max(1, int(n))
+    if max_batch is not None and n >= max_batch:
+        return n if n > max_batch else int(max_batch)
+    bucket = 1 << (n - 1).bit_length()
+    return bucket if max_batch is None else min(bucket, int(max_batch))
+
+
+def bucket_count(max_batch: int) -> int:
+    """1 ~ max_batch 행 요청이 쓰는 bucket 수 (1, 2, 4, ..., max_batch)"""
+    return len({batch_bucket(n, max_batch) for n in range(1, int(max_batch) + 1)})
+
+
+# =========================================================
+# Per-shape buffer set
+# =========================================================
+class TRTBuffers:
+    def __init__(self, allocator: BufferAllocator, in_shape, out_shape):
+        self.in_shape = tuple(in_shape)
+        self.out_shape = tuple(out_shape)
+
+        self.host_input = allocator.host_empty(self.in_shape, np.float32)
+        self.host_output = allocator.host_empty(self.out_shape, np.float32)
+
+        self.d_input = allocator.device_alloc(self.host_input.nbytes)
+        self.d_output = allocator.device_alloc(self.host_output.nbytes)
+
+    def is_host_input(self, x: np.ndarray) -> bool:
+        """x가 host_input 앞쪽 행의 view인지 (input_buffer()로 받은 zero-copy 배열)"""
+        return (
+            x.dtype == self.host_input.dtype
+            and x.flags.c_contiguous
+            and x.__array_interface__["data"][0] == self.host_input.__array_interface__["data"][0]
+        )
+
+    def free(self, allocator: BufferAllocator):
+        if self.d_input is not None:
+            allocator.device_free(self.d_input)
+        if self.d_output is not None:
+            allocator.device_free(self.d_output)
+        self.d_input = None
+        self.d_output = None
+
+
+class BufferPool:
+    """
+    입력 shape (N,C,H,W) → TRTBuffers 캐시
+    - 같은 shape는 한 번만 할당
+    - max_batch가 주어지면 N을 batch_bucket(N)으로 올려 할당 (반환 버퍼의 in_shape[0] >= N,
+      호출자는 앞쪽 N행만 사용) → 1 ~ max_batch 사이 batch 크기가 섞여도 shape 수는 bucket 수로 고정
+    - max_entries 초과 시 가장 오래 안 쓴 shape부터 해제 (LRU)
+      (None이면 max_batch가 있을 때 bucket 수, 없으면 4)
+    """
+
+    def __init__(
+        self,
+        allocator: BufferAllocator,
+        max_entries: Optional[int] = None,
+        max_batch: Optional[int] = None,
+    ):
+        self.allocator = allocator
+        self.max_batch = None if max_batch is None else max(1, int(max_batch))
+        if max_entries is None:
+            max_entries = 4 if self.max_batch is None else bucket_count(self.max_batch)
+        self.max_entries = max(1, int(max_entries))
+
+        self._entries: "OrderedDict[Tuple[int, ...], TRTBuffers]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(
+        self,
+        in_shape,
+        out_shape_fn: Callable[[Tuple[int, ...]], Tuple[int, ...]],
+    ) -> TRTBuffers:
+        """
+        out_shape_fn(in_shape)는 캐시 miss 때만 (bucket shape로) 호출된다
+        """
+        key = tuple(int(d) for d in in_shape)
+        if self.max_batch is not None:
+            key = (batch_bucket(key[0], self.max_batch),) + key[1:]
+
+        bufs: Optional[TRTBuffers] = self._entries.get(key)
+        if bufs is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return bufs
+
+        self.misses += 1
+        bufs = TRTBuffers(self.allocator, key, out_shape_fn(key))
+        self._entries[key] = bufs
+
+        while len(self._entries) > self.max_entries:
+            _, old = self._entries.popitem(last=False)
+            old.free(self.allocator)
+
+        return bufs
+
+    def clear(self):
+        for bufs in self._entries.values():
+            bufs.free(self.allocator)
+        self._entries.clear()
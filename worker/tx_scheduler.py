@@ -0,0 +1,239 @@
+"""
+Priority TX scheduler: SerialController tx_queue 대체
+
+class별 queue (높은 우선순위부터 전송)
+- SAFETY       : pipette stop (duty 0), force off → 절대 버리지 않음, 같은 id의 대기 중인 motion 제거
+                 (force on / 이동이 뒤늦게 나가 꺼진 actuator가 다시 움직이지 않도록)
+- MOTION       : set position / speed / current / force on, pipette run, MyActuator angle
+                 같은 (id, cmd)가 대기 중이면 새 값으로 교체 (supersede, 순서 유지)
+- HOUSEKEEPING : status poll / feedback 요청 → 같은 (id, cmd)가 대기 중이면 새 요청은 합침 (coalesce)
+
+queue.Queue 와 같은 방식의 task 카운터 (task_done / unfinished_tasks)로 drain 대기를 지원한다.
+put(future=...)로 넘긴 Future는 전송 시 (get_item을 꺼낸 쪽이) 완료하고,
+버려지면 (stop / force off에 의한 취소 / 용량 초과 / clear) RuntimeError로 끝난다. 교체되면 새 packet을 따라간다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+from worker.make_packet import MakePacket
+
+SAFETY = 0
+MOTION = 1
+HOUSEKEEPING = 2
+CLASS_NAMES = {SAFETY: "safety", MOTION: "motion", HOUSEKEEPING: "housekeeping"}
+
+DEFAULT_CAPACITY = {SAFETY: 32, MOTION: 16, HOUSEKEEPING: 4}
+
+_HOUSEKEEPING_CMDS = (
+    MakePacket.MIGHTYZAP_GetMovingState,
+    MakePacket.MIGHTYZAP_GetFeedbackData,
+    MakePacket.MyActuator_getAbsoluteAngle,
+)
+
+
+def classify(packet: bytes) -> Tuple[int, tuple]:
+    """packet → (class, key)"""
+    actuator_id, cmd = packet[2], packet[4]
+
+    if cmd == MakePacket.GearedDC_changePipetteVolume and packet[6] == 0:
+        return SAFETY, (actuator_id, "stop")
+    if cmd == MakePacket.MIGHTYZAP_SetForceOnOff and packet[5] == 0:
+        return SAFETY, (actuator_id, "force_off")
+    if cmd in _HOUSEKEEPING_CMDS:
+        return HOUSEKEEPING, (actuator_id, cmd)
+    return MOTION, (actuator_id, cmd)
+
+
+class TxScheduler:
+    def __init__(self, capacity: Optional[dict] = None):
+        """
+        - capacity: class별 최대 대기 packet 수
+          SAFETY가 가득 차면 (정상이라면 불가능) 가장 오래된 MOTION/HOUSEKEEPING 자리를 빼서라도 넣는다
+          MOTION이 가득 차면 가장 오래된 motion을 버림, HOUSEKEEPING은 새 요청을 버림
+        """
+        self.capacity = dict(DEFAULT_CAPACITY)
+        if capacity:
+            self.capacity.update(capacity)
+
+        self._cond = threading.Condition()
+        self._queues = {c: OrderedDict() for c in CLASS_NAMES}
+        self._wake = False
+        self.unfinished_tasks = 0
+
+        self.reset_stats()
+
+    # =========================
+    # Stats
+    # =========================
+    def reset_stats(self):
+        with self._cond:
+            self.enqueued = {c: 0 for c in CLASS_NAMES}
+            self.sent = {c: 0 for c in CLASS_NAMES}
+            self.dropped = {c: 0 for c in CLASS_NAMES}
+            self.superseded = 0
+            self.coalesced = 0
+            self.cancelled = 0       # stop / force off에 의해 제거된 motion
+            self.max_depth = {c: 0 for c in CLASS_NAMES}
+            self.max_wait_s = {c: 0.0 for c in CLASS_NAMES}
+
+    def stats(self) -> dict:
+        with self._cond:
+            def named(d):
+                return {CLASS_NAMES[c]: v for c, v in d.items()}
+
+            return {
+                "depth": named({c: len(q) for c, q in self._queues.items()}),
+                "max_depth": named(self.max_depth),
+                "enqueued": named(self.enqueued),
+                "sent": named(self.sent),
+                "dropped": named(self.dropped),
+                "superseded": self.superseded,
+                "coalesced": self.coalesced,
+                "cancelled": self.cancelled,
+                "max_wait_ms": {k: round(v * 1000, 2) for k, v in named(self.max_wait_s).items()},
+            }
+
+    # =========================
+    # Queue API
+    # =========================
+    def qsize(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def put(self, packet: bytes, cls: Optional[int] = None, key=None, future: Optional[Future] = None) -> bool:
+        """
+        - cls / key: None이면 packet 내용으로 분류
+        - future: 전송 완료 시 결과를 받을 Future (coalesce되면 기존 요청 전송 시 완료)
+        - returns: 새로 대기열에 들어갔거나 기존 항목을 교체했으면 True, 버려졌으면 False
+        """
+        futures = [future] if future is not None else []
+        auto_cls, auto_key = classify(packet)
+        cls = auto_cls if cls is None else cls
+        key = auto_key if key is None else key
+
+        with self._cond:
+            q = self._queues[cls]
+            self.enqueued[cls] += 1
+            now = time.monotonic()
+
+            if key in q:
+                _, t_put, pending = q[key]
+                pending.extend(futures)
+                if cls == HOUSEKEEPING:
+                    self.coalesced += 1
+                    return False
+                # 같은 대상에 대한 최신 명령으로 교체 (대기 시작 시각 / 위치 유지)
+                q[key] = (packet, t_put, pending)
+                self.superseded += 1
+                return True
+
+            if cls == SAFETY:
+                self._cancel_motion(key[0], key[1])
+
+            if len(q) >= self.capacity[cls]:
+                if cls == HOUSEKEEPING:
+                    self.dropped[cls] += 1
+                    _fail(futures, "tx queue full")
+                    return False
+                if cls == MOTION:
+                    _fail(q.popitem(last=False)[1][2], "tx queue full")
+                    self._finish(1)
+                    self.dropped[cls] += 1
+                else:
+                    self._evict_for_safety()
+
+            q[key] = (packet, now, futures)
+            self.unfinished_tasks += 1
+            self.max_depth[cls] = max(self.max_depth[cls], len(q))
+            self._cond.notify()
+            return True
+
+    def _cancel_motion(self, actuator_id: int, reason: str = "stop"):
+        q = self._queues[MOTION]
+        for key in [k for k in q if k[0] == actuator_id]:
+            _fail(q.pop(key)[2], f"cancelled by {reason}")
+            self._finish(1)
+            self.cancelled += 1
+
+    def _evict_for_safety(self):
+        self.dropped[SAFETY] += 1  # 용량 초과 기록 (packet 자체는 넣는다)
+        for cls in (HOUSEKEEPING, MOTION):
+            if self._queues[cls]:
+                _fail(self._queues[cls].popitem(last=False)[1][2], "evicted for safety packet")
+                self._finish(1)
+                self.dropped[cls] += 1
+                return
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        """
+        우선순위가 가장 높은 packet (blocking)
+        - timeout 경과 또는 wake() 호출 시 None
+        - 꺼낸 packet은 전송 후 task_done() 호출
+        """
+        item = self.get_item(timeout)
+        return None if item is None else item[0]
+
+    def get_item(self, timeout: Optional[float] = None) -> Optional[Tuple[bytes, List[Future]]]:
+        """get()과 같지만 (packet, 전송 후 완료할 Future 목록) 반환"""
+        with self._cond:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                for cls, q in self._queues.items():
+                    if q:
+                        _, (packet, t_put, futures) = q.popitem(last=False)
+                        self.sent[cls] += 1
+                        self.max_wait_s[cls] = max(self.max_wait_s[cls], time.monotonic() - t_put)
+                        return packet, futures
+
+                if self._wake:
+                    self._wake = False
+                    return None
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def wake(self):
+        """blocking get()을 packet 없이 깨움 (close 시)"""
+        with self._cond:
+            self._wake = True
+            self._cond.notify_all()
+
+    def task_done(self):
+        with self._cond:
+            self._finish(1)
+
+    def _finish(self, n: int):
+        self.unfinished_tasks = max(0, self.unfinished_tasks - n)
+        if self.unfinished_tasks == 0:
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """대기 + 전송 중인 packet이 모두 끝날 때까지 (drain)"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.unfinished_tasks == 0, timeout)
+
+    def clear(self) -> int:
+        """대기 중인 packet 모두 버림 (전송 중인 것은 task_done으로 정리)"""
+        with self._cond:
+            n = sum(len(q) for q in self._queues.values())
+            for q in self._queues.values():
+                for _, _, futures in q.values():
+                    _fail(futures, "tx queue cleared")
+                q.clear()
+            self._finish(n)
+            self._wake = False
+            return n
+
+
+def _fail(futures, reason: str):
+    for f in futures:
+        if not f.done():
+            f.set_exception(RuntimeError(reason))
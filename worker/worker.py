@@ -1,39 +1,512 @@
 import argparse
 import json
 import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
 import cv2
 
 from worker.paths import (
     ensure_state_dir,
     FRAME_JPG_PATH,
+    PLANT_MODEL_PATH,
     ROIS_JSON_PATH,
-    OCR_TRT_PATH,
 )
-from worker.camera import capture_one_frame
-from worker.yolo_worker import run_yolo_on_frame
-from worker.ocr_trt import TRTWrapper, read_volume_trt
-from worker.control_worker import run_to_target
+from worker.actuator_volume_dc import VOLUME_DC_ID, VolumeDCActuator
+from worker.camera import capture_one_frame, get_camera_stream, rotate_frame
+from worker.yolo_worker import (
+    flush_annotations,
+    get_yolo_model,
+    run_yolo_on_frame,
+    warmup_yolo,
+)
+from worker.ocr import OcrStats, load_rois, read_volume_confident
+from worker.roi_cache import RoiCache
+from worker.ocr_backends import BACKENDS, OcrBackend, create_backend
+from worker.control_strategy import STRATEGIES, default_plant_model
+from worker.control_worker import run_session_target
+from worker.roi_tracker import RoiTracker, TrackResult
 
-print("[WORKER] worker.py entry", flush=True)
+print("[WORKER] worker.py entry", file=sys.stderr, flush=True)
 
 # ==================================================
 # Utils
 # ==================================================
-def rotate_frame(frame, rotate_code: int):
+def reset_rois():
+    if os.path.exists(ROIS_JSON_PATH):
+        try:
+            os.remove(ROIS_JSON_PATH)
+        except Exception:
+            pass
+
+
+# ==================================================
+# Session (모델/엔진은 프로세스 수명 동안 1회만 로드)
+# ==================================================
+class WorkerSession:
     """
-    rotate_code:
-      0: no rotate
-      1: 90 CW
-      2: 90 CCW
-      3: 180
+    CLI 단발 실행과 --serve 데몬이 공유하는 요청 처리기.
+    OCR backend와 YOLO 모델은 첫 사용 시 로드 후 재사용한다.
     """
-    if rotate_code == 1:
-        return cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-    if rotate_code == 2:
-        return cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-    if rotate_code == 3:
-        return cv2.rotate(frame, cv2.ROTATE_180)
-    return frame
+
+    def __init__(
+        self,
+        camera_index: int = 0,
+        rotate: int = 1,
+        ocr_backend: str = None,
+        ocr_model: str = None,
+        ocr_threads: int = None,
+        track_rois: bool = True,
+        strategy: str = None,
+        motor_port: str = None,
+        motor_id: int = VOLUME_DC_ID,
+        vision_settle: bool = True,
+        use_estimator: bool = True,
+        roi_cache: bool = True,
+    ):
+        self.camera_index = camera_index
+        self.rotate = rotate
+        self.track_rois = track_rois
+        # 펄스 뒤 고정 SETTLE_TIME 대신 ROI 정지 감지
+        self.vision_settle = vision_settle
+        # OCR 판독 + 명령 펄스 융합 추정 (outlier 판독 무시 / 확실한 step OCR 생략)
+        self.use_estimator = use_estimator
+        self.strategy_name = strategy
+
+        # direct mode: 설정되면 run-target 동안 worker가 포트를 열고 모터를 직접 구동
+        self.motor_port = motor_port
+        self.motor_id = motor_id
+
+        self.ocr_backend_name = ocr_backend
+        self.ocr_model_path = ocr_model
+        self.ocr_threads = ocr_threads
+
+        self._ocr_backend = None
+        self._plant_model = None
+        # 저신뢰 digit 재판독 횟수 / 비용 (세션 누적, ocr 응답에 포함)
+        self.ocr_stats = OcrStats()
+        # 직전 추론 crop과 같은 digit ROI는 추론 생략 (ocr / run-target 공용)
+        self.roi_cache = RoiCache() if roi_cache else None
+
+        # 추적이 끊겼을 때만 YOLO 재검출
+        self.roi_tracker = RoiTracker(
+            detector=lambda frame: run_yolo_on_frame(frame, model=self.yolo_model)[0]
+        )
+
+    # -------------------------------------------------
+    # Lazy resources
+    # -------------------------------------------------
+    @property
+    def ocr_backend(self) -> OcrBackend:
+        if self._ocr_backend is None:
+            self._ocr_backend = create_backend(
+                self.ocr_backend_name,
+                model_path=self.ocr_model_path,
+                threads=self.ocr_threads,
+            )
+        return self._ocr_backend
+
+    @property
+    def plant_model(self):
+        if self._plant_model is None:
+            self._plant_model = default_plant_model()
+        return self._plant_model
+
+    def reset_plant_model(self):
+        """calibration.json 기준으로 다시 시작 (저장된 추정치 폐기)"""
+        if os.path.exists(PLANT_MODEL_PATH):
+            os.remove(PLANT_MODEL_PATH)
+        self._plant_model = None
+        return self.plant_model
+
+    @property
+    def yolo_model(self):
+        return get_yolo_model()
+
+    def warmup(self):
+        """serve 시작 시 엔진/모델을 미리 올려 첫 요청 지연 제거"""
+        _ = self.ocr_backend
+        warmup_yolo()
+
+    def locate_rois(self, frame) -> TrackResult:
+        """
+        현재 프레임의 ROI
+        - 추적 시작 전이면 rois.json (없으면 YOLO) 기준으로 초기화
+        - track_rois=False면 rois.json 그대로
+        """
+        if not self.track_rois:
+            return TrackResult(load_rois(), 1.0, 0.0, False, False)
+
+        initial = None
+        if not self.roi_tracker.initialized and os.path.exists(ROIS_JSON_PATH):
+            initial = load_rois()
+        return self.roi_tracker.update(frame, initial_rois=initial)
+
+    # -------------------------------------------------
+    # Requests
+    # -------------------------------------------------
+    def capture_rotated(self, camera_index=None, rotate=None):
+        if camera_index is None:
+            camera_index = self.camera_index
+        if rotate is None:
+            rotate = self.rotate
+        frame = capture_one_frame(camera_index)
+        return rotate_frame(frame, rotate)
+
+    def capture(self, camera_index=None, rotate=None) -> dict:
+        frame = self.capture_rotated(camera_index, rotate)
+        cv2.imwrite(FRAME_JPG_PATH, frame)
+        return {"ok": True, "frame_path": FRAME_JPG_PATH}
+
+    def yolo(self, camera_index=None, rotate=None, reset=False, annotate=False) -> dict:
+        if reset:
+            reset_rois()
+
+        frame = self.capture_rotated(camera_index, rotate)
+        cv2.imwrite(FRAME_JPG_PATH, frame)
+
+        # GUI가 원본 프레임 위에 직접 ROI를 그리므로 annotated 이미지는 opt-in
+        rois, annotated_path = run_yolo_on_frame(
+            frame, model=self.yolo_model, annotate=annotate
+        )
+        if rois:
+            self.roi_tracker.reset(frame, rois)
+        return {
+            "ok": True,
+            "rois": rois,
+            "frame_path": FRAME_JPG_PATH,
+            "annotated_path": annotated_path,
+        }
+
+    def ocr(self, camera_index=None, rotate=None, auto_rois=False) -> dict:
+        frame = self.capture_rotated(camera_index, rotate)
+        cv2.imwrite(FRAME_JPG_PATH, frame)
+
+        if auto_rois and not os.path.exists(ROIS_JSON_PATH):
+            rois, _ = run_yolo_on_frame(frame, model=self.yolo_model)
+            if rois:
+                self.roi_tracker.reset(frame, rois)
+
+        track = self.locate_rois(frame)
+        reading = read_volume_confident(
+            frame, self.ocr_backend, track.rois,
+            recapture=lambda: self.capture_rotated(camera_index, rotate),
+            stats=self.ocr_stats,
+            cache=self.roi_cache,
+        )
+        return {
+            "ok": True,
+            "volume": reading.volume,
+            "digits": reading.digits,
+            "digit_conf": [round(c, 4) for c in reading.conf],
+            "ocr_valid": reading.valid,
+            "in_transition": reading.in_transition,
+            "ocr_stats": self.ocr_stats.as_dict(),
+            "rois": track.rois,
+            "roi_confidence": round(track.confidence, 3),
+            "roi_drift": round(track.drift, 1),
+            "roi_redetected": track.redetected,
+        }
+
+    @contextmanager
+    def _volume_actuator(self, port):
+        """
+        run-target 동안만 포트 점유 (exclusive). 종료 시 stop 전송 후 thread join + close
+        → GUI가 바로 다시 연결할 수 있다
+        """
+        if not port:
+            yield None
+            return
+
+        from worker.serial_controller import SerialController
+
+        serial = SerialController(port)
+        serial.tx_debug = serial.rx_debug = False
+        serial.polling_enabled = False  # DC 모터는 status poll 불필요
+        serial.connect(exclusive=True)
+        actuator = VolumeDCActuator(serial, self.motor_id)
+        print(f"[WORKER] motor port acquired: {port}", file=sys.stderr, flush=True)
+        try:
+            yield actuator
+        finally:
+            try:
+                actuator.stop()
+            finally:
+                serial.close()
+                print(f"[WORKER] motor port released: {port}", file=sys.stderr, flush=True)
+
+    def run_target(
+        self, target: int, camera_index=None, emit=None, stop_event=None, strategy=None,
+        motor_port=None, rotate=None,
+    ) -> dict:
+        """
+        motor_port: 지정되면 (또는 session.motor_port) 펄스를 worker가 직접 실행
+        rotate: 요청별 회전 (None이면 session.rotate), OCR 캡처와 정지 감지 프레임에 똑같이 적용
+        """
+        if camera_index is None:
+            camera_index = self.camera_index
+        if rotate is None:
+            rotate = self.rotate
+        motor_port = motor_port or self.motor_port
+
+        with self._volume_actuator(motor_port) as actuator:
+            result = run_session_target(
+                target,
+                self.plant_model,
+                strategy=strategy or self.strategy_name,
+                camera=get_camera_stream(camera_index) if self.vision_settle else None,
+                rotate=rotate,
+                vision_settle=self.vision_settle,
+                use_estimator=self.use_estimator,
+                camera_index=camera_index,
+                ocr_backend=self.ocr_backend,
+                emit=emit,
+                stop_event=stop_event,
+                capture=lambda: self.capture_rotated(camera_index, rotate),
+                locate_rois=lambda frame: self.locate_rois(frame).rois,
+                actuator=actuator,
+                ocr_stats=self.ocr_stats,
+                roi_cache=self.roi_cache,
+            )
+        return {"ok": True, "result": result}
+
+
+# ==================================================
+# Serve mode (newline-delimited JSON over stdin/stdout)
+# ==================================================
+#
+# request : {"id": 1, "cmd": "ocr", "camera": 0, "rotate": 1}
+# event   : {"id": 1, "event": {...}}          (run-target 진행 상황)
+# response: {"id": 1, "ok": true, ...}
+#
+# "cancel"은 즉시 처리된다: {"cmd": "cancel", "target_id": 3} 이면 run-target 요청 3만,
+# target_id가 없으면 받은 모든 run-target (실행 중 + 대기 중) 을 중단.
+# 요청별 취소 Event는 stdin에서 읽는 순간 만들어지므로 시작 전 (또는 요청보다 먼저) 온 cancel도 유지된다.
+# run-target은 별도 thread에서 실행되며, 그동안 ping / cancel / shutdown 외의 요청은
+# {"ok": false, "error": "busy: ..."} 로 바로 거절 (카메라 / OCR / 모터를 공유하므로).
+# "shutdown" 또는 stdin EOF 시 실행 중인 run-target을 취소하고 끝날 때까지 기다린 뒤 종료.
+#
+SERVE_COMMANDS = (
+    "ping", "capture", "yolo", "ocr", "run-target", "plant-model", "cancel", "shutdown",
+)
+
+
+class _ProtocolWriter:
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def send(self, msg: dict):
+        line = json.dumps(msg, ensure_ascii=False)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+def _handle_request(session: WorkerSession, req: dict, out: _ProtocolWriter, stop_event):
+    rid = req.get("id")
+    cmd = req.get("cmd")
+
+    cam = req.get("camera")
+    rot = req.get("rotate")
+
+    if cmd == "ping":
+        return {"ok": True, "pid": os.getpid()}
+
+    if cmd == "capture":
+        return session.capture(cam, rot)
+
+    if cmd == "yolo":
+        return session.yolo(
+            cam, rot,
+            reset=bool(req.get("reset", False)),
+            annotate=bool(req.get("annotate", False)),
+        )
+
+    if cmd == "ocr":
+        return session.ocr(cam, rot, auto_rois=bool(req.get("auto_rois", False)))
+
+    if cmd == "run-target":
+        return session.run_target(
+            target=int(req.get("target", 0)),
+            camera_index=cam,
+            emit=lambda msg: out.send({"id": rid, "event": msg}),
+            stop_event=stop_event,
+            strategy=req.get("strategy"),
+            motor_port=req.get("motor_port"),
+            rotate=rot,
+        )
+
+    if cmd == "plant-model":
+        model = session.reset_plant_model() if req.get("reset") else session.plant_model
+        return {"ok": True, "model": model.summary()}
+
+    return {"ok": False, "error": f"unknown cmd: {cmd}"}
+
+
+class _CancelRegistry:
+    """run-target 요청 id → 취소 Event (stdin reader thread가 등록 / 취소)"""
+
+    def __init__(self):
+        self._events: Dict[Any, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def register(self, rid) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault(rid, threading.Event())
+
+    def cancel(self, rid=None) -> int:
+        """
+        rid가 None이면 등록된 전부. returns: 취소한 요청 수
+        아직 도착하지 않은 rid도 미리 취소해 둔다 (register 시 set된 Event를 받음)
+        """
+        with self._lock:
+            if rid is None:
+                events = list(self._events.values())
+            else:
+                events = [self._events.setdefault(rid, threading.Event())]
+        for e in events:
+            e.set()
+        return len(events)
+
+    def release(self, rid):
+        with self._lock:
+            self._events.pop(rid, None)
+
+
+def _stdin_reader(inbox: "queue.Queue", cancels: _CancelRegistry, stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            req = json.loads(line)
+        except Exception:
+            print(f"[SERVE] bad request: {line!r}", file=sys.stderr, flush=True)
+            continue
+
+        # 취소 Event는 큐에 넣기 전에 등록 / 반영 (처리 순서와 무관하게 cancel이 유지되도록)
+        if req.get("cmd") == "run-target":
+            cancels.register(req.get("id"))
+        elif req.get("cmd") == "cancel":
+            req["cancelled"] = cancels.cancel(req.get("target_id"))
+        inbox.put(req)
+
+    inbox.put(None)  # EOF
+
+
+def _session_from_args(args) -> WorkerSession:
+    return WorkerSession(
+        camera_index=args.camera,
+        rotate=args.rotate,
+        ocr_backend=args.ocr_backend,
+        ocr_model=args.ocr_model,
+        ocr_threads=args.ocr_threads,
+        track_rois=not args.no_roi_tracking,
+        strategy=args.strategy,
+        motor_port=args.motor_port,
+        vision_settle=not args.fixed_settle,
+        use_estimator=not args.no_estimator,
+        roi_cache=not args.no_roi_cache,
+    )
+
+
+def serve(args):
+    # stdout은 프로토콜 전용. 기존 print 로그는 전부 stderr로 돌린다.
+    out = _ProtocolWriter(sys.stdout)
+    sys.stdout = sys.stderr
+
+    session = _session_from_args(args)
+
+    t0 = time.perf_counter()
+    if not args.no_warmup:
+        try:
+            session.warmup()
+        except Exception as e:
+            print(f"[SERVE] warmup failed: {e}", file=sys.stderr, flush=True)
+    print(
+        f"[SERVE] ready pid={os.getpid()} warmup={time.perf_counter() - t0:.2f}s",
+        file=sys.stderr, flush=True,
+    )
+
+    serve_loop(session, sys.stdin, out)
+
+
+def _response(session: WorkerSession, req: dict, out: _ProtocolWriter, stop_event) -> dict:
+    try:
+        res = _handle_request(session, req, out, stop_event)
+    except Exception as e:
+        res = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+    res["id"] = req.get("id")
+    return res
+
+
+def serve_loop(session: WorkerSession, stream, out: _ProtocolWriter):
+    """stream (줄 단위 JSON 요청) 을 EOF / shutdown까지 처리"""
+    inbox: "queue.Queue" = queue.Queue()
+    cancels = _CancelRegistry()
+    threading.Thread(
+        target=_stdin_reader, args=(inbox, cancels, stream), daemon=True
+    ).start()
+
+    running: Optional[threading.Thread] = None
+    running_id = None
+    # 응답을 보내기 전에 set: 응답을 받은 클라이언트의 다음 요청이 busy로 거절되지 않도록
+    run_done = threading.Event()
+
+    def run_target(req: dict, stop_event: threading.Event):
+        res = _response(session, req, out, stop_event)
+        cancels.release(req.get("id"))
+        run_done.set()
+        out.send(res)
+
+    while True:
+        req = inbox.get()
+        if req is None:
+            break
+
+        rid = req.get("id")
+        cmd = req.get("cmd")
+        if running is not None and run_done.is_set():
+            running.join()
+            running, running_id = None, None
+
+        if cmd == "shutdown":
+            if running is not None:
+                cancels.cancel()
+                running.join()
+            out.send({"id": rid, "ok": True})
+            return
+
+        if cmd == "cancel":
+            # 해당 run-target이 없으면 no-op (cancelled = 0)
+            out.send({"id": rid, "ok": True, "cancelled": req.get("cancelled", 0)})
+            continue
+
+        if running is not None and cmd != "ping":
+            # 대기 중이던 run-target이 거절되면 취소 Event도 정리
+            cancels.release(rid)
+            out.send({"id": rid, "ok": False, "error": f"busy: run-target {running_id} in progress"})
+            continue
+
+        if cmd == "run-target":
+            run_done.clear()
+            running = threading.Thread(target=run_target, args=(req, cancels.register(rid)), daemon=True)
+            running_id = rid
+            running.start()
+            continue
+
+        out.send(_response(session, req, out, None))
+
+    # stdin EOF: 실행 중인 run-target 정리
+    if running is not None:
+        cancels.cancel()
+        running.join()
 
 
 def main():
@@ -47,75 +520,82 @@ def main():
     ap.add_argument("--capture", action="store_true")
     ap.add_argument("--yolo", action="store_true")
     ap.add_argument("--reset-rois", action="store_true")
+    ap.add_argument("--annotate", action="store_true")
     ap.add_argument("--ocr", action="store_true")
     ap.add_argument("--ocr-auto-rois", action="store_true")
     ap.add_argument("--run-target", action="store_true")
     ap.add_argument("--target", type=int, default=0)
+    ap.add_argument("--strategy", choices=list(STRATEGIES), default=None)
+    ap.add_argument("--motor-port", default=None, help="지정 시 run-target 펄스를 worker가 직접 실행")
+    ap.add_argument("--ping", action="store_true")
+
+    # -------------------------------------------------
+    # OCR backend (trt | onnx | opencv)
+    # -------------------------------------------------
+    ap.add_argument("--ocr-backend", choices=list(BACKENDS), default=None)
+    ap.add_argument("--ocr-model", default=None)
+    ap.add_argument("--ocr-threads", type=int, default=None)
+    ap.add_argument("--no-roi-tracking", action="store_true")
+    ap.add_argument("--fixed-settle", action="store_true", help="펄스 뒤 ROI 정지 감지 대신 고정 SETTLE_TIME")
+    ap.add_argument("--no-roi-cache", action="store_true", help="바뀌지 않은 digit ROI도 매번 추론")
+    ap.add_argument("--no-estimator", action="store_true", help="융합 추정 없이 매 step OCR 판독값 그대로 사용")
+
+    # -------------------------------------------------
+    # Daemon
+    # -------------------------------------------------
+    ap.add_argument("--serve", action="store_true")
+    ap.add_argument("--no-warmup", action="store_true")
 
     args = ap.parse_args()
     ensure_state_dir()
 
+    if args.serve:
+        serve(args)
+        return
+
     # -------------------------------------------------
     # Reset ROIs
     # -------------------------------------------------
-    if args.reset_rois and os.path.exists(ROIS_JSON_PATH):
-        try:
-            os.remove(ROIS_JSON_PATH)
-        except Exception:
-            pass
+    if args.reset_rois:
+        reset_rois()
 
-    def capture_rotated():
-        frame = capture_one_frame(args.camera)
-        return rotate_frame(frame, args.rotate)
+    session = _session_from_args(args)
+
+    # -------------------------------------------------
+    # Ping (cold start 측정용)
+    # -------------------------------------------------
+    if args.ping:
+        print(json.dumps({"ok": True, "pid": os.getpid()}))
+        return
 
     # -------------------------------------------------
     # Capture
     # -------------------------------------------------
     if args.capture:
-        frame = capture_rotated()
-        cv2.imwrite(FRAME_JPG_PATH, frame)
-        print(json.dumps({"ok": True, "frame_path": FRAME_JPG_PATH}))
+        print(json.dumps(session.capture()))
         return
 
     # -------------------------------------------------
     # YOLO
     # -------------------------------------------------
     if args.yolo:
-        frame = capture_rotated()
-        cv2.imwrite(FRAME_JPG_PATH, frame)
-
-        rois, annotated_path = run_yolo_on_frame(frame)
-        print(json.dumps({
-            "ok": True,
-            "rois": rois,
-            "annotated_path": annotated_path,
-        }))
+        res = session.yolo(annotate=args.annotate)
+        flush_annotations()  # 프로세스 종료 전에 이미지 기록 완료
+        print(json.dumps(res))
         return
 
     # -------------------------------------------------
     # OCR
     # -------------------------------------------------
     if args.ocr:
-        frame = capture_rotated()
-        cv2.imwrite(FRAME_JPG_PATH, frame)
-
-        if args.ocr_auto_rois and not os.path.exists(ROIS_JSON_PATH):
-            run_yolo_on_frame(frame)
-
-        trt_model = TRTWrapper(OCR_TRT_PATH)
-        volume = read_volume_trt(frame, trt_model)
-
-        print(json.dumps({
-            "ok": True,
-            "volume": int(volume),
-        }))
+        print(json.dumps(session.ocr(auto_rois=args.ocr_auto_rois)))
         return
 
     # -------------------------------------------------
     # Run to target (vision based)
     # -------------------------------------------------
     if args.run_target:
-        run_to_target(target=args.target, camera_index=args.camera)
+        session.run_target(target=args.target)
         print(json.dumps({"ok": True}))
         return
 
@@ -1,6 +1,10 @@
 import json
+import queue
+import threading
+from typing import Optional
+
 import cv2
-from ultralytics import YOLO
+import numpy as np
 
 from worker.paths import (
     YOLO_MODEL_PATH,
@@ -10,6 +14,35 @@ from worker.paths import (
 )
 
 
+# =========================================================
+# Model cache (프로세스당 1회 로드)
+# =========================================================
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_yolo_model(model_path: str = YOLO_MODEL_PATH):
+    with _models_lock:
+        model = _models.get(model_path)
+        if model is None:
+            from ultralytics import YOLO
+            model = YOLO(model_path)
+            _models[model_path] = model
+        return model
+
+
+def warmup_yolo(model_path: str = YOLO_MODEL_PATH, frame_shape=(1280, 800, 3)):
+    """
+    모델 로드 + 더미 추론 1회 (CUDA context / fuse / 첫 호출 지연을 미리 소모)
+    """
+    model = get_yolo_model(model_path)
+    model(np.zeros(frame_shape, dtype=np.uint8), verbose=False)
+    return model
+
+
+# =========================================================
+# Detection
+# =========================================================
 def _sorted_rois_from_results(results, frame_shape):
     boxes = results.boxes
     if boxes is None or len(boxes) == 0:
@@ -29,19 +62,27 @@ def _sorted_rois_from_results(results, frame_shape):
     return rois
 
 
-def run_yolo_on_frame(frame, conf: float = 0.2, iou: float = 0.5):
+def detect_rois(frame, conf: float = 0.2, iou: float = 0.5, model=None):
     """
-    - frame: BGR image from camera
-    - returns: (rois, annotated_image_path)
+    추론만 수행 (파일 I/O / 시각화 없음)
+    - returns: [[x, y, w, h], ...] 위 → 아래 정렬, 최대 4개
     """
-    ensure_state_dir()
+    if model is None:
+        model = get_yolo_model()
+    result = model(frame, conf=conf, iou=iou, verbose=False)[0]
+    return _sorted_rois_from_results(result, frame.shape)
 
 
-    model = YOLO(YOLO_MODEL_PATH)
-    result = model(frame, conf=conf, iou=iou, verbose=False)[0]
+def save_rois(rois, path: str = ROIS_JSON_PATH):
+    ensure_state_dir()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rois, f, ensure_ascii=False, indent=2)
 
-    rois = _sorted_rois_from_results(result, frame.shape)
 
+# =========================================================
+# Annotation (opt-in, background writer)
+# =========================================================
+def render_annotated(frame, rois, path: str = YOLO_JPG_PATH):
     vis = frame.copy()
     for i, (x, y, w, h) in enumerate(rois):
         cv2.rectangle(vis, (x, y), (x + w, y + h), (0, 255, 0), 2)
@@ -55,10 +96,81 @@ def run_yolo_on_frame(frame, conf: float = 0.2, iou: float = 0.5):
             2,
         )
 
-    cv2.imwrite(YOLO_JPG_PATH, vis)
+    if not cv2.imwrite(path, vis):
+        raise RuntimeError(f"Failed to write image: {path}")
+    return path
+
+
+class _AnnotationWriter:
+    """
+    시각화 + JPEG 인코딩을 별도 thread에서 처리
+    - 밀린 요청은 최신 1개만 남긴다 (중간 결과는 버림)
+    - 기록 실패는 error에 남기고 다음 flush()에서 RuntimeError로 알림
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=1)
+        self._thread = None
+        self._lock = threading.Lock()
+        self.error: Optional[str] = None
+
+    def submit(self, frame, rois, path: str = YOLO_JPG_PATH):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True)
+                self._thread.start()
+
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                pass
+            self._queue.put((frame, list(rois), path))
+
+    def flush(self):
+        """대기 중인 이미지가 모두 기록될 때까지 대기 (그 사이 실패가 있었으면 RuntimeError)"""
+        self._queue.join()
+        error, self.error = self.error, None
+        if error is not None:
+            raise RuntimeError(f"Annotation write failed: {error}")
+
+    def _loop(self):
+        while True:
+            frame, rois, path = self._queue.get()
+            try:
+                render_annotated(frame, rois, path)
+            except Exception as e:
+                self.error = f"{path}: {type(e).__name__}: {e}"
+            finally:
+                self._queue.task_done()
 
-    with open(ROIS_JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(rois, f, ensure_ascii=False, indent=2)
+
+_annotation_writer = _AnnotationWriter()
+
+
+def flush_annotations():
+    _annotation_writer.flush()
+
+
+def run_yolo_on_frame(
+    frame,
+    conf: float = 0.2,
+    iou: float = 0.5,
+    model=None,
+    annotate: bool = False,
+):
+    """
+    - frame: BGR image from camera (annotate=True면 기록 완료 전까지 수정 금지)
+    - model: None이면 캐시된 모델 사용
+    - annotate: True면 YOLO_JPG_PATH에 ROI 시각화 이미지를 background로 기록
+    - returns: (rois, annotated_image_path or None)
+    """
+    rois = detect_rois(frame, conf=conf, iou=iou, model=model)
+    save_rois(rois)
 
     # OpenCV GUI 절대 사용하지 않음
+    if not annotate:
+        return rois, None
+
+    _annotation_writer.submit(frame, rois)
     return rois, YOLO_JPG_PATH